@@ -8,6 +8,9 @@ from celery import Celery
 from celery.exceptions import ImproperlyConfigured
 from celery.signals import celeryd_after_setup, task_postrun, task_prerun
 from django.conf import settings
+from django.db import connection
+
+from grandchallenge.core.metrics import get_task_metric_name, increment_metric
 
 logger = logging.getLogger(__name__)
 
@@ -101,3 +104,38 @@ def remove_ecs_scale_in_protection(*_, **__):
             json={"ProtectionEnabled": False},
         )
         response.raise_for_status()
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+_query_counters = {}
+
+
+@task_prerun.connect()
+def start_counting_queries(*_, task_id, **__):
+    if settings.ENABLE_CELERY_TASK_METRICS:
+        _query_counters[task_id] = _QueryCounter()
+        connection.execute_wrappers.append(_query_counters[task_id])
+
+
+@task_postrun.connect()
+def stop_counting_queries(*_, task_id, task, **__):
+    query_counter = _query_counters.pop(task_id, None)
+
+    if query_counter is not None:
+        connection.execute_wrappers.remove(query_counter)
+
+        increment_metric(
+            name=get_task_metric_name(task_name=task.name, name="runs")
+        )
+        increment_metric(
+            name=get_task_metric_name(task_name=task.name, name="queries"),
+            value=query_counter.count,
+        )
@@ -6,6 +6,7 @@ from datetime import timedelta
 from itertools import product
 from pathlib import Path
 from subprocess import CalledProcessError
+from tempfile import gettempdir
 
 import sentry_sdk
 from celery.schedules import crontab
@@ -110,6 +111,18 @@ REGISTERED_USERS_GROUP_NAME = "__registered_users_group__"
 REGISTERED_AND_ANON_USERS_GROUP_NAME = "__registered_and_anonymous_users__"
 CHALLENGES_REVIEWERS_GROUP_NAME = "__challengerequest_reviewers__"
 
+# Models, as app_label.ModelName, where filter_by_permission should use the
+# materialised object permission index rather than the permission tables.
+# The index is only maintained for these models, so after adding one run
+# check_object_permission_index --fix to rebuild it.
+GUARDIAN_PERMISSION_INDEX_MODELS = {
+    label
+    for label in os.environ.get("GUARDIAN_PERMISSION_INDEX_MODELS", "").split(
+        ","
+    )
+    if label
+}
+
 # Local time zone for this installation. Choices can be found here:
 # http://en.wikipedia.org/wiki/List_of_tz_zones_by_name
 # although not all choices may be available on all operating systems.
@@ -944,6 +957,10 @@ CELERY_SOLO_QUEUES = {
 CELERY_WORKER_MAX_MEMORY_MB = int(
     os.environ.get("CELERY_WORKER_MAX_MEMORY_MB", "0")
 )
+# Count the queries and lock retries of each task, used for benchmarking
+ENABLE_CELERY_TASK_METRICS = strtobool(
+    os.environ.get("ENABLE_CELERY_TASK_METRICS", "False")
+)
 ECS_ENABLE_CELERY_SCALE_IN_PROTECTION = strtobool(
     os.environ.get("ECS_ENABLE_CELERY_SCALE_IN_PROTECTION", "False"),
 )
@@ -996,6 +1013,14 @@ COMPONENTS_DEFAULT_BACKEND = os.environ.get(
     "COMPONENTS_DEFAULT_BACKEND",
     "grandchallenge.components.backends.amazon_sagemaker_training.AmazonSageMakerTrainingExecutor",
 )
+# The number of concurrent inference stand-ins of the local executor
+# on each worker, and how long they take
+COMPONENTS_LOCAL_EXECUTOR_CONCURRENCY = int(
+    os.environ.get("COMPONENTS_LOCAL_EXECUTOR_CONCURRENCY", "4")
+)
+COMPONENTS_LOCAL_EXECUTOR_INFERENCE_SECONDS = float(
+    os.environ.get("COMPONENTS_LOCAL_EXECUTOR_INFERENCE_SECONDS", "0")
+)
 COMPONENTS_REGISTRY_URL = os.environ.get(
     "COMPONENTS_REGISTRY_URL", "registry:5000"
 )
@@ -1021,6 +1046,10 @@ COMPONENTS_OUTPUT_BUCKET_NAME = os.environ.get(
     "COMPONENTS_OUTPUT_BUCKET_NAME", "grand-challenge-components-outputs"
 )
 COMPONENTS_MAXIMUM_IMAGE_SIZE = 10 * GIGABYTE
+# The largest json output that will be read into memory for parsing
+COMPONENTS_MAXIMUM_JSON_OUTPUT_SIZE = 512 * MEGABYTE
+# The largest item of a streamed json file that will be read into memory
+COMPONENTS_MAXIMUM_JSON_ITEM_SIZE = 64 * MEGABYTE
 COMPONENTS_MINIMUM_JOB_DURATION = 5 * 60  # 5 minutes
 COMPONENTS_MAXIMUM_JOB_DURATION = 24 * 60 * 60  # 24 hours
 COMPONENTS_AMAZON_ECR_REGION = os.environ.get("COMPONENTS_AMAZON_ECR_REGION")
@@ -1209,6 +1238,22 @@ CELERY_BEAT_SCHEDULE = {
         "task": "grandchallenge.notifications.tasks.send_unread_notification_emails",
         "schedule": crontab(hour=4, minute=0),
     },
+    "backfill_civ_content_hashes": {
+        "task": "grandchallenge.components.tasks.backfill_civ_content_hashes",
+        "schedule": crontab(hour=4, minute=15),
+    },
+    **{
+        f"backfill_{model_name}_civ_set_fingerprints": {
+            "task": "grandchallenge.components.tasks.backfill_civ_set_fingerprints",
+            "kwargs": {"app_label": app_label, "model_name": model_name},
+            "schedule": crontab(hour=4, minute=45),
+        }
+        for app_label, model_name in (
+            ("algorithms", "job"),
+            ("archives", "archiveitem"),
+            ("evaluation", "evaluation"),
+        )
+    },
     "update_site_statistics": {
         "task": "grandchallenge.statistics.tasks.update_site_statistics_cache",
         "schedule": crontab(hour=5, minute=30),
@@ -1273,6 +1318,10 @@ CELERY_BEAT_SCHEDULE = {
         "task": "grandchallenge.evaluation.tasks.cancel_external_evaluations_past_timeout",
         "schedule": timedelta(hours=1),
     },
+    "create_buffered_downloads": {
+        "task": "grandchallenge.serving.tasks.create_buffered_downloads",
+        "schedule": timedelta(seconds=30),
+    },
     "push_metrics_to_cloudwatch": {
         "task": "grandchallenge.core.tasks.put_cloudwatch_metrics",
         "schedule": timedelta(seconds=30),
@@ -1437,9 +1486,23 @@ CASES_MAX_NUM_USER_POST_PROCESSING_TASKS = int(
 CASES_MAX_NUM_USER_UPLOADS = int(
     os.environ.get("CASES_MAX_NUM_USER_UPLOADS", "2000")
 )
+# Store imported images with bulk inserts and concurrent uploads
+CASES_BULK_STORE_IMAGES = strtobool(
+    os.environ.get("CASES_BULK_STORE_IMAGES", "False")
+)
 
 # Maximum file size in bytes to be opened by SimpleITK.ReadImage in Image.sitk_image
 MAX_SITK_FILE_SIZE = 256 * MEGABYTE
+# Worker local cache of the files opened in Image.sitk_image
+IMAGE_CACHE_DIRECTORY = Path(
+    os.environ.get(
+        "IMAGE_CACHE_DIRECTORY",
+        Path(gettempdir()) / "grand-challenge-image-cache",
+    )
+)
+IMAGE_CACHE_MAX_BYTES = int(
+    os.environ.get("IMAGE_CACHE_MAX_BYTES", 4 * GIGABYTE)
+)
 
 # The maximum size of all the files in an upload session in bytes
 UPLOAD_SESSION_MAX_BYTES = 10 * GIGABYTE
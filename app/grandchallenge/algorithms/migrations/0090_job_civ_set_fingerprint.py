@@ -0,0 +1,42 @@
+# Generated by Django 5.2.9 on 2026-10-17 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("algorithms", "0089_jobobjectpermissionindex"),
+    ]
+
+    operations = [
+        # Existing rows are left empty for the backfill task
+        migrations.AddField(
+            model_name="job",
+            name="civ_set_fingerprint",
+            field=models.CharField(
+                default="",
+                editable=False,
+                help_text="The SHA256 of the sorted pks of the CIVs of this object",
+                max_length=64,
+            ),
+            preserve_default=False,
+        ),
+        migrations.AlterField(
+            model_name="job",
+            name="civ_set_fingerprint",
+            field=models.CharField(
+                default="e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855",
+                editable=False,
+                help_text="The SHA256 of the sorted pks of the CIVs of this object",
+                max_length=64,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["algorithm_image", "civ_set_fingerprint"],
+                name="algorithms__algorit_c39c04_idx",
+            ),
+        ),
+    ]
@@ -27,6 +27,7 @@ from grandchallenge.anatomy.models import BodyStructure
 from grandchallenge.charts.specs import stacked_bar
 from grandchallenge.components.models import (  # noqa: F401
     CIVForObjectMixin,
+    CIVSetFingerprintMixin,
     ComponentImage,
     ComponentInterface,
     ComponentInterfaceValue,
@@ -38,6 +39,7 @@ from grandchallenge.components.models import (  # noqa: F401
 from grandchallenge.components.schemas import GPUTypeChoices
 from grandchallenge.core.guardian import (
     GroupObjectPermissionBase,
+    ObjectPermissionIndexBase,
     UserObjectPermissionBase,
 )
 from grandchallenge.core.models import RequestBase, UUIDModel
@@ -961,27 +963,19 @@ class JobManager(ComponentJobManager):
     def get_jobs_with_same_inputs(
         self, *, inputs, algorithm_image, algorithm_model
     ):
-        existing_civs = self.retrieve_existing_civs(civ_data_objects=inputs)
         unique_kwargs = {
             "algorithm_image": algorithm_image,
         }
-        input_interface_count = len(inputs)
 
         if algorithm_model:
             unique_kwargs["algorithm_model"] = algorithm_model
         else:
             unique_kwargs["algorithm_model__isnull"] = True
 
-        # annotate the number of inputs and the number of inputs that match
-        # the existing civs and filter on both counts so as to not include jobs
-        # with partially overlapping inputs
-        # or jobs with more inputs than the existing civs
-        annotated_qs = annotate_input_output_counts(
-            queryset=Job.objects.filter(**unique_kwargs), inputs=existing_civs
-        )
-        existing_jobs = annotated_qs.filter(
-            input_count=input_interface_count,
-            relevant_input_count=input_interface_count,
+        # match on the fingerprint of all inputs so as to not include jobs
+        # with partially overlapping inputs or with more inputs
+        existing_jobs = Job.objects.filter(**unique_kwargs).filter_by_civ_set(
+            civ_data_objects=inputs
         )
 
         return existing_jobs
@@ -1070,7 +1064,7 @@ class AlgorithmModelGroupObjectPermission(GroupObjectPermissionBase):
     )
 
 
-class Job(CIVForObjectMixin, ComponentJob):
+class Job(CIVForObjectMixin, CIVSetFingerprintMixin, ComponentJob):
     objects = JobManager.as_manager()
 
     algorithm_image = models.ForeignKey(
@@ -1119,6 +1113,10 @@ class Job(CIVForObjectMixin, ComponentJob):
     class Meta(UUIDModel.Meta, ComponentJob.Meta):
         ordering = ("created",)
         permissions = [("view_logs", "Can view the jobs logs")]
+        indexes = [
+            *ComponentJob.Meta.indexes,
+            models.Index(fields=["algorithm_image", "civ_set_fingerprint"]),
+        ]
 
     def __str__(self):
         return f"Job {self.pk}"
@@ -1291,6 +1289,9 @@ class Job(CIVForObjectMixin, ComponentJob):
     def get_civ_for_interface(self, interface):
         return self.inputs.get(interface=interface)
 
+    def get_fingerprinted_civs(self):
+        return self.inputs.all()
+
     def validate_civ_data_objects_and_execute_linked_task(
         self, *, civ_data_objects, user, linked_task=None
     ):
@@ -1384,6 +1385,10 @@ class JobGroupObjectPermission(GroupObjectPermissionBase):
     content_object = models.ForeignKey(Job, on_delete=models.CASCADE)
 
 
+class JobObjectPermissionIndex(ObjectPermissionIndexBase):
+    content_object = models.ForeignKey(Job, on_delete=models.CASCADE)
+
+
 @receiver(post_delete, sender=Job)
 def delete_job_groups_hook(*_, instance: Job, using, **__):
     """
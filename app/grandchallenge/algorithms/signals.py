@@ -3,7 +3,13 @@ from django.dispatch import receiver
 from guardian.shortcuts import assign_perm, remove_perm
 
 from grandchallenge.algorithms.models import Job
-from grandchallenge.cases.models import Image
+from grandchallenge.cases.models import (
+    Image,
+    bulk_update_viewer_groups_permissions,
+)
+from grandchallenge.components.models import (
+    update_civ_set_fingerprints_on_m2m_change,
+)
 
 
 @receiver(m2m_changed, sender=Job.inputs.through)
@@ -59,12 +65,12 @@ def update_view_image_permissions_on_job_io_change(  # noqa:C901
                 assign_perm("view_image", group, images)
 
     elif action in {"post_remove", "pre_clear"}:
-        exclude_jobs = jobs if action == "pre_clear" else None
-
-        for image in images:
-            # We cannot remove image permissions directly as the groups
-            # may have permissions through another object
-            image.update_viewer_groups_permissions(exclude_jobs=exclude_jobs)
+        # We cannot remove image permissions directly as the groups
+        # may have permissions through another object
+        bulk_update_viewer_groups_permissions(
+            images=images,
+            exclude_jobs=jobs if action == "pre_clear" else None,
+        )
 
     else:
         raise NotImplementedError
@@ -113,12 +119,12 @@ def update_permissions_on_viewer_groups_change(  # noqa:C901
             for job in jobs:
                 remove_perm("view_job", group, job)
 
-        exclude_jobs = jobs if action == "pre_clear" else None
-
-        for image in images:
-            # We cannot remove image permissions directly as the groups
-            # may have permissions through another object
-            image.update_viewer_groups_permissions(exclude_jobs=exclude_jobs)
+        # We cannot remove image permissions directly as the groups
+        # may have permissions through another object
+        bulk_update_viewer_groups_permissions(
+            images=images,
+            exclude_jobs=jobs if action == "pre_clear" else None,
+        )
 
     else:
         raise NotImplementedError
@@ -128,7 +134,21 @@ def update_permissions_on_viewer_groups_change(  # noqa:C901
 def update_view_image_permissions_on_job_deletion(*_, instance: Job, **__):
     jobs = [instance]
 
-    for image in _get_images_for_jobs(jobs=jobs):
-        # We cannot remove image permissions directly as the groups
-        # may have permissions through another object
-        image.update_viewer_groups_permissions(exclude_jobs=jobs)
+    # We cannot remove image permissions directly as the groups
+    # may have permissions through another object
+    bulk_update_viewer_groups_permissions(
+        images=_get_images_for_jobs(jobs=jobs), exclude_jobs=jobs
+    )
+
+
+@receiver(m2m_changed, sender=Job.inputs.through)
+def update_job_civ_set_fingerprint(
+    *, instance, action, reverse, model, pk_set, **_
+):
+    update_civ_set_fingerprints_on_m2m_change(
+        instance=instance,
+        action=action,
+        reverse=reverse,
+        model=model,
+        pk_set=pk_set,
+    )
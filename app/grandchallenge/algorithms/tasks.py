@@ -1,17 +1,22 @@
+from itertools import batched
 from typing import NamedTuple
 
+from celery import group
 from celery.utils.log import get_task_logger
 from dateutil.relativedelta import relativedelta
 from django.conf import settings
+from django.contrib.postgres.aggregates import ArrayAgg
 from django.core.cache import cache
 from django.db import transaction
-from django.db.models import F, Max
+from django.db.models import Exists, F, Max, OuterRef
 from django.db.transaction import on_commit
 from django.utils import timezone
+from guardian.shortcuts import assign_perm
 
 from grandchallenge.algorithms.exceptions import TooManyJobsScheduled
 from grandchallenge.components.schemas import GPUTypeChoices
 from grandchallenge.components.tasks import (
+    provision_job,
     remove_container_image_from_registry,
 )
 from grandchallenge.core.celery import (
@@ -28,6 +33,9 @@ from grandchallenge.subdomains.utils import reverse
 
 logger = get_task_logger(__name__)
 
+# The number of jobs that are sent for provisioning in one Celery group
+JOB_SCHEDULING_CHUNK_SIZE = 100
+
 
 @acks_late_micro_short_task(
     retry_on=(LockNotAcquiredException, TooManyJobsScheduled)
@@ -116,8 +124,6 @@ def create_algorithm_jobs(
     job_utilization_challenge
         The challenge that should be assigned for utilization tracking
     """
-    from grandchallenge.algorithms.models import Job
-
     if not algorithm_image:
         raise RuntimeError("Algorithm image required to create jobs.")
 
@@ -127,29 +133,81 @@ def create_algorithm_jobs(
         algorithm_model=algorithm_model,
     )
 
-    items_remaining = sum(
-        len(archive_items) for archive_items in valid_job_inputs.values()
-    )
+    job_inputs = [
+        (interface, ai)
+        for interface, archive_items in valid_job_inputs.items()
+        for ai in archive_items
+    ]
 
     if time_limit is None:
         time_limit = settings.ALGORITHMS_JOB_DEFAULT_TIME_LIMIT_SECONDS
 
+    jobs = _bulk_create_algorithm_jobs(
+        job_inputs=job_inputs[:max_jobs],
+        items_remaining=len(job_inputs),
+        algorithm_image=algorithm_image,
+        algorithm_model=algorithm_model,
+        time_limit=time_limit,
+        requires_gpu_type=requires_gpu_type,
+        requires_memory_gb=requires_memory_gb,
+        task_on_success=task_on_success,
+        task_on_failure=task_on_failure,
+    )
+
+    _bulk_create_job_relations(
+        jobs=jobs,
+        job_inputs=job_inputs[:max_jobs],
+        extra_viewer_groups=extra_viewer_groups,
+        extra_logs_viewer_groups=extra_logs_viewer_groups,
+        job_utilization_phase=job_utilization_phase,
+        job_utilization_challenge=job_utilization_challenge,
+    )
+
+    for chunk in batched(jobs, JOB_SCHEDULING_CHUNK_SIZE, strict=False):
+        on_commit(
+            group(
+                provision_job.signature(**job.signature_kwargs)
+                for job in chunk
+            ).apply_async
+        )
+
+    if len(job_inputs) > max_jobs:
+        # The jobs that were created are kept, the caller can retry
+        # to create the rest
+        raise TooManyJobsScheduled
+
+    return jobs
+
+
+def _bulk_create_algorithm_jobs(
+    *,
+    job_inputs,
+    items_remaining,
+    algorithm_image,
+    algorithm_model,
+    time_limit,
+    requires_gpu_type,
+    requires_memory_gb,
+    task_on_success,
+    task_on_failure,
+):
+    from grandchallenge.algorithms.models import Job
+    from grandchallenge.components.models import get_civ_set_fingerprint
+
     jobs = []
-    for interface, archive_items in valid_job_inputs.items():
-        for ai in archive_items:
-            if len(jobs) >= max_jobs:
-                raise TooManyJobsScheduled
-
-            use_warm_pool = (requires_gpu_type == GPUTypeChoices.A10G) and (
-                (
-                    items_remaining
-                    - settings.ALGORITHMS_MAX_ACTIVE_JOBS_PER_ALGORITHM
-                    - len(jobs)
-                )
-                > 0
+
+    for interface, ai in job_inputs:
+        use_warm_pool = (requires_gpu_type == GPUTypeChoices.A10G) and (
+            (
+                items_remaining
+                - settings.ALGORITHMS_MAX_ACTIVE_JOBS_PER_ALGORITHM
+                - len(jobs)
             )
+            > 0
+        )
 
-            job = Job.objects.create(
+        jobs.append(
+            Job(
                 creator=None,  # System jobs, so no creator
                 algorithm_image=algorithm_image,
                 algorithm_model=algorithm_model,
@@ -159,22 +217,95 @@ def create_algorithm_jobs(
                 time_limit=time_limit,
                 requires_gpu_type=requires_gpu_type,
                 requires_memory_gb=requires_memory_gb,
-                extra_viewer_groups=extra_viewer_groups,
-                extra_logs_viewer_groups=extra_logs_viewer_groups,
-                input_civ_set=ai.values.all(),
                 use_warm_pool=use_warm_pool,
+                # The inputs are bulk created, which does not send the
+                # m2m_changed signal that would set this
+                civ_set_fingerprint=get_civ_set_fingerprint(
+                    civ_pks=ai.value_pks
+                ),
             )
+        )
 
-            job.utilization.archive = ai.archive
-            job.utilization.phase = job_utilization_phase
-            job.utilization.challenge = job_utilization_challenge
-            job.utilization.save()
+    if jobs:
+        # The credits only depend on the algorithm and time limit
+        # which are the same for all of these jobs
+        jobs[0].init_credits_consumed()
 
-            job.execute()
+        for job in jobs[1:]:
+            job.credits_consumed = jobs[0].credits_consumed
 
-            jobs.append(job)
+    return Job.objects.bulk_create(jobs)
 
-    return jobs
+
+def _bulk_create_job_relations(
+    *,
+    jobs,
+    job_inputs,
+    extra_viewer_groups,
+    extra_logs_viewer_groups,
+    job_utilization_phase,
+    job_utilization_challenge,
+):
+    """
+    Creates what Job.save and JobManager.create would for system jobs
+
+    The m2m_changed signals are not sent for bulk creation, so the
+    permissions they would have assigned are set here.
+    """
+    from grandchallenge.algorithms.models import Job
+    from grandchallenge.cases.models import (
+        Image,
+        bulk_update_viewer_groups_permissions,
+    )
+    from grandchallenge.utilization.models import JobUtilization
+
+    JobUtilization.objects.bulk_create(
+        [
+            JobUtilization(
+                job=job,
+                creator=None,
+                algorithm_image=job.algorithm_image,
+                algorithm=job.algorithm_image.algorithm,
+                archive_id=ai.archive_id,
+                phase=job_utilization_phase,
+                challenge=job_utilization_challenge,
+            )
+            for job, (_, ai) in zip(jobs, job_inputs, strict=True)
+        ]
+    )
+
+    Job.inputs.through.objects.bulk_create(
+        [
+            Job.inputs.through(job_id=job.pk, componentinterfacevalue_id=pk)
+            for job, (_, ai) in zip(jobs, job_inputs, strict=True)
+            for pk in ai.value_pks
+        ]
+    )
+
+    job_queryset = Job.objects.filter(pk__in=[job.pk for job in jobs])
+
+    if extra_viewer_groups:
+        Job.viewer_groups.through.objects.bulk_create(
+            [
+                Job.viewer_groups.through(
+                    job_id=job.pk, group_id=viewer_group.pk
+                )
+                for job in jobs
+                for viewer_group in extra_viewer_groups
+            ]
+        )
+
+        for viewer_group in extra_viewer_groups:
+            assign_perm("view_job", viewer_group, job_queryset)
+
+        bulk_update_viewer_groups_permissions(
+            images=Image.objects.filter(
+                componentinterfacevalue__algorithms_jobs_as_input__in=job_queryset
+            )
+        )
+
+    for logs_viewer_group in extra_logs_viewer_groups or []:
+        assign_perm("algorithms.view_logs", logs_viewer_group, job_queryset)
 
 
 def filter_archive_items_for_algorithm(
@@ -197,9 +328,10 @@ def filter_archive_items_for_algorithm(
     -------
     Dictionary of valid ArchiveItems for new jobs, grouped by AlgorithmInterface
     """
+    from grandchallenge.algorithms.models import Job
+    from grandchallenge.components.models import EMPTY_CIV_SET_FINGERPRINT
     from grandchallenge.evaluation.models import (
         get_archive_items_for_interfaces,
-        get_valid_jobs_for_interfaces_and_archive_items,
     )
 
     algorithm_interfaces = (
@@ -213,27 +345,30 @@ def filter_archive_items_for_algorithm(
         algorithm_interfaces=algorithm_interfaces, archive_items=archive_items
     )
 
-    # Next, group all system jobs that have been run for the provided archive items
-    # with the same model and image by interface
-    existing_jobs_for_interfaces = (
-        get_valid_jobs_for_interfaces_and_archive_items(
-            algorithm_image=algorithm_image,
-            algorithm_model=algorithm_model,
-            algorithm_interfaces=algorithm_interfaces,
-            valid_archive_items_per_interface=valid_job_inputs,
-        )
-    )
-    # Finally, exclude archive items for which there already is a job
+    if algorithm_model:
+        extra_filter = {"algorithm_model": algorithm_model}
+    else:
+        extra_filter = {"algorithm_model__isnull": True}
+
+    # Next, exclude the archive items that have the same values as the
+    # inputs of a system job run with the same model and image
     filtered_valid_job_inputs = {}
     for interface, archive_items in valid_job_inputs.items():
-        job_input_sets_for_interface = {
-            frozenset(j.inputs.all())
-            for j in existing_jobs_for_interfaces[interface]
-        }
+        existing_jobs = Job.objects.filter(
+            algorithm_image=algorithm_image,
+            algorithm_interface=interface,
+            creator=None,
+            civ_set_fingerprint=OuterRef("civ_set_fingerprint"),
+            **extra_filter,
+        ).exclude(
+            # Rows that have not been backfilled yet, or that have no
+            # inputs, do not identify an input set
+            civ_set_fingerprint__in=["", EMPTY_CIV_SET_FINGERPRINT]
+        )
         filtered_valid_job_inputs[interface] = [
-            ai
-            for ai in archive_items
-            if not frozenset(ai.values.all()) in job_input_sets_for_interface
+            *archive_items.annotate(
+                value_pks=ArrayAgg("values__pk", distinct=True, default=[])
+            ).exclude(Exists(existing_jobs))
         ]
 
     return filtered_valid_job_inputs
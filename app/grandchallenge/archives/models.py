@@ -10,6 +10,7 @@ from pictures.models import PictureField
 from grandchallenge.anatomy.models import BodyStructure
 from grandchallenge.components.models import (
     CIVForObjectMixin,
+    CIVSetFingerprintMixin,
     CIVSetObjectPermissionsMixin,
     CIVSetStringRepresentationMixin,
     ComponentInterfaceValue,
@@ -318,6 +319,7 @@ class ArchiveItem(
     CIVSetStringRepresentationMixin,
     CIVSetObjectPermissionsMixin,
     CIVForObjectMixin,
+    CIVSetFingerprintMixin,
     UUIDModel,
 ):
     archive = models.ForeignKey(
@@ -336,6 +338,7 @@ class ArchiveItem(
                 condition=~Q(title=""),
             )
         ]
+        indexes = [models.Index(fields=["archive", "civ_set_fingerprint"])]
 
     def assign_permissions(self):
         # Archive editors, uploaders and users can view this archive item
@@ -397,6 +400,9 @@ class ArchiveItem(
     def get_civ_for_interface(self, interface):
         return self.values.get(interface=interface)
 
+    def get_fingerprinted_civs(self):
+        return self.values.all()
+
 
 class ArchiveItemUserObjectPermission(UserObjectPermissionBase):
     allowed_permissions = frozenset()
@@ -2,7 +2,13 @@ from django.db.models.signals import m2m_changed, post_save, pre_delete
 from django.dispatch import receiver
 
 from grandchallenge.archives.models import ArchiveItem
-from grandchallenge.cases.models import Image
+from grandchallenge.cases.models import (
+    Image,
+    bulk_update_viewer_groups_permissions,
+)
+from grandchallenge.components.models import (
+    update_civ_set_fingerprints_on_m2m_change,
+)
 
 
 @receiver(m2m_changed, sender=ArchiveItem.values.through)
@@ -39,10 +45,9 @@ def update_view_image_permissions_on_archive_item_values_change(
 
     exclude_archive_items = archive_items if action == "pre_clear" else None
 
-    for image in images.distinct():
-        image.update_viewer_groups_permissions(
-            exclude_archive_items=exclude_archive_items
-        )
+    bulk_update_viewer_groups_permissions(
+        images=images, exclude_archive_items=exclude_archive_items
+    )
 
 
 @receiver(pre_delete, sender=ArchiveItem)
@@ -55,7 +60,19 @@ def update_view_image_permissions_on_archive_item_change(
     )
     exclude_archive_items = [instance] if signal is pre_delete else None
 
-    for image in images.distinct():
-        image.update_viewer_groups_permissions(
-            exclude_archive_items=exclude_archive_items
-        )
+    bulk_update_viewer_groups_permissions(
+        images=images, exclude_archive_items=exclude_archive_items
+    )
+
+
+@receiver(m2m_changed, sender=ArchiveItem.values.through)
+def update_archive_item_civ_set_fingerprint(
+    *, instance, action, reverse, model, pk_set, **_
+):
+    update_civ_set_fingerprints_on_m2m_change(
+        instance=instance,
+        action=action,
+        reverse=reverse,
+        model=model,
+        pk_set=pk_set,
+    )
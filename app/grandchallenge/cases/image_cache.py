@@ -0,0 +1,238 @@
+"""
+Worker local cache of the image files that are opened with SimpleITK
+
+Each entry is a directory containing the files of one image, so that an
+MHD header can find its RAW file. Image files cannot be changed once
+they are stored, so an entry is keyed by the primary keys, names and
+sizes of its files. Cache hits are served without contacting the
+storage backend.
+
+The cache is shared by the processes on a worker. Entries are filled in
+a temporary directory and then renamed into place, and are protected
+from eviction with a shared file lock while in use. The least recently
+used entries are evicted when the cache grows beyond
+settings.IMAGE_CACHE_MAX_BYTES. The temporary directories that are left
+behind by processes that died count towards that size until they are
+removed.
+"""
+
+import fcntl
+import logging
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from hashlib import sha256
+from pathlib import Path
+from uuid import uuid4
+
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+from django.conf import settings
+
+from grandchallenge.core.metrics import increment_metric
+
+logger = logging.getLogger(__name__)
+
+# Files are downloaded with concurrent ranged requests of this size
+IMAGE_CACHE_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * settings.MEGABYTE,
+    multipart_chunksize=8 * settings.MEGABYTE,
+    max_concurrency=8,
+)
+
+_LOCK_FILE_NAME = ".lock"
+
+# Staging and evicted directories that are not locked and have not been
+# changed for this long were left behind by a process that died
+_STALE_DIRECTORY_SECONDS = 10 * 60
+
+
+@contextmanager
+def cached_image_files(*, image_files):
+    """
+    Provides local copies of the image files
+
+    Yields
+    ------
+        The local paths of the image files, in the same order
+    """
+    directory = _get_entry_directory(image_files=image_files)
+    names = [Path(f.file.name).name for f in image_files]
+
+    with _locked_entry(directory=directory) as is_hit:
+        if is_hit:
+            increment_metric(name="cases.image_cache.hits")
+            increment_metric(
+                name="cases.image_cache.bytes_saved",
+                value=sum(f.size_in_storage for f in image_files),
+            )
+            yield [directory / name for name in names]
+            return
+
+    increment_metric(name="cases.image_cache.misses")
+
+    with _filled_entry(
+        directory=directory, image_files=image_files
+    ) as filled_directory:
+        yield [filled_directory / name for name in names]
+
+    _evict_entries()
+
+
+def _get_entry_directory(*, image_files):
+    key = sha256(
+        "\n".join(
+            f"{f.pk}:{f.file.name}:{f.size_in_storage}" for f in image_files
+        ).encode("utf-8")
+    ).hexdigest()
+    return settings.IMAGE_CACHE_DIRECTORY / key
+
+
+@contextmanager
+def _locked_entry(*, directory):
+    """Holds a shared lock on the entry, if it exists"""
+    try:
+        lock_file = open(directory / _LOCK_FILE_NAME, "rb")
+    except FileNotFoundError:
+        yield False
+        return
+
+    with lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_SH)
+
+        # The entry could have been evicted while waiting for the lock
+        is_hit = directory.exists()
+
+        if is_hit:
+            # Entries are evicted by their modification time
+            os.utime(directory)
+
+        yield is_hit
+
+
+@contextmanager
+def _filled_entry(*, directory, image_files):
+    """Fills the entry and holds a shared lock on it"""
+    settings.IMAGE_CACHE_DIRECTORY.mkdir(parents=True, exist_ok=True)
+    staging = settings.IMAGE_CACHE_DIRECTORY / f".staging-{uuid4()}"
+    staging.mkdir()
+
+    try:
+        with open(staging / _LOCK_FILE_NAME, "xb") as lock_file:
+            # The lock moves with the directory, so the entry cannot be
+            # evicted before it is used
+            fcntl.flock(lock_file, fcntl.LOCK_SH)
+
+            for image_file in image_files:
+                _download_file(
+                    file=image_file.file,
+                    path=staging / Path(image_file.file.name).name,
+                )
+
+            try:
+                staging.rename(directory)
+            except OSError:
+                # Another process filled the entry first, use this copy
+                yield staging
+            else:
+                yield directory
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _download_file(*, file, path):
+    client = file.storage.connection.meta.client
+
+    try:
+        client.download_file(
+            Bucket=file.storage.bucket.name,
+            Key=file.name,
+            Filename=str(path),
+            Config=IMAGE_CACHE_TRANSFER_CONFIG,
+        )
+    except ClientError as error:
+        if error.response["Error"]["Code"] in {"404", "NoSuchKey"}:
+            raise FileNotFoundError(f"No file found for {file}") from error
+        raise
+
+
+def _evict_entries():
+    """Removes the least recently used entries that are not in use"""
+    entries = []
+    total_bytes = 0
+
+    for directory in settings.IMAGE_CACHE_DIRECTORY.iterdir():
+        try:
+            modified = directory.stat().st_mtime
+            num_bytes = sum(f.stat().st_size for f in directory.iterdir())
+        except FileNotFoundError:
+            # Evicted or moved by another process
+            continue
+
+        total_bytes += num_bytes
+
+        if not directory.name.startswith("."):
+            entries.append((modified, num_bytes, directory))
+        elif time.time() - modified > _STALE_DIRECTORY_SECONDS:
+            if _remove_stale_directory(directory=directory):
+                total_bytes -= num_bytes
+
+    for _, num_bytes, directory in sorted(entries):
+        if total_bytes <= settings.IMAGE_CACHE_MAX_BYTES:
+            break
+
+        if _remove_entry(directory=directory):
+            total_bytes -= num_bytes
+
+
+def _remove_entry(*, directory):
+    try:
+        lock_file = open(directory / _LOCK_FILE_NAME, "rb")
+    except FileNotFoundError:
+        return False
+
+    with lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            # The entry is in use
+            return False
+
+        evicted = directory.with_name(f".evicted-{uuid4()}")
+
+        try:
+            directory.rename(evicted)
+        except FileNotFoundError:
+            return False
+
+    shutil.rmtree(evicted, ignore_errors=True)
+    logger.info(f"Evicted {directory.name} from the image cache")
+
+    return True
+
+
+def _remove_stale_directory(*, directory):
+    """Removes a staging or evicted directory that is not in use"""
+    try:
+        lock_file = open(directory / _LOCK_FILE_NAME, "rb")
+    except FileNotFoundError:
+        # The process died before creating the lock file, or the
+        # directory was removed by another process
+        lock_file = None
+
+    if lock_file is not None:
+        with lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # The entry is still being filled
+                return False
+
+    if not directory.exists():
+        return False
+
+    shutil.rmtree(directory, ignore_errors=True)
+    logger.info(f"Removed {directory.name} from the image cache")
+
+    return True
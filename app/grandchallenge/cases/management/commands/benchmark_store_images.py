@@ -0,0 +1,87 @@
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from uuid import uuid4
+
+from django.core.files import File
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from grandchallenge.cases.models import Image, ImageFile
+from grandchallenge.cases.tasks import _bulk_store_images, _store_images
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the individual and bulk image storage paths "
+        "on a synthetic upload session. Nothing is persisted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--num-files", type=int, default=5_000)
+        parser.add_argument("--file-size", type=int, default=16 * 1024)
+
+    def handle(self, *args, **options):
+        with TemporaryDirectory() as tmp_dir:
+            paths = self._create_files(
+                directory=Path(tmp_dir),
+                num_files=options["num_files"],
+                file_size=options["file_size"],
+            )
+
+            for store_images in (_store_images, _bulk_store_images):
+                duration = self._time_store_images(
+                    store_images=store_images, paths=paths
+                )
+                self.stdout.write(
+                    f"{store_images.__name__}: {len(paths)} files in "
+                    f"{duration:.2f} s ({len(paths) / duration:.1f} files/s)"
+                )
+
+    @staticmethod
+    def _create_files(*, directory, num_files, file_size):
+        paths = []
+
+        for idx in range(num_files):
+            path = directory / f"{idx}.mha"
+            path.write_bytes(os.urandom(file_size))
+            paths.append(path)
+
+        return paths
+
+    @staticmethod
+    def _time_store_images(*, store_images, paths):
+        images = set()
+        image_files = set()
+
+        for path in paths:
+            image = Image(pk=uuid4(), name=path.name, width=1, height=1)
+            image_file = ImageFile(
+                image_id=image.pk, image_type=ImageFile.IMAGE_TYPE_MHD
+            )
+            image_file.file = File(open(path, "rb"), str(path))
+
+            images.add(image)
+            image_files.add(image_file)
+
+        try:
+            with transaction.atomic():
+                start = perf_counter()
+                store_images(
+                    origin=None, images=images, image_files=image_files
+                )
+                duration = perf_counter() - start
+
+                transaction.set_rollback(True)
+        finally:
+            local_names = {str(path) for path in paths}
+
+            for image_file in image_files:
+                image_file.file.close()
+
+                if image_file.file.name not in local_names:
+                    # The file was uploaded so needs to be removed
+                    image_file.file.storage.delete(image_file.file.name)
+
+        return duration
@@ -0,0 +1,58 @@
+from itertools import batched
+
+from django.core.management import BaseCommand
+
+from grandchallenge.cases.models import Image
+from grandchallenge.cases.tasks import (
+    VIEWER_GROUPS_PERMISSIONS_CHUNK_SIZE,
+    update_image_viewer_groups_permissions,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Schedules the recomputation of the view_image group permissions "
+        "for the images in an archive or reader study, or for all images."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--archive", type=str)
+        parser.add_argument("--reader-study", type=str)
+
+    def handle(self, *args, **options):
+        images = Image.objects.all()
+
+        if options["archive"]:
+            images = images.filter(
+                componentinterfacevalue__archive_items__archive__slug=options[
+                    "archive"
+                ]
+            )
+
+        if options["reader_study"]:
+            images = images.filter(
+                componentinterfacevalue__display_sets__reader_study__slug=options[
+                    "reader_study"
+                ]
+            )
+
+        image_pks = (
+            images.distinct()
+            .order_by("pk")
+            .values_list("pk", flat=True)
+            .iterator(chunk_size=VIEWER_GROUPS_PERMISSIONS_CHUNK_SIZE)
+        )
+        num_images = 0
+
+        # One task per chunk keeps the messages and the tasks small
+        for chunk in batched(
+            image_pks, VIEWER_GROUPS_PERMISSIONS_CHUNK_SIZE, strict=False
+        ):
+            update_image_viewer_groups_permissions.apply_async(
+                kwargs={"image_pks": [str(pk) for pk in chunk]}
+            )
+            num_images += len(chunk)
+
+        self.stdout.write(
+            f"Scheduled the permissions update for {num_images} images"
+        )
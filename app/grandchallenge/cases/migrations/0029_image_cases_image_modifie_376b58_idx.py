@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-17 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cases", "0028_imageobjectpermissionindex"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="image",
+            index=models.Index(
+                fields=["modified"], name="cases_image_modifie_376b58_idx"
+            ),
+        ),
+    ]
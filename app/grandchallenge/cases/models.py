@@ -2,18 +2,17 @@ import gzip
 import hashlib
 import json
 import logging
-from pathlib import Path
-from tempfile import SpooledTemporaryFile, TemporaryDirectory
+from tempfile import SpooledTemporaryFile
 from typing import NamedTuple
 from urllib.parse import urlparse
 
 import boto3
 from actstream.actions import follow
-from billiard.exceptions import SoftTimeLimitExceeded
 from botocore.awsrequest import AWSRequest
 from botocore.exceptions import ClientError
 from celery import signature
 from django.conf import settings
+from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ObjectDoesNotExist, SuspiciousFileOperation
@@ -27,7 +26,7 @@ from django.utils.text import get_valid_filename
 from django.utils.translation import gettext_lazy as _
 from django_deprecate_fields import deprecate_field
 from grand_challenge_dicom_de_identifier.deidentifier import DicomDeidentifier
-from guardian.shortcuts import assign_perm, get_groups_with_perms, remove_perm
+from guardian.shortcuts import assign_perm
 from panimg.image_builders.metaio_utils import load_sitk_image
 from panimg.models import MAXIMUM_SEGMENTS_LENGTH, ColorSpace, ImageType
 from pydantic import ConfigDict, Field, field_validator
@@ -35,13 +34,17 @@ from pydantic.alias_generators import to_camel
 from pydantic.dataclasses import dataclass
 from storages.utils import clean_name
 
+from grandchallenge.cases.image_cache import cached_image_files
 from grandchallenge.core.error_handlers import (
     DICOMImageSetUploadErrorHandler,
     RawImageUploadSessionErrorHandler,
 )
 from grandchallenge.core.guardian import (
     GroupObjectPermissionBase,
+    ObjectPermissionIndexBase,
     UserObjectPermissionBase,
+    get_enabled_obj_perms_index_model,
+    update_obj_perms_index,
 )
 from grandchallenge.core.models import FieldChangeMixin, UUIDModel
 from grandchallenge.core.storage import protected_s3_storage
@@ -640,8 +643,7 @@ class Image(UUIDModel):
         Raises
         ------
         FileNotFoundError
-            Raised when Image has no related mhd/mha ImageFile or actual file
-            cannot be found on storage
+            Raised when Image has no related mhd/mha ImageFile
         """
         image_data_file = None
         try:
@@ -662,9 +664,6 @@ class Image(UUIDModel):
                     f"No mhd or mha file found for image {self.name} (pk: {self.pk})"
                 )
 
-        if not header_file.file.storage.exists(name=header_file.file.name):
-            raise FileNotFoundError(f"No file found for {header_file.file}")
-
         return header_file, image_data_file
 
     @property
@@ -682,13 +681,11 @@ class Image(UUIDModel):
         """
         files = [i for i in self._metaimage_files if i is not None]
 
-        file_size = 0
-        for file in files:
-            if not file.file.storage.exists(name=file.file.name):
-                raise FileNotFoundError(f"No file found for {file.file}")
-
-            # Add up file sizes of mhd and raw file to get total file size
-            file_size += file.file.size
+        # Add up file sizes of mhd and raw file to get total file size,
+        # the stored sizes avoid requests to the storage backend
+        file_size = sum(
+            file.size_in_storage or file.file.size for file in files
+        )
 
         # Check file size to guard for out of memory error
         if file_size > settings.MAX_SITK_FILE_SIZE:
@@ -696,22 +693,11 @@ class Image(UUIDModel):
                 f"File exceeds maximum file size. (Size: {file_size}, Max: {settings.MAX_SITK_FILE_SIZE})"
             )
 
-        with TemporaryDirectory() as tempdirname:
-            for file in files:
-                with (
-                    file.file.open("rb") as infile,
-                    open(
-                        Path(tempdirname) / Path(file.file.name).name, "wb"
-                    ) as outfile,
-                ):
-                    buffer = True
-                    while buffer:
-                        buffer = infile.read(1024)
-                        outfile.write(buffer)
-
+        # The files are cached locally, so that an image that is loaded
+        # repeatedly is only downloaded once per worker
+        with cached_image_files(image_files=files) as paths:
             try:
-                hdr_path = Path(tempdirname) / Path(files[0].file.name).name
-                sitk_image = load_sitk_image(hdr_path)
+                sitk_image = load_sitk_image(paths[0])
             except RuntimeError as e:
                 logging.error(
                     f"Failed to load SimpleITK image with error: {e}"
@@ -727,166 +713,182 @@ class Image(UUIDModel):
         exclude_archive_items=None,
         exclude_display_sets=None,
     ):
-        expected_groups = set()
-
-        expected_groups.update(
-            self._get_expected_job_viewer_groups(exclude_jobs=exclude_jobs)
-        )
-
-        expected_groups.update(
-            self._get_expected_archive_item_viewer_groups(
-                exclude_archive_items=exclude_archive_items
-            )
-        )
-
-        expected_groups.update(
-            self._get_expected_display_set_viewer_groups(
-                exclude_display_sets=exclude_display_sets
-            )
+        bulk_update_viewer_groups_permissions(
+            images=Image.objects.filter(pk=self.pk),
+            exclude_jobs=exclude_jobs,
+            exclude_archive_items=exclude_archive_items,
+            exclude_display_sets=exclude_display_sets,
         )
 
-        expected_groups.update(self._get_expected_reader_study_answer_groups())
-
-        current_groups = get_groups_with_perms(self, attach_perms=True)
-        current_groups = {
-            group
-            for group, perms in current_groups.items()
-            if "view_image" in perms
-        }
-
-        groups_missing_perms = expected_groups - current_groups
-        groups_with_extra_perms = current_groups - expected_groups
-
-        for g in groups_missing_perms:
-            assign_perm("view_image", g, self)
-
-        for g in groups_with_extra_perms:
-            remove_perm("view_image", g, self)
+    def assign_view_perm_to_creator(self):
+        for answer in self.answer_set.all():
+            assign_perm("view_image", answer.creator, self)
 
-    def _get_expected_job_viewer_groups(self, exclude_jobs):
-        from grandchallenge.algorithms.models import Job
+    @property
+    def api_url(self) -> str:
+        return reverse("api:image-detail", kwargs={"pk": self.pk})
 
-        expected_groups = set()
+    class Meta:
+        ordering = ("name",)
+        indexes = [
+            models.Index(fields=["modified"]),
+        ]
 
-        for key in ["inputs__image", "outputs__image"]:
-            job_queryset = (
-                Job.objects.filter(**{key: self})
-                .prefetch_related("viewer_groups")
-                .only("viewer_groups")
-            )
 
-            if exclude_jobs is not None:
-                job_queryset = job_queryset.exclude(
-                    pk__in={j.pk for j in exclude_jobs}
-                )
+@receiver(post_delete, sender=Image)
+def delete_dicom_image_set(*_, instance: Image, **__):
+    if instance.dicom_image_set:
+        instance.dicom_image_set.delete()
 
-            try:
-                for job in job_queryset:
-                    expected_groups.update(job.viewer_groups.all())
-            except SoftTimeLimitExceeded as error:
-                logger.error(error, exc_info=True)
-                raise
 
-        return expected_groups
+def bulk_update_viewer_groups_permissions(
+    *,
+    images,
+    exclude_jobs=None,
+    exclude_archive_items=None,
+    exclude_display_sets=None,
+):
+    """
+    Sets the view_image group permissions for a queryset of images
 
-    def _get_expected_archive_item_viewer_groups(
-        self, *, exclude_archive_items
-    ):
-        from grandchallenge.archives.models import ArchiveItem
+    The groups that should be able to view the images are determined by
+    the jobs, archive items, display sets and answers that use them.
+    Rather than checking each image in turn the expected and current
+    groups are fetched with a query per source, and the differences
+    applied with a bulk insert and a single delete.
+    """
+    image_pks = {*images.values_list("pk", flat=True)}
 
-        expected_groups = set()
+    expected_permissions = _get_expected_image_viewer_groups(
+        image_pks=image_pks,
+        exclude_jobs=exclude_jobs,
+        exclude_archive_items=exclude_archive_items,
+        exclude_display_sets=exclude_display_sets,
+    )
 
-        archive_items_queryset = (
-            ArchiveItem.objects.filter(values__image=self)
-            .select_related(
-                "archive__editors_group",
-                "archive__uploaders_group",
-                "archive__users_group",
-            )
-            .only(
-                "archive__editors_group",
-                "archive__uploaders_group",
-                "archive__users_group",
-            )
+    permission = Permission.objects.get(
+        content_type__app_label=Image._meta.app_label,
+        codename=f"view_{Image._meta.model_name}",
+    )
+    current_permissions = {
+        (image_pk, group_pk): pk
+        for pk, image_pk, group_pk in ImageGroupObjectPermission.objects.filter(
+            content_object__pk__in=image_pks, permission=permission
+        ).values_list(
+            "pk", "content_object_id", "group_id"
         )
+    }
 
-        if exclude_archive_items is not None:
-            archive_items_queryset = archive_items_queryset.exclude(
-                pk__in={ai.pk for ai in exclude_archive_items}
-            )
+    missing_permissions = expected_permissions - current_permissions.keys()
+    extra_permissions = current_permissions.keys() - expected_permissions
 
-        for archive_item in archive_items_queryset:
-            expected_groups.update(
-                [
-                    archive_item.archive.editors_group,
-                    archive_item.archive.uploaders_group,
-                    archive_item.archive.users_group,
-                ]
+    ImageGroupObjectPermission.objects.bulk_create(
+        [
+            ImageGroupObjectPermission(
+                content_object_id=image_pk,
+                group_id=group_pk,
+                permission=permission,
             )
+            for image_pk, group_pk in missing_permissions
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
 
-        return expected_groups
+    # The post_delete signals update the permission index and revoke the
+    # image access grants of the removed permissions
+    ImageGroupObjectPermission.objects.filter(
+        pk__in=[current_permissions[key] for key in extra_permissions]
+    ).delete()
+
+    # The bulk insert does not send signals, so update the index for the
+    # added permissions here
+    added_image_pks = {image_pk for image_pk, _ in missing_permissions}
+
+    if added_image_pks and get_enabled_obj_perms_index_model(Image):
+        update_obj_perms_index(
+            index_model=ImageObjectPermissionIndex,
+            object_pks=added_image_pks,
+            permission_pk=permission.pk,
+        )
 
-    def _get_expected_display_set_viewer_groups(self, *, exclude_display_sets):
-        from grandchallenge.reader_studies.models import DisplaySet
 
-        expected_groups = set()
+def _get_expected_image_viewer_groups(
+    *, image_pks, exclude_jobs, exclude_archive_items, exclude_display_sets
+):
+    """Returns the expected (image pk, group pk) view_image permissions"""
+    from grandchallenge.algorithms.models import Job
+    from grandchallenge.archives.models import ArchiveItem
+    from grandchallenge.reader_studies.models import Answer, DisplaySet
 
-        display_set_queryset = (
-            DisplaySet.objects.filter(values__image=self)
-            .select_related(
-                "reader_study__editors_group",
-                "reader_study__readers_group",
-            )
-            .only(
-                "reader_study__editors_group",
-                "reader_study__readers_group",
-            )
-        )
+    expected_permissions = set()
 
-        if exclude_display_sets is not None:
-            display_set_queryset = display_set_queryset.exclude(
-                pk__in={ds.pk for ds in exclude_display_sets}
-            )
+    for key in ["inputs", "outputs"]:
+        job_viewer_groups = Job.viewer_groups.through.objects.filter(
+            **{f"job__{key}__image__pk__in": image_pks}
+        )
 
-        for display_set in display_set_queryset:
-            expected_groups.update(
-                [
-                    display_set.reader_study.editors_group,
-                    display_set.reader_study.readers_group,
-                ]
+        if exclude_jobs is not None:
+            job_viewer_groups = job_viewer_groups.exclude(
+                job__pk__in={j.pk for j in exclude_jobs}
             )
 
-        return expected_groups
-
-    def _get_expected_reader_study_answer_groups(self):
-        # Reader study editors for reader studies that have answers that
-        # include this image.
+        expected_permissions.update(
+            job_viewer_groups.values_list(
+                f"job__{key}__image", "group"
+            ).distinct()
+        )
 
-        expected_groups = set()
+    archive_items = ArchiveItem.objects.filter(values__image__pk__in=image_pks)
 
-        for answer in self.answer_set.select_related(
-            "question__reader_study__editors_group"
-        ).all():
-            expected_groups.add(answer.question.reader_study.editors_group)
+    if exclude_archive_items is not None:
+        archive_items = archive_items.exclude(
+            pk__in={ai.pk for ai in exclude_archive_items}
+        )
 
-        return expected_groups
+    display_sets = DisplaySet.objects.filter(values__image__pk__in=image_pks)
 
-    def assign_view_perm_to_creator(self):
-        for answer in self.answer_set.all():
-            assign_perm("view_image", answer.creator, self)
+    if exclude_display_sets is not None:
+        display_sets = display_sets.exclude(
+            pk__in={ds.pk for ds in exclude_display_sets}
+        )
 
-    @property
-    def api_url(self) -> str:
-        return reverse("api:image-detail", kwargs={"pk": self.pk})
-
-    class Meta:
-        ordering = ("name",)
+    # Reader study editors for reader studies that have answers that
+    # include the image
+    answers = Answer.objects.filter(answer_image__pk__in=image_pks)
 
+    for queryset, image_lookup, group_lookups in [
+        (
+            archive_items,
+            "values__image",
+            [
+                "archive__editors_group",
+                "archive__uploaders_group",
+                "archive__users_group",
+            ],
+        ),
+        (
+            display_sets,
+            "values__image",
+            [
+                "reader_study__editors_group",
+                "reader_study__readers_group",
+            ],
+        ),
+        (
+            answers,
+            "answer_image",
+            ["question__reader_study__editors_group"],
+        ),
+    ]:
+        for image_pk, *group_pks in queryset.values_list(
+            image_lookup, *group_lookups
+        ).distinct():
+            expected_permissions.update(
+                (image_pk, group_pk) for group_pk in group_pks
+            )
 
-@receiver(post_delete, sender=Image)
-def delete_dicom_image_set(*_, instance: Image, **__):
-    if instance.dicom_image_set:
-        instance.dicom_image_set.delete()
+    return expected_permissions
 
 
 class ImageUserObjectPermission(UserObjectPermissionBase):
@@ -901,6 +903,10 @@ class ImageGroupObjectPermission(GroupObjectPermissionBase):
     content_object = models.ForeignKey(Image, on_delete=models.CASCADE)
 
 
+class ImageObjectPermissionIndex(ObjectPermissionIndexBase):
+    content_object = models.ForeignKey(Image, on_delete=models.CASCADE)
+
+
 class ImageFile(FieldChangeMixin, UUIDModel):
     IMAGE_TYPE_MHD = ImageType.MHD.value
     IMAGE_TYPE_TIFF = ImageType.TIFF.value
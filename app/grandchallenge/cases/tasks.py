@@ -1,20 +1,28 @@
+import asyncio
 import re
 import zipfile
 from collections.abc import Callable, Sequence
 from dataclasses import asdict, dataclass
+from itertools import batched
 from pathlib import Path
-from shutil import rmtree
+from shutil import disk_usage, rmtree
 from tempfile import TemporaryDirectory
 
+import aioboto3
 import boto3
 import botocore.exceptions
+from asgiref.sync import async_to_sync
 from billiard.exceptions import SoftTimeLimitExceeded, TimeLimitExceeded
 from botocore.exceptions import ClientError
 from celery import signature
 from celery.utils.log import get_task_logger
 from django.apps import apps
 from django.conf import settings
-from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.core.exceptions import (
+    ObjectDoesNotExist,
+    SuspiciousFileOperation,
+    ValidationError,
+)
 from django.core.files import File
 from django.db import transaction
 from django.db.transaction import on_commit
@@ -34,6 +42,7 @@ from grandchallenge.cases.models import (
     PostProcessImageTask,
     PostProcessImageTaskStatusChoices,
     RawImageUploadSession,
+    bulk_update_viewer_groups_permissions,
 )
 from grandchallenge.components.backends.exceptions import RetryStep
 from grandchallenge.components.backends.utils import UUID4_REGEX, safe_extract
@@ -43,6 +52,7 @@ from grandchallenge.core.celery import (
     acks_late_micro_short_task,
 )
 from grandchallenge.core.exceptions import LockNotAcquiredException
+from grandchallenge.core.storage import bulk_upload_files
 from grandchallenge.core.utils.query import check_lock_acquired
 from grandchallenge.uploads.models import UserUpload
 
@@ -53,15 +63,29 @@ POST_PROCESSORS = [
 ]
 
 
+# The number of user uploads that are downloaded at the same time
+PROVISIONING_CONCURRENCY = 16
+PROVISIONING_CHUNK_SIZE = 8 * settings.MEGABYTE
+
+# Local file headers, or the end of central directory record for empty zips
+ZIP_MAGIC_NUMBERS = (b"PK\x03\x04", b"PK\x05\x06")
+
+# The number of images that have their permissions updated per transaction
+VIEWER_GROUPS_PERMISSIONS_CHUNK_SIZE = 1000
+
+
 class DuplicateFilesException(ValueError):
     pass
 
 
+class InsufficientDiskSpaceException(ValueError):
+    pass
+
+
 def _populate_tmp_dir(tmp_dir, upload_session):
     session_files = [*upload_session.user_uploads.all()]
 
     populate_provisioning_directory(session_files, tmp_dir)
-    extract_files(source_path=tmp_dir)
 
 
 def populate_provisioning_directory(
@@ -70,15 +94,115 @@ def populate_provisioning_directory(
     """
     Provisions provisioning_dir with the files associated using the given
     list of uploaded files.
+
+    The files are downloaded concurrently, and any zip archives among
+    them are extracted as soon as they have been downloaded.
     """
+    destinations = {}
+
     for input_file in input_files:
+        if not input_file.is_completed:
+            raise RuntimeError("Upload is not completed")
+
         dest = Path(safe_join(provisioning_dir, input_file.filename))
 
-        if dest.exists():
+        if dest in destinations or dest.exists():
             raise DuplicateFilesException("Duplicate files uploaded")
 
+        destinations[dest] = {
+            "Bucket": input_file.bucket,
+            "Key": input_file.key,
+        }
+
+    async_to_sync(_download_and_extract_objects)(
+        destinations=destinations, provisioning_dir=provisioning_dir
+    )
+
+
+async def _download_and_extract_objects(*, destinations, provisioning_dir):
+    semaphore = asyncio.Semaphore(PROVISIONING_CONCURRENCY)
+    session = aioboto3.Session()
+
+    try:
+        async with session.client(
+            "s3",
+            endpoint_url=settings.AWS_S3_ENDPOINT_URL,
+            region_name=settings.AWS_S3_REGION_NAME,
+        ) as s3_client:
+            async with asyncio.TaskGroup() as task_group:
+                head_tasks = [
+                    task_group.create_task(
+                        _head_object(
+                            s3_object=s3_object,
+                            semaphore=semaphore,
+                            s3_client=s3_client,
+                        )
+                    )
+                    for s3_object in destinations.values()
+                ]
+
+            # Check the budget before anything is downloaded
+            check_disk_space(
+                path=provisioning_dir,
+                required_bytes=sum(
+                    task.result()["ContentLength"] for task in head_tasks
+                ),
+            )
+
+            async with asyncio.TaskGroup() as task_group:
+                for dest, s3_object in destinations.items():
+                    task_group.create_task(
+                        _download_and_extract_object(
+                            s3_object=s3_object,
+                            dest=dest,
+                            semaphore=semaphore,
+                            s3_client=s3_client,
+                        )
+                    )
+    except ExceptionGroup as error:
+        # Surface the first error so that it can be handled by the caller
+        raise error.exceptions[0]
+
+
+async def _head_object(*, s3_object, semaphore, s3_client):
+    async with semaphore:
+        return await s3_client.head_object(**s3_object)
+
+
+async def _download_and_extract_object(
+    *, s3_object, dest, semaphore, s3_client
+):
+    async with semaphore:
+        response = await s3_client.get_object(**s3_object)
+
         with open(dest, "wb") as f:
-            input_file.download_fileobj(fileobj=f)
+            async with response["Body"] as body:
+                while chunk := await body.read(PROVISIONING_CHUNK_SIZE):
+                    await asyncio.to_thread(f.write, chunk)
+
+    await asyncio.to_thread(
+        check_compressed_and_extract, src_path=dest, checked_paths=set()
+    )
+
+
+def check_disk_space(*, path: Path, required_bytes: int):
+    """Raises an exception if the required bytes will not fit on the disk"""
+    free_bytes = disk_usage(path).free
+
+    if required_bytes > free_bytes:
+        raise InsufficientDiskSpaceException(
+            f"{required_bytes} bytes are required, "
+            f"but only {free_bytes} bytes are available"
+        )
+
+
+def is_zip_file(*, path: Path):
+    """Determines if a file is a zip archive from its magic bytes"""
+    if not path.is_file() or path.is_symlink():
+        return False
+
+    with open(path, "rb") as f:
+        return f.read(4) in ZIP_MAGIC_NUMBERS
 
 
 def check_compressed_and_extract(*, src_path: Path, checked_paths: set[Path]):
@@ -88,13 +212,25 @@ def check_compressed_and_extract(*, src_path: Path, checked_paths: set[Path]):
 
     checked_paths.add(src_path)
 
+    if not is_zip_file(path=src_path):
+        return
+
     extracted_dir = src_path.parent / f"{src_path.name}_extracted"
     extracted_dir.mkdir()
 
     try:
+        with zipfile.ZipFile(src_path) as zf:
+            check_disk_space(
+                path=extracted_dir,
+                required_bytes=sum(m.file_size for m in zf.infolist()),
+            )
+
         safe_extract(src=src_path, dest=extracted_dir)
     except (zipfile.BadZipFile, OSError):
         rmtree(extracted_dir)
+    except InsufficientDiskSpaceException:
+        rmtree(extracted_dir)
+        raise
     else:
         src_path.unlink()
         extracted_dir.rename(src_path)
@@ -185,7 +321,9 @@ def build_images(  # noqa:C901
             tmp_dir = Path(tmp_dir).resolve()
             _populate_tmp_dir(tmp_dir, upload_session)
             importer_result = import_images(
-                input_directory=tmp_dir, origin=upload_session
+                input_directory=tmp_dir,
+                origin=upload_session,
+                bulk_store=settings.CASES_BULK_STORE_IMAGES,
             )
             _handle_raw_files(
                 consumed_files=importer_result.consumed_files,
@@ -212,6 +350,14 @@ def build_images(  # noqa:C901
             ),
         )
         return
+    except InsufficientDiskSpaceException:
+        _handle_error(
+            error_message=(
+                "The uploaded files were too large to process, "
+                "please try again with fewer or smaller files"
+            ),
+        )
+        return
     except (SoftTimeLimitExceeded, TimeLimitExceeded):
         _handle_error(error_message="Time limit exceeded")
         return
@@ -303,6 +449,7 @@ def import_images(
     origin: RawImageUploadSession | None = None,
     builders: Sequence[Callable] | None = None,
     recurse_subdirectories: bool = True,
+    bulk_store: bool = False,
 ) -> ImporterResult:
     """
     Creates Image objects from a set of files.
@@ -315,6 +462,9 @@ def import_images(
         The RawImageUploadSession (if any) that was the source of these files
     builders
         The Image Builders to use to try and convert these files into Images
+    bulk_store
+        Store the images with bulk inserts and concurrent uploads rather
+        than saving each image and file individually
 
     Returns
     -------
@@ -338,14 +488,15 @@ def import_images(
             new_image_files=panimg_result.new_image_files,
         )
 
-        _store_images(
+        store_images = _bulk_store_images if bulk_store else _store_images
+        store_images(
             origin=origin,
             images=django_result.new_images,
             image_files=django_result.new_image_files,
         )
 
         post_process_image_ids = {
-            f.image.pk
+            f.image_id
             for f in django_result.new_image_files
             if f.image_type == ImageFile.IMAGE_TYPE_TIFF
         }
@@ -429,6 +580,75 @@ def _store_images(
         obj.save()
 
 
+def _bulk_store_images(
+    *,
+    origin: RawImageUploadSession | None,
+    images: set[Image],
+    image_files: set[ImageFile],
+):
+    """
+    Stores the images with a constant number of queries
+
+    The objects are validated in memory, the files are uploaded to the
+    storage concurrently, and then the rows are created with bulk inserts.
+    Uniqueness is enforced by the database on insert.
+    """
+    for image in images:
+        image.origin = origin
+        image.full_clean(validate_unique=False, validate_constraints=False)
+
+    new_images = {image.pk: image for image in images}
+    files_to_upload = {}
+
+    for obj in image_files:
+        if obj.image_id not in new_images:
+            raise ValidationError("Image files must belong to a new image")
+
+        # The image does not exist yet so cannot be fetched when the
+        # file names are generated
+        obj.image = new_images[obj.image_id]
+
+        # The image does not exist yet so cannot be validated by the db
+        obj.full_clean(
+            exclude={"image"},
+            validate_unique=False,
+            validate_constraints=False,
+        )
+
+        local_path = Path(obj.file.file.name)
+        name = obj.file.field.generate_filename(
+            instance=obj, filename=obj.file.name
+        )
+
+        files_to_upload[name] = local_path
+        size_in_storage = local_path.stat().st_size
+
+        if obj._directory is not None:
+            for file in obj._directory.rglob("**/*"):
+                if not file.is_file():
+                    continue
+
+                if file.is_symlink() or file.absolute() != file.resolve():
+                    raise SuspiciousFileOperation
+
+                files_to_upload[obj._directory_file_destination(file=file)] = (
+                    file
+                )
+                size_in_storage += file.stat().st_size
+
+        obj.file.close()
+        obj.file = name  # The file is now committed to the storage
+        obj.size_in_storage = size_in_storage
+
+    bulk_upload_files(
+        storage=ImageFile._meta.get_field("file").storage,
+        files=files_to_upload,
+    )
+
+    Image.objects.bulk_create(images)
+    ImageFile.objects.bulk_create(image_files)
+
+
 def _handle_raw_files(
     *,
     consumed_files: set[Path],
@@ -701,3 +921,24 @@ def revert_image_set_to_initial_version(*, image_set_id, version_id):
             pass  # already updated
         else:
             raise
+
+
+@acks_late_2xlarge_task
+def update_image_viewer_groups_permissions(*, image_pks):
+    """Updates the view_image group permissions for many images in chunks"""
+    num_images = len(image_pks)
+    num_updated = 0
+
+    for chunk in batched(
+        sorted(image_pks), VIEWER_GROUPS_PERMISSIONS_CHUNK_SIZE, strict=False
+    ):
+        with transaction.atomic():
+            bulk_update_viewer_groups_permissions(
+                images=Image.objects.filter(pk__in=chunk)
+            )
+
+        num_updated += len(chunk)
+        logger.info(
+            f"Updated viewer groups permissions for {num_updated} of "
+            f"{num_images} images"
+        )
@@ -8,12 +8,13 @@ import json
 import logging
 import os
 import secrets
+import time
 from abc import ABC, abstractmethod
 from datetime import timedelta
 from json import JSONDecodeError
 from math import ceil
 from pathlib import Path
-from tempfile import SpooledTemporaryFile, TemporaryDirectory
+from tempfile import TemporaryDirectory
 from typing import NamedTuple
 from uuid import UUID
 
@@ -37,6 +38,7 @@ from pydantic_core import to_json
 from grandchallenge.cases.tasks import import_images
 from grandchallenge.components.backends.exceptions import (
     ComponentException,
+    ObjectTooLarge,
     UncleanExit,
 )
 from grandchallenge.components.backends.utils import user_error
@@ -55,8 +57,6 @@ from grandchallenge.core.utils.error_messages import (
 
 logger = logging.getLogger(__name__)
 
-MAX_SPOOL_SIZE = settings.GIGABYTE
-
 # For multipart uploads the minimum chunk size is 5 MB
 # There is a maximum of 10_000 chunks
 # Using a chunk size of 5 MB results in a maximum file size of 50 GB
@@ -79,6 +79,13 @@ class CIVProvisioningTask(NamedTuple):
     task: functools.partial
 
 
+class FetchedOutput(NamedTuple):
+    interface: ComponentInterface
+    path: str | None
+    error: Exception | None
+    duration: timedelta
+
+
 def duration_to_millicents(*, duration, usd_cents_per_hour):
     return ceil(
         (duration.total_seconds() / 3600)
@@ -279,6 +286,61 @@ async def s3_stream_response(
                 raise
 
 
+async def s3_download_file(
+    *,
+    bucket,
+    key,
+    filename,
+    semaphore,
+    s3_client,
+):
+    async with semaphore:
+        Path(filename).parent.mkdir(parents=True, exist_ok=True)
+        await s3_client.download_file(
+            Bucket=bucket,
+            Key=key,
+            Filename=filename,
+        )
+
+
+async def s3_download_bounded_file(
+    *,
+    bucket,
+    key,
+    filename,
+    max_size,
+    semaphore,
+    s3_client,
+):
+    """
+    Streams the content of an object to a file, failing early if the
+    object is larger than max_size bytes.
+    """
+    async with semaphore:
+        response = await s3_client.get_object(Bucket=bucket, Key=key)
+
+        if response["ContentLength"] > max_size:
+            raise ObjectTooLarge(
+                f"Object {key!r} exceeds the maximum size of {max_size} bytes"
+            )
+
+        Path(filename).parent.mkdir(parents=True, exist_ok=True)
+        size = 0
+
+        async with response["Body"] as body:
+            with open(filename, "wb") as f:
+                while chunk := await body.read(S3_CHUNK_SIZE):
+                    size += len(chunk)
+
+                    if size > max_size:
+                        raise ObjectTooLarge(
+                            f"Object {key!r} exceeds the maximum size of "
+                            f"{max_size} bytes"
+                        )
+
+                    f.write(chunk)
+
+
 class InferenceIO(BaseModel):
     model_config = ConfigDict(frozen=True)
 
@@ -341,6 +403,7 @@ class Executor(ABC):
         self._invoke_duration = None
         self._stdout = []
         self._stderr = []
+        self._output_fetch_durations = {}
 
         self.__s3_client = None
 
@@ -364,21 +427,29 @@ class Executor(ABC):
         """Create ComponentInterfaceValues from the output interfaces"""
         outputs = []
 
-        with transaction.atomic():
-            # Atomic block required as create_instance needs to
-            # create interfaces in order to store the files
-            for interface in output_interfaces:
-                if interface.is_image_kind:
-                    res = self._create_images_result(interface=interface)
-                elif interface.is_json_kind:
-                    res = self._create_json_result(interface=interface)
-                else:
-                    res = self._create_file_result(interface=interface)
+        with TemporaryDirectory() as tmpdir:
+            # All output objects are fetched concurrently before entering
+            # the transaction, so no database locks are held while the
+            # outputs are downloaded.
+            fetched_outputs = self._fetch_outputs(
+                output_interfaces=[*output_interfaces], tmpdir=tmpdir
+            )
 
-                outputs.append(res)
+            with transaction.atomic():
+                # Atomic block required as create_instance needs to
+                # create interfaces in order to store the files
+                for fetched_output in fetched_outputs:
+                    outputs.append(
+                        self._create_output(fetched_output=fetched_output)
+                    )
 
         return outputs
 
+    @property
+    def output_fetch_durations(self):
+        """The time taken to fetch each output, keyed by interface slug"""
+        return self._output_fetch_durations
+
     def deprovision(self):
         self._delete_objects(
             bucket=settings.COMPONENTS_INPUT_BUCKET_NAME,
@@ -868,14 +939,116 @@ class Executor(ABC):
         else:
             raise ComponentException(user_error(self.stderr))
 
-    def _create_images_result(self, *, interface):
-        prefix = safe_join(self._io_prefix, interface.relative_path)
+    @async_to_sync
+    async def _fetch_outputs(self, *, output_interfaces, tmpdir):
+        semaphore = asyncio.Semaphore(ASYNC_CONCURRENCY)
+        session = aioboto3.Session()
 
-        response = self._s3_client.list_objects_v2(
-            Bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME,
-            Prefix=(prefix.lstrip("/") if settings.USING_MINIO else prefix),
+        async with session.client(
+            "s3",
+            endpoint_url=settings.AWS_S3_ENDPOINT_URL,
+            config=ASYNC_BOTO_CONFIG,
+        ) as s3_client:
+            async with asyncio.TaskGroup() as task_group:
+                tasks = [
+                    task_group.create_task(
+                        self._fetch_output(
+                            interface=interface,
+                            directory=safe_join(tmpdir, str(idx)),
+                            semaphore=semaphore,
+                            s3_client=s3_client,
+                        )
+                    )
+                    for idx, interface in enumerate(output_interfaces)
+                ]
+
+        fetched_outputs = [task.result() for task in tasks]
+
+        for fetched_output in fetched_outputs:
+            logger.info(
+                f"Fetched output {fetched_output.interface.relative_path!r} "
+                f"in {fetched_output.duration}"
+            )
+            self._output_fetch_durations[fetched_output.interface.slug] = (
+                fetched_output.duration
+            )
+
+        return fetched_outputs
+
+    async def _fetch_output(self, *, interface, directory, **kwargs):
+        """
+        Fetch the objects for a single output interface
+
+        Errors are captured rather than raised so that they can be
+        reported in the order of the output interfaces, and so that one
+        failed output does not cancel the fetching of the others.
+        """
+        start = time.monotonic()
+        path = error = None
+
+        try:
+            if interface.is_image_kind:
+                path = await self._fetch_images_output(
+                    interface=interface, directory=directory, **kwargs
+                )
+            elif interface.is_json_kind and not interface.store_in_database:
+                path = await self._fetch_json_file_output(
+                    interface=interface, **kwargs
+                )
+            elif interface.is_json_kind:
+                path = await self._fetch_json_output(
+                    interface=interface, directory=directory, **kwargs
+                )
+            else:
+                path = await self._fetch_file_output(
+                    interface=interface, directory=directory, **kwargs
+                )
+        except Exception as e:
+            error = e
+
+        return FetchedOutput(
+            interface=interface,
+            path=path,
+            error=error,
+            duration=timedelta(seconds=time.monotonic() - start),
         )
 
+    def _create_output(self, *, fetched_output):
+        if fetched_output.error is not None:
+            raise fetched_output.error
+
+        interface = fetched_output.interface
+
+        if interface.is_image_kind:
+            return self._create_images_result(
+                interface=interface, directory=fetched_output.path
+            )
+        elif interface.is_json_kind and not interface.store_in_database:
+            return self._create_json_file_result(
+                interface=interface, key=fetched_output.path
+            )
+        elif interface.is_json_kind:
+            return self._create_json_result(
+                interface=interface, filename=fetched_output.path
+            )
+        else:
+            return self._create_file_result(
+                interface=interface, filename=fetched_output.path
+            )
+
+    async def _fetch_images_output(
+        self, *, interface, directory, semaphore, s3_client
+    ):
+        prefix = safe_join(self._io_prefix, interface.relative_path)
+
+        async with semaphore:
+            response = await s3_client.list_objects_v2(
+                Bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME,
+                Prefix=(
+                    prefix.lstrip("/") if settings.USING_MINIO else prefix
+                ),
+            )
+
         if response.get("IsTruncated", False):
             raise ComponentException(
                 f"Too many files produced in {interface.relative_path!r}"
@@ -887,24 +1060,136 @@ class Executor(ABC):
                 f"Output directory {interface.relative_path!r} is empty"
             )
 
-        with TemporaryDirectory() as tmpdir:
-            self._download_output_files(
-                output_files=output_files, tmpdir=tmpdir, prefix=prefix
+        Path(directory).mkdir(parents=True, exist_ok=True)
+
+        async with asyncio.TaskGroup() as task_group:
+            for file in output_files:
+                try:
+                    root_key = safe_join("/", file["Key"])
+                    dest = safe_join(
+                        directory, Path(root_key).relative_to(prefix)
+                    )
+                except (SuspiciousFileOperation, ValueError):
+                    logger.warning(f"Skipping {file=}")
+                    continue
+
+                logger.info(
+                    f"Downloading {file['Key']} to {dest} from "
+                    f"{settings.COMPONENTS_OUTPUT_BUCKET_NAME}"
+                )
+
+                task_group.create_task(
+                    s3_download_file(
+                        bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME,
+                        key=file["Key"],
+                        filename=dest,
+                        semaphore=semaphore,
+                        s3_client=s3_client,
+                    )
+                )
+
+        return directory
+
+    async def _fetch_json_output(
+        self, *, interface, directory, semaphore, s3_client
+    ):
+        key = safe_join(self._io_prefix, interface.relative_path)
+        dest = safe_join(directory, Path(interface.relative_path).name)
+
+        try:
+            # The outputs are only parsed when their values are created,
+            # one at a time, so they are downloaded to disk
+            await s3_download_bounded_file(
+                bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME,
+                key=key,
+                filename=dest,
+                max_size=settings.COMPONENTS_MAXIMUM_JSON_OUTPUT_SIZE,
+                semaphore=semaphore,
+                s3_client=s3_client,
+            )
+        except botocore.exceptions.ClientError as error:
+            if error.response["Error"]["Code"] in {"404", "NoSuchKey"}:
+                raise ComponentException(
+                    f"Output file {interface.relative_path!r} was not produced"
+                )
+            else:
+                raise
+        except ObjectTooLarge:
+            raise ComponentException(
+                f"The output file {interface.relative_path!r} is too large"
             )
 
-            try:
-                importer_result = import_images(
-                    input_directory=tmpdir,
-                    builders=[image_builder_mhd, image_builder_tiff],
+        return dest
+
+    async def _fetch_json_file_output(
+        self, *, interface, semaphore, s3_client
+    ):
+        key = safe_join(self._io_prefix, interface.relative_path)
+
+        try:
+            # The output is copied to the value's file and validated from
+            # there, so only check that it exists here
+            async with semaphore:
+                response = await s3_client.head_object(
+                    Bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME, Key=key
+                )
+        except botocore.exceptions.ClientError as error:
+            if error.response["Error"]["Code"] in {"404", "NoSuchKey"}:
+                raise ComponentException(
+                    f"Output file {interface.relative_path!r} was not produced"
+                )
+            else:
+                raise
+
+        if (
+            response["ContentLength"]
+            > settings.COMPONENTS_MAXIMUM_JSON_OUTPUT_SIZE
+        ):
+            raise ComponentException(
+                f"The output file {interface.relative_path!r} is too large"
+            )
+
+        return key
+
+    async def _fetch_file_output(
+        self, *, interface, directory, semaphore, s3_client
+    ):
+        key = safe_join(self._io_prefix, interface.relative_path)
+        dest = safe_join(directory, Path(interface.relative_path).name)
+
+        try:
+            await s3_download_file(
+                bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME,
+                key=key,
+                filename=dest,
+                semaphore=semaphore,
+                s3_client=s3_client,
+            )
+        except botocore.exceptions.ClientError as error:
+            if error.response["Error"]["Code"] in {"404", "NoSuchKey"}:
+                raise ComponentException(
+                    f"Output file {interface.relative_path!r} was not produced"
                 )
-            except RuntimeError as error:
-                if "std::bad_alloc" in str(error):
-                    raise ComponentException(
-                        "The output image was too large to process, "
-                        "please try again with smaller images"
-                    ) from error
-                else:
-                    raise
+            else:
+                raise
+
+        return dest
+
+    def _create_images_result(self, *, interface, directory):
+        try:
+            importer_result = import_images(
+                input_directory=directory,
+                builders=[image_builder_mhd, image_builder_tiff],
+                bulk_store=settings.CASES_BULK_STORE_IMAGES,
+            )
+        except RuntimeError as error:
+            if "std::bad_alloc" in str(error):
+                raise ComponentException(
+                    "The output image was too large to process, "
+                    "please try again with smaller images"
+                ) from error
+            else:
+                raise
 
         if len(importer_result.new_images) == 0:
             raise ComponentException(
@@ -928,58 +1213,24 @@ class Executor(ABC):
 
         return civ
 
-    def _download_output_files(self, *, output_files, tmpdir, prefix):
-        for file in output_files:
-            try:
-                root_key = safe_join("/", file["Key"])
-                dest = safe_join(tmpdir, Path(root_key).relative_to(prefix))
-            except (SuspiciousFileOperation, ValueError):
-                logger.warning(f"Skipping {file=}")
-                continue
-
-            logger.info(
-                f"Downloading {file['Key']} to {dest} from "
-                f"{settings.COMPONENTS_OUTPUT_BUCKET_NAME}"
-            )
-
-            Path(dest).parent.mkdir(parents=True, exist_ok=True)
-            self._s3_client.download_file(
-                Filename=dest,
-                Bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME,
-                Key=file["Key"],
-            )
-
-    def _create_json_result(self, *, interface):
-        key = safe_join(self._io_prefix, interface.relative_path)
-
+    def _create_json_result(self, *, interface, filename):
         try:
-            with io.BytesIO() as fileobj:
-                self._s3_client.download_fileobj(
-                    Fileobj=fileobj,
-                    Bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME,
-                    Key=key,
-                )
-                fileobj.seek(0)
-                result = json.loads(
-                    fileobj.read().decode("utf-8"),
+            with open(filename, "rb") as f:
+                value = json.loads(
+                    f.read().decode("utf-8"),
                     parse_constant=lambda x: None,  # Removes -inf, inf and NaN
                 )
-            civ = interface.create_instance(value=result)
-        except botocore.exceptions.ClientError as error:
-            if error.response["Error"]["Code"] in {"404", "NoSuchKey"}:
-                raise ComponentException(
-                    f"Output file {interface.relative_path!r} was not produced"
-                )
-            else:
-                raise
         except MemoryError:
             raise ComponentException(
                 f"The output file {interface.relative_path!r} is too large"
             )
-        except JSONDecodeError:
+        except (JSONDecodeError, UnicodeDecodeError):
             raise ComponentException(
                 f"The output file {interface.relative_path!r} is not valid json"
             )
+
+        try:
+            civ = interface.create_instance(value=value)
         except ValidationError as e:
             raise ComponentException(
                 f"The output file {interface.relative_path!r} is not valid. {format_validation_error_message(error=e)}"
@@ -987,25 +1238,22 @@ class Executor(ABC):
 
         return civ
 
-    def _create_file_result(self, *, interface):
-        key = safe_join(self._io_prefix, interface.relative_path)
+    def _create_json_file_result(self, *, interface, key):
+        try:
+            civ = interface.create_instance_from_object(
+                bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME, key=key
+            )
+        except ValidationError as e:
+            raise ComponentException(
+                f"The output file {interface.relative_path!r} is not valid. {format_validation_error_message(error=e)}"
+            )
 
+        return civ
+
+    def _create_file_result(self, *, interface, filename):
         try:
-            with SpooledTemporaryFile(max_size=MAX_SPOOL_SIZE) as fileobj:
-                self._s3_client.download_fileobj(
-                    Fileobj=fileobj,
-                    Bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME,
-                    Key=key,
-                )
-                fileobj.seek(0)
+            with open(filename, "rb") as fileobj:
                 civ = interface.create_instance(fileobj=fileobj)
-        except botocore.exceptions.ClientError as error:
-            if error.response["Error"]["Code"] in {"404", "NoSuchKey"}:
-                raise ComponentException(
-                    f"Output file {interface.relative_path!r} was not produced"
-                )
-            else:
-                raise
         except ValidationError as e:
             raise ComponentException(
                 f"The output file {interface.relative_path!r} is not valid. {format_validation_error_message(error=e)}"
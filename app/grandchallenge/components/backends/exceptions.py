@@ -39,3 +39,7 @@ class CINotAllowedException(ComponentBaseException):
     Raised during attempt to update an archive item,
     when the socket is not in the set of allowed sockets for the base object.
     """
+
+
+class ObjectTooLarge(ComponentBaseException):
+    """Raised if an object is too large to be read into memory"""
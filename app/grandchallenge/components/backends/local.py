@@ -0,0 +1,161 @@
+"""
+Executor that runs stand-ins for the inference containers on the worker
+
+This backend is used to measure the throughput of the job pipeline without
+SageMaker, see the benchmark_job_pipeline management command. The stand-ins
+only copy files in the S3 compatible storage, such as MinIO. When they exit a
+completion event is sent to `handle_event`, as SageMaker does via
+EventBridge.
+"""
+
+import json
+import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import cache, partial
+from pathlib import Path
+
+from django.conf import settings
+from django.db.transaction import on_commit
+from django.utils.timezone import now
+
+from grandchallenge.components.backends.amazon_sagemaker_base import (
+    ModelChoices,
+)
+from grandchallenge.components.backends.base import Executor, JobParams
+from grandchallenge.components.backends.exceptions import ComponentException
+from grandchallenge.components.backends.utils import UUID4_REGEX, user_error
+from grandchallenge.components.tasks import handle_event
+
+INFERENCE_SCRIPT = Path(__file__).resolve().parent / "local_inference.py"
+
+
+@cache
+def _get_inference_pool():
+    # Celery workers are daemonic so cannot start a multiprocessing pool,
+    # instead the threads of this pool each wait on a subprocess
+    return ThreadPoolExecutor(
+        max_workers=settings.COMPONENTS_LOCAL_EXECUTOR_CONCURRENCY,
+        thread_name_prefix="local-executor",
+    )
+
+
+def _run_inference(*, config, event, backend):
+    try:
+        process = subprocess.run(
+            [sys.executable, str(INFERENCE_SCRIPT)],
+            input=json.dumps(config),
+            text=True,
+            capture_output=True,
+            timeout=config["time_limit"],
+        )
+    except subprocess.TimeoutExpired as error:
+        event.update(return_code=None, stdout=error.stdout or "", stderr="")
+    else:
+        event.update(
+            return_code=process.returncode,
+            stdout=process.stdout,
+            stderr=process.stderr,
+        )
+
+    event["stop_time"] = now().isoformat()
+
+    handle_event.apply_async(kwargs={"event": event, "backend": backend})
+
+
+class LocalExecutor(Executor):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__utilization_duration = None
+
+    @property
+    def _backend(self):
+        return f"{self.__class__.__module__}.{self.__class__.__qualname__}"
+
+    @property
+    def _inference_config(self):
+        return {
+            "endpoint_url": settings.AWS_S3_ENDPOINT_URL,
+            "input_bucket_name": settings.COMPONENTS_INPUT_BUCKET_NAME,
+            "output_bucket_name": settings.COMPONENTS_OUTPUT_BUCKET_NAME,
+            "invocation_key": self._invocation_key,
+            "inference_result_key": self._inference_result_key,
+            "job_id": self._job_id,
+            "signing_key": self._signing_key.hex(),
+            "inference_seconds": settings.COMPONENTS_LOCAL_EXECUTOR_INFERENCE_SECONDS,
+            "time_limit": self._time_limit.total_seconds(),
+        }
+
+    def execute(self):
+        event = {"job_name": self._job_id, "start_time": now().isoformat()}
+
+        on_commit(
+            partial(
+                _get_inference_pool().submit,
+                _run_inference,
+                config=self._inference_config,
+                event=event,
+                backend=self._backend,
+            )
+        )
+
+    def handle_event(self, *, event):
+        self.__utilization_duration = datetime.fromisoformat(
+            event["stop_time"]
+        ) - datetime.fromisoformat(event["start_time"])
+        self._stdout = event["stdout"].splitlines()
+        self._stderr = event["stderr"].splitlines()
+
+        if event["return_code"] is None:
+            raise ComponentException("Time limit exceeded")
+        elif event["return_code"] != 0:
+            raise ComponentException(user_error(self.stderr))
+
+        self._handle_completed_job()
+
+    @staticmethod
+    def get_job_name(*, event):
+        return event["job_name"]
+
+    @staticmethod
+    def get_job_params(*, job_name):
+        model_regex = r"|".join(ModelChoices.labels)
+        pattern = rf"^(?P<job_model>{model_regex})\-(?P<job_pk>{UUID4_REGEX})\-(?P<attempt>\d{{2}})$"
+
+        result = re.match(pattern, job_name)
+
+        if result is None:
+            raise ValueError("Invalid job name")
+        else:
+            job_app_label, job_model_name = result.group("job_model").split(
+                "-"
+            )
+            return JobParams(
+                app_label=job_app_label,
+                model_name=job_model_name,
+                pk=result.group("job_pk"),
+                attempt=int(result.group("attempt")),
+            )
+
+    @property
+    def utilization_duration(self):
+        return self.__utilization_duration
+
+    @property
+    def usd_cents_per_hour(self):
+        return 0
+
+    @property
+    def runtime_metrics(self):
+        return None
+
+    @property
+    def external_admin_url(self):
+        return ""
+
+    @property
+    def warm_pool_retained_billable_time_in_seconds(self):
+        # Nothing is retained after the stand-ins exit
+        return 0
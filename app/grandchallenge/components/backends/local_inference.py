@@ -0,0 +1,84 @@
+"""
+Script that stands in for an inference container of the local executor.
+Provide the invocation configuration as json on stdin.
+
+For each task of the invocation the inputs are copied to the output prefix
+and results.json and metrics.json files are created, after which the signed
+inference result is written like the sagemaker shim does.
+
+The script only depends on boto3 so that it does not need to set up Django.
+"""
+
+import hashlib
+import hmac
+import io
+import json
+import sys
+import time
+
+import boto3
+
+
+def run(config):
+    start = time.monotonic()
+
+    s3_client = boto3.client("s3", endpoint_url=config["endpoint_url"])
+
+    with io.BytesIO() as f:
+        s3_client.download_fileobj(
+            Fileobj=f,
+            Bucket=config["input_bucket_name"],
+            Key=config["invocation_key"],
+        )
+        invocation_json = json.loads(f.getvalue().decode("utf-8"))
+
+    time.sleep(config["inference_seconds"])
+
+    for task in invocation_json:
+        for inpt in task["inputs"]:
+            print(f"Copying {inpt['relative_path']}")
+            s3_client.copy(
+                CopySource={
+                    "Bucket": inpt["bucket_name"],
+                    "Key": inpt["bucket_key"],
+                },
+                Bucket=config["output_bucket_name"],
+                Key=f"{task['output_prefix']}/{inpt['relative_path']}",
+            )
+
+        for output_filename in ["results", "metrics"]:
+            s3_client.upload_fileobj(
+                Fileobj=io.BytesIO(json.dumps({"score": 1}).encode("utf-8")),
+                Bucket=config["output_bucket_name"],
+                Key=f"{task['output_prefix']}/{output_filename}.json",
+            )
+
+    duration = time.monotonic() - start
+
+    inference_result = json.dumps(
+        {
+            "pk": config["job_id"],
+            "return_code": 0,
+            "exec_duration": duration,
+            "invoke_duration": duration,
+            "outputs": [],
+            "sagemaker_shim_version": "local",
+        }
+    ).encode("utf-8")
+
+    signature = hmac.new(
+        key=bytes.fromhex(config["signing_key"]),
+        msg=inference_result,
+        digestmod=hashlib.sha256,
+    ).hexdigest()
+
+    s3_client.upload_fileobj(
+        Fileobj=io.BytesIO(inference_result),
+        Bucket=config["output_bucket_name"],
+        Key=config["inference_result_key"],
+        ExtraArgs={"Metadata": {"signature_hmac_sha256": signature}},
+    )
+
+
+if __name__ == "__main__":
+    run(json.load(sys.stdin))
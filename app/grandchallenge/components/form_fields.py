@@ -10,7 +10,10 @@ from grandchallenge.cases.widgets import (
     ImageSearchWidget,
 )
 from grandchallenge.components.models import ComponentInterfaceValue
-from grandchallenge.components.schemas import generate_component_json_schema
+from grandchallenge.components.schemas import (
+    generate_component_json_schema,
+    get_component_json_validator,
+)
 from grandchallenge.components.widgets import (
     FileSearchWidget,
     FlexibleFileWidget,
@@ -20,7 +23,6 @@ from grandchallenge.core.guardian import (
     get_object_if_allowed,
 )
 from grandchallenge.core.templatetags.bleach import clean
-from grandchallenge.core.validators import JSONValidator
 from grandchallenge.core.widgets import JSONEditorWidget
 from grandchallenge.serving.models import (
     get_component_interface_values_for_user,
@@ -123,7 +125,11 @@ class InterfaceFormFieldFactory:
 
         if field_type == forms.JSONField:
             kwargs["widget"] = JSONEditorWidget(schema=schema)
-        kwargs["validators"] = [JSONValidator(schema=schema)]
+        kwargs["validators"] = [
+            get_component_json_validator(
+                component_interface=interface, required=kwargs["required"]
+            )
+        ]
 
         return field_type(**kwargs)
 
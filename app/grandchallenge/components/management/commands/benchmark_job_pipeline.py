@@ -0,0 +1,251 @@
+from statistics import quantiles
+from time import perf_counter, sleep
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+
+from grandchallenge.algorithms.models import Job
+from grandchallenge.components.backends.local import LocalExecutor
+from grandchallenge.components.tasks import (
+    deprovision_job,
+    execute_job,
+    handle_event,
+    parse_job_outputs,
+    provision_job,
+)
+from grandchallenge.core.metrics import get_task_metric_name, pop_metrics
+from grandchallenge.evaluation.models import Evaluation
+
+PIPELINE_TASKS = (
+    provision_job,
+    execute_job,
+    handle_event,
+    parse_job_outputs,
+    deprovision_job,
+)
+
+# The statuses that a successful job passes through, in order
+MILESTONES = (
+    Job.PROVISIONING,
+    Job.PROVISIONED,
+    Job.EXECUTING,
+    Job.EXECUTED,
+    Job.PARSING,
+    Job.SUCCESS,
+)
+
+STAGES = {
+    "queued for provision_job": (None, Job.PROVISIONING),
+    "provision_job": (Job.PROVISIONING, Job.PROVISIONED),
+    "execute_job": (Job.PROVISIONED, Job.EXECUTING),
+    "inference and handle_event": (Job.EXECUTING, Job.EXECUTED),
+    "queued for parse_job_outputs": (Job.EXECUTED, Job.PARSING),
+    "parse_job_outputs": (Job.PARSING, Job.SUCCESS),
+    "total": (None, Job.SUCCESS),
+}
+
+TERMINAL_STATUSES = {Job.SUCCESS, Job.FAILURE, Job.CANCELLED}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the throughput of the job pipeline by running copies of "
+        "an algorithm job and of an evaluation through the celery tasks "
+        "with the local executor. The copies are not removed, only use "
+        "this on a development database. The workers need to be started "
+        "with ENABLE_CELERY_TASK_METRICS to report the query counts and "
+        "lock retries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--algorithm-job", type=str)
+        parser.add_argument("--evaluation", type=str)
+        parser.add_argument("--num-jobs", type=int, default=10)
+        parser.add_argument("--timeout", type=float, default=600)
+        parser.add_argument("--poll-interval", type=float, default=0.25)
+
+    def handle(self, *args, **options):
+        expected_backend = (
+            f"{LocalExecutor.__module__}.{LocalExecutor.__qualname__}"
+        )
+
+        if settings.COMPONENTS_DEFAULT_BACKEND != expected_backend:
+            raise CommandError(
+                f"Set COMPONENTS_DEFAULT_BACKEND={expected_backend} here "
+                "and on the workers."
+            )
+
+        templates = []
+
+        if options["algorithm_job"]:
+            templates.append(Job.objects.get(pk=options["algorithm_job"]))
+
+        if options["evaluation"]:
+            templates.append(Evaluation.objects.get(pk=options["evaluation"]))
+
+        if not templates:
+            raise CommandError("Provide an algorithm job or an evaluation")
+
+        metric_names = self._get_metric_names()
+        pop_metrics(names=metric_names)
+
+        start = perf_counter()
+
+        with transaction.atomic():
+            jobs = [
+                self._copy_job(template=template)
+                for template in templates
+                for _ in range(options["num_jobs"])
+            ]
+
+        milestone_times = self._wait_for_jobs(
+            jobs=jobs,
+            timeout=options["timeout"],
+            poll_interval=options["poll_interval"],
+        )
+
+        self._report_throughput(
+            start=start, jobs=jobs, milestone_times=milestone_times
+        )
+        self._report_stage_latencies(
+            start=start, milestone_times=milestone_times
+        )
+        self._report_task_metrics(metrics=pop_metrics(names=metric_names))
+
+    @staticmethod
+    def _copy_job(*, template):
+        if isinstance(template, Job):
+            job = Job.objects.create(
+                creator=template.creator,
+                algorithm_image=template.algorithm_image,
+                algorithm_model=template.algorithm_model,
+                algorithm_interface=template.algorithm_interface,
+                time_limit=template.time_limit,
+                requires_gpu_type=template.requires_gpu_type,
+                requires_memory_gb=template.requires_memory_gb,
+            )
+        else:
+            job = Evaluation.objects.create(
+                submission=template.submission,
+                method=template.method,
+                ground_truth=template.ground_truth,
+                time_limit=template.time_limit,
+                requires_gpu_type=template.requires_gpu_type,
+                requires_memory_gb=template.requires_memory_gb,
+            )
+
+        job.inputs.set(template.inputs.all())
+        job.execute()
+
+        return job
+
+    def _wait_for_jobs(self, *, jobs, timeout, poll_interval):
+        """
+        Polls the statuses of the jobs until they are done
+
+        Returns the time at which each job was first seen at or past each
+        milestone. Statuses that pass between two polls are attributed to
+        the later poll.
+        """
+        milestone_times = {job.pk: {} for job in jobs}
+        pending = {type(job): set() for job in jobs}
+
+        for job in jobs:
+            pending[type(job)].add(job.pk)
+
+        deadline = perf_counter() + timeout
+
+        while any(pending.values()):
+            if perf_counter() > deadline:
+                self.stderr.write(
+                    f"{sum(len(pks) for pks in pending.values())} jobs did "
+                    "not finish in time"
+                )
+                break
+
+            sleep(poll_interval)
+            now = perf_counter()
+
+            for model, pks in pending.items():
+                for pk, status in model.objects.filter(pk__in=pks).values_list(
+                    "pk", "status"
+                ):
+                    self._record_status(
+                        times=milestone_times[pk], status=status, now=now
+                    )
+
+                    if status in TERMINAL_STATUSES:
+                        pks.remove(pk)
+
+        return milestone_times
+
+    @staticmethod
+    def _record_status(*, times, status, now):
+        if status in MILESTONES:
+            # Earlier milestones that were not seen have passed too
+            for milestone in MILESTONES[: MILESTONES.index(status) + 1]:
+                times.setdefault(milestone, now)
+
+        times.setdefault(status, now)
+
+    def _report_throughput(self, *, start, jobs, milestone_times):
+        end_times = [
+            times[status]
+            for times in milestone_times.values()
+            for status in TERMINAL_STATUSES
+            if status in times
+        ]
+        num_successful = sum(
+            Job.SUCCESS in times for times in milestone_times.values()
+        )
+
+        self.stdout.write(
+            f"{num_successful} of {len(jobs)} jobs succeeded, "
+            f"{len(jobs) - len(end_times)} did not finish"
+        )
+
+        if end_times:
+            duration = max(end_times) - start
+            self.stdout.write(
+                f"Throughput: {num_successful / duration * 60:.1f} jobs/min"
+            )
+
+    def _report_stage_latencies(self, *, start, milestone_times):
+        self.stdout.write("Stage latency (s): p50, p90, p99, max")
+
+        for stage, (first, last) in STAGES.items():
+            latencies = [
+                times[last] - times.get(first, start)
+                for times in milestone_times.values()
+                if last in times and (first is None or first in times)
+            ]
+
+            if latencies:
+                percentiles = quantiles(latencies, n=100, method="inclusive")
+                self.stdout.write(
+                    f"  {stage}: {percentiles[49]:.2f}, "
+                    f"{percentiles[89]:.2f}, {percentiles[98]:.2f}, "
+                    f"{max(latencies):.2f}"
+                )
+
+    def _report_task_metrics(self, *, metrics):
+        self.stdout.write("Task runs, queries per run, lock retries")
+
+        for task in PIPELINE_TASKS:
+            runs, queries, lock_retries = (
+                metrics[get_task_metric_name(task_name=task.name, name=name)]
+                for name in ("runs", "queries", "lock_retries")
+            )
+            self.stdout.write(
+                f"  {task.name}: {runs}, "
+                f"{queries / runs if runs else 0:.1f}, {lock_retries}"
+            )
+
+    @staticmethod
+    def _get_metric_names():
+        return [
+            get_task_metric_name(task_name=task.name, name=name)
+            for task in PIPELINE_TASKS
+            for name in ("runs", "queries", "lock_retries")
+        ]
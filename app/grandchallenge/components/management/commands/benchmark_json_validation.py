@@ -0,0 +1,78 @@
+from time import perf_counter
+
+from django.core.management import BaseCommand, CommandError
+
+from grandchallenge.components.models import (
+    INTERFACE_KIND_JSON_EXAMPLES,
+    ComponentInterface,
+)
+from grandchallenge.components.schemas import generate_component_json_schema
+from grandchallenge.core.validators import JSONValidator
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares validating the example values of the json interface kinds "
+        "with a new validator per value, with the compiled validator from "
+        "the registry, and with a single validate_many call."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--num-values", type=int, default=1000)
+        parser.add_argument(
+            "--kinds",
+            nargs="*",
+            default=[*INTERFACE_KIND_JSON_EXAMPLES],
+            help="The interface kinds to validate, defaults to all",
+        )
+
+    def handle(self, *args, **options):
+        unknown_kinds = {*options["kinds"]} - {*INTERFACE_KIND_JSON_EXAMPLES}
+
+        if unknown_kinds:
+            raise CommandError(f"No examples for kinds {unknown_kinds}")
+
+        for kind in options["kinds"]:
+            interface = ComponentInterface(kind=kind)
+            example = INTERFACE_KIND_JSON_EXAMPLES[kind]
+            values = [example.value] * options["num_values"]
+
+            def validate_each_uncompiled():
+                for value in values:
+                    schema = generate_component_json_schema(
+                        component_interface=interface, required=True
+                    )
+                    JSONValidator(schema=schema)(value)
+
+            def validate_each():
+                for value in values:
+                    interface.validate_against_schema(value=value)
+
+            def validate_many():
+                interface.validate_many_against_schema(values=values)
+
+            # Compile the validator and retrieve any remote schemas first
+            validate_many()
+
+            durations = {
+                label: self._time(validate=validate)
+                for label, validate in (
+                    ("new validator", validate_each_uncompiled),
+                    ("registry", validate_each),
+                    ("validate_many", validate_many),
+                )
+            }
+
+            self.stdout.write(
+                f"{kind}: "
+                + ", ".join(
+                    f"{label} {len(values) / duration:.0f} values/s"
+                    for label, duration in durations.items()
+                )
+            )
+
+    @staticmethod
+    def _time(*, validate):
+        start = perf_counter()
+        validate()
+        return perf_counter() - start
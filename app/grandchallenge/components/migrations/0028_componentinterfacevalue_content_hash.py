@@ -0,0 +1,31 @@
+# Generated by Django 5.2.9 on 2026-10-17 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("components", "0027_alter_componentinterfacevalue_file"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="componentinterfacevalue",
+            name="content_hash",
+            field=models.CharField(
+                blank=True,
+                default="",
+                editable=False,
+                help_text="Identifies the value, file or image of this CIV",
+                max_length=77,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="componentinterfacevalue",
+            index=models.Index(
+                fields=["interface", "content_hash"],
+                name="components__interfa_3334b0_idx",
+            ),
+        ),
+    ]
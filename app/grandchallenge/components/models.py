@@ -2,8 +2,12 @@ import json
 import logging
 import re
 import secrets
+from contextlib import closing, nullcontext
 from enum import Enum
+from hashlib import sha256
+from itertools import chain, product
 from json import JSONDecodeError
+from math import prod
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 
@@ -24,7 +28,7 @@ from django.core.validators import (
     RegexValidator,
 )
 from django.db import models, transaction
-from django.db.models import IntegerChoices, QuerySet
+from django.db.models import Count, IntegerChoices, Q, QuerySet
 from django.db.transaction import on_commit
 from django.forms import ModelChoiceField
 from django.template.defaultfilters import truncatewords
@@ -50,7 +54,8 @@ from grandchallenge.components.backends.exceptions import (
 )
 from grandchallenge.components.schemas import (
     GPUTypeChoices,
-    generate_component_json_schema,
+    get_component_json_validator,
+    invalidate_component_json_validators,
 )
 from grandchallenge.components.tasks import (
     _repo_login_and_run,
@@ -77,12 +82,17 @@ from grandchallenge.core.error_handlers import (
 )
 from grandchallenge.core.models import FieldChangeMixin, UUIDModel
 from grandchallenge.core.storage import (
+    copy_s3_object,
     private_s3_storage,
     protected_s3_storage,
 )
 from grandchallenge.core.utils.error_messages import (
     format_validation_error_message,
 )
+from grandchallenge.core.utils.json_streams import (
+    JSONItemTooLargeError,
+    load_streamed_json,
+)
 from grandchallenge.core.validators import (
     ExtensionValidator,
     JSONSchemaValidator,
@@ -523,14 +533,36 @@ class ComponentInterface(FieldChangeMixin, OverlaySegmentsMixin):
             raise RuntimeError(f"Unknown kind {self.kind}") from e
 
     def create_instance(self, *, image=None, value=None, fileobj=None):
+        if image:
+            # Imported images are new, so there is nothing to reuse
+            content_hash = None
+        elif fileobj:
+            content_hash = get_file_content_hash(File(fileobj).chunks())
+        elif not self.store_in_database:
+            content_hash = get_file_content_hash(
+                [json.dumps(value).encode("utf-8")]
+            )
+        else:
+            content_hash = get_value_content_hash(value)
+
+        if content_hash is not None:
+            existing_civ = ComponentInterfaceValue.objects.filter(
+                interface=self, content_hash=content_hash
+            ).first()
+
+            if existing_civ is not None:
+                return existing_civ
+
         civ = ComponentInterfaceValue.objects.create(interface=self)
 
         if image:
             civ.image = image
         elif fileobj:
             container = File(fileobj)
+            civ.content_hash = content_hash
             civ.file.save(Path(self.relative_path).name, container)
         elif not self.store_in_database:
+            civ.content_hash = content_hash
             civ.file = ContentFile(
                 json.dumps(value).encode("utf-8"),
                 name=Path(self.relative_path).name,
@@ -543,6 +575,63 @@ class ComponentInterface(FieldChangeMixin, OverlaySegmentsMixin):
 
         return civ
 
+    def create_instance_from_object(self, *, bucket, key):
+        """
+        Creates a value from a json document in an S3 object
+
+        The object is copied to the file of the value and validated from
+        there, so the document is never loaded into memory.
+        """
+        if not self.is_json_kind or self.store_in_database:
+            raise RuntimeError(
+                "Only json values that are stored in files can be "
+                "created from objects"
+            )
+
+        civ = ComponentInterfaceValue.objects.create(interface=self)
+
+        copy_s3_object(
+            to_field=civ.file,
+            dest_filename=Path(self.relative_path).name,
+            src_bucket=bucket,
+            src_key=key,
+            mimetype="application/json",
+            save=False,
+        )
+
+        try:
+            # Streams the copied file, setting its size and content hash
+            civ.full_clean()
+        except ValidationError:
+            civ.file.delete(save=False)
+            civ.delete()
+            raise
+
+        existing_civ = (
+            ComponentInterfaceValue.objects.filter(
+                interface=self, content_hash=civ.content_hash
+            )
+            .exclude(pk=civ.pk)
+            .first()
+        )
+
+        if existing_civ is not None:
+            civ.file.delete(save=False)
+            civ.delete()
+            return existing_civ
+
+        civ.save()
+
+        return civ
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        if self.has_changed("schema") or self.has_changed("kind"):
+            invalidate_component_json_validators(
+                component_interface_pk=self.pk
+            )
+
     def clean(self):
         super().clean()
         self._clean_overlay_segments()
@@ -674,12 +763,26 @@ class ComponentInterface(FieldChangeMixin, OverlaySegmentsMixin):
                 "A socket that requires a file should not have a default value"
             )
 
+    @property
+    def schema_version(self):
+        """Identifies the schema that the values are validated against"""
+        return sha256(
+            json.dumps([self.kind, self.schema], sort_keys=True).encode(
+                "utf-8"
+            )
+        ).hexdigest()
+
     def validate_against_schema(self, *, value):
         """Validates values against both default and custom schemas"""
-        schema = generate_component_json_schema(
-            component_interface=self, required=True
+        get_component_json_validator(component_interface=self, required=True)(
+            value=value
         )
-        JSONValidator(schema=schema)(value=value)
+
+    def validate_many_against_schema(self, *, values):
+        """Validates the values, reporting the errors for all of them"""
+        get_component_json_validator(
+            component_interface=self, required=True
+        ).validate_many(values)
 
     @cached_property
     def value_required(self):
@@ -1252,12 +1355,49 @@ def component_interface_value_path(instance, filename):
     )
 
 
+def get_value_content_hash(value):
+    """The content hash of a value stored in the database"""
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"))
+    return f"value:sha256:{sha256(encoded.encode('utf-8')).hexdigest()}"
+
+
+def get_file_content_hash(chunks):
+    """The content hash of a file, given as an iterable of bytes"""
+    digest = sha256()
+
+    for chunk in chunks:
+        digest.update(chunk)
+
+    return f"file:sha256:{digest.hexdigest()}"
+
+
+def get_image_content_hash(image_id):
+    """
+    The content hash of an image value, which identifies the image
+
+    The image files are not hashed, reading them from storage would cost
+    more than the values that it would save. So only the values of the
+    same image are deduplicated, not those of images that were imported
+    again with identical files.
+    """
+    return f"image:{image_id}"
+
+
 class ComponentInterfaceValueManager(models.Manager):
 
     def get_first_or_create(self, **kwargs):
+        if "value" in kwargs:
+            # Find identical values by their hash rather than comparing JSON
+            value = kwargs.pop("value")
+            kwargs.update(
+                content_hash=get_value_content_hash(value),
+                defaults={"value": value},
+            )
+
         try:
             return self.get_or_create(**kwargs)
         except MultipleObjectsReturned:
+            kwargs.pop("defaults", None)
             return self.filter(**kwargs).first(), False
 
 
@@ -1328,6 +1468,13 @@ class ComponentInterfaceValue(models.Model, FieldChangeMixin):
         default=0,
         help_text="The number of bytes stored in the storage backend",
     )
+    content_hash = models.CharField(
+        editable=False,
+        blank=True,
+        default="",
+        max_length=77,
+        help_text="Identifies the value, file or image of this CIV",
+    )
 
     _user_upload_validated = False
 
@@ -1404,6 +1551,14 @@ class ComponentInterfaceValue(models.Model, FieldChangeMixin):
         if self.has_changed("file"):
             self.update_size_in_storage()
 
+        if not self.file:
+            self.content_hash = self.calculate_content_hash()
+        elif not self.content_hash.startswith("file:"):
+            # Hashing a file means reading all of it, so new files are
+            # hashed when they are created or validated, and existing
+            # files by the backfill
+            self.content_hash = ""
+
         super().save(*args, **kwargs)
 
     def clean(self):
@@ -1470,23 +1625,46 @@ class ComponentInterfaceValue(models.Model, FieldChangeMixin):
             return
         if self.interface.store_in_database:
             self._validate_value_only()
-            value = self.value
+            self.interface.validate_against_schema(value=self.value)
         else:
             self._validate_file_only()
-            with self.file.open("r") as f:
-                try:
-                    value = json.loads(f.read().decode("utf-8"))
-                except JSONDecodeError as error:
-                    raise ValidationError(error)
-                except UnicodeDecodeError:
-                    raise ValidationError("The file could not be decoded")
-                except MemoryError as error:
-                    raise ValidationError(
-                        "The file was too large to process, "
-                        "please try again with a smaller file"
-                    ) from error
+            self._validate_file_value()
+
+    def _validate_file_value(self):
+        try:
+            document = load_streamed_json(open_stream=self._open_file_stream)
+        except JSONDecodeError as error:
+            raise ValidationError(error)
+        except UnicodeDecodeError:
+            raise ValidationError("The file could not be decoded")
+        except (JSONItemTooLargeError, MemoryError) as error:
+            raise ValidationError(
+                "The file was too large to process, "
+                "please try again with a smaller file"
+            ) from error
 
-        self.interface.validate_against_schema(value=value)
+        self.interface.validate_against_schema(value=document.value)
+
+        # The file was read in a single pass, so use that for its size and
+        # hash rather than reading it again on save
+        self.size_in_storage = document.size
+
+        if not self.content_hash.startswith("file:"):
+            self.content_hash = f"file:sha256:{document.sha256}"
+
+    def _open_file_stream(self, *, offset):
+        if self.file._committed:
+            storage = self.file.storage
+            kwargs = {"Range": f"bytes={offset}-"} if offset else {}
+            response = storage.connection.meta.client.get_object(
+                Bucket=storage.bucket.name, Key=self.file.name, **kwargs
+            )
+            return closing(response["Body"])
+        else:
+            # The file has not been saved to storage yet
+            self.file.open("rb")
+            self.file.seek(offset)
+            return nullcontext(self.file)
 
     def validate_user_upload(self, user_upload):
         if not user_upload.is_completed:
@@ -1494,12 +1672,14 @@ class ComponentInterfaceValue(models.Model, FieldChangeMixin):
         try:
             if self.interface.is_json_kind:
                 try:
-                    value = json.loads(user_upload.read_object())
+                    document = load_streamed_json(
+                        open_stream=user_upload.open_object_stream
+                    )
                 except JSONDecodeError as error:
                     raise ValidationError(
                         f"The file is not valid JSON. {error}"
                     ) from error
-                self.interface.validate_against_schema(value=value)
+                self.interface.validate_against_schema(value=document.value)
             elif self.interface.kind == InterfaceKindChoices.NEWICK:
                 validate_newick_tree_format(tree=user_upload.read_object())
             elif self.interface.kind == InterfaceKindChoices.BIOM:
@@ -1509,6 +1689,7 @@ class ComponentInterfaceValue(models.Model, FieldChangeMixin):
         except UnicodeDecodeError:
             raise ValidationError("The file could not be decoded")
         except (
+            JSONItemTooLargeError,
             MemoryError,
             SoftTimeLimitExceeded,
             TimeLimitExceeded,
@@ -1526,8 +1707,23 @@ class ComponentInterfaceValue(models.Model, FieldChangeMixin):
         else:
             raise NotImplementedError
 
+    def calculate_content_hash(self):
+        if self.file:
+            with self.file.open("rb") as f:
+                return get_file_content_hash(f.chunks())
+        elif self.image_id:
+            return get_image_content_hash(self.image_id)
+        else:
+            return get_value_content_hash(self.value)
+
     class Meta:
         ordering = ("pk",)
+        indexes = (models.Index(fields=["interface", "content_hash"]),)
+
+
+# The number of combinations of duplicated input CIVs that are matched
+# on their fingerprints
+MAXIMUM_CIV_SET_FINGERPRINT_CANDIDATES = 1000
 
 
 class ComponentJobManager(models.QuerySet):
@@ -1581,30 +1777,133 @@ class ComponentJobManager(models.QuerySet):
             ):
                 # uploads will create new CIVs, so ignore these
                 continue
-            elif civ_data.image:
-                try:
-                    civs = ComponentInterfaceValue.objects.filter(
-                        interface__slug=civ_data.interface_slug,
-                        image=civ_data.image,
-                    ).all()
-                    existing_civs.extend(civs)
-                except ObjectDoesNotExist:
-                    continue
             elif civ_data.file_civ:
                 existing_civs.append(civ_data.file_civ)
             else:
-                # values can be of different types, including None and False
-                try:
-                    civs = ComponentInterfaceValue.objects.filter(
+                existing_civs.extend(
+                    ComponentInterfaceValue.objects.filter(
+                        get_existing_civ_lookup(civ_data=civ_data),
                         interface__slug=civ_data.interface_slug,
-                        value=civ_data.value,
-                    ).all()
-                    existing_civs.extend(civs)
-                except ObjectDoesNotExist:
-                    continue
+                    )
+                )
 
         return existing_civs
 
+    @staticmethod
+    def get_existing_civ_pks(*, civ_data_objects):
+        """
+        The pks of all the existing CIVs for each of the provided data
+
+        Returns None if there is no existing CIV for one of the inputs,
+        uploads always create new CIVs.
+        """
+        existing_civ_pks = []
+
+        for civ_data in civ_data_objects:
+            if (
+                civ_data.user_upload
+                or civ_data.upload_session
+                or civ_data.user_upload_queryset
+                or civ_data.dicom_upload_with_name
+            ):
+                return None
+            elif civ_data.file_civ:
+                civ_pks = [civ_data.file_civ.pk]
+            else:
+                civ_pks = [
+                    *ComponentInterfaceValue.objects.filter(
+                        get_existing_civ_lookup(civ_data=civ_data),
+                        interface__slug=civ_data.interface_slug,
+                    ).values_list("pk", flat=True)
+                ]
+
+            if not civ_pks:
+                return None
+
+            existing_civ_pks.append(civ_pks)
+
+        return existing_civ_pks
+
+    def filter_by_civ_set(self, *, civ_data_objects, input_interfaces=None):
+        """
+        Filters the jobs that have exactly the provided inputs
+
+        The CIVs of an input can be duplicated, an image has a CIV for
+        each archive item or display set for instance, so the fingerprints
+        of every combination of them are matched. Jobs without a
+        fingerprint, and inputs with too many combinations, are matched
+        by counting their inputs instead.
+
+        Parameters
+        ----------
+        civ_data_objects
+            A list of CIVData objects.
+        input_interfaces
+            The interfaces of the inputs that are fingerprinted, by
+            default all of the inputs are.
+        """
+        existing_civ_pks = self.get_existing_civ_pks(
+            civ_data_objects=civ_data_objects
+        )
+
+        if existing_civ_pks is None:
+            return self.none()
+
+        input_count = len(existing_civ_pks)
+        input_filter = (
+            Q()
+            if input_interfaces is None
+            else Q(inputs__interface__in=input_interfaces)
+        )
+        jobs_with_same_inputs = (
+            self.annotate(
+                civ_set_input_count=Count(
+                    "inputs", filter=input_filter, distinct=True
+                ),
+                civ_set_relevant_input_count=Count(
+                    "inputs",
+                    filter=Q(inputs__in=chain(*existing_civ_pks)),
+                    distinct=True,
+                ),
+            )
+            .filter(
+                civ_set_input_count=input_count,
+                civ_set_relevant_input_count=input_count,
+            )
+            .values("pk")
+        )
+
+        if (
+            prod(len(civ_pks) for civ_pks in existing_civ_pks)
+            > MAXIMUM_CIV_SET_FINGERPRINT_CANDIDATES
+        ):
+            return self.filter(pk__in=jobs_with_same_inputs)
+
+        fingerprints = {
+            get_civ_set_fingerprint(civ_pks=civ_pks)
+            for civ_pks in product(*existing_civ_pks)
+        }
+
+        return self.filter(
+            Q(civ_set_fingerprint__in=fingerprints)
+            | Q(
+                civ_set_fingerprint="",
+                pk__in=jobs_with_same_inputs.filter(civ_set_fingerprint=""),
+            )
+        )
+
+
+def get_existing_civ_lookup(*, civ_data):
+    """The lookup of the existing CIVs for an image or value"""
+    if civ_data.image:
+        return Q(image=civ_data.image)
+    else:
+        # values can be of different types, including None and False,
+        # those without a content hash have not been backfilled yet
+        return Q(content_hash=get_value_content_hash(civ_data.value)) | Q(
+            content_hash="", value=civ_data.value
+        )
+
 
 class ComponentJob(FieldChangeMixin, UUIDModel):
     # The job statuses come directly from celery.result.AsyncResult.status:
@@ -2474,6 +2773,65 @@ class CIVSetObjectPermissionsMixin:
         raise NotImplementedError
 
 
+def get_civ_set_fingerprint(*, civ_pks):
+    """Identifies a set of CIVs by the SHA256 of their sorted pks"""
+    encoded = ",".join(str(pk) for pk in sorted(civ_pks)).encode("utf-8")
+    return sha256(encoded).hexdigest()
+
+
+EMPTY_CIV_SET_FINGERPRINT = get_civ_set_fingerprint(civ_pks=[])
+
+
+class CIVSetFingerprintMixin(models.Model):
+    """
+    Stores a fingerprint of the CIVs of an object
+
+    The fingerprint is updated by m2m_changed receivers, so that an object
+    with exactly the same CIVs can be found with an indexed lookup.
+    An empty fingerprint has not been calculated yet.
+    """
+
+    civ_set_fingerprint = models.CharField(
+        editable=False,
+        default=EMPTY_CIV_SET_FINGERPRINT,
+        max_length=64,
+        help_text="The SHA256 of the sorted pks of the CIVs of this object",
+    )
+
+    class Meta:
+        abstract = True
+
+    def get_fingerprinted_civs(self):
+        raise NotImplementedError
+
+    def update_civ_set_fingerprint(self):
+        self.civ_set_fingerprint = get_civ_set_fingerprint(
+            civ_pks=self.get_fingerprinted_civs().values_list("pk", flat=True)
+        )
+        # Only update this field, saving objects can have side effects
+        type(self).objects.filter(pk=self.pk).update(
+            civ_set_fingerprint=self.civ_set_fingerprint
+        )
+
+
+def update_civ_set_fingerprints_on_m2m_change(
+    *, instance, action, reverse, model, pk_set
+):
+    """Called by the m2m_changed receivers of the fingerprinted CIV sets"""
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        # nothing to do for the other actions
+        return
+
+    if reverse:
+        # pk_set is None when clearing, CIVs are not cleared from this side
+        objects = model.objects.filter(pk__in=pk_set or [])
+    else:
+        objects = [instance]
+
+    for obj in objects:
+        obj.update_civ_set_fingerprint()
+
+
 class CIVForObjectMixin:
 
     def add_civ(self, *, civ):
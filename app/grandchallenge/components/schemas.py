@@ -1,6 +1,8 @@
 from django.db.models import TextChoices
 from django.utils.translation import gettext_lazy as _
 
+from grandchallenge.core.validators import JSONValidator
+
 ANSWER_TYPE_SCHEMA = {
     "$schema": "http://json-schema.org/draft-07/schema#",
     "definitions": {
@@ -727,3 +729,39 @@ def generate_component_json_schema(*, component_interface, required):
                     {"$ref": f"#/definitions/{component_interface.kind}"},
                 ],
             }
+
+
+_component_json_validators = {}
+
+
+def get_component_json_validator(*, component_interface, required):
+    """
+    Returns the compiled validator for the values of a component interface
+
+    The validators are kept for the lifetime of the process, by interface
+    and schema version, so the schema only needs to be generated and
+    checked once.
+    """
+    key = (
+        component_interface.pk,
+        component_interface.schema_version,
+        required,
+    )
+
+    try:
+        return _component_json_validators[key]
+    except KeyError:
+        validator = JSONValidator(
+            schema=generate_component_json_schema(
+                component_interface=component_interface, required=required
+            )
+        )
+        _component_json_validators[key] = validator
+        return validator
+
+
+def invalidate_component_json_validators(*, component_interface_pk):
+    """Removes the validators for the previous schema versions"""
+    for key in [*_component_json_validators]:
+        if key[0] == component_interface_pk:
+            _component_json_validators.pop(key, None)
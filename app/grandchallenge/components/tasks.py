@@ -1,4 +1,5 @@
 import gzip
+import io
 import itertools
 import json
 import shlex
@@ -8,6 +9,8 @@ import uuid
 import zlib
 from base64 import b64decode, b64encode
 from binascii import hexlify
+from contextlib import closing, nullcontext
+from hashlib import sha256
 from lzma import LZMAError
 from pathlib import Path
 from tempfile import NamedTemporaryFile, TemporaryDirectory
@@ -109,28 +112,34 @@ def validate_docker_image(  # noqa C901
     instance.import_status = instance.ImportStatusChoices.STARTED
     instance.save()
 
-    if instance.is_manifest_valid is None:
-        try:
-            _validate_docker_image_manifest(instance=instance)
-            instance.is_manifest_valid = True
-            instance.save()
-        except ValidationError as error:
-            instance.is_manifest_valid = False
-            instance.status = oxford_comma(error)
-            instance.import_status = instance.ImportStatusChoices.FAILED
-            instance.save()
-            send_invalid_dockerfile_email(container_image=instance)
+    with NamedTemporaryFile(suffix=".tar") as decompressed_tarball:
+        if instance.is_manifest_valid is None:
+            try:
+                # The decompressed tarball is written in the same pass
+                # so that it does not need to be read again for the push
+                _validate_docker_image_manifest(
+                    instance=instance, out_fileobj=decompressed_tarball
+                )
+                instance.is_manifest_valid = True
+                instance.save()
+            except ValidationError as error:
+                instance.is_manifest_valid = False
+                instance.status = oxford_comma(error)
+                instance.import_status = instance.ImportStatusChoices.FAILED
+                instance.save()
+                send_invalid_dockerfile_email(container_image=instance)
+                return
+        elif instance.is_manifest_valid is False:
+            # Nothing to do
             return
-    elif instance.is_manifest_valid is False:
-        # Nothing to do
-        return
+        else:
+            decompressed_tarball = None
 
-    upload_to_registry_and_sagemaker(
-        app_label=app_label,
-        model_name=model_name,
-        pk=pk,
-        mark_as_desired=mark_as_desired,
-    )
+        _upload_to_registry_and_sagemaker(
+            instance=instance,
+            mark_as_desired=mark_as_desired,
+            decompressed_tarball=decompressed_tarball,
+        )
 
 
 @acks_late_2xlarge_task
@@ -140,12 +149,22 @@ def upload_to_registry_and_sagemaker(
     model = apps.get_model(app_label=app_label, model_name=model_name)
     instance = model.objects.get(pk=pk)
 
+    _upload_to_registry_and_sagemaker(
+        instance=instance, mark_as_desired=mark_as_desired
+    )
+
+
+def _upload_to_registry_and_sagemaker(
+    *, instance, mark_as_desired, decompressed_tarball=None
+):
     instance.import_status = instance.ImportStatusChoices.STARTED
     instance.save()
 
     if not instance.is_in_registry:
         try:
-            push_container_image(instance=instance)
+            push_container_image(
+                instance=instance, decompressed_tarball=decompressed_tarball
+            )
             instance.is_in_registry = True
             instance.save()
         except ValidationError as error:
@@ -398,15 +417,26 @@ def delete_container_image(*, pk: uuid.UUID, app_label: str, model_name: str):
     instance.save()
 
 
-def push_container_image(*, instance):
+def push_container_image(*, instance, decompressed_tarball=None):
+    """
+    Pushes the container image to the registry
+
+    The decompressed tarball is created if it is not provided, as crane
+    cannot handle compressed tarballs.
+    """
     if not instance.is_manifest_valid:
         raise RuntimeError("Cannot push invalid instance to registry")
 
     try:
-        with NamedTemporaryFile(suffix=".tar") as o:
-            with instance.image.open(mode="rb") as im:
-                # Rewrite to tar as crane cannot handle gz
-                _decompress_tarball(in_fileobj=im, out_fileobj=o)
+        with (
+            nullcontext(decompressed_tarball)
+            if decompressed_tarball is not None
+            else NamedTemporaryFile(suffix=".tar")
+        ) as o:
+            if decompressed_tarball is None:
+                _get_image_config_and_sha256(instance=instance, out_fileobj=o)
+
+            o.flush()
 
             _repo_login_and_run(
                 command=["crane", "push", o.name, instance.original_repo_tag]
@@ -586,19 +616,10 @@ def _mutate_container_image(
         )
 
 
-def _decompress_tarball(*, in_fileobj, out_fileobj):
-    """Create an uncompress tarball from a (compressed) tarball"""
-    with (
-        tarfile.open(fileobj=in_fileobj, mode="r") as it,
-        tarfile.open(fileobj=out_fileobj, mode="w|") as ot,
-    ):
-        for member in it.getmembers():
-            extracted = it.extractfile(member)
-            ot.addfile(member, extracted)
-
-
-def _validate_docker_image_manifest(*, instance) -> str:
-    config_and_sha256 = _get_image_config_and_sha256(instance=instance)
+def _validate_docker_image_manifest(*, instance, out_fileobj=None) -> str:
+    config_and_sha256 = _get_image_config_and_sha256(
+        instance=instance, out_fileobj=out_fileobj
+    )
 
     config = config_and_sha256["config"]
     image_sha256 = config_and_sha256["image_sha256"]
@@ -644,47 +665,93 @@ def _validate_docker_image_manifest(*, instance) -> str:
             )
 
 
-def _get_image_config_and_sha256(*, instance):
-    try:
-        with (
-            instance.image.open(mode="rb") as im,
-            tarfile.open(fileobj=im, mode="r") as open_tarfile,
-        ):
-            container_image_files = {
-                tarinfo.name: tarinfo
-                for tarinfo in open_tarfile.getmembers()
-                if tarinfo.isfile()
-            }
+# The manifest and config files are small, anything larger is a layer
+MAX_CONTAINER_IMAGE_METADATA_FILE_SIZE = 1024 * 1024
 
-            image_manifest = _get_image_manifest(
-                container_image_files=container_image_files,
-                open_tarfile=open_tarfile,
-            )
 
-            return _get_image_config_file(
-                image_manifest=image_manifest,
-                container_image_files=container_image_files,
-                open_tarfile=open_tarfile,
-            )
+def _get_image_config_and_sha256(*, instance, out_fileobj=None):
+    """
+    Reads the config of a (compressed) container image tarball
 
+    The tarball is streamed from storage in a single forward pass. If
+    ``out_fileobj`` is provided the decompressed tarball is written to it
+    in the same pass.
+    """
+    try:
+        with closing(
+            _get_storage_object_body(file_field=instance.image)
+        ) as im:
+            metadata_files = _read_container_image_metadata_files(
+                in_fileobj=im, out_fileobj=out_fileobj
+            )
     except (
         EOFError,
         zlib.error,
         gzip.BadGzipFile,
         LZMAError,
         tarfile.ReadError,
+        tarfile.CompressionError,
         MemoryError,
     ):
         raise ValidationError("Could not decompress the container image file.")
 
+    image_manifest = _get_image_manifest(metadata_files=metadata_files)
+
+    return _get_image_config_file(
+        image_manifest=image_manifest, metadata_files=metadata_files
+    )
+
+
+def _get_storage_object_body(*, file_field):
+    """A forward only stream of a file in storage, nothing is spooled"""
+    response = file_field.storage.connection.meta.client.get_object(
+        Bucket=file_field.storage.bucket.name, Key=file_field.name
+    )
+    return response["Body"]
+
+
+def _read_container_image_metadata_files(*, in_fileobj, out_fileobj=None):
+    """
+    Returns the small JSON files of a (compressed) tarball by name
+
+    The config file name is only known once the manifest has been read,
+    and the manifest can be anywhere in the tarball, so all small JSON
+    files are kept.
+    """
+    metadata_files = {}
+
+    with (
+        tarfile.open(fileobj=in_fileobj, mode="r|*") as it,
+        (
+            tarfile.open(fileobj=out_fileobj, mode="w|")
+            if out_fileobj is not None
+            else nullcontext()
+        ) as ot,
+    ):
+        for member in it:
+            # Links cannot be extracted from a stream, they have no content
+            extracted = it.extractfile(member) if member.isfile() else None
+
+            if (
+                extracted is not None
+                and member.size <= MAX_CONTAINER_IMAGE_METADATA_FILE_SIZE
+            ):
+                content = extracted.read()
+
+                if content.lstrip()[:1] in {b"{", b"["}:
+                    metadata_files[member.name] = content
+
+                extracted = io.BytesIO(content)
 
-def _get_image_manifest(*, container_image_files, open_tarfile):
+            if ot is not None:
+                ot.addfile(member, extracted)
+
+    return metadata_files
+
+
+def _get_image_manifest(*, metadata_files):
     try:
-        manifest = json.loads(
-            open_tarfile.extractfile(
-                container_image_files["manifest.json"]
-            ).read()
-        )
+        manifest = json.loads(metadata_files["manifest.json"])
     except KeyError:
         raise ValidationError(
             "Could not find manifest.json in the container image file. "
@@ -700,23 +767,19 @@ def _get_image_manifest(*, container_image_files, open_tarfile):
     return manifest[0]
 
 
-def _get_image_config_file(
-    *, image_manifest, container_image_files, open_tarfile
-):
+def _get_image_config_file(*, image_manifest, metadata_files):
     config_filename = image_manifest["Config"]
 
     try:
-        config = json.loads(
-            open_tarfile.extractfile(
-                container_image_files[config_filename]
-            ).read()
-        )
+        config_file = metadata_files[config_filename]
     except KeyError:
         raise ValidationError(
             "Could not find the config file in the container image file. "
             "Was this created with docker save?"
         )
 
+    config = json.loads(config_file)
+
     if config_filename.endswith(".json"):
         # Docker <25 container image
         image_sha256 = config_filename.split(".")[0]
@@ -728,7 +791,8 @@ def _get_image_config_file(
         # Images created by crane have a sha256 prefix
         image_sha256 = image_sha256[7:]
 
-    if len(image_sha256) != 64:
+    # The image id is the digest of the config file
+    if image_sha256 != sha256(config_file).hexdigest():
         raise ValidationError(
             "The container image file does not have a valid sha256 hash."
         )
@@ -1194,21 +1258,83 @@ def preload_interactive_algorithms():
 @acks_late_2xlarge_task
 @transaction.atomic
 def civ_value_to_file(*, civ_pk):
-    from grandchallenge.components.models import ComponentInterfaceValue
+    from grandchallenge.components.models import (
+        ComponentInterfaceValue,
+        get_file_content_hash,
+    )
 
     civ = ComponentInterfaceValue.objects.get(pk=civ_pk)
 
     if civ.file:
         raise RuntimeError("CIV file is not None")
 
+    content = json.dumps(civ.value).encode("utf-8")
+
+    civ.content_hash = get_file_content_hash([content])
     civ.file = ContentFile(
-        json.dumps(civ.value).encode("utf-8"),
-        name=Path(civ.interface.relative_path).name,
+        content, name=Path(civ.interface.relative_path).name
     )
     civ.value = None
     civ.save()
 
 
+@acks_late_2xlarge_task
+def backfill_civ_content_hashes(*, start_pk=0, batch_size=1000):
+    """Adds the content hash to the CIVs that do not have one, in batches"""
+    from grandchallenge.components.models import ComponentInterfaceValue
+
+    civs = [
+        *ComponentInterfaceValue.objects.filter(
+            content_hash="", pk__gt=start_pk
+        ).order_by("pk")[:batch_size]
+    ]
+
+    for civ in civs:
+        try:
+            civ.content_hash = civ.calculate_content_hash()
+        except FileNotFoundError:
+            logger.warning(f"File for CIV {civ.pk} not found")
+
+    ComponentInterfaceValue.objects.bulk_update(
+        [civ for civ in civs if civ.content_hash], fields=["content_hash"]
+    )
+
+    if len(civs) == batch_size:
+        on_commit(
+            backfill_civ_content_hashes.signature(
+                kwargs={"start_pk": civs[-1].pk, "batch_size": batch_size}
+            ).apply_async
+        )
+
+
+@acks_late_2xlarge_task
+def backfill_civ_set_fingerprints(*, app_label, model_name, batch_size=1000):
+    """Adds the CIV set fingerprint to the objects without one, in batches"""
+    from grandchallenge.components.models import get_civ_set_fingerprint
+
+    model = apps.get_model(app_label=app_label, model_name=model_name)
+
+    objects = [*model.objects.filter(civ_set_fingerprint="")[:batch_size]]
+
+    for obj in objects:
+        obj.civ_set_fingerprint = get_civ_set_fingerprint(
+            civ_pks=obj.get_fingerprinted_civs().values_list("pk", flat=True)
+        )
+
+    model.objects.bulk_update(objects, fields=["civ_set_fingerprint"])
+
+    if len(objects) == batch_size:
+        on_commit(
+            backfill_civ_set_fingerprints.signature(
+                kwargs={
+                    "app_label": app_label,
+                    "model_name": model_name,
+                    "batch_size": batch_size,
+                }
+            ).apply_async
+        )
+
+
 @acks_late_2xlarge_task
 def validate_voxel_values(*, civ_pk):
     from grandchallenge.components.models import ComponentInterfaceValue
@@ -1381,10 +1507,7 @@ def add_file_to_object(
 ):
     from grandchallenge.algorithms.models import Job
     from grandchallenge.archives.models import ArchiveItem
-    from grandchallenge.components.models import (
-        ComponentInterface,
-        ComponentInterfaceValue,
-    )
+    from grandchallenge.components.models import ComponentInterface
     from grandchallenge.reader_studies.models import DisplaySet
 
     model = apps.get_model(app_label=app_label, model_name=model_name)
@@ -1406,12 +1529,10 @@ def add_file_to_object(
         interface=interface, user=user_upload.creator
     )
 
-    civ = ComponentInterfaceValue(interface=interface)
     try:
-        civ.validate_user_upload(user_upload)
-        civ.full_clean()
-        civ.save()
-        user_upload.copy_object(to_field=civ.file)
+        civ = _get_or_create_civ_for_user_upload(
+            interface=interface, user_upload=user_upload
+        )
         user_upload.delete()
     except ValidationError as e:
         error_handler.handle_error(
@@ -1453,6 +1574,30 @@ def add_file_to_object(
         logger.info("No linked task, task complete")
 
 
+def _get_or_create_civ_for_user_upload(*, interface, user_upload):
+    """Reuses an existing CIV with the same content as the upload"""
+    from grandchallenge.components.models import (
+        ComponentInterfaceValue,
+        get_file_content_hash,
+    )
+
+    content_hash = get_file_content_hash(user_upload.iter_object_chunks())
+    civ = ComponentInterfaceValue.objects.filter(
+        interface=interface, content_hash=content_hash
+    ).first()
+
+    if civ is None:
+        civ = ComponentInterfaceValue(interface=interface)
+        civ.validate_user_upload(user_upload)
+        civ.full_clean()
+        civ.save()
+        user_upload.copy_object(to_field=civ.file, save=False)
+        civ.content_hash = content_hash
+        civ.save()
+
+    return civ
+
+
 @acks_late_2xlarge_task(retry_on=(LockNotAcquiredException,))
 @transaction.atomic
 def assign_tarball_from_upload(
@@ -10,6 +10,9 @@ from django.core.cache import cache
 from django.db.transaction import on_commit
 from redis.exceptions import LockError
 
+from grandchallenge.core.exceptions import LockNotAcquiredException
+from grandchallenge.core.metrics import get_task_metric_name, increment_metric
+
 logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 60 * 24 * 2  # 2 days assuming 1 minute delay
@@ -158,6 +161,14 @@ class AcksLateTaskDecorator:
                     logger.info(
                         f"Retrying task {task_func.name} due to error: {error}, {_retries=}"
                     )
+                    if settings.ENABLE_CELERY_TASK_METRICS and isinstance(
+                        error, LockNotAcquiredException
+                    ):
+                        increment_metric(
+                            name=get_task_metric_name(
+                                task_name=task_func.name, name="lock_retries"
+                            )
+                        )
                     return task_func._retry()
                 else:
                     raise error
@@ -1,9 +1,18 @@
-from functools import cached_property
+from functools import cache, cached_property
+from itertools import batched, chain
+from typing import NamedTuple
 
+from django.apps import apps
+from django.conf import settings
 from django.contrib.auth.models import Permission
 from django.core.exceptions import ImproperlyConfigured
-from django.db.models import Index
+from django.db import models
+from django.db.models import Exists, Index, OuterRef, UniqueConstraint
 from guardian.core import ObjectPermissionChecker
+from guardian.managers import (
+    GroupObjectPermissionManager,
+    UserObjectPermissionManager,
+)
 from guardian.mixins import PermissionRequiredMixin  # noqa: I251
 from guardian.models import GroupObjectPermission
 from guardian.models import (  # noqa: I251
@@ -70,6 +79,37 @@ class ObjectPermissionRequiredMixin(PermissionRequiredMixin):
     accept_global_perms = False
 
 
+class ObjectPermissionIndexManagerMixin:
+    """
+    Keeps the object permission index up to date for bulk assignments
+
+    Guardian uses bulk_create when assigning a permission for many objects,
+    or to many users or groups, so no post_save signals are sent.
+    """
+
+    def bulk_assign_perm(self, *args, **kwargs):
+        assigned_perms = super().bulk_assign_perm(*args, **kwargs)
+        update_obj_perms_index_for_assignments(assignments=assigned_perms)
+        return assigned_perms
+
+    def assign_perm_to_many(self, *args, **kwargs):
+        assigned_perms = super().assign_perm_to_many(*args, **kwargs)
+        update_obj_perms_index_for_assignments(assignments=assigned_perms)
+        return assigned_perms
+
+
+class IndexedUserObjectPermissionManager(
+    ObjectPermissionIndexManagerMixin, UserObjectPermissionManager
+):
+    pass
+
+
+class IndexedGroupObjectPermissionManager(
+    ObjectPermissionIndexManagerMixin, GroupObjectPermissionManager
+):
+    pass
+
+
 class UserObjectPermissionBase(UserObjectPermissionBaseOrig):
     """
     Base user object permissions
@@ -86,6 +126,8 @@ class UserObjectPermissionBase(UserObjectPermissionBaseOrig):
 
     allowed_permissions = None
 
+    objects = IndexedUserObjectPermissionManager()
+
     def save(self, *args, **kwargs):
         if not isinstance(self.allowed_permissions, frozenset):
             raise ImproperlyConfigured(
@@ -123,6 +165,8 @@ class GroupObjectPermissionBase(GroupObjectPermissionBaseOrig):
 
     allowed_permissions = None
 
+    objects = IndexedGroupObjectPermissionManager()
+
     def save(self, *args, **kwargs):
         if not isinstance(self.allowed_permissions, frozenset):
             raise ImproperlyConfigured(
@@ -144,6 +188,43 @@ class GroupObjectPermissionBase(GroupObjectPermissionBaseOrig):
         ]
 
 
+class ObjectPermissionIndexBase(models.Model):
+    """
+    Base materialised object permission index
+
+    Contains a row for each permission that a user holds on an object,
+    whether it was assigned to the user directly or to one of their groups.
+    This allows filter_by_permission to use a single indexed lookup rather
+    than joining both object permission tables and the users group
+    memberships.
+
+    The rows are kept up to date by the signal handlers in
+    grandchallenge.core.signals for the models in
+    GUARDIAN_PERMISSION_INDEX_MODELS, which only see assignments made with
+    save() or delete(). Use check_obj_perms_index to detect and repair
+    any drift.
+
+    content_object must be a foreign key to the related model with
+    on_delete=CASCADE.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    permission = models.ForeignKey(
+        Permission, on_delete=models.CASCADE, related_name="+"
+    )
+
+    class Meta:
+        abstract = True
+        constraints = [
+            UniqueConstraint(
+                fields=["user", "permission", "content_object"],
+                name="%(app_label)s_%(class)s_unique",
+            ),
+        ]
+
+
 def filter_by_permission(*, queryset, user, codename):
     """
     Optimised version of get_objects_for_user
@@ -192,6 +273,21 @@ def filter_by_permission(*, queryset, user, codename):
         dfk_group_model.content_object.field.related_query_name()
     )
 
+    index_model = get_enabled_obj_perms_index_model(queryset.model)
+
+    if index_model is not None and (
+        group_filter_required or user_filter_required
+    ):
+        index_related_query_name = (
+            index_model.content_object.field.related_query_name()
+        )
+        return queryset.filter(
+            **{
+                f"{index_related_query_name}__user": user,
+                f"{index_related_query_name}__permission": permission,
+            }
+        )
+
     # Evaluate the pks in python to force the use of the index
     group_pks = {*user.groups.values_list("pk", flat=True)}
 
@@ -236,3 +332,220 @@ def get_object_if_allowed(*, model, pk, user, codename):
 
     if user.has_perm(codename, obj):
         return obj
+
+
+@cache
+def get_obj_perms_index_model(model):
+    """Returns the object permission index model for model, if it has one"""
+    for field in model._meta.get_fields():
+        if (
+            field.one_to_many
+            and issubclass(field.related_model, ObjectPermissionIndexBase)
+            and field.field.name == "content_object"
+        ):
+            return field.related_model
+
+    return None
+
+
+def get_enabled_obj_perms_index_model(model):
+    """
+    Returns the index model for model if it is used and maintained
+
+    The index is enabled per model with the
+    GUARDIAN_PERMISSION_INDEX_MODELS setting. It is not maintained for the
+    other models, so it needs to be rebuilt when a model is enabled.
+    """
+    if model._meta.label in settings.GUARDIAN_PERMISSION_INDEX_MODELS:
+        return get_obj_perms_index_model(model)
+    else:
+        return None
+
+
+def get_enabled_obj_perms_index_models():
+    return [
+        index_model
+        for index_model in get_obj_perms_index_models()
+        if index_model.content_object.field.related_model._meta.label
+        in settings.GUARDIAN_PERMISSION_INDEX_MODELS
+    ]
+
+
+def get_obj_perms_index_models():
+    return [
+        model
+        for model in apps.get_models()
+        if issubclass(model, ObjectPermissionIndexBase)
+    ]
+
+
+def _get_obj_perms_index_sources(*, index_model):
+    model = index_model.content_object.field.related_model
+    return get_user_obj_perms_model(model), get_group_obj_perms_model(model)
+
+
+def update_obj_perms_index(
+    *, index_model, user_pks=None, object_pks=None, permission_pk=None
+):
+    """
+    Brings the object permission index up to date
+
+    Only the entries for the given users, objects and permission are
+    considered, which keeps updates that result from a single assignment
+    cheap. Leaving all of them out updates the whole index.
+    """
+    dfk_user_model, dfk_group_model = _get_obj_perms_index_sources(
+        index_model=index_model
+    )
+
+    user_filter_kwargs = {}
+    group_filter_kwargs = {"group__user__isnull": False}
+    index_filter_kwargs = {}
+
+    if user_pks is not None:
+        user_filter_kwargs["user__pk__in"] = user_pks
+        group_filter_kwargs["group__user__pk__in"] = user_pks
+        index_filter_kwargs["user__pk__in"] = user_pks
+
+    if object_pks is not None:
+        for kwargs in (
+            user_filter_kwargs,
+            group_filter_kwargs,
+            index_filter_kwargs,
+        ):
+            kwargs["content_object__pk__in"] = object_pks
+
+    if permission_pk is not None:
+        for kwargs in (
+            user_filter_kwargs,
+            group_filter_kwargs,
+            index_filter_kwargs,
+        ):
+            kwargs["permission__pk"] = permission_pk
+
+    index_model.objects.filter(**index_filter_kwargs).exclude(
+        _index_entry_has_source(dfk_user_model, user_lookup="user")
+    ).exclude(
+        _index_entry_has_source(dfk_group_model, user_lookup="group__user")
+    ).delete()
+
+    entries = chain(
+        dfk_user_model.objects.filter(**user_filter_kwargs)
+        .values_list("user_id", "permission_id", "content_object_id")
+        .iterator(),
+        dfk_group_model.objects.filter(**group_filter_kwargs)
+        .values_list("group__user", "permission_id", "content_object_id")
+        .iterator(),
+    )
+
+    for batch in batched(entries, 1000, strict=False):
+        index_model.objects.bulk_create(
+            [
+                index_model(
+                    user_id=user_pk,
+                    permission_id=permission_pk,
+                    content_object_id=content_object_pk,
+                )
+                for user_pk, permission_pk, content_object_pk in batch
+            ],
+            ignore_conflicts=True,
+        )
+
+
+def update_obj_perms_index_for_assignments(*, assignments):
+    """
+    Updates the object permission index for changed permission assignments
+
+    The assignments are instances of one DFK user or group object
+    permission model, which may have been created or deleted.
+    """
+    if not assignments:
+        return
+
+    dfk_model = type(assignments[0])
+    index_model = get_enabled_obj_perms_index_model(
+        dfk_model._meta.get_field("content_object").related_model
+    )
+
+    if index_model is None:
+        return
+
+    scopes = {}
+
+    for assignment in assignments:
+        user_pks, object_pks = scopes.setdefault(
+            assignment.permission_id, (set(), set())
+        )
+        user_pks.add(getattr(assignment, "user_id", None))
+        object_pks.add(assignment.content_object_id)
+
+    for permission_pk, (user_pks, object_pks) in scopes.items():
+        update_obj_perms_index(
+            index_model=index_model,
+            # All members of a group could be affected
+            user_pks=None if None in user_pks else user_pks,
+            object_pks=object_pks,
+            permission_pk=permission_pk,
+        )
+
+
+def _index_entry_has_source(dfk_model, *, user_lookup):
+    return Exists(
+        dfk_model.objects.filter(
+            **{
+                user_lookup: OuterRef("user"),
+                "permission": OuterRef("permission"),
+                "content_object": OuterRef("content_object"),
+            }
+        )
+    )
+
+
+class ObjectPermissionIndexDrift(NamedTuple):
+    missing: int
+    extra: int
+
+
+def check_obj_perms_index(*, index_model):
+    """
+    Counts the differences between the object permission index and guardian
+
+    missing is the number of user or group assignments that are not
+    reflected in the index, extra the number of index entries without
+    a corresponding assignment.
+    """
+    dfk_user_model, dfk_group_model = _get_obj_perms_index_sources(
+        index_model=index_model
+    )
+
+    missing = 0
+
+    for dfk_model, user_lookup in (
+        (dfk_user_model, "user"),
+        (dfk_group_model, "group__user"),
+    ):
+        missing += (
+            dfk_model.objects.filter(**{f"{user_lookup}__isnull": False})
+            .exclude(
+                Exists(
+                    index_model.objects.filter(
+                        user=OuterRef(user_lookup),
+                        permission=OuterRef("permission"),
+                        content_object=OuterRef("content_object"),
+                    )
+                )
+            )
+            .count()
+        )
+
+    extra = (
+        index_model.objects.exclude(
+            _index_entry_has_source(dfk_user_model, user_lookup="user")
+        )
+        .exclude(
+            _index_entry_has_source(dfk_group_model, user_lookup="group__user")
+        )
+        .count()
+    )
+
+    return ObjectPermissionIndexDrift(missing=missing, extra=extra)
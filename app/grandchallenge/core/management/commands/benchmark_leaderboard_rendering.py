@@ -0,0 +1,100 @@
+from statistics import median
+from time import perf_counter
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management import BaseCommand, CommandError
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+
+from grandchallenge.evaluation.models import Phase
+from grandchallenge.evaluation.views import LeaderboardDetail
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares rendering the rows of a leaderboard one template at a "
+        "time with rendering them in a single pass, with a cold and a warm "
+        "row cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("challenge_short_name", type=str)
+        parser.add_argument("phase_slug", type=str)
+        parser.add_argument("--page-size", type=int, default=50)
+        parser.add_argument("--repeats", type=int, default=5)
+
+    def handle(self, *args, **options):
+        try:
+            phase = Phase.objects.select_related("challenge").get(
+                challenge__short_name__iexact=options["challenge_short_name"],
+                slug=options["phase_slug"],
+            )
+        except Phase.DoesNotExist:
+            raise CommandError("Phase not found")
+
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+        request.challenge = phase.challenge
+
+        view = LeaderboardDetail()
+        view.setup(request, slug=phase.slug)
+        view.object_list = view.get_queryset()
+
+        object_list = [*view.object_list[: options["page_size"]]]
+
+        if not object_list:
+            raise CommandError("The leaderboard is empty")
+
+        cache_keys = [view.get_row_cache_key(object_=o) for o in object_list]
+
+        def render_each():
+            page_context = view.get_context_data(object_list=object_list)
+            return [
+                render_to_string(
+                    view.row_template,
+                    context={**page_context, "object": o},
+                    request=request,
+                ).split("<split></split>")
+                for o in object_list
+            ]
+
+        def render_cold():
+            cache.delete_many(cache_keys)
+            return view.render_rows(object_list=object_list, request=request)
+
+        def render_warm():
+            return view.render_rows(object_list=object_list, request=request)
+
+        durations = {}
+        results = {}
+
+        for label, render in (
+            ("per row", render_each),
+            ("single pass, cold cache", render_cold),
+            ("single pass, warm cache", render_warm),
+        ):
+            durations[label], results[label] = self._time_render(
+                render=render, repeats=options["repeats"]
+            )
+            self.stdout.write(
+                f"{label}: {durations[label] * 1000:.1f} ms, "
+                f"{len(object_list) / durations[label]:.0f} rows/s"
+            )
+
+        cache.delete_many(cache_keys)
+
+        for label, rows in results.items():
+            if rows != results["per row"]:
+                self.stderr.write(f"{label}: rows differ from per row")
+
+    @staticmethod
+    def _time_render(*, render, repeats):
+        durations = []
+
+        for _ in range(repeats):
+            start = perf_counter()
+            rows = render()
+            durations.append(perf_counter() - start)
+
+        return median(durations), rows
@@ -0,0 +1,85 @@
+from statistics import median
+from time import perf_counter
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand, CommandError
+from django.db.models import Count
+from django.test import override_settings
+
+from grandchallenge.core.guardian import (
+    filter_by_permission,
+    get_obj_perms_index_model,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares filter_by_permission using the permission tables with "
+        "using the object permission index, for the users with the most "
+        "group memberships."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", type=str, default="cases.Image")
+        parser.add_argument("--num-users", type=int, default=10)
+        parser.add_argument("--repeats", type=int, default=5)
+
+    def handle(self, *args, **options):
+        model = apps.get_model(options["model"])
+
+        if get_obj_perms_index_model(model) is None:
+            raise CommandError(f"{model._meta.label} has no permission index")
+
+        codename = f"view_{model._meta.model_name}"
+        users = (
+            get_user_model()
+            .objects.filter(is_superuser=False)
+            .annotate(num_groups=Count("groups"))
+            .order_by("-num_groups")[: options["num_users"]]
+        )
+
+        for user in users:
+            durations = {}
+            results = {}
+
+            for label, index_models in (
+                ("tables", set()),
+                ("index", {model._meta.label}),
+            ):
+                with override_settings(
+                    GUARDIAN_PERMISSION_INDEX_MODELS=index_models
+                ):
+                    durations[label], results[label] = self._time_filter(
+                        model=model,
+                        user=user,
+                        codename=codename,
+                        repeats=options["repeats"],
+                    )
+
+            self.stdout.write(
+                f"{user.username} ({user.num_groups} groups, "
+                f"{len(results['tables'])} objects): "
+                f"tables {durations['tables'] * 1000:.1f} ms, "
+                f"index {durations['index'] * 1000:.1f} ms"
+            )
+
+            if results["tables"] != results["index"]:
+                self.stderr.write(
+                    f"{user.username}: index results differ from tables"
+                )
+
+    @staticmethod
+    def _time_filter(*, model, user, codename, repeats):
+        durations = []
+
+        for _ in range(repeats):
+            start = perf_counter()
+            pks = {
+                *filter_by_permission(
+                    queryset=model.objects.all(), user=user, codename=codename
+                ).values_list("pk", flat=True)
+            }
+            durations.append(perf_counter() - start)
+
+        return median(durations), pks
@@ -0,0 +1,30 @@
+from django.core.management import BaseCommand
+
+from grandchallenge.core.guardian import (
+    check_obj_perms_index,
+    get_obj_perms_index_models,
+    update_obj_perms_index,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the object permission indexes with the guardian "
+        "permission tables, optionally rebuilding those that have drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fix", action="store_true")
+
+    def handle(self, *args, **options):
+        for index_model in get_obj_perms_index_models():
+            drift = check_obj_perms_index(index_model=index_model)
+
+            self.stdout.write(
+                f"{index_model._meta.label}: {drift.missing} missing, "
+                f"{drift.extra} extra"
+            )
+
+            if options["fix"] and (drift.missing or drift.extra):
+                update_obj_perms_index(index_model=index_model)
+                self.stdout.write(f"{index_model._meta.label}: rebuilt")
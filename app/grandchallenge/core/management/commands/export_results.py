@@ -1,55 +1,90 @@
-import json
+from datetime import datetime
 
-from django.core.management import BaseCommand
+from django.core.management import BaseCommand, CommandError
+from django.utils.timezone import is_naive, make_aware
 
 from grandchallenge.challenges.models import Challenge
-from grandchallenge.evaluation.models import Evaluation
+from grandchallenge.core.storage import private_s3_storage
+from grandchallenge.evaluation.exports import (
+    EXPORT_RENDERERS,
+    export_evaluations,
+    get_evaluations_for_export,
+)
+
+
+def _parse_datetime(value):
+    dt = datetime.fromisoformat(value)
+    return make_aware(dt) if is_naive(dt) else dt
 
 
 class Command(BaseCommand):
+    help = "Exports the evaluations of a challenge"
+
     def add_arguments(self, parser):
-        parser.add_argument("challenge_short_name", nargs="+", type=str)
+        parser.add_argument("challenge_short_name", type=str)
+        parser.add_argument(
+            "--phase", type=str, help="Only export this phase (slug)"
+        )
+        parser.add_argument(
+            "--created-after",
+            type=_parse_datetime,
+            help="Only export evaluations created at or after this ISO date",
+        )
+        parser.add_argument(
+            "--created-before",
+            type=_parse_datetime,
+            help="Only export evaluations created before this ISO date",
+        )
+        parser.add_argument(
+            "--format",
+            choices=sorted(EXPORT_RENDERERS),
+            default="ndjson",
+            dest="export_format",
+        )
+        destination = parser.add_mutually_exclusive_group()
+        destination.add_argument(
+            "--output", type=str, help="Write to this file, default stdout"
+        )
+        destination.add_argument(
+            "--s3-key", type=str, help="Write to this key in private storage"
+        )
 
     def handle(self, *args, **options):
-        challenge = Challenge.objects.get(
-            short_name__iexact=options["challenge_short_name"][0]
-        )
+        try:
+            challenge = Challenge.objects.get(
+                short_name__iexact=options["challenge_short_name"]
+            )
+        except Challenge.DoesNotExist:
+            raise CommandError("Challenge not found")
+
+        if options["phase"]:
+            try:
+                phase = challenge.phase_set.get(slug=options["phase"])
+            except challenge.phase_set.model.DoesNotExist:
+                raise CommandError("Phase not found")
+        else:
+            phase = None
 
-        jobs = (
-            Evaluation.objects.filter(method__challenge=challenge)
-            .select_related("submission", "method")
-            .prefetch_related("outputs")
+        chunks = export_evaluations(
+            evaluations=get_evaluations_for_export(
+                challenge=challenge,
+                phase=phase,
+                created_after=options["created_after"],
+                created_before=options["created_before"],
+            ),
+            export_format=options["export_format"],
         )
 
-        print("[")
-
-        for j in jobs:
-            out = {
-                "pk": str(j.pk),
-                "created": j.created.isoformat(),
-                "submission": str(j.submission.pk),
-                "submission_comment": j.submission.comment,
-                "submission_file": (
-                    j.submission.predictions_file.url
-                    if j.submission.predictions_file
-                    else None
-                ),
-                "supplementary_file": (
-                    j.submission.supplementary_file.url
-                    if j.submission.supplementary_file
-                    else None
-                ),
-                "supplementary_url": j.submission.supplementary_url,
-                "method": str(j.method.pk),
-                "creator": str(j.submission.creator),
-                "published": j.published,
-                "metrics": j.outputs.get(
-                    interface__slug="metrics-json-file"
-                ).value,
-                "rank": j.rank,
-                "rank_score": j.rank_score,
-                "rank_per_metric": j.rank_per_metric,
-            }
-            print(json.dumps(out, indent=2) + ",")
-
-        print("]")
+        if options["s3_key"]:
+            # Written with a multipart upload, so only one part is buffered
+            with private_s3_storage.open(options["s3_key"], "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk.encode("utf-8"))
+        elif options["output"]:
+            with open(
+                options["output"], "w", encoding="utf-8", newline=""
+            ) as f:
+                f.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
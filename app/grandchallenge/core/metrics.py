@@ -0,0 +1,32 @@
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+
+def _get_metric_key(*, name):
+    return cache.make_key(f"metrics.{name}")
+
+
+def increment_metric(*, name, value=1):
+    """Adds to a counter that is pushed with the other site metrics"""
+    get_redis_connection("default").incrby(_get_metric_key(name=name), value)
+
+
+def get_task_metric_name(*, task_name, name):
+    """Returns the name of a metric of a celery task"""
+    return f"celery.tasks.{task_name}.{name}"
+
+
+def pop_metrics(*, names):
+    """Returns and resets the counters"""
+    keys = [_get_metric_key(name=name) for name in names]
+
+    # GETDEL is not available in redis 5, so use a transaction
+    with get_redis_connection("default").pipeline(transaction=True) as pipe:
+        pipe.mget(keys)
+        pipe.delete(*keys)
+        values, _ = pipe.execute()
+
+    return {
+        name: int(value or 0)
+        for name, value in zip(names, values, strict=True)
+    }
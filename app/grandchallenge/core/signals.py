@@ -2,20 +2,36 @@ from actstream.actions import follow, unfollow
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
+from django.contrib.auth.signals import user_logged_out
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ObjectDoesNotExist
 from django.db.models import Q
 from django.db.models.signals import (
     m2m_changed,
+    post_delete,
     post_save,
     pre_delete,
     pre_save,
 )
 from django.dispatch import receiver
-from guardian.utils import get_anonymous_user
+from guardian.utils import get_anonymous_user, get_group_obj_perms_model
+from knox.models import AuthToken
 
-from grandchallenge.algorithms.models import AlgorithmPermissionRequest
+from grandchallenge.algorithms.models import (
+    AlgorithmPermissionRequest,
+    JobGroupObjectPermission,
+    JobUserObjectPermission,
+)
 from grandchallenge.archives.models import ArchivePermissionRequest
+from grandchallenge.cases.models import (
+    ImageGroupObjectPermission,
+    ImageUserObjectPermission,
+)
+from grandchallenge.core.guardian import (
+    get_enabled_obj_perms_index_models,
+    update_obj_perms_index,
+    update_obj_perms_index_for_assignments,
+)
 from grandchallenge.core.utils import disable_for_loaddata
 from grandchallenge.notifications.models import (
     Notification,
@@ -23,6 +39,7 @@ from grandchallenge.notifications.models import (
 )
 from grandchallenge.participants.models import RegistrationRequest
 from grandchallenge.reader_studies.models import ReaderStudyPermissionRequest
+from grandchallenge.serving.utils import invalidate_image_access_grants
 
 
 @receiver(post_save, sender=get_user_model())
@@ -178,3 +195,105 @@ def clean_up_user_notifications(instance, **_):
         | Q(target_object_id=instance.pk) & Q(target_content_type=ct)
         | Q(user_id=instance.pk)
     ).delete()
+
+
+@receiver(post_save, sender=ImageUserObjectPermission)
+@receiver(post_save, sender=ImageGroupObjectPermission)
+@receiver(post_save, sender=JobUserObjectPermission)
+@receiver(post_save, sender=JobGroupObjectPermission)
+@disable_for_loaddata
+def update_obj_perms_index_on_assign(*, instance, **_):
+    update_obj_perms_index_for_assignments(assignments=[instance])
+
+
+@receiver(post_delete, sender=ImageUserObjectPermission)
+@receiver(post_delete, sender=ImageGroupObjectPermission)
+@receiver(post_delete, sender=JobUserObjectPermission)
+@receiver(post_delete, sender=JobGroupObjectPermission)
+def update_obj_perms_index_on_remove(*, instance, **_):
+    update_obj_perms_index_for_assignments(assignments=[instance])
+
+
+@receiver(m2m_changed, sender=Group.user_set.through)
+def update_obj_perms_index_on_membership_change(
+    instance, action, reverse, pk_set, **_
+):
+    if action not in ["post_add", "post_remove", "post_clear"]:
+        # nothing to do for the other actions
+        return
+
+    index_models = get_enabled_obj_perms_index_models()
+
+    if not index_models:
+        return
+
+    if reverse:
+        # The users of a group changed, all users were removed on clear
+        user_pks, group_pks = pk_set, {instance.pk}
+    else:
+        # The groups of a user changed, which are no longer known on clear
+        user_pks, group_pks = {instance.pk}, pk_set
+
+    for index_model in index_models:
+        if group_pks is None:
+            object_pks = None
+        else:
+            # Only the permissions of the changed groups are affected
+            dfk_group_model = get_group_obj_perms_model(
+                index_model.content_object.field.related_model
+            )
+            object_pks = dfk_group_model.objects.filter(
+                group__pk__in=group_pks
+            ).values("content_object")
+
+        update_obj_perms_index(
+            index_model=index_model, user_pks=user_pks, object_pks=object_pks
+        )
+
+
+@receiver(post_delete, sender=ImageUserObjectPermission)
+@receiver(post_delete, sender=ImageGroupObjectPermission)
+def invalidate_image_access_grants_on_remove(*, instance, **_):
+    invalidate_image_access_grants(image_pks=[instance.content_object_id])
+
+
+@receiver(m2m_changed, sender=Group.user_set.through)
+def invalidate_image_access_grants_on_membership_change(
+    instance, action, reverse, pk_set, **_
+):
+    if action not in ["post_remove", "pre_clear"]:
+        # Only removals can revoke permissions
+        return
+
+    if not reverse:
+        user_pks = [instance.pk]
+    elif pk_set is not None:
+        user_pks = pk_set
+    else:
+        user_pks = instance.user_set.values_list("pk", flat=True)
+
+    invalidate_image_access_grants(user_pks=user_pks)
+
+
+@receiver(pre_save, sender=get_user_model())
+def invalidate_image_access_grants_on_deactivation(*, instance, **_):
+    if instance.pk is None or instance.is_active:
+        return
+
+    if (
+        get_user_model()
+        .objects.filter(pk=instance.pk, is_active=True)
+        .exists()
+    ):
+        invalidate_image_access_grants(user_pks=[instance.pk])
+
+
+@receiver(user_logged_out)
+def invalidate_image_access_grants_on_logout(*, user, **_):
+    if user is not None:
+        invalidate_image_access_grants(user_pks=[user.pk])
+
+
+@receiver(post_delete, sender=AuthToken)
+def invalidate_image_access_grants_on_token_delete(*, instance, **_):
+    invalidate_image_access_grants(user_pks=[instance.user_id])
@@ -1,8 +1,13 @@
+import asyncio
 import copy
 import datetime
 from base64 import b64decode
 from uuid import uuid4
 
+import aioboto3
+from asgiref.sync import async_to_sync
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.signers import CloudFrontSigner
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes, serialization
@@ -187,3 +192,60 @@ def copy_s3_object(
     # Save the object because it has changed, unless save is False
     if save:
         to_field.instance.save()
+
+
+BULK_UPLOAD_CONCURRENCY = 32
+BULK_UPLOAD_BOTO_CONFIG = Config(max_pool_connections=64)
+BULK_UPLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * settings.MEGABYTE,
+    multipart_chunksize=8 * settings.MEGABYTE,
+)
+
+
+def bulk_upload_files(*, storage, files):
+    """
+    Concurrently uploads local files to an S3 storage
+
+    `files` maps the storage name of each file to its local path.
+    Unlike `storage.save` the names are not checked for availability,
+    the caller is responsible for ensuring that they are unique.
+    Large files are uploaded with multipart uploads.
+    """
+    async_to_sync(_bulk_upload_files)(storage=storage, files=files)
+
+
+async def _bulk_upload_files(*, storage, files):
+    semaphore = asyncio.Semaphore(BULK_UPLOAD_CONCURRENCY)
+    session = aioboto3.Session()
+
+    async with session.client(
+        "s3",
+        endpoint_url=storage.endpoint_url,
+        region_name=storage.region_name,
+        config=BULK_UPLOAD_BOTO_CONFIG,
+    ) as s3_client:
+        async with asyncio.TaskGroup() as task_group:
+            for name, path in files.items():
+                task_group.create_task(
+                    _upload_file(
+                        storage=storage,
+                        name=name,
+                        path=path,
+                        semaphore=semaphore,
+                        s3_client=s3_client,
+                    )
+                )
+
+
+async def _upload_file(*, storage, name, path, semaphore, s3_client):
+    key = storage._normalize_name(clean_name(name))
+
+    async with semaphore:
+        with open(path, "rb") as f:
+            await s3_client.upload_fileobj(
+                Fileobj=f,
+                Bucket=storage.bucket_name,
+                Key=key,
+                ExtraArgs=storage._get_write_parameters(key, f),
+                Config=BULK_UPLOAD_TRANSFER_CONFIG,
+            )
@@ -17,7 +17,10 @@ from grandchallenge.cases.models import (
     RawImageUploadSession,
 )
 from grandchallenge.core.celery import acks_late_micro_short_task
+from grandchallenge.core.metrics import pop_metrics
+from grandchallenge.core.templatetags.bleach import pop_md2html_cache_metrics
 from grandchallenge.evaluation.models import Evaluation, Method
+from grandchallenge.serving.utils import pop_image_access_grant_metrics
 from grandchallenge.workstations.models import Session
 
 
@@ -142,4 +145,82 @@ def _get_metrics():
         }
     )
 
+    image_cache_metrics = pop_metrics(
+        names=[
+            "cases.image_cache.hits",
+            "cases.image_cache.misses",
+            "cases.image_cache.bytes_saved",
+        ]
+    )
+
+    metric_data.append(
+        {
+            "Namespace": f"{site.domain}/cases",
+            "MetricData": [
+                {
+                    "MetricName": "ImageCacheHits",
+                    "Value": image_cache_metrics["cases.image_cache.hits"],
+                    "Unit": "Count",
+                },
+                {
+                    "MetricName": "ImageCacheMisses",
+                    "Value": image_cache_metrics["cases.image_cache.misses"],
+                    "Unit": "Count",
+                },
+                {
+                    "MetricName": "ImageCacheBytesSaved",
+                    "Value": image_cache_metrics[
+                        "cases.image_cache.bytes_saved"
+                    ],
+                    "Unit": "Bytes",
+                },
+            ],
+        }
+    )
+
+    image_access_grant_metrics = pop_image_access_grant_metrics()
+
+    metric_data.append(
+        {
+            "Namespace": f"{site.domain}/serving",
+            "MetricData": [
+                {
+                    "MetricName": "ImageAccessGrantCacheHits",
+                    "Value": image_access_grant_metrics["hits"],
+                    "Unit": "Count",
+                },
+                {
+                    "MetricName": "ImageAccessGrantCacheMisses",
+                    "Value": image_access_grant_metrics["misses"],
+                    "Unit": "Count",
+                },
+            ],
+        }
+    )
+
+    md2html_cache_metrics = pop_md2html_cache_metrics()
+
+    metric_data.append(
+        {
+            "Namespace": f"{site.domain}/core",
+            "MetricData": [
+                {
+                    "MetricName": "Md2HtmlLocalCacheHits",
+                    "Value": md2html_cache_metrics["local_hits"],
+                    "Unit": "Count",
+                },
+                {
+                    "MetricName": "Md2HtmlCacheHits",
+                    "Value": md2html_cache_metrics["hits"],
+                    "Unit": "Count",
+                },
+                {
+                    "MetricName": "Md2HtmlCacheMisses",
+                    "Value": md2html_cache_metrics["misses"],
+                    "Unit": "Count",
+                },
+            ],
+        }
+    )
+
     return metric_data
@@ -1,12 +1,22 @@
+import json
+from collections import OrderedDict
+from functools import lru_cache
+from hashlib import sha256
+from threading import Lock
+
 import bleach
 from bleach.css_sanitizer import CSSSanitizer
 from django import template
 from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.template.loader import render_to_string
 from django.utils.safestring import SafeString, mark_safe
 from markdown import markdown as render_markdown
 from markdown.extensions.toc import TocExtension
 
+from grandchallenge.core.metrics import increment_metric, pop_metrics
 from grandchallenge.core.utils.markdown import LinkBlankTargetExtension
 from grandchallenge.core.utils.tag_substitutions import TagSubstitution
 
@@ -57,6 +67,115 @@ YOUTUBE_TAG_SUBSTITUTION = TagSubstitution(
 )
 
 
+# Increment when the html produced for the same markdown and settings
+# changes, e.g. when the extensions are updated, to invalidate the cache
+MD2HTML_CACHE_VERSION = 1
+MD2HTML_CACHE_TIMEOUT = 24 * 60 * 60
+MD2HTML_LOCAL_CACHE_SIZE = 512
+# Local cache hits are counted in the process and added to the
+# metrics in batches, so that a local hit does not need to use redis
+MD2HTML_LOCAL_HITS_BATCH_SIZE = 100
+
+MD2HTML_SETTINGS = frozenset(
+    {
+        "MARKDOWNX_MARKDOWN_EXTENSIONS",
+        "MARKDOWNX_MARKDOWN_EXTENSION_CONFIGS",
+        "MARKDOWN_POST_PROCESSORS",
+        "BLEACH_ALLOWED_TAGS",
+        "BLEACH_ALLOWED_ATTRIBUTES",
+        "BLEACH_ALLOWED_STYLES",
+        "BLEACH_ALLOWED_PROTOCOLS",
+        "BLEACH_STRIP",
+    }
+)
+
+
+class _LocalMd2HtmlCache:
+    """A least recently used cache of rendered html for this process"""
+
+    def __init__(self, *, max_size):
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._unreported_hits = 0
+
+    def get(self, key):
+        with self._lock:
+            html = self._entries.get(key)
+
+            if html is None:
+                return None
+
+            self._entries.move_to_end(key)
+            self._unreported_hits += 1
+
+            if self._unreported_hits < MD2HTML_LOCAL_HITS_BATCH_SIZE:
+                return html
+
+            unreported_hits, self._unreported_hits = self._unreported_hits, 0
+
+        increment_metric(
+            name="core.md2html_cache.local_hits", value=unreported_hits
+        )
+
+        return html
+
+    def set(self, key, html):
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_local_md2html_cache = _LocalMd2HtmlCache(max_size=MD2HTML_LOCAL_CACHE_SIZE)
+
+
+@lru_cache(maxsize=1)
+def _get_md2html_settings_fingerprint():
+    """Describes the settings that the rendered html depends on"""
+    return repr(
+        [
+            [
+                (
+                    extension
+                    if isinstance(extension, str)
+                    else f"{type(extension).__module__}.{type(extension).__qualname__}"
+                )
+                for extension in settings.MARKDOWNX_MARKDOWN_EXTENSIONS
+            ],
+            *(
+                getattr(settings, name)
+                for name in sorted(MD2HTML_SETTINGS)
+                if name != "MARKDOWNX_MARKDOWN_EXTENSIONS"
+            ),
+        ]
+    )
+
+
+@receiver(setting_changed)
+def _clear_md2html_settings_fingerprint(*, setting, **__):
+    if setting in MD2HTML_SETTINGS:
+        _get_md2html_settings_fingerprint.cache_clear()
+
+
+def _get_md2html_cache_key(*, markdown, options):
+    content = json.dumps(
+        [
+            MD2HTML_CACHE_VERSION,
+            _get_md2html_settings_fingerprint(),
+            options,
+            markdown,
+        ]
+    )
+    return f"core.md2html.{sha256(content.encode('utf-8')).hexdigest()}"
+
+
 @register.filter
 def md2html(
     markdown: str | None,
@@ -65,8 +184,44 @@ def md2html(
     create_permalink_for_headers=True,
     process_youtube_tags=True,
 ):
-    """Convert markdown to clean html"""
+    """
+    Convert markdown to clean html
+
+    The html is cached by the content of the markdown, in this process
+    and in redis, so it does not need to be invalidated.
+    """
+    options = {
+        "link_blank_target": link_blank_target,
+        "create_permalink_for_headers": create_permalink_for_headers,
+        "process_youtube_tags": process_youtube_tags,
+    }
+    key = _get_md2html_cache_key(markdown=markdown or "", options=options)
+
+    html = _local_md2html_cache.get(key)
 
+    if html is None:
+        html = cache.get(key)
+
+        if html is None:
+            increment_metric(name="core.md2html_cache.misses")
+            html = _render_md2html(markdown=markdown or "", **options)
+            cache.set(key, str(html), timeout=MD2HTML_CACHE_TIMEOUT)
+        else:
+            increment_metric(name="core.md2html_cache.hits")
+
+        _local_md2html_cache.set(key, html)
+
+    # Only SafeStrings are cached, the type is lost in redis
+    return mark_safe(html)
+
+
+def _render_md2html(
+    *,
+    markdown,
+    link_blank_target,
+    create_permalink_for_headers,
+    process_youtube_tags,
+):
     extensions = [*settings.MARKDOWNX_MARKDOWN_EXTENSIONS]
 
     if link_blank_target:
@@ -81,7 +236,7 @@ def md2html(
         )
 
     html = render_markdown(
-        text=markdown or "",
+        text=markdown,
         extensions=extensions,
         extension_configs=settings.MARKDOWNX_MARKDOWN_EXTENSION_CONFIGS,
         tab_length=2,
@@ -101,3 +256,17 @@ def md2html(
         raise RuntimeError("Markdown rendering failed to produce a SafeString")
 
     return cleaned_html
+
+
+def pop_md2html_cache_metrics():
+    """Returns and resets the number of cache hits and misses"""
+    metrics = pop_metrics(
+        names=[
+            f"core.md2html_cache.{name}"
+            for name in ("local_hits", "hits", "misses")
+        ]
+    )
+    return {
+        name.removeprefix("core.md2html_cache."): value
+        for name, value in metrics.items()
+    }
@@ -0,0 +1,333 @@
+"""
+Incremental parsing of large json documents
+
+The documents are read in chunks from a stream, such as the body of an
+S3 object. The root array, or the arrays that are members of the root
+object, are not loaded. Instead they are replaced with a
+`StreamedJSONArray` that parses its items one at a time from a new
+stream whenever it is iterated. Other values are decoded with the
+standard library, up to settings.COMPONENTS_MAXIMUM_JSON_ITEM_SIZE
+characters each, so the memory that is used is bounded by the largest
+item rather than by the size of the document.
+"""
+
+import re
+from codecs import getincrementaldecoder
+from collections.abc import Sequence
+from hashlib import sha256
+from itertools import islice
+from json import JSONDecodeError, JSONDecoder
+from typing import Any, NamedTuple
+
+from django.conf import settings
+
+CHUNK_SIZE = 1024 * 1024
+
+_NON_WHITESPACE = re.compile(r"[^ \t\n\r]")
+
+# A token that is cut off, such as "tru", "1." or "-Infinit", is reported
+# by the decoder at its start, so at most this far from the end
+_MAX_INCOMPLETE_TOKEN_LENGTH = len("-Infinity")
+
+
+class JSONItemTooLargeError(ValueError):
+    pass
+
+
+class StreamedJSON(NamedTuple):
+    value: Any
+    size: int
+    sha256: str
+
+
+def load_streamed_json(*, open_stream):
+    """
+    Parses a json document, streaming its large arrays
+
+    Parameters
+    ----------
+    open_stream
+        Called with the byte offset at which the document should be read
+        from, returns a context manager of a binary stream. It is called
+        again every time that a streamed array is iterated.
+
+    Returns
+    -------
+        The value of the document, and the size in bytes and sha256
+        hexdigest of the document, which are calculated in the same pass
+    """
+    digest = sha256()
+
+    with open_stream(offset=0) as stream:
+        reader = _Reader(stream=stream, digest=digest)
+
+        if reader.peek() == "{":
+            value = _parse_object(reader=reader, open_stream=open_stream)
+        elif reader.peek() == "[":
+            value = _scan_array(reader=reader, open_stream=open_stream)
+        else:
+            value = reader.decode()
+
+        if reader.peek() != "":
+            raise reader.decode_error(msg="Extra data")
+
+    return StreamedJSON(
+        value=value, size=reader.size, sha256=digest.hexdigest()
+    )
+
+
+class StreamedJSONArray(Sequence):
+    """An array of a json document that is parsed whenever it is iterated"""
+
+    def __init__(self, *, open_stream, offset, length):
+        self._open_stream = open_stream
+        self._offset = offset
+        self._length = length
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        with self._open_stream(offset=self._offset) as stream:
+            yield from _iter_array_items(reader=_Reader(stream=stream))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            indices = range(*index.indices(len(self)))
+            wanted = set(indices)
+            items = {
+                idx: item for idx, item in enumerate(self) if idx in wanted
+            }
+            return [items[idx] for idx in indices]
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("array index out of range")
+
+        return next(islice(self, index, None))
+
+    def __repr__(self):
+        # Shown in place of the array in json schema error messages
+        return "[...]"
+
+
+def _parse_object(*, reader, open_stream):
+    reader.expect("{", msg="Expecting value")
+    value = {}
+
+    if reader.peek() == "}":
+        reader.expect("}", msg="Expecting '}'")
+        return value
+
+    while True:
+        if reader.peek() != '"':
+            raise reader.decode_error(
+                msg="Expecting property name enclosed in double quotes"
+            )
+
+        key = reader.decode()
+        reader.expect(":", msg="Expecting ':' delimiter")
+
+        if reader.peek() == "[":
+            value[key] = _scan_array(reader=reader, open_stream=open_stream)
+        else:
+            value[key] = reader.decode()
+
+        if reader.expect(",}", msg="Expecting ',' delimiter") == "}":
+            return value
+
+
+def _scan_array(*, reader, open_stream):
+    """Checks the items of the array once, without keeping them"""
+    reader.peek()
+    offset = reader.offset
+    length = sum(1 for _ in _iter_array_items(reader=reader))
+    return StreamedJSONArray(
+        open_stream=open_stream, offset=offset, length=length
+    )
+
+
+def _iter_array_items(*, reader):
+    reader.expect("[", msg="Expecting value")
+
+    if reader.peek() == "]":
+        reader.expect("]", msg="Expecting ']'")
+        return
+
+    while True:
+        yield reader.decode()
+
+        if reader.expect(",]", msg="Expecting ',' delimiter") == "]":
+            return
+
+
+class _Reader:
+    """Decodes json values from a buffer that is filled from a stream"""
+
+    def __init__(self, *, stream, digest=None):
+        self._stream = stream
+        self._digest = digest
+        self._text_decoder = getincrementaldecoder("utf-8")()
+        self._json_decoder = JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._at_eof = False
+
+        # The position of the start of the buffer in the document
+        self._buffer_offset = 0
+        self._buffer_chars = 0
+        self._buffer_lineno = 1
+        self._buffer_colno = 1
+
+        self.size = 0
+
+    @property
+    def offset(self):
+        """The byte offset of the current position in the stream"""
+        return self._buffer_offset + len(
+            self._buffer[: self._pos].encode("utf-8")
+        )
+
+    def peek(self):
+        """Moves to the next non-whitespace character and returns it"""
+        while True:
+            match = _NON_WHITESPACE.search(self._buffer, self._pos)
+
+            if match is not None:
+                self._pos = match.start()
+                return self._buffer[self._pos]
+
+            self._pos = len(self._buffer)
+
+            if not self._fill(size=CHUNK_SIZE):
+                return ""
+
+    def expect(self, characters, *, msg):
+        """Consumes the next character, which must be one of characters"""
+        character = self.peek()
+
+        if character == "" or character not in characters:
+            raise self.decode_error(msg=msg)
+
+        self._pos += 1
+        return character
+
+    def decode(self):
+        """Decodes the next value"""
+        self.peek()
+        self._compact()
+
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(
+                    self._buffer, self._pos
+                )
+            except JSONDecodeError as error:
+                if not (
+                    self._is_incomplete(error=error) and self._fill_for_value()
+                ):
+                    raise self.decode_error(
+                        msg=error.msg, pos=error.pos
+                    ) from error
+            else:
+                # A number at the end of the buffer could be incomplete,
+                # "0.5E-" is decoded as 0.5 for instance
+                if (
+                    len(self._buffer) - end > _MAX_INCOMPLETE_TOKEN_LENGTH
+                    or not self._fill_for_value()
+                ):
+                    self._check_value_size(size=end - self._pos)
+                    self._pos = end
+                    return value
+
+    def decode_error(self, *, msg, pos=None):
+        """An error with the position in the document rather than the buffer"""
+        if pos is None:
+            pos = self._pos
+
+        preceding = self._buffer[:pos]
+        last_newline = preceding.rfind("\n")
+
+        lineno = self._buffer_lineno + preceding.count("\n")
+        colno = (
+            pos - last_newline
+            if last_newline != -1
+            else self._buffer_colno + pos
+        )
+
+        error = JSONDecodeError(msg, self._buffer, pos)
+        error.pos = self._buffer_chars + pos
+        error.lineno = lineno
+        error.colno = colno
+        error.args = (
+            f"{msg}: line {lineno} column {colno} (char {error.pos})",
+        )
+
+        return error
+
+    def _is_incomplete(self, *, error):
+        """Could the error be caused by the end of the buffer?"""
+        # A string that was cut off is reported at its opening quote
+        return (
+            len(self._buffer) - error.pos <= _MAX_INCOMPLETE_TOKEN_LENGTH
+            or error.msg == "Unterminated string starting at"
+        )
+
+    def _check_value_size(self, *, size):
+        if size > settings.COMPONENTS_MAXIMUM_JSON_ITEM_SIZE:
+            raise JSONItemTooLargeError(
+                f"An item starting at byte {self.offset} is larger than "
+                f"{settings.COMPONENTS_MAXIMUM_JSON_ITEM_SIZE} characters"
+            )
+
+    def _fill_for_value(self):
+        pending = len(self._buffer) - self._pos
+        self._check_value_size(size=pending)
+
+        # Growing the buffer geometrically means that a large value is
+        # decoded a logarithmic rather than a linear number of times
+        return self._fill(size=max(CHUNK_SIZE, pending))
+
+    def _fill(self, *, size):
+        """Reads more of the stream, returns False at the end of it"""
+        if self._at_eof:
+            return False
+
+        self._compact()
+
+        chunk = self._stream.read(size)
+
+        if chunk:
+            self.size += len(chunk)
+
+            if self._digest is not None:
+                self._digest.update(chunk)
+        else:
+            self._at_eof = True
+
+        self._buffer += self._text_decoder.decode(chunk, final=not chunk)
+
+        return not self._at_eof
+
+    def _compact(self):
+        """Drops the consumed part of the buffer"""
+        consumed = self._buffer[: self._pos]
+
+        if not consumed:
+            return
+
+        newlines = consumed.count("\n")
+
+        if newlines:
+            self._buffer_lineno += newlines
+            self._buffer_colno = len(consumed) - consumed.rfind("\n")
+        else:
+            self._buffer_colno += len(consumed)
+
+        self._buffer_chars += len(consumed)
+        self._buffer_offset += len(consumed.encode("utf-8"))
+
+        self._buffer = self._buffer[self._pos :]
+        self._pos = 0
@@ -9,9 +9,11 @@ import requests
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.utils.deconstruct import deconstructible
-from jsonschema import SchemaError
-from jsonschema import ValidationError as JSONValidationError
-from jsonschema import validate, validators
+from django.utils.functional import cached_property
+from jsonschema import SchemaError, validators
+from jsonschema.exceptions import best_match
+
+from grandchallenge.core.utils.json_streams import StreamedJSONArray
 
 
 @deconstructible
@@ -146,6 +148,11 @@ def get_json_schema_registry():
     return referencing.Registry(retrieve=retrieve)
 
 
+def _is_json_array(checker, instance):
+    # Large arrays of json files are streamed rather than loaded as lists
+    return isinstance(instance, (list, StreamedJSONArray))
+
+
 @deconstructible
 class JSONValidator:
     """Uses jsonschema to validate json fields."""
@@ -157,13 +164,44 @@ class JSONValidator:
         self.registry = get_json_schema_registry()
         super().__init__()
 
+    @cached_property
+    def _validator(self):
+        # The schema is checked once when the validator is compiled,
+        # rather than for every value
+        cls = validators.validator_for(self.schema)
+        cls.check_schema(self.schema)
+        cls = validators.extend(
+            cls,
+            type_checker=cls.TYPE_CHECKER.redefine("array", _is_json_array),
+        )
+        return cls(self.schema, registry=self.registry)
+
+    def _get_error_message(self, *, value):
+        error = best_match(self._validator.iter_errors(value))
+
+        if error is None:
+            return None
+        else:
+            return f"JSON does not fulfill schema: instance {error.message.replace(str(error.instance) + ' ', '')}"
+
     def __call__(self, value):
-        try:
-            validate(value, self.schema, registry=self.registry)
-        except JSONValidationError as e:
-            raise ValidationError(
-                f"JSON does not fulfill schema: instance {e.message.replace(str(e.instance) + ' ', '')}"
-            )
+        error_message = self._get_error_message(value=value)
+
+        if error_message is not None:
+            raise ValidationError(error_message)
+
+    def validate_many(self, values):
+        """Validates the values, reporting the errors for all of them"""
+        errors = []
+
+        for idx, value in enumerate(values):
+            error_message = self._get_error_message(value=value)
+
+            if error_message is not None:
+                errors.append(ValidationError(f"Item {idx}: {error_message}"))
+
+        if errors:
+            raise ValidationError(errors)
 
     def __eq__(self, other):
         return isinstance(other, JSONValidator) and self.schema == other.schema
@@ -1,20 +1,41 @@
 from dataclasses import dataclass
 from functools import reduce
+from hashlib import md5
 from operator import or_
+from uuid import uuid4
 
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
 from django.core.paginator import EmptyPage
 from django.db.models import Q
 from django.http import JsonResponse
-from django.template.loader import render_to_string
+from django.template import RequestContext
+from django.template.loader import get_template
 from django.views.generic import ListView
 
 
+def _total_count_version_key(*, model):
+    return f"datatables:total-count-version:{model._meta.label_lower}"
+
+
+def invalidate_total_counts(*, model):
+    """Invalidates the cached total counts of the tables listing ``model``"""
+    cache.delete(_total_count_version_key(model=model))
+
+
 class PaginatedTableListView(ListView):
     columns = []
     search_fields = []
     default_sort_column = 0
     text_align = "center"
     default_sort_order = "desc"
+    # Seconds to cache the rendered rows for, the objects need a
+    # modified field. None disables the cache.
+    row_cache_timeout = None
+    # Seconds to cache the unfiltered number of objects for, the view
+    # must call invalidate_total_counts when these change. None disables
+    # the cache.
+    total_count_cache_timeout = None
 
     def get_context_data(self, *, object_list=None, **kwargs):
         context = super().get_context_data(object_list=object_list, **kwargs)
@@ -28,21 +49,81 @@ class PaginatedTableListView(ListView):
         )
         return context
 
-    def render_row(self, *, object_, page_context, request):
-        return render_to_string(
-            self.row_template,
-            context={**page_context, "object": object_},
-            request=request,
-        ).split("<split></split>")
+    def get_row_cache_version(self):
+        """Anything other than the object that the rows depend on"""
+        return self.request.user.pk
+
+    def get_row_cache_key(self, *, object_):
+        return (
+            f"datatables:row:{self.row_template}:{object_.pk}:"
+            f"{object_.modified.timestamp()}:{self.get_row_cache_version()}"
+        )
 
     def render_rows(self, *, object_list, request):
-        page_context = self.get_context_data(object_list=object_list)
-        return [
-            self.render_row(
-                object_=o, page_context=page_context, request=request
-            )
-            for o in object_list
-        ]
+        """Renders the cells of each object on a page in a single pass"""
+        if not object_list:
+            return []
+
+        if self.row_cache_timeout is None:
+            cache_keys = [None] * len(object_list)
+            cached_rows = {}
+        else:
+            cache_keys = [
+                self.get_row_cache_key(object_=o) for o in object_list
+            ]
+            cached_rows = cache.get_many(cache_keys)
+
+        # The page context and context processors are only evaluated once
+        template = get_template(self.row_template).template
+        context = RequestContext(
+            request, self.get_context_data(object_list=object_list)
+        )
+        rows = []
+        rendered_rows = {}
+
+        with context.bind_template(template):
+            for object_, cache_key in zip(
+                object_list, cache_keys, strict=True
+            ):
+                if cache_key in cached_rows:
+                    rows.append(cached_rows[cache_key])
+                    continue
+
+                with context.push(object=object_):
+                    row = template.render(context).split("<split></split>")
+
+                rows.append(row)
+
+                if cache_key is not None:
+                    rendered_rows[cache_key] = row
+
+        if rendered_rows:
+            cache.set_many(rendered_rows, timeout=self.row_cache_timeout)
+
+        return rows
+
+    def get_total_count(self):
+        """The number of objects in the table before searching"""
+        if self.total_count_cache_timeout is None:
+            return self.object_list.count()
+
+        try:
+            query = str(self.object_list.query)
+        except EmptyResultSet:
+            return 0
+
+        version = cache.get_or_set(
+            _total_count_version_key(model=self.object_list.model),
+            lambda: uuid4().hex,
+            timeout=None,
+        )
+        query_hash = md5(query.encode("utf-8"), usedforsecurity=False)
+
+        return cache.get_or_set(
+            f"datatables:total-count:{version}:{query_hash.hexdigest()}",
+            self.object_list.count,
+            timeout=self.total_count_cache_timeout,
+        )
 
     def get_order_by(self, *, column_index, direction):
         try:
@@ -72,6 +153,11 @@ class PaginatedTableListView(ListView):
         )
         data = self.filter_queryset(self.object_list, search, order_by)
         paginator = self.get_paginator(queryset=data, per_page=page_size)
+        records_total = self.get_total_count()
+
+        if not search:
+            # Only searching changes the number of objects
+            paginator.count = records_total
 
         try:
             objects = paginator.page(page)
@@ -82,7 +168,7 @@ class PaginatedTableListView(ListView):
         return JsonResponse(
             {
                 "draw": draw,
-                "recordsTotal": self.object_list.count(),
+                "recordsTotal": records_total,
                 "recordsFiltered": paginator.count,
                 "data": self.render_rows(object_list=objects, request=request),
             }
@@ -88,6 +88,9 @@ class DocPage(models.Model):
 
         super().save(*args, **kwargs)
 
+        # Render the content as the page does, so that it is cached
+        md2html(self.content)
+
         DocPage.objects.filter(pk=self.pk).update(
             search_vector=SearchVector("title", "content_plain")
         )
@@ -0,0 +1,149 @@
+import csv
+import io
+import json
+
+from django.db.models import Prefetch
+
+from grandchallenge.components.models import ComponentInterfaceValue
+from grandchallenge.evaluation.models import Evaluation, Submission
+
+EXPORT_CHUNK_SIZE = 1000
+
+EXPORT_FIELDS = (
+    "pk",
+    "created",
+    "phase",
+    "submission",
+    "submission_comment",
+    "submission_file",
+    "supplementary_file",
+    "supplementary_url",
+    "method",
+    "creator",
+    "published",
+    "metrics",
+    "rank",
+    "rank_score",
+    "rank_per_metric",
+)
+
+
+def get_evaluations_for_export(
+    *, challenge, phase=None, created_after=None, created_before=None
+):
+    """The evaluations of a challenge, optionally filtered, oldest first"""
+    evaluations = Evaluation.objects.filter(
+        submission__phase__challenge=challenge
+    )
+
+    if phase is not None:
+        evaluations = evaluations.filter(submission__phase=phase)
+
+    if created_after is not None:
+        evaluations = evaluations.filter(created__gte=created_after)
+
+    if created_before is not None:
+        evaluations = evaluations.filter(created__lt=created_before)
+
+    return (
+        evaluations.select_related("submission__phase", "submission__creator")
+        .prefetch_related(
+            Prefetch(
+                "outputs",
+                queryset=ComponentInterfaceValue.objects.filter(
+                    interface__slug="metrics-json-file"
+                ),
+                to_attr="metrics_outputs",
+            )
+        )
+        .order_by("created", "pk")
+    )
+
+
+def iter_evaluation_records(evaluations, *, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yields a flat record for each evaluation
+
+    The evaluations are read with a server side cursor in chunks, the
+    metrics are prefetched per chunk.
+    """
+    file_storage = Submission._meta.get_field("predictions_file").storage
+
+    for evaluation in evaluations.iterator(chunk_size=chunk_size):
+        submission = evaluation.submission
+
+        yield {
+            "pk": str(evaluation.pk),
+            "created": evaluation.created.isoformat(),
+            "phase": submission.phase.slug,
+            "submission": str(submission.pk),
+            "submission_comment": submission.comment,
+            "submission_file": (
+                file_storage.url(submission.predictions_file.name)
+                if submission.predictions_file
+                else None
+            ),
+            "supplementary_file": (
+                file_storage.url(submission.supplementary_file.name)
+                if submission.supplementary_file
+                else None
+            ),
+            "supplementary_url": submission.supplementary_url,
+            "method": str(evaluation.method_id),
+            "creator": (
+                submission.creator.username if submission.creator else None
+            ),
+            "published": evaluation.published,
+            "metrics": (
+                evaluation.metrics_outputs[0].value
+                if evaluation.metrics_outputs
+                else None
+            ),
+            "rank": evaluation.rank,
+            "rank_score": evaluation.rank_score,
+            "rank_per_metric": evaluation.rank_per_metric,
+        }
+
+
+def render_ndjson(records):
+    for record in records:
+        yield json.dumps(record) + "\n"
+
+
+def render_csv(records):
+    """Renders the records as CSV, nested values are JSON encoded"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+
+    writer.writeheader()
+
+    for record in records:
+        writer.writerow(
+            {
+                key: (
+                    json.dumps(value)
+                    if isinstance(value, dict | list)
+                    else value
+                )
+                for key, value in record.items()
+            }
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # Only the header is left if there were no records
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+EXPORT_RENDERERS = {
+    "ndjson": (render_ndjson, "application/x-ndjson"),
+    "csv": (render_csv, "text/csv"),
+}
+
+
+def export_evaluations(*, evaluations, export_format):
+    """Yields the chunks of text of the export"""
+    renderer, _ = EXPORT_RENDERERS[export_format]
+    return renderer(iter_evaluation_records(evaluations))
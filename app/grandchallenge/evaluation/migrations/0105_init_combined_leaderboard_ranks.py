@@ -0,0 +1,92 @@
+import numpy as np
+from django.db import migrations
+from django.utils import timezone
+
+from grandchallenge.evaluation.utils import combine_phase_ranks
+
+COMBINATION_METHODS = {
+    "MEAN": lambda x: np.mean(x, axis=1),
+    "MEDIAN": lambda x: np.median(x, axis=1),
+    "SUM": lambda x: np.sum(x, axis=1),
+}
+
+
+def init_combined_leaderboard_ranks(apps, schema_editor):
+    CombinedLeaderboard = apps.get_model(  # noqa: N806
+        "evaluation", "CombinedLeaderboard"
+    )
+    CombinedLeaderboardRank = apps.get_model(  # noqa: N806
+        "evaluation", "CombinedLeaderboardRank"
+    )
+    Evaluation = apps.get_model("evaluation", "Evaluation")  # noqa: N806
+    Phase = apps.get_model("evaluation", "Phase")  # noqa: N806
+    PhaseUserRank = apps.get_model("evaluation", "PhaseUserRank")  # noqa: N806
+
+    for phase in Phase.objects.filter(
+        combinedleaderboard__isnull=False
+    ).distinct():
+        PhaseUserRank.objects.bulk_create(
+            [
+                PhaseUserRank(
+                    phase=phase,
+                    user_id=user_id,
+                    evaluation_id=evaluation_id,
+                    rank=rank,
+                    created=created,
+                )
+                for user_id, evaluation_id, rank, created in Evaluation.objects.filter(
+                    submission__phase=phase,
+                    submission__creator__isnull=False,
+                    published=True,
+                    status=4,  # Evaluation.SUCCESS
+                    rank__gt=0,
+                )
+                .order_by("submission__creator", "rank", "-created")
+                .distinct("submission__creator")
+                .values_list("submission__creator", "pk", "rank", "created")
+            ],
+            batch_size=1000,
+        )
+
+    for leaderboard in CombinedLeaderboard.objects.all():
+        combined_ranks = combine_phase_ranks(
+            phase_ranks=leaderboard.phases.filter(public=True).values_list(
+                "pk",
+                "user_ranks__user",
+                "user_ranks__evaluation",
+                "user_ranks__rank",
+                "user_ranks__created",
+            ),
+            combination_method=COMBINATION_METHODS[
+                leaderboard.combination_method
+            ],
+        )
+        CombinedLeaderboardRank.objects.bulk_create(
+            [
+                CombinedLeaderboardRank(
+                    combined_leaderboard=leaderboard,
+                    user_id=combined_rank.user,
+                    rank=combined_rank.rank,
+                    combined_rank=combined_rank.combined_rank,
+                    created=combined_rank.created,
+                    evaluations=combined_rank.evaluations,
+                )
+                for combined_rank in combined_ranks
+            ],
+            batch_size=1000,
+        )
+        leaderboard.combined_ranks_created = timezone.now()
+        leaderboard.save(update_fields=["combined_ranks_created"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        (
+            "evaluation",
+            "0104_combinedleaderboard_combined_ranks_created_and_more",
+        ),
+    ]
+
+    operations = [
+        migrations.RunPython(init_combined_leaderboard_ranks, elidable=True),
+    ]
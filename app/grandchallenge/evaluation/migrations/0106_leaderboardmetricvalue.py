@@ -0,0 +1,62 @@
+# Generated by Django 5.2.9 on 2026-10-17 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("evaluation", "0105_init_combined_leaderboard_ranks"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeaderboardMetricValue",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("path", models.CharField(max_length=255)),
+                ("value", models.FloatField(null=True)),
+                ("error", models.FloatField(null=True)),
+                ("rank", models.PositiveIntegerField(null=True)),
+                (
+                    "evaluation",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="leaderboard_metric_values",
+                        to="evaluation.evaluation",
+                    ),
+                ),
+                (
+                    "phase",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="leaderboard_metric_values",
+                        to="evaluation.phase",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["phase", "path", "value"],
+                        name="evaluation__phase_i_23d918_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("evaluation", "path"),
+                        name="unique_leaderboard_metric_value",
+                    )
+                ],
+            },
+        ),
+    ]
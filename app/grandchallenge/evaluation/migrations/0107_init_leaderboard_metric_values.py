@@ -0,0 +1,72 @@
+from django.db import migrations
+from django.db.models import Prefetch
+
+from grandchallenge.evaluation.utils import get_leaderboard_metric_values
+
+
+def init_leaderboard_metric_values(apps, schema_editor):
+    ComponentInterfaceValue = apps.get_model(  # noqa: N806
+        "components", "ComponentInterfaceValue"
+    )
+    Evaluation = apps.get_model("evaluation", "Evaluation")  # noqa: N806
+    LeaderboardMetricValue = apps.get_model(  # noqa: N806
+        "evaluation", "LeaderboardMetricValue"
+    )
+    Phase = apps.get_model("evaluation", "Phase")  # noqa: N806
+
+    for phase in Phase.objects.iterator():
+        columns = (
+            (phase.score_jsonpath, phase.score_error_jsonpath),
+            *(
+                (col["path"], col.get("error_path", ""))
+                for col in phase.extra_results_columns
+            ),
+        )
+        evaluations = Evaluation.objects.filter(
+            submission__phase=phase,
+            published=True,
+            status=4,  # Evaluation.SUCCESS
+            rank__gt=0,
+        ).prefetch_related(
+            Prefetch(
+                "outputs",
+                queryset=ComponentInterfaceValue.objects.filter(
+                    interface__slug="metrics-json-file"
+                ),
+                to_attr="metrics_outputs",
+            )
+        )
+
+        LeaderboardMetricValue.objects.bulk_create(
+            [
+                LeaderboardMetricValue(
+                    phase=phase,
+                    evaluation=evaluation,
+                    path=path,
+                    value=values.value,
+                    error=values.error,
+                    rank=values.rank,
+                )
+                for evaluation in evaluations
+                for path, values in get_leaderboard_metric_values(
+                    metrics_json_file=(
+                        evaluation.metrics_outputs[0].value
+                        if evaluation.metrics_outputs
+                        else None
+                    ),
+                    rank_per_metric=evaluation.rank_per_metric,
+                    columns=columns,
+                ).items()
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("evaluation", "0106_leaderboardmetricvalue"),
+    ]
+
+    operations = [
+        migrations.RunPython(init_leaderboard_metric_values, elidable=True),
+    ]
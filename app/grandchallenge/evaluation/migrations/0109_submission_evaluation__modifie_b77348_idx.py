@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-17 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("evaluation", "0108_evaluation_civ_set_fingerprint"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="submission",
+            index=models.Index(
+                fields=["modified"], name="evaluation__modifie_b77348_idx"
+            ),
+        ),
+    ]
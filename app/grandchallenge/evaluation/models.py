@@ -1,18 +1,17 @@
 import logging
 from datetime import timedelta
-from statistics import mean, median
+from uuid import UUID
 
+import numpy as np
 from actstream.actions import follow, is_following
 from django.conf import settings
 from django.contrib.auth.models import Group
 from django.contrib.sites.models import Site
-from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.core.mail import mail_managers
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.db.models import Count, Q
-from django.db.models.functions import Coalesce
 from django.db.transaction import on_commit
 from django.utils import timezone
 from django.utils.functional import cached_property
@@ -32,6 +31,7 @@ from grandchallenge.archives.models import Archive
 from grandchallenge.challenges.models import Challenge
 from grandchallenge.components.models import (
     CIVForObjectMixin,
+    CIVSetFingerprintMixin,
     ComponentImage,
     ComponentInterface,
     ComponentJob,
@@ -78,6 +78,8 @@ from grandchallenge.evaluation.utils import (
     Metric,
     StatusChoices,
     SubmissionKindChoices,
+    combine_phase_ranks,
+    get_leaderboard_metric_values,
 )
 from grandchallenge.forge.models import ForgePhase
 from grandchallenge.hanging_protocols.models import HangingProtocolMixin
@@ -193,32 +195,20 @@ def get_valid_jobs_for_interfaces_and_archive_items(
 
     jobs_per_interface = {}
     for interface in algorithm_interfaces:
-        jobs_per_interface[interface] = []
-        jobs_for_interface = (
-            jobs.filter(
+        # subset to jobs whose input set exactly matches
+        # one of the valid archive items' value sets
+        archive_item_fingerprints = {
+            item.civ_set_fingerprint
+            for item in valid_archive_items_per_interface[interface]
+        } - {""}
+        jobs_per_interface[interface] = [
+            *jobs.filter(
                 algorithm_interface=interface,
-                inputs__archive_items__in=valid_archive_items_per_interface[
-                    interface
-                ],
+                civ_set_fingerprint__in=archive_item_fingerprints,
             )
-            .distinct()
             .prefetch_related("inputs")
             .select_related("algorithm_image__algorithm")
-        )
-
-        archive_item_value_sets = {
-            frozenset(value.pk for value in item.values.all())
-            for item in valid_archive_items_per_interface[interface]
-        }
-
-        for job in jobs_for_interface:
-            # subset to jobs whose input set exactly matches
-            # one of the valid archive items' value sets
-            if (
-                frozenset(inpt.pk for inpt in job.inputs.all())
-                in archive_item_value_sets
-            ):
-                jobs_per_interface[interface].append(job)
+        ]
 
     return jobs_per_interface
 
@@ -762,6 +752,11 @@ class Phase(FieldChangeMixin, HangingProtocolMixin, UUIDModel):
                 ).apply_async
             )
 
+            # Only public phases are combined, so the combined ranks
+            # change when a phase is published or hidden
+            for leaderboard in self.combinedleaderboard_set.all():
+                leaderboard.schedule_combined_ranks_update()
+
         if (
             self.give_algorithm_editors_job_view_permissions
             and self.has_changed("give_algorithm_editors_job_view_permissions")
@@ -893,20 +888,131 @@ class Phase(FieldChangeMixin, HangingProtocolMixin, UUIDModel):
 
     @property
     def scoring_method(self):
+        """
+        Aggregates a 2D array of ranks per metric to a rank score per row
+        """
         if self.scoring_method_choice == self.ABSOLUTE:
 
             def scoring_method(x):
-                return list(x)[0]
+                return x[:, 0]
 
         elif self.scoring_method_choice == self.MEAN:
-            scoring_method = mean
+
+            def scoring_method(x):
+                return np.mean(x, axis=1)
+
         elif self.scoring_method_choice == self.MEDIAN:
-            scoring_method = median
+
+            def scoring_method(x):
+                return np.median(x, axis=1)
+
         else:
             raise NotImplementedError
 
         return scoring_method
 
+    def update_user_ranks(self):
+        """Store the best rank of each user for the combined leaderboards"""
+        user_ranks = [
+            PhaseUserRank(
+                phase=self,
+                user_id=user_id,
+                evaluation_id=evaluation_id,
+                rank=rank,
+                created=created,
+            )
+            for user_id, evaluation_id, rank, created in Evaluation.objects.filter(
+                submission__phase=self,
+                submission__creator__isnull=False,
+                published=True,
+                status=Evaluation.SUCCESS,
+                rank__gt=0,
+            )
+            .order_by("submission__creator", "rank", "-created")
+            .distinct("submission__creator")
+            .values_list("submission__creator", "pk", "rank", "created")
+        ]
+
+        PhaseUserRank.objects.bulk_create(
+            user_ranks,
+            update_conflicts=True,
+            unique_fields=["phase", "user"],
+            update_fields=["evaluation", "rank", "created"],
+            batch_size=1000,
+        )
+        # Nothing refers to these rows, so skip the collector
+        PhaseUserRank.objects.filter(phase=self).exclude(
+            user__in=[user_rank.user_id for user_rank in user_ranks]
+        )._raw_delete(using=PhaseUserRank.objects.db)
+
+    @property
+    def leaderboard_metric_columns(self):
+        """The (path, error path) of each metric column of the leaderboard"""
+        return (
+            (self.score_jsonpath, self.score_error_jsonpath),
+            *(
+                (col["path"], col.get("error_path", ""))
+                for col in self.extra_results_columns
+            ),
+        )
+
+    def update_leaderboard_metric_values(self, *, evaluations):
+        """
+        Store the metric values of the evaluations shown on the leaderboard
+
+        The evaluations must have their ranks set, only the values that
+        changed are written.
+        """
+        metric_values = {
+            (evaluation.pk, path): values
+            for evaluation in evaluations
+            if evaluation.rank > 0
+            for path, values in get_leaderboard_metric_values(
+                metrics_json_file=evaluation.metrics_json_file,
+                rank_per_metric=evaluation.rank_per_metric,
+                columns=self.leaderboard_metric_columns,
+            ).items()
+        }
+
+        stale_pks = []
+
+        for (
+            pk,
+            evaluation_id,
+            path,
+            *values,
+        ) in self.leaderboard_metric_values.values_list(
+            "pk", "evaluation", "path", "value", "error", "rank"
+        ):
+            key = (evaluation_id, path)
+
+            if key not in metric_values:
+                stale_pks.append(pk)
+            elif metric_values[key] == tuple(values):
+                del metric_values[key]
+
+        # Nothing refers to these rows, so skip the collector
+        LeaderboardMetricValue.objects.filter(pk__in=stale_pks)._raw_delete(
+            using=LeaderboardMetricValue.objects.db
+        )
+        LeaderboardMetricValue.objects.bulk_create(
+            [
+                LeaderboardMetricValue(
+                    phase=self,
+                    evaluation_id=evaluation_id,
+                    path=path,
+                    value=values.value,
+                    error=values.error,
+                    rank=values.rank,
+                )
+                for (evaluation_id, path), values in metric_values.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["evaluation", "path"],
+            update_fields=["value", "error", "rank"],
+            batch_size=1000,
+        )
+
     @property
     def algorithm_interfaces_locked(self):
         if self.parent or self.children.exists():
@@ -1601,6 +1707,7 @@ class Submission(FieldChangeMixin, UUIDModel):
         )
         indexes = [
             models.Index(fields=["created"]),
+            models.Index(fields=["modified"]),
         ]
 
     @cached_property
@@ -1875,7 +1982,6 @@ class EvaluationManager(ComponentJobManager):
         requires_gpu_type,
         requires_memory_gb,
     ):
-        existing_civs = self.retrieve_existing_civs(civ_data_objects=inputs)
         unique_kwargs = {
             "submission": submission,
             "method": method,
@@ -1889,51 +1995,20 @@ class EvaluationManager(ComponentJobManager):
         else:
             unique_kwargs["ground_truth__isnull"] = True
 
-        input_interface_count = len(inputs)
-        configured_input_interface_slugs = (
-            submission.phase.additional_evaluation_inputs.values_list(
-                "slug", flat=True
-            )
-        )
-
-        # annotate the number of inputs and the number of inputs that match
-        # the existing civs and filter on both counts so as to not include evaluations
-        # with partially overlapping inputs
-        # or evaluations with more inputs than the existing civs
-        existing_evaluations = (
-            Evaluation.objects.filter(**unique_kwargs)
-            .annotate(
-                additional_input_count=Coalesce(
-                    Count(
-                        "inputs",
-                        filter=(
-                            Q(
-                                inputs__interface__slug__in=configured_input_interface_slugs
-                            )
-                        ),
-                        distinct=True,
-                    ),
-                    0,
-                ),
-                relevant_additional_input_count=Coalesce(
-                    Count(
-                        "inputs",
-                        filter=(Q(inputs__in=existing_civs)),
-                        distinct=True,
-                    ),
-                    0,
-                ),
-            )
-            .filter(
-                additional_input_count=input_interface_count,
-                relevant_additional_input_count=input_interface_count,
-            )
+        # match on the fingerprint of the additional inputs so as to not
+        # include evaluations with partially overlapping inputs or with
+        # more inputs
+        existing_evaluations = Evaluation.objects.filter(
+            **unique_kwargs
+        ).filter_by_civ_set(
+            civ_data_objects=inputs,
+            input_interfaces=submission.phase.additional_evaluation_inputs.all(),
         )
 
         return existing_evaluations
 
 
-class Evaluation(CIVForObjectMixin, ComponentJob):
+class Evaluation(CIVForObjectMixin, CIVSetFingerprintMixin, ComponentJob):
     """Stores information about a evaluation for a given submission."""
 
     submission = models.ForeignKey("Submission", on_delete=models.PROTECT)
@@ -1973,6 +2048,7 @@ class Evaluation(CIVForObjectMixin, ComponentJob):
             *ComponentJob.Meta.indexes,
             models.Index(fields=["created"]),
             models.Index(fields=["submission", "published", "status", "rank"]),
+            models.Index(fields=["submission", "civ_set_fingerprint"]),
         ]
 
     def save(self, *args, **kwargs):
@@ -1985,10 +2061,24 @@ class Evaluation(CIVForObjectMixin, ComponentJob):
 
         self.assign_permissions()
 
-        on_commit(
-            calculate_ranks.signature(
-                kwargs={"phase_pk": self.submission.phase.pk}
-            ).apply_async
+        if self.may_change_ranks:
+            on_commit(
+                calculate_ranks.signature(
+                    kwargs={"phase_pk": self.submission.phase.pk}
+                ).apply_async
+            )
+
+    @property
+    def may_change_ranks(self):
+        """
+        Only successful evaluations are ranked, so the leaderboard
+        only needs updating if this evaluation is, or was, successful
+        or if its publication status changed.
+        """
+        return (
+            self.status == self.SUCCESS
+            or self.initial_value("status") == self.SUCCESS
+            or self.has_changed("published")
         )
 
     @property
@@ -2140,6 +2230,12 @@ class Evaluation(CIVForObjectMixin, ComponentJob):
     def get_civ_for_interface(self, interface):
         return self.inputs.get(interface=interface)
 
+    def get_fingerprinted_civs(self):
+        # Only the additional inputs, not the predictions
+        return self.inputs.filter(
+            interface__in=self.submission.phase.additional_evaluation_inputs.all()
+        )
+
     def validate_civ_data_objects_and_execute_linked_task(
         self, *, civ_data_objects, user, linked_task=None
     ):
@@ -2172,6 +2268,11 @@ class Evaluation(CIVForObjectMixin, ComponentJob):
             if output.interface.slug == "metrics-json-file":
                 return output.value
 
+    @cached_property
+    def leaderboard_metrics(self):
+        """The leaderboard metric values of this evaluation by path"""
+        return {m.path: m for m in self.leaderboard_metric_values.all()}
+
     @cached_property
     def invalid_metrics(self):
         return {
@@ -2251,6 +2352,62 @@ class EvaluationGroupObjectPermission(GroupObjectPermissionBase):
     content_object = models.ForeignKey(Evaluation, on_delete=models.CASCADE)
 
 
+class PhaseUserRank(models.Model):
+    """The best rank of a user on a phase, used by the combined leaderboards"""
+
+    phase = models.ForeignKey(
+        Phase, on_delete=models.CASCADE, related_name="user_ranks"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    evaluation = models.ForeignKey(
+        Evaluation, on_delete=models.CASCADE, related_name="+"
+    )
+    rank = models.PositiveIntegerField()
+    created = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["phase", "user"], name="unique_phase_user_rank"
+            )
+        ]
+
+
+class LeaderboardMetricValue(models.Model):
+    """
+    A metric value of an evaluation shown on the leaderboard
+
+    These are extracted from the metrics json file when the ranks are
+    calculated so that the leaderboard can be sorted by each metric.
+    """
+
+    phase = models.ForeignKey(
+        Phase,
+        on_delete=models.CASCADE,
+        related_name="leaderboard_metric_values",
+    )
+    evaluation = models.ForeignKey(
+        Evaluation,
+        on_delete=models.CASCADE,
+        related_name="leaderboard_metric_values",
+    )
+    path = models.CharField(max_length=255)
+    value = models.FloatField(null=True)
+    error = models.FloatField(null=True)
+    rank = models.PositiveIntegerField(null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["evaluation", "path"],
+                name="unique_leaderboard_metric_value",
+            )
+        ]
+        indexes = [models.Index(fields=["phase", "path", "value"])]
+
+
 class CombinedLeaderboard(TitleSlugDescriptionModel, UUIDModel):
     class CombinationMethodChoices(models.TextChoices):
         MEAN = "MEAN", "Mean"
@@ -2266,6 +2423,7 @@ class CombinedLeaderboard(TitleSlugDescriptionModel, UUIDModel):
         choices=CombinationMethodChoices.choices,
         default=CombinationMethodChoices.MEAN,
     )
+    combined_ranks_created = models.DateTimeField(null=True, editable=False)
 
     class Meta:
         unique_together = (("challenge", "slug"),)
@@ -2276,145 +2434,68 @@ class CombinedLeaderboard(TitleSlugDescriptionModel, UUIDModel):
 
     @property
     def concrete_combination_method(self):
+        """
+        Aggregates a 2D array of ranks per phase to a combined rank per row
+        """
         if self.combination_method == self.CombinationMethodChoices.MEAN:
-            return mean
+
+            def combination_method(x):
+                return np.mean(x, axis=1)
+
         elif self.combination_method == self.CombinationMethodChoices.MEDIAN:
-            return median
-        elif self.combination_method == self.CombinationMethodChoices.SUM:
-            return sum
-        else:
-            raise NotImplementedError
 
-    @cached_property
-    def _combined_ranks_object(self):
-        result = cache.get(self.combined_ranks_cache_key)
+            def combination_method(x):
+                return np.median(x, axis=1)
 
-        if (
-            result is None
-            or result["phases"] != {phase.pk for phase in self.public_phases}
-            or result["combination_method"] != self.combination_method
-        ):
-            self.schedule_combined_ranks_update()
-            return None
-        else:
-            return result
+        elif self.combination_method == self.CombinationMethodChoices.SUM:
+
+            def combination_method(x):
+                return np.sum(x, axis=1)
 
-    @property
-    def combined_ranks(self):
-        combined_ranks = self._combined_ranks_object
-        if combined_ranks is not None:
-            return combined_ranks["results"]
         else:
-            return []
+            raise NotImplementedError
 
-    @property
-    def combined_ranks_users(self):
-        return [cr["user"] for cr in self.combined_ranks]
+        return combination_method
 
     @property
-    def combined_ranks_created(self):
-        combined_ranks = self._combined_ranks_object
-        if combined_ranks is not None:
-            return combined_ranks["created"]
-        else:
-            return None
+    def combined_ranks(self):
+        return self.ranks.select_related("user").order_by("rank", "created")
 
-    @property
-    def users_best_evaluation_per_phase(self):
-        evaluations = Evaluation.objects.filter(
+    def update_combined_ranks(self):
+        combined_ranks = combine_phase_ranks(
             # Note, only use public phases here to prevent leaking of
             # evaluations for hidden phases
-            submission__phase__in=self.public_phases,
-            published=True,
-            status=Evaluation.SUCCESS,
-            rank__gt=0,
-        ).values(
-            "submission__creator__username",
-            "submission__phase__pk",
-            "pk",
-            "created",
-            "rank",
+            phase_ranks=self.public_phases.values_list(
+                "pk",
+                "user_ranks__user",
+                "user_ranks__evaluation",
+                "user_ranks__rank",
+                "user_ranks__created",
+            ),
+            combination_method=self.concrete_combination_method,
         )
 
-        users_best_evaluation_per_phase = {}
-
-        for evaluation in evaluations.iterator():
-            phase = evaluation["submission__phase__pk"]
-            user = evaluation["submission__creator__username"]
-
-            if user not in users_best_evaluation_per_phase:
-                users_best_evaluation_per_phase[user] = {}
-
-            if (
-                phase not in users_best_evaluation_per_phase[user]
-                or evaluation["rank"]
-                < users_best_evaluation_per_phase[user][phase]["rank"]
-            ):
-                users_best_evaluation_per_phase[user][phase] = {
-                    "pk": evaluation["pk"],
-                    "created": evaluation["created"],
-                    "rank": evaluation["rank"],
-                }
-
-        return users_best_evaluation_per_phase
-
-    @property
-    def combined_ranks_cache_key(self):
-        return f"{self._meta.app_label}.{self._meta.model_name}.combined_ranks.{self.pk}"
-
-    def update_combined_ranks_cache(self):
-        combined_ranks = []
-        num_phases = self.public_phases.count()
-
-        now = timezone.now()
-        for user, evaluations in self.users_best_evaluation_per_phase.items():
-            if len(evaluations) == num_phases:  # Exclude missing data
-                combined_ranks.append(
-                    {
-                        "user": user,
-                        "combined_rank": self.concrete_combination_method(
-                            evaluation["rank"]
-                            for evaluation in evaluations.values()
-                        ),
-                        "created": max(
-                            evaluation["created"]
-                            for evaluation in evaluations.values()
-                        ),
-                        "evaluations": {
-                            phase: {
-                                "pk": evaluation["pk"],
-                                "rank": evaluation["rank"],
-                            }
-                            for phase, evaluation in evaluations.items()
-                        },
-                    }
+        # Nothing refers to these rows, so skip the collector
+        self.ranks.all()._raw_delete(using=CombinedLeaderboardRank.objects.db)
+        CombinedLeaderboardRank.objects.bulk_create(
+            [
+                CombinedLeaderboardRank(
+                    combined_leaderboard=self,
+                    user_id=combined_rank.user,
+                    rank=combined_rank.rank,
+                    combined_rank=combined_rank.combined_rank,
+                    created=combined_rank.created,
+                    evaluations=combined_rank.evaluations,
                 )
+                for combined_rank in combined_ranks
+            ],
+            batch_size=1000,
+        )
 
-        self._rank_combined_rank_scores(combined_ranks)
-
-        cache_object = {
-            "phases": {phase.pk for phase in self.public_phases},
-            "combination_method": self.combination_method,
-            "created": now,
-            "results": combined_ranks,
-        }
-
-        cache.set(self.combined_ranks_cache_key, cache_object, timeout=None)
-
-    @staticmethod
-    def _rank_combined_rank_scores(combined_ranks):
-        """In-place addition of a rank based on the combined rank"""
-        combined_ranks.sort(key=lambda x: x["combined_rank"])
-        current_score = current_rank = None
-
-        for idx, score in enumerate(
-            cr["combined_rank"] for cr in combined_ranks
-        ):
-            if score != current_score:
-                current_score = score
-                current_rank = idx + 1
-
-            combined_ranks[idx]["rank"] = current_rank
+        self.combined_ranks_created = timezone.now()
+        CombinedLeaderboard.objects.filter(pk=self.pk).update(
+            combined_ranks_created=self.combined_ranks_created
+        )
 
     def schedule_combined_ranks_update(self):
         on_commit(
@@ -2436,9 +2517,35 @@ class CombinedLeaderboard(TitleSlugDescriptionModel, UUIDModel):
             },
         )
 
-    def delete(self, *args, **kwargs):
-        cache.delete(self.combined_ranks_cache_key)
-        return super().delete(*args, **kwargs)
+
+class CombinedLeaderboardRank(models.Model):
+    combined_leaderboard = models.ForeignKey(
+        CombinedLeaderboard, on_delete=models.CASCADE, related_name="ranks"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    rank = models.PositiveIntegerField()
+    combined_rank = models.FloatField()
+    created = models.DateTimeField()
+    # The best evaluation of the user per phase, {phase_pk: {pk, rank}}
+    evaluations = models.JSONField(default=dict)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["combined_leaderboard", "user"],
+                name="unique_combined_leaderboard_user_rank",
+            )
+        ]
+        indexes = [models.Index(fields=["combined_leaderboard", "rank"])]
+
+    @property
+    def evaluations_by_phase(self):
+        return {
+            UUID(phase_pk): evaluation
+            for phase_pk, evaluation in self.evaluations.items()
+        }
 
 
 class CombinedLeaderboardPhase(models.Model):
@@ -9,11 +9,12 @@ from rest_framework.exceptions import ValidationError as DRFValidationError
 from rest_framework.fields import (
     CharField,
     ChoiceField,
+    DateTimeField,
     JSONField,
     SerializerMethodField,
 )
-from rest_framework.relations import HyperlinkedRelatedField
-from rest_framework.serializers import ModelSerializer
+from rest_framework.relations import HyperlinkedRelatedField, SlugRelatedField
+from rest_framework.serializers import ModelSerializer, Serializer
 
 from grandchallenge.algorithms.serializers import (
     AlgorithmImageSerializer,
@@ -28,6 +29,7 @@ from grandchallenge.components.serializers import (
     ComponentInterfaceValueSerializer,
 )
 from grandchallenge.core.drf_fields import ISODurationField
+from grandchallenge.evaluation.exports import EXPORT_RENDERERS
 from grandchallenge.evaluation.models import Evaluation, Phase, Submission
 from grandchallenge.evaluation.templatetags.evaluation_extras import (
     get_jsonpath,
@@ -301,3 +303,26 @@ class ExternalEvaluationUpdateSerializer(ModelSerializer):
             **extra_kwargs,
         )
         return super().update(instance, validated_data)
+
+
+class EvaluationExportParametersSerializer(Serializer):
+    challenge = SlugRelatedField(
+        slug_field="short_name", queryset=Challenge.objects.all()
+    )
+    phase = CharField(required=False)
+    created_after = DateTimeField(required=False)
+    created_before = DateTimeField(required=False)
+    output_format = ChoiceField(
+        choices=sorted(EXPORT_RENDERERS), default="ndjson"
+    )
+
+    def validate(self, attrs):
+        if "phase" in attrs:
+            try:
+                attrs["phase"] = attrs["challenge"].phase_set.get(
+                    slug=attrs["phase"]
+                )
+            except Phase.DoesNotExist:
+                raise DRFValidationError({"phase": "Phase not found"})
+
+        return attrs
@@ -1,15 +1,21 @@
-from django.db.models.signals import m2m_changed
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
+from grandchallenge.components.models import (
+    update_civ_set_fingerprints_on_m2m_change,
+)
+from grandchallenge.datatables.views import invalidate_total_counts
 from grandchallenge.evaluation.models import (
     CombinedLeaderboard,
     CombinedLeaderboardPhase,
+    Evaluation,
+    Phase,
 )
 
 
 @receiver(m2m_changed, sender=CombinedLeaderboardPhase)
 def handle_combined_leaderboard_phase_change(
-    sender, instance, action, reverse, **_
+    sender, instance, action, reverse, pk_set, **_
 ):
     if action not in ["post_add", "pre_remove", "pre_clear"]:
         # nothing to do for the other actions
@@ -19,8 +25,35 @@ def handle_combined_leaderboard_phase_change(
         leaderboards = CombinedLeaderboard.objects.filter(
             phases__pk=instance.pk
         )
+        phases = [instance]
     else:
         leaderboards = [instance]
+        phases = Phase.objects.filter(pk__in=pk_set or [])
+
+    if action == "post_add":
+        # The ranks of phases are only stored whilst they are part of
+        # a combined leaderboard, so may be missing or out of date
+        for phase in phases:
+            phase.update_user_ranks()
 
     for leaderboard in leaderboards:
         leaderboard.schedule_combined_ranks_update()
+
+
+@receiver(post_delete, sender=Evaluation)
+@receiver(post_save, sender=Evaluation)
+def invalidate_evaluation_table_counts(**_):
+    invalidate_total_counts(model=Evaluation)
+
+
+@receiver(m2m_changed, sender=Evaluation.inputs.through)
+def update_evaluation_civ_set_fingerprint(
+    *, instance, action, reverse, model, pk_set, **_
+):
+    update_civ_set_fingerprints_on_m2m_change(
+        instance=instance,
+        action=action,
+        reverse=reverse,
+        model=model,
+        pk_set=pk_set,
+    )
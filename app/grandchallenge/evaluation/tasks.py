@@ -24,7 +24,12 @@ from grandchallenge.core.celery import (
 from grandchallenge.core.exceptions import LockNotAcquiredException
 from grandchallenge.core.utils.query import check_lock_acquired
 from grandchallenge.core.validators import get_file_mimetype
-from grandchallenge.evaluation.utils import SubmissionKindChoices, rank_results
+from grandchallenge.datatables.views import invalidate_total_counts
+from grandchallenge.evaluation.utils import (
+    SubmissionKindChoices,
+    get_score_matrix,
+    rank_score_matrix,
+)
 
 logger = get_task_logger(__name__)
 
@@ -532,13 +537,18 @@ def calculate_ranks(*, phase_pk: uuid.UUID):
         if e.status == Evaluation.SUCCESS and e.published is True
     ]
 
+    # Extract the metrics once, both ranking passes reuse this matrix
+    score_matrix = get_score_matrix(
+        evaluations=valid_evaluations, metrics=phase.valid_metrics
+    )
+
     if phase.result_display_choice == phase.MOST_RECENT:
         valid_evaluations = filter_by_creators_most_recent(
             evaluations=valid_evaluations
         )
     elif phase.result_display_choice == phase.BEST:
-        all_positions = rank_results(
-            evaluations=valid_evaluations,
+        all_positions = rank_score_matrix(
+            score_matrix=score_matrix,
             metrics=phase.valid_metrics,
             score_method=phase.scoring_method,
         )
@@ -546,12 +556,14 @@ def calculate_ranks(*, phase_pk: uuid.UUID):
             evaluations=valid_evaluations, ranks=all_positions.ranks
         )
 
-    final_positions = rank_results(
-        evaluations=valid_evaluations,
+    final_positions = rank_score_matrix(
+        score_matrix=score_matrix.take(pks=(e.pk for e in valid_evaluations)),
         metrics=phase.valid_metrics,
         score_method=phase.scoring_method,
     )
 
+    changed_evaluations = []
+
     for e in evaluations:
         try:
             rank = final_positions.ranks[e.pk]
@@ -563,15 +575,37 @@ def calculate_ranks(*, phase_pk: uuid.UUID):
             rank_score = 0.0
             rank_per_metric = {}
 
-        e.rank = rank
-        e.rank_score = rank_score
-        e.rank_per_metric = rank_per_metric
-
+        if (
+            e.rank != rank
+            or e.rank_score != rank_score
+            or e.rank_per_metric != rank_per_metric
+        ):
+            e.rank = rank
+            e.rank_score = rank_score
+            e.rank_per_metric = rank_per_metric
+            # Invalidates the cached leaderboard row
+            e.modified = now()
+            changed_evaluations.append(e)
+
+    # Only write the rows whose position actually changed, usually only
+    # a few when a single new evaluation is added to a large phase
     Evaluation.objects.bulk_update(
-        evaluations, ["rank", "rank_score", "rank_per_metric"]
+        changed_evaluations,
+        ["rank", "rank_score", "rank_per_metric", "modified"],
     )
+    phase.update_leaderboard_metric_values(evaluations=evaluations)
+
+    if changed_evaluations:
+        invalidate_total_counts(model=Evaluation)
+
+    combined_leaderboards = phase.combinedleaderboard_set.all()
+
+    if combined_leaderboards:
+        # Only the ranks of this phase change, the other phases of the
+        # combined leaderboards are left as they are
+        phase.update_user_ranks()
 
-    for leaderboard in phase.combinedleaderboard_set.all():
+    for leaderboard in combined_leaderboards:
         leaderboard.schedule_combined_ranks_update()
 
 
@@ -581,7 +615,7 @@ def update_combined_leaderboard(*, pk):
     from grandchallenge.evaluation.models import CombinedLeaderboard
 
     leaderboard = CombinedLeaderboard.objects.get(pk=pk)
-    leaderboard.update_combined_ranks_cache()
+    leaderboard.update_combined_ranks()
 
 
 @acks_late_2xlarge_task
@@ -1,7 +1,7 @@
-from collections import OrderedDict
 from collections.abc import Callable, Iterable
 from typing import NamedTuple
 
+import numpy as np
 from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
 from django.db import models
 
@@ -21,6 +21,29 @@ class Positions(NamedTuple):
     rank_per_metric: dict[str, dict[str, float]]
 
 
+class ScoreMatrix(NamedTuple):
+    """
+    The metric values of a set of evaluations in columnar form
+
+    Row ``i`` of ``scores`` holds the values of each metric, in the order
+    of the metrics used to build the matrix, for the evaluation ``pks[i]``.
+    """
+
+    pks: list
+    scores: np.ndarray
+
+    def take(self, *, pks: Iterable) -> "ScoreMatrix":
+        """Select the rows of the given pks, preserving their order."""
+        index = {pk: idx for idx, pk in enumerate(self.pks)}
+        selected = [pk for pk in pks if pk in index]
+        return ScoreMatrix(
+            pks=selected,
+            scores=self.scores[[index[pk] for pk in selected]].reshape(
+                (len(selected), self.scores.shape[1])
+            ),
+        )
+
+
 def get(inputs):
     """Substitute for queryset.get when the qs already exists."""
     if len(inputs) == 1:
@@ -31,99 +54,210 @@ def get(inputs):
         raise MultipleObjectsReturned
 
 
+def get_score_matrix(
+    *, evaluations: Iterable, metrics: tuple[Metric, ...]
+) -> ScoreMatrix:
+    """
+    Extract the values of all metrics for all evaluations in a single pass
+
+    Evaluations where any of the metrics are missing or are not numeric
+    are excluded from the matrix.
+    """
+    pks = []
+    rows = []
+
+    for e in evaluations:
+        metrics_json_file = e.metrics_json_file
+        row = [get_jsonpath(metrics_json_file, m.path) for m in metrics]
+
+        if all(isinstance(value, (int, float)) for value in row):
+            pks.append(e.pk)
+            rows.append(row)
+
+    return ScoreMatrix(
+        pks=pks,
+        scores=np.array(rows, dtype=np.float64).reshape(
+            (len(rows), len(metrics))
+        ),
+    )
+
+
+class LeaderboardMetricValues(NamedTuple):
+    value: float | None
+    error: float | None
+    rank: int | None
+
+
+def get_leaderboard_metric_values(
+    *, metrics_json_file, rank_per_metric, columns: Iterable[tuple[str, str]]
+) -> dict[str, LeaderboardMetricValues]:
+    """
+    Extract the values shown in the metric columns of a leaderboard row
+
+    The columns are ``(path, error_path)`` pairs, values that cannot be
+    converted to a float are ``None``.
+    """
+    rank_per_metric = rank_per_metric or {}
+
+    return {
+        path: LeaderboardMetricValues(
+            value=_to_float(get_jsonpath(metrics_json_file, path)),
+            error=(
+                _to_float(get_jsonpath(metrics_json_file, error_path))
+                if error_path
+                else None
+            ),
+            rank=rank_per_metric.get(path),
+        )
+        for path, error_path in columns
+    }
+
+
+def _to_float(value) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
 def rank_results(
     *, evaluations: list, metrics: tuple[Metric, ...], score_method: Callable
 ) -> Positions:
     """Determine the overall rank for each result."""
-    evaluations = _filter_valid_results(
-        evaluations=evaluations, metrics=metrics
+    return rank_score_matrix(
+        score_matrix=get_score_matrix(
+            evaluations=evaluations, metrics=metrics
+        ),
+        metrics=metrics,
+        score_method=score_method,
     )
 
-    rank_per_metric = _get_rank_per_metric(
-        evaluations=evaluations, metrics=metrics
-    )
 
-    rank_scores = {
-        pk: score_method([m for m in metrics.values()])
-        for pk, metrics in rank_per_metric.items()
-    }
+def rank_score_matrix(
+    *,
+    score_matrix: ScoreMatrix,
+    metrics: tuple[Metric, ...],
+    score_method: Callable,
+) -> Positions:
+    """
+    Determine the overall rank for each row of a score matrix
+
+    The score method takes a 2D array of the ranks per metric and must
+    return a 1D array with the aggregate rank score for each row.
+    """
+    if not score_matrix.pks:
+        return Positions(ranks={}, rank_scores={}, rank_per_metric={})
+
+    metric_ranks = np.column_stack(
+        [
+            _values_to_ranks(
+                values=score_matrix.scores[:, idx], reverse=metric.reverse
+            )
+            for idx, metric in enumerate(metrics)
+        ]
+    )
+    rank_scores = np.asarray(score_method(metric_ranks), dtype=np.float64)
+    ranks = _values_to_ranks(values=rank_scores, reverse=False)
 
     return Positions(
-        ranks=_scores_to_ranks(scores=rank_scores, reverse=False),
-        rank_scores=rank_scores,
-        rank_per_metric=rank_per_metric,
+        ranks=dict(zip(score_matrix.pks, ranks.tolist(), strict=True)),
+        rank_scores=dict(
+            zip(score_matrix.pks, rank_scores.tolist(), strict=True)
+        ),
+        rank_per_metric={
+            pk: {
+                metric.path: rank
+                for metric, rank in zip(metrics, row, strict=True)
+            }
+            for pk, row in zip(
+                score_matrix.pks, metric_ranks.tolist(), strict=True
+            )
+        },
     )
 
 
-def _filter_valid_results(
-    *, evaluations: Iterable, metrics: tuple[Metric, ...]
-) -> list:
-    """Ensure that all the metrics are in every result."""
-    return [e for e in evaluations if not e.invalid_metrics]
+def _values_to_ranks(*, values: np.ndarray, reverse: bool) -> np.ndarray:
+    """
+    Go from scores (scalars) to ranks (integers). If two scalars are the
+    same then they will have the same rank, and the following rank is
+    skipped, e.g. ``(1, 2, 2, 4)``.
+    """
+    if reverse:
+        values = -values
 
+    sorted_values = np.sort(values, kind="stable")
 
-def _get_rank_per_metric(
-    *, evaluations: Iterable, metrics: tuple[Metric, ...]
-) -> dict[str, dict[str, float]]:
-    """
-    Takes results and calculates the rank for each of the individual metrics
+    return np.searchsorted(sorted_values, values, side="left") + 1
 
-    Returns a dictionary where the key is the pk of the result, and the
-    values is another dictionary where the key is the path of the metric and
-    the value is the rank of this result for this metric
-    """
-    metric_rank = {}
-    for metric in metrics:
-        # Extract the value of the metric for this primary key and sort on the
-        # value of the metric
-        metric_scores = {
-            e.pk: get_jsonpath(
-                e.metrics_json_file,
-                metric.path,
-            )
-            for e in evaluations
-        }
-        metric_rank[metric.path] = _scores_to_ranks(
-            scores=metric_scores, reverse=metric.reverse
-        )
 
-    return {
-        e.pk: {
-            metric_path: ranks[e.pk]
-            for metric_path, ranks in metric_rank.items()
-        }
-        for e in evaluations
-    }
+class CombinedRank(NamedTuple):
+    user: int
+    rank: int
+    combined_rank: float
+    created: object
+    evaluations: dict
 
 
-def _scores_to_ranks(
-    *, scores: dict, reverse: bool = False
-) -> dict[str, float]:
+def combine_phase_ranks(
+    *, phase_ranks: Iterable[tuple], combination_method: Callable
+) -> list[CombinedRank]:
     """
-    Go from a score (a scalar) to a rank (integer). If two scalars are the
-    same then they will have the same rank.
+    Combine the best rank of each user on each phase to a single rank
 
-    Takes a dictionary where the keys are the pk of the results and the values
-    are the scores.
-
-    Outputs a dictionary where they keys are the pk of the results and the
-    values are the ranks.
+    ``phase_ranks`` are ``(phase, user, evaluation, rank, created)`` rows,
+    a phase without any ranks is a single row where all but the phase are
+    ``None``. Users without a rank on every phase are excluded. The
+    combination method takes a 2D array of the ranks per phase and must
+    return a 1D array with the combined rank for each row.
     """
-    scores = OrderedDict(
-        sorted(scores.items(), key=lambda t: t[1], reverse=reverse)
-    )
+    phase_ranks = [*phase_ranks]
+    phases = {
+        phase: idx
+        for idx, phase in enumerate(dict.fromkeys(r[0] for r in phase_ranks))
+    }
+    ranked = [r for r in phase_ranks if r[1] is not None]
+
+    if not ranked:
+        return []
 
-    ranks = {}
-    current_score = current_rank = None
+    users, user_idx = np.unique([r[1] for r in ranked], return_inverse=True)
+    phase_idx = np.array([phases[r[0]] for r in ranked])
+    shape = (len(users), len(phases))
 
-    for idx, (pk, score) in enumerate(scores.items()):
-        if score != current_score:
-            current_score = score
-            current_rank = idx + 1
+    ranks = np.full(shape, np.nan)
+    ranks[user_idx, phase_idx] = [r[3] for r in ranked]
 
-        ranks[pk] = current_rank
+    details = np.full(shape, None, dtype=object)
+    for row, col, r in zip(user_idx, phase_idx, ranked, strict=True):
+        details[row, col] = r
+
+    complete = ~np.isnan(ranks).any(axis=1)
+    combined_ranks = np.asarray(
+        combination_method(ranks[complete]), dtype=np.float64
+    )
+    positions = _values_to_ranks(values=combined_ranks, reverse=False)
+
+    result = [
+        CombinedRank(
+            user=user.item(),
+            rank=position,
+            combined_rank=combined_rank,
+            created=max(r[4] for r in row),
+            evaluations={
+                str(r[0]): {"pk": str(r[2]), "rank": r[3]} for r in row
+            },
+        )
+        for user, position, combined_rank, row in zip(
+            users[complete],
+            positions.tolist(),
+            combined_ranks.tolist(),
+            details[complete],
+            strict=True,
+        )
+    ]
+    result.sort(key=lambda cr: cr.rank)
 
-    return ranks
+    return result
 
 
 class StatusChoices(models.TextChoices):
@@ -1,6 +1,7 @@
 import io
 import logging
 from datetime import datetime, time, timezone
+from hashlib import md5
 from pathlib import Path
 from zipfile import ZipFile
 
@@ -14,7 +15,7 @@ from django.contrib.auth.mixins import (
 )
 from django.contrib.messages.views import SuccessMessageMixin
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import Prefetch
+from django.db.models import F, FilteredRelation, Prefetch, Q
 from django.http import FileResponse, Http404
 from django.shortcuts import get_object_or_404
 from django.utils.functional import cached_property
@@ -68,6 +69,7 @@ from grandchallenge.evaluation.forms import (
 )
 from grandchallenge.evaluation.models import (
     CombinedLeaderboard,
+    CombinedLeaderboardRank,
     Evaluation,
     EvaluationGroundTruth,
     Method,
@@ -714,6 +716,8 @@ class LeaderboardDetail(
     template_name = "evaluation/leaderboard_detail.html"
     row_template = "evaluation/leaderboard_row.html"
     search_fields = ["pk", "submission__creator__username"]
+    row_cache_timeout = 300
+    total_count_cache_timeout = 300
 
     def test_func(self):
         if self.phase.public:
@@ -733,6 +737,25 @@ class LeaderboardDetail(
     def additional_inputs_defined_on_phase(self):
         return self.phase.additional_evaluation_inputs.exists()
 
+    def get_row_cache_version(self):
+        # The rows are the same for all users
+        teams = md5(
+            repr(sorted(self.user_teams.items())).encode("utf-8"),
+            usedforsecurity=False,
+        )
+        return (
+            f"{self.request.challenge.modified.timestamp()}:"
+            f"{self.phase.modified.timestamp()}:{teams.hexdigest()}"
+        )
+
+    @cached_property
+    def metric_sort_fields(self):
+        """The sort fields of the metric columns of the leaderboard"""
+        return [
+            f"metric_{idx}__value"
+            for idx, _ in enumerate(self.phase.leaderboard_metric_columns)
+        ]
+
     @property
     def columns(self):
         columns = []
@@ -776,18 +799,25 @@ class LeaderboardDetail(
 
         if self.phase.scoring_method_choice == self.phase.ABSOLUTE:
             columns.append(
-                Column(title=self.phase.score_title, sort_field="rank")
+                Column(
+                    title=self.phase.score_title,
+                    sort_field=self.metric_sort_fields[0],
+                )
             )
         else:
             columns.append(
                 Column(
                     title=f"{self.phase.score_title} (Position)",
-                    sort_field="rank",
+                    sort_field=self.metric_sort_fields[0],
                     classes=("toggleable",),
                 )
             )
 
-        for c in self.phase.extra_results_columns:
+        for c, sort_field in zip(
+            self.phase.extra_results_columns,
+            self.metric_sort_fields[1:],
+            strict=True,
+        ):
             columns.append(
                 Column(
                     title=(
@@ -797,7 +827,7 @@ class LeaderboardDetail(
                         or c.get("exclude_from_ranking", False)
                         else f"{c['title']} (Position)"
                     ),
-                    sort_field="rank",
+                    sort_field=sort_field,
                     classes=("toggleable",),
                 )
             )
@@ -862,7 +892,19 @@ class LeaderboardDetail(
                 "submission__phase__challenge",
                 "submission__algorithm_image__algorithm",
             )
-            .prefetch_related("outputs__interface")
+            .prefetch_related("leaderboard_metric_values")
+            # Only joined when sorting by one of the metrics
+            .alias(
+                **{
+                    f"metric_{idx}": FilteredRelation(
+                        "leaderboard_metric_values",
+                        condition=Q(leaderboard_metric_values__path=path),
+                    )
+                    for idx, (path, _) in enumerate(
+                        self.phase.leaderboard_metric_columns
+                    )
+                }
+            )
         )
 
         if self.additional_inputs_defined_on_phase:
@@ -877,6 +919,21 @@ class LeaderboardDetail(
 
         return queryset
 
+    def get_order_by(self, *, column_index, direction):
+        order_by = super().get_order_by(
+            column_index=column_index, direction=direction
+        )
+
+        if order_by and order_by.lstrip("-") in self.metric_sort_fields:
+            # Evaluations without a value for this metric go last
+            field = F(order_by.lstrip("-"))
+            if order_by.startswith("-"):
+                return field.desc(nulls_last=True)
+            else:
+                return field.asc(nulls_last=True)
+        else:
+            return order_by
+
     def filter_by_date(self, queryset):
         if "date" in self.request.GET:
             timestr = self.request.GET["date"]
@@ -1025,16 +1082,62 @@ class CombinedLeaderboardCreate(
         return super().form_valid(form)
 
 
-class CombinedLeaderboardDetail(DetailView):
-    model = CombinedLeaderboard
+class CombinedLeaderboardDetail(PaginatedTableListView):
+    model = CombinedLeaderboardRank
+    template_name = "evaluation/combinedleaderboard_detail.html"
+    row_template = "evaluation/combinedleaderboard_row.html"
+    search_fields = ["user__username"]
+    default_sort_order = "asc"
 
-    def get_object(self, queryset=None):
+    @cached_property
+    def combined_leaderboard(self):
         return get_object_or_404(
             CombinedLeaderboard,
             challenge=self.request.challenge,
             slug=self.kwargs["slug"],
         )
 
+    @cached_property
+    def public_phases(self):
+        return [*self.combined_leaderboard.public_phases]
+
+    @property
+    def columns(self):
+        return [
+            Column(title="#", sort_field="rank"),
+            Column(title="User", sort_field="user__username"),
+            Column(title="Created", sort_field="created"),
+            Column(
+                title=(
+                    "Combined Rank "
+                    f"({self.combined_leaderboard.get_combination_method_display()})"
+                ),
+                sort_field="combined_rank",
+            ),
+            *(
+                Column(title=f"{phase.title.title()} Rank")
+                for phase in self.public_phases
+            ),
+        ]
+
+    def get_context_data(self, *args, **kwargs):
+        context = super().get_context_data(*args, **kwargs)
+        context.update(
+            {
+                "object": self.combined_leaderboard,
+                "public_phases": self.public_phases,
+            }
+        )
+        return context
+
+    def get_queryset(self):
+        return (
+            super()
+            .get_queryset()
+            .filter(combined_leaderboard=self.combined_leaderboard)
+            .select_related("user__user_profile", "user__verification")
+        )
+
 
 class CombinedLeaderboardUpdate(
     LoginRequiredMixin,
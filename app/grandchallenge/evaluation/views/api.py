@@ -1,11 +1,18 @@
 from django.conf import settings
+from django.db.models import F, FilteredRelation, Q
 from django.db.transaction import on_commit
+from django.http import StreamingHttpResponse
 from django.utils.timezone import now
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.types import OpenApiTypes
-from drf_spectacular.utils import OpenApiParameter, extend_schema
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    extend_schema,
+    extend_schema_view,
+)
 from rest_framework import permissions
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.filters import BaseFilterBackend
 from rest_framework.permissions import DjangoObjectPermissions
 from rest_framework.response import Response
@@ -13,13 +20,20 @@ from rest_framework.settings import api_settings
 from rest_framework.status import HTTP_400_BAD_REQUEST
 from rest_framework.viewsets import ReadOnlyModelViewSet
 
+from grandchallenge.api.permissions import IsAuthenticated
 from grandchallenge.core.guardian import (
     ViewObjectPermissionsFilter,
     filter_by_permission,
 )
 from grandchallenge.core.renderers import PaginatedCSVRenderer
+from grandchallenge.evaluation.exports import (
+    EXPORT_RENDERERS,
+    export_evaluations,
+    get_evaluations_for_export,
+)
 from grandchallenge.evaluation.models import Evaluation
 from grandchallenge.evaluation.serializers import (
+    EvaluationExportParametersSerializer,
     EvaluationSerializer,
     ExternalEvaluationSerializer,
     ExternalEvaluationUpdateSerializer,
@@ -47,6 +61,49 @@ class CanClaimEvaluationFilter(BaseFilterBackend):
         )
 
 
+class LeaderboardMetricOrderingFilter(BaseFilterBackend):
+    """Orders the evaluations by the value of one of their leaderboard metrics"""
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = request.query_params.get("ordering_metric")
+
+        if not ordering:
+            return queryset
+
+        value = F("ordering_metric__value")
+
+        return queryset.alias(
+            ordering_metric=FilteredRelation(
+                "leaderboard_metric_values",
+                condition=Q(
+                    leaderboard_metric_values__path=ordering.removeprefix("-")
+                ),
+            )
+        ).order_by(
+            (
+                value.desc(nulls_last=True)
+                if ordering.startswith("-")
+                else value.asc(nulls_last=True)
+            ),
+            "pk",
+        )
+
+
+@extend_schema_view(
+    list=extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "ordering_metric",
+                OpenApiTypes.STR,
+                OpenApiParameter.QUERY,
+                description=(
+                    "The path of a leaderboard metric to order by, "
+                    "prefix with - for descending order"
+                ),
+            ),
+        ],
+    ),
+)
 class EvaluationViewSet(ReadOnlyModelViewSet):
     queryset = (
         Evaluation.objects.all()
@@ -55,7 +112,11 @@ class EvaluationViewSet(ReadOnlyModelViewSet):
     )
     serializer_class = EvaluationSerializer
     permission_classes = (DjangoObjectPermissions,)
-    filter_backends = (DjangoFilterBackend, ViewObjectPermissionsFilter)
+    filter_backends = (
+        DjangoFilterBackend,
+        ViewObjectPermissionsFilter,
+        LeaderboardMetricOrderingFilter,
+    )
     filterset_fields = ["submission__phase"]
     renderer_classes = (
         *api_settings.DEFAULT_RENDERER_CLASSES,
@@ -95,6 +156,55 @@ class EvaluationViewSet(ReadOnlyModelViewSet):
                 data=serializer.errors, status=HTTP_400_BAD_REQUEST
             )
 
+    @extend_schema(
+        parameters=[EvaluationExportParametersSerializer],
+        responses={
+            (200, content_type): OpenApiTypes.STR
+            for _, content_type in EXPORT_RENDERERS.values()
+        },
+    )
+    @action(
+        detail=False,
+        methods=["GET"],
+        permission_classes=[IsAuthenticated],
+        filter_backends=[],
+        pagination_class=None,
+        serializer_class=EvaluationExportParametersSerializer,
+    )
+    def export(self, request, *args, **kwargs):
+        """Streams all evaluations of a challenge, for challenge admins"""
+        serializer = EvaluationExportParametersSerializer(
+            data=request.query_params
+        )
+        serializer.is_valid(raise_exception=True)
+        parameters = serializer.validated_data
+        challenge = parameters["challenge"]
+
+        if not challenge.is_admin(user=request.user):
+            raise PermissionDenied
+
+        export_format = parameters["output_format"]
+        _, content_type = EXPORT_RENDERERS[export_format]
+
+        response = StreamingHttpResponse(
+            export_evaluations(
+                evaluations=get_evaluations_for_export(
+                    challenge=challenge,
+                    phase=parameters.get("phase"),
+                    created_after=parameters.get("created_after"),
+                    created_before=parameters.get("created_before"),
+                ),
+                export_format=export_format,
+            ),
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{challenge.short_name}_evaluations'
+            f'.{export_format}"'
+        )
+
+        return response
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
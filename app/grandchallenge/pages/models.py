@@ -89,10 +89,16 @@ class Page(FieldChangeMixin, models.Model):
         ):
             self.handle_changed_content_for_inactive_challenge()
 
+        content_changed = adding or self.has_changed("content_markdown")
+
         super().save(*args, **kwargs)
 
         self.assign_permissions()
 
+        if content_changed:
+            # Render the content as the page does, so that it is cached
+            md2html(self.content_markdown)
+
     def assign_permissions(self):
         """Give the right groups permissions to this object."""
         admins_group = self.challenge.admins_group
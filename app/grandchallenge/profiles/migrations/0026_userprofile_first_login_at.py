@@ -0,0 +1,34 @@
+# Generated by Django 5.2.9 on 2026-10-17 15:00
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def init_first_login_at(apps, schema_editor):
+    User = apps.get_model("auth", "User")  # noqa: N806
+    UserProfile = apps.get_model("profiles", "UserProfile")  # noqa: N806
+
+    # The first logins are not known, the last login is the best estimate
+    UserProfile.objects.filter(user__last_login__isnull=False).update(
+        first_login_at=Subquery(
+            User.objects.filter(pk=OuterRef("user_id")).values("last_login")
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("profiles", "0025_alter_userprofile_mugshot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="first_login_at",
+            field=models.DateTimeField(
+                db_index=True, default=None, editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(init_first_login_at, elidable=True),
+    ]
@@ -82,6 +82,9 @@ class UserProfile(models.Model):
     unread_messages_email_last_sent_at = models.DateTimeField(
         default=None, null=True, editable=False
     )
+    first_login_at = models.DateTimeField(
+        default=None, null=True, editable=False, db_index=True
+    )
     receive_newsletter = models.BooleanField(
         null=True,
         blank=True,
@@ -1,10 +1,19 @@
 from allauth.account.models import EmailAddress
 from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_in
 from django.core.exceptions import ObjectDoesNotExist
 from django.db.models.signals import pre_delete
 from django.dispatch import receiver
+from django.utils.timezone import now
 
-from grandchallenge.profiles.models import BannedEmailAddress
+from grandchallenge.profiles.models import BannedEmailAddress, UserProfile
+
+
+@receiver(user_logged_in)
+def set_first_login_at(*, user, **_):
+    UserProfile.objects.filter(user=user, first_login_at__isnull=True).update(
+        first_login_at=now()
+    )
 
 
 @receiver(pre_delete, sender=get_user_model())
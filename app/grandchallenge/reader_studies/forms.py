@@ -74,6 +74,7 @@ from grandchallenge.reader_studies.models import (
     Question,
     ReaderStudy,
     ReaderStudyPermissionRequest,
+    ReaderStudyStatisticsSnapshot,
 )
 from grandchallenge.reader_studies.tasks import (
     answers_from_ground_truth,
@@ -766,11 +767,15 @@ class GroundTruthFromAnswersForm(SaveFormInitMixin, Form):
             creator=self.cleaned_data["user"],
         )
         answers.update(is_ground_truth=True)
+        self._reader_study.rebuild_reader_progress()
 
         # Unassign all scores: some are invalid now
         Answer.objects.filter(
             question__reader_study=self._reader_study
         ).update(score=None)
+        ReaderStudyStatisticsSnapshot.objects.filter(
+            reader_study=self._reader_study
+        ).invalidate()
 
         on_commit(
             bulk_assign_scores_for_reader_study.signature(
@@ -0,0 +1,22 @@
+from django.core.management import BaseCommand
+
+from grandchallenge.reader_studies.models import ReaderStudy
+
+
+class Command(BaseCommand):
+    help = "Recounts the answers of the readers of one or all reader studies"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reader-study", type=str)
+
+    def handle(self, *args, **options):
+        reader_studies = ReaderStudy.objects.all()
+
+        if options["reader_study"]:
+            reader_studies = reader_studies.filter(
+                slug=options["reader_study"]
+            )
+
+        for reader_study in reader_studies.iterator():
+            reader_study.rebuild_reader_progress()
+            self.stdout.write(f"Rebuilt the progress of {reader_study.slug}")
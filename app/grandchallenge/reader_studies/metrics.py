@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def accuracy_score(y_true, y_pred):
     if len(y_true) != len(y_pred):
         raise ValueError("Length of ground truth and prediction must match")
@@ -7,3 +10,25 @@ def accuracy_score(y_true, y_pred):
     score /= len(y_true)
 
     return score
+
+
+def accuracy_scores(y_true, y_pred, sizes):
+    """
+    Row wise ``accuracy_score`` for 2D arrays of encoded ground truths and
+    predictions. Only the first ``sizes[i]`` elements of row ``i`` are
+    compared, the remainder of each row is padding.
+    """
+    y_true = np.asarray(y_true)
+    y_pred = np.asarray(y_pred)
+    sizes = np.asarray(sizes)
+
+    if y_true.shape != y_pred.shape:
+        raise ValueError("Shape of ground truth and prediction must match")
+
+    if np.any(sizes < 1) or np.any(sizes > y_true.shape[1]):
+        raise ValueError("Sizes must be within the row length")
+
+    in_row = np.arange(y_true.shape[1]) < sizes[:, np.newaxis]
+    matches = np.count_nonzero((y_true == y_pred) & in_row, axis=1)
+
+    return matches / sizes
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.9 on 2026-10-17 10:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reader_studies", "0073_alter_readerstudy_logo_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReaderStudyStatisticsSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "version",
+                    models.PositiveBigIntegerField(default=0, editable=False),
+                ),
+                (
+                    "statistics",
+                    models.JSONField(editable=False, null=True),
+                ),
+                (
+                    "statistics_version",
+                    models.PositiveBigIntegerField(editable=False, null=True),
+                ),
+                (
+                    "reader_study",
+                    models.OneToOneField(
+                        editable=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="statistics_snapshot",
+                        to="reader_studies.readerstudy",
+                    ),
+                ),
+            ],
+        ),
+    ]
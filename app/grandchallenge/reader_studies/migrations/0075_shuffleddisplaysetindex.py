@@ -0,0 +1,73 @@
+# Generated by Django 5.2.9 on 2026-10-17 11:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("reader_studies", "0074_readerstudystatisticssnapshot"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="displayset",
+            index=models.Index(
+                fields=["reader_study", "order", "created"],
+                name="reader_stud_reader__64237d_idx",
+            ),
+        ),
+        migrations.CreateModel(
+            name="ShuffledDisplaySetIndex",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("index", models.PositiveIntegerField()),
+                (
+                    "display_set",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="shuffled_indices",
+                        to="reader_studies.displayset",
+                    ),
+                ),
+                (
+                    "reader_study",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="shuffled_display_set_indices",
+                        to="reader_studies.readerstudy",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("reader_study", "user", "index"),
+                        name="unique_shuffled_display_set_index",
+                    ),
+                    models.UniqueConstraint(
+                        fields=("user", "display_set"),
+                        name="unique_shuffled_display_set_user",
+                    ),
+                ],
+            },
+        ),
+    ]
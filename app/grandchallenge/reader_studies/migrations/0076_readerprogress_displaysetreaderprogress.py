@@ -0,0 +1,156 @@
+# Generated by Django 5.2.9 on 2026-10-17 12:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def init_reader_progress(apps, schema_editor):
+    Answer = apps.get_model("reader_studies", "Answer")  # noqa: N806
+    DisplaySetReaderProgress = apps.get_model(  # noqa: N806
+        "reader_studies", "DisplaySetReaderProgress"
+    )
+    ReaderProgress = apps.get_model(  # noqa: N806
+        "reader_studies", "ReaderProgress"
+    )
+
+    DisplaySetReaderProgress.objects.bulk_create(
+        (
+            DisplaySetReaderProgress(
+                reader_study_id=reader_study_id,
+                user_id=user_id,
+                display_set_id=display_set_id,
+                answer_count=answer_count,
+            )
+            for reader_study_id, user_id, display_set_id, answer_count in Answer.objects.filter(
+                display_set__isnull=False, is_ground_truth=False
+            )
+            .order_by()
+            .values("question__reader_study", "creator", "display_set")
+            .annotate(count=Count("pk"))
+            .values_list(
+                "question__reader_study", "creator", "display_set", "count"
+            )
+            .iterator()
+        ),
+        batch_size=1000,
+    )
+
+    ReaderProgress.objects.bulk_create(
+        (
+            ReaderProgress(
+                reader_study_id=reader_study_id,
+                user_id=user_id,
+                answer_count=total,
+            )
+            for reader_study_id, user_id, total in DisplaySetReaderProgress.objects.order_by()
+            .values("reader_study", "user")
+            .annotate(total=Sum("answer_count"))
+            .values_list("reader_study", "user", "total")
+            .iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("reader_studies", "0075_shuffleddisplaysetindex"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReaderProgress",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("answer_count", models.PositiveIntegerField()),
+                (
+                    "reader_study",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reader_progress",
+                        to="reader_studies.readerstudy",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("reader_study", "user"),
+                        name="unique_reader_progress",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="DisplaySetReaderProgress",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("answer_count", models.PositiveIntegerField()),
+                (
+                    "display_set",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reader_progress",
+                        to="reader_studies.displayset",
+                    ),
+                ),
+                (
+                    "reader_study",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="display_set_reader_progress",
+                        to="reader_studies.readerstudy",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["reader_study", "user", "answer_count"],
+                        name="reader_stud_reader__16b9c8_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("display_set", "user"),
+                        name="unique_display_set_reader_progress",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(init_reader_progress, elidable=True),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-17 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("reader_studies", "0076_readerprogress_displaysetreaderprogress"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="readerstudystatisticssnapshot",
+            name="statistics_computed_at",
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+    ]
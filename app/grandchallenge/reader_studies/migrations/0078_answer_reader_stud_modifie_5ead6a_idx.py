@@ -0,0 +1,22 @@
+# Generated by Django 5.2.9 on 2026-10-17 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        (
+            "reader_studies",
+            "0077_readerstudystatisticssnapshot_statistics_computed_at",
+        ),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="answer",
+            index=models.Index(
+                fields=["modified"], name="reader_stud_modifie_5ead6a_idx"
+            ),
+        ),
+    ]
@@ -1,5 +1,8 @@
 from math import ceil
+from random import Random
+from uuid import UUID
 
+import numpy as np
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
@@ -12,11 +15,21 @@ from django.core.validators import (
     RegexValidator,
     StepValueValidator,
 )
-from django.db import models
-from django.db.models import Avg, Count, Q, Sum
+from django.db import models, transaction
+from django.db.models import (
+    Count,
+    F,
+    FilteredRelation,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+)
+from django.db.models.functions import Coalesce
 from django.db.models.signals import post_delete
 from django.dispatch import receiver
 from django.utils.functional import cached_property
+from django.utils.timezone import now
 from django_extensions.db.models import TitleSlugDescriptionModel
 from guardian.shortcuts import assign_perm, remove_perm
 from pictures.models import PictureField
@@ -40,7 +53,7 @@ from grandchallenge.core.guardian import (
     GroupObjectPermissionBase,
     UserObjectPermissionBase,
 )
-from grandchallenge.core.models import RequestBase, UUIDModel
+from grandchallenge.core.models import FieldChangeMixin, RequestBase, UUIDModel
 from grandchallenge.core.storage import (
     get_logo_path,
     get_social_image_path,
@@ -63,7 +76,15 @@ from grandchallenge.publications.models import Publication
 from grandchallenge.reader_studies.interactive_algorithms import (
     InteractiveAlgorithmChoices,
 )
-from grandchallenge.reader_studies.metrics import accuracy_score
+from grandchallenge.reader_studies.metrics import (
+    accuracy_score,
+    accuracy_scores,
+)
+from grandchallenge.reader_studies.scoring import (
+    AnswerEncoder,
+    get_score_statistics,
+    score_answers,
+)
 from grandchallenge.subdomains.utils import reverse
 from grandchallenge.workstations.templatetags.workstations import (
     get_workstation_path_and_query_string,
@@ -607,40 +628,135 @@ class ReaderStudy(
 
     def get_progress_for_user(self, user):
         """Returns the percentage of completed hangings and questions for ``user``."""
-        if self.display_sets.count() == 0:
-            return {"questions": 0.0, "hangings": 0.0, "diff": 0.0}
+        return self.get_progress_for_users(users=[user])[user.pk]
 
+    def get_progress_for_users(self, *, users):
+        """
+        Returns the percentage of completed hangings and questions for each
+        of ``users``, keyed by user pk.
+        """
         n_display_sets = self.display_sets.count()
-        expected = n_display_sets * self.answerable_question_count
-
-        answers = Answer.objects.filter(
-            question__in=self.answerable_questions,
-            creator_id=user.id,
-            is_ground_truth=False,
-        ).distinct()
-        answer_count = answers.count()
-
-        if expected == 0 or answer_count == 0:
-            return {"questions": 0.0, "hangings": 0.0, "diff": 0.0}
-
-        completed_hangings = (
-            self.display_sets.annotate(
-                answers_for_user=Count(
-                    "answers",
-                    filter=Q(
-                        answers__creator=user,
-                        answers__is_ground_truth=False,
-                    ),
+        n_questions = self.answerable_question_count
+        expected = n_display_sets * n_questions
+
+        answer_counts = dict(
+            self.reader_progress.filter(user__in=users).values_list(
+                "user", "answer_count"
+            )
+        )
+        completed_hangings = dict(
+            self.display_set_reader_progress.filter(
+                user__in=users, answer_count__gte=n_questions
+            )
+            .order_by()
+            .values("user")
+            .annotate(count=Count("pk"))
+            .values_list("user", "count")
+        )
+
+        progress = {}
+
+        for user in users:
+            answer_count = answer_counts.get(user.pk, 0)
+
+            if expected == 0 or answer_count == 0:
+                progress[user.pk] = {
+                    "questions": 0.0,
+                    "hangings": 0.0,
+                    "diff": 0.0,
+                }
+            else:
+                questions = answer_count / expected * 100
+                hangings = (
+                    completed_hangings.get(user.pk, 0) / n_display_sets * 100
                 )
-            ).filter(answers_for_user=self.answerable_question_count)
-        ).count()
-        questions = answer_count / expected * 100
-        hangings = completed_hangings / n_display_sets * 100
-        return {
-            "questions": questions,
-            "hangings": hangings,
-            "diff": questions - hangings,
-        }
+                progress[user.pk] = {
+                    "questions": questions,
+                    "hangings": hangings,
+                    "diff": questions - hangings,
+                }
+
+        return progress
+
+    def update_reader_progress(self, *, user_id, display_set_id, delta):
+        """
+        Adds delta to the number of answers of a reader for a display set
+
+        The counts are changed atomically in the database rather than
+        recounted, so that answers that are saved concurrently are all
+        counted.
+        """
+        with transaction.atomic():
+            _add_to_answer_count(
+                model=DisplaySetReaderProgress,
+                delta=delta,
+                reader_study=self,
+                user_id=user_id,
+                display_set_id=display_set_id,
+            )
+            _add_to_answer_count(
+                model=ReaderProgress,
+                delta=delta,
+                reader_study=self,
+                user_id=user_id,
+            )
+
+    def rebuild_reader_progress(self):
+        """Recounts the answers of all readers for all display sets"""
+        answer_counts = (
+            Answer.objects.filter(
+                question__reader_study=self,
+                display_set__isnull=False,
+                is_ground_truth=False,
+            )
+            .order_by()
+            .values("creator", "display_set")
+            .annotate(count=Count("pk"))
+            .values_list("creator", "display_set", "count")
+        )
+
+        with transaction.atomic():
+            # Nothing refers to these rows, so skip the collector
+            self.display_set_reader_progress.all()._raw_delete(
+                using=DisplaySetReaderProgress.objects.db
+            )
+            DisplaySetReaderProgress.objects.bulk_create(
+                [
+                    DisplaySetReaderProgress(
+                        reader_study=self,
+                        user_id=user_id,
+                        display_set_id=display_set_id,
+                        answer_count=answer_count,
+                    )
+                    for user_id, display_set_id, answer_count in answer_counts
+                ],
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=["display_set", "user"],
+                update_fields=["answer_count"],
+            )
+            self.reader_progress.all()._raw_delete(
+                using=ReaderProgress.objects.db
+            )
+            self._update_reader_progress_totals()
+
+    def _update_reader_progress_totals(self):
+        totals = (
+            self.display_set_reader_progress.order_by()
+            .values("user")
+            .annotate(total=Sum("answer_count"))
+            .values_list("user", "total")
+        )
+
+        ReaderProgress.objects.bulk_create(
+            [
+                ReaderProgress(
+                    reader_study=self, user_id=user_id, answer_count=total
+                )
+                for user_id, total in totals
+            ],
+            batch_size=1000,
+        )
 
     @cached_property
     def questions_with_ground_truth(self):
@@ -676,65 +792,116 @@ class ReaderStudy(
 
     def score_for_user(self, user):
         """Returns the average and total score for answers given by ``user``."""
+        for entry in self.get_statistics_snapshot().statistics[
+            "scores_by_user"
+        ]:
+            if entry["creator__username"] == user.username:
+                return {
+                    "score__sum": entry["score__sum"],
+                    "score__avg": entry["score__avg"],
+                }
 
-        return Answer.objects.filter(
-            creator=user,
-            question__in=self.questions_with_ground_truth,
-            is_ground_truth=False,
-        ).aggregate(Sum("score"), Avg("score"))
+        return {"score__sum": None, "score__avg": None}
 
     @cached_property
     def scores_by_user(self):
         """The average and total scores for this ``ReaderStudy`` grouped by user."""
-        return (
-            Answer.objects.filter(
-                question__in=self.questions_with_ground_truth,
-                is_ground_truth=False,
-            )
-            .order_by("creator_id")
-            .values("creator__username")
-            .annotate(Sum("score"), Avg("score"))
-            .order_by("-score__sum")
-        )
+        return self.get_statistics_snapshot().statistics["scores_by_user"]
 
     @cached_property
     def leaderboard(self):
         """The leaderboard for this ``ReaderStudy``."""
+        snapshot = self.get_statistics_snapshot()
         n_hangings = self.display_sets.count()
         question_count = float(self.answerable_question_count) * n_hangings
         return {
             "question_count": question_count,
-            "grouped_scores": self.scores_by_user,
+            "grouped_scores": snapshot.statistics["scores_by_user"],
+            "computed_at": snapshot.statistics_computed_at,
         }
 
     @cached_property
     def statistics(self):
         """Statistics per question and case based on the total / average score."""
-        scores_by_question = (
-            Answer.objects.filter(
-                question__reader_study=self, is_ground_truth=False
-            )
-            .order_by("question_id")
-            .values("question__question_text")
-            .annotate(Sum("score"), Avg("score"))
-            .order_by("-score__avg")
+        snapshot = self.get_statistics_snapshot()
+        statistics = snapshot.statistics
+        user_count = len(statistics["scores_by_user"])
+
+        display_sets = self.display_sets.select_related(
+            "reader_study__workstation__config"
+        ).in_bulk()
+
+        scores_by_case = []
+        for entry in statistics["scores_by_case"]:
+            display_set = display_sets.get(UUID(entry["id"]))
+
+            if display_set is None:
+                # Removed since the snapshot was taken
+                continue
+
+            display_set.sum = entry["sum"]
+            display_set.avg = entry["avg"]
+            scores_by_case.append(display_set)
+
+        return {
+            "max_score_questions": float(len(display_sets)) * user_count,
+            "scores_by_question": statistics["scores_by_question"],
+            "max_score_cases": float(self.answerable_question_count)
+            * user_count,
+            "scores_by_case": scores_by_case,
+            "ground_truths": {
+                UUID(display_set_pk): ground_truth
+                for display_set_pk, ground_truth in statistics[
+                    "ground_truths"
+                ].items()
+            },
+            "questions": statistics["questions"],
+            "computed_at": snapshot.statistics_computed_at,
+        }
+
+    def get_statistics_snapshot(self):
+        """
+        The statistics snapshot with the scores and ground truth of this
+        ``ReaderStudy``.
+
+        Out of date statistics are served until they are updated in a
+        task, they are only computed here if there are none yet.
+        """
+        snapshot, _ = ReaderStudyStatisticsSnapshot.objects.get_or_create(
+            reader_study=self
         )
 
-        scores_by_case = (
-            DisplaySet.objects.filter(reader_study=self)
-            .select_related("reader_study__workstation__config")
-            .annotate(
-                sum=Sum(
-                    "answers__score", filter=Q(answers__is_ground_truth=False)
-                ),
-                avg=Avg(
-                    "answers__score", filter=Q(answers__is_ground_truth=False)
-                ),
-            )
-            .order_by("avg")
-            .all()
+        if not snapshot.has_statistics:
+            snapshot.update_statistics()
+
+        return snapshot
+
+    def _compute_statistics(self):
+        questions = self.questions.all()
+        answers = Answer.objects.filter(question__reader_study=self)
+
+        table = score_answers(
+            answers=answers.filter(is_ground_truth=False),
+            ground_truths=answers.filter(is_ground_truth=True),
+            questions=questions,
         )
 
+        return {
+            "schema_version": ReaderStudyStatisticsSnapshot.SCHEMA_VERSION,
+            **get_score_statistics(
+                table=table,
+                questions_with_ground_truth={
+                    *answers.filter(is_ground_truth=True).values_list(
+                        "question_id", flat=True
+                    )
+                },
+                question_texts={q.pk: q.question_text for q in questions},
+                display_sets=self.display_sets.values_list("pk", flat=True),
+            ),
+            **self._compute_ground_truth_statistics(),
+        }
+
+    def _compute_ground_truth_statistics(self):
         options = {}
         for option in CategoricalOption.objects.filter(
             question__reader_study=self
@@ -760,7 +927,7 @@ class ReaderStudy(
         ):
             questions.append(gt["question__question_text"])
 
-            field = gt["display_set_id"]
+            field = str(gt["display_set_id"])
             ground_truths[field] = ground_truths.get(field, {})
 
             if (
@@ -783,16 +950,7 @@ class ReaderStudy(
 
         questions = list(dict.fromkeys(questions))
 
-        return {
-            "max_score_questions": float(len(self.display_sets.all()))
-            * self.scores_by_user.count(),
-            "scores_by_question": scores_by_question,
-            "max_score_cases": float(self.answerable_question_count)
-            * self.scores_by_user.count(),
-            "scores_by_case": scores_by_case,
-            "ground_truths": ground_truths,
-            "questions": questions,
-        }
+        return {"ground_truths": ground_truths, "questions": questions}
 
     @property
     def next_display_set_order(self):
@@ -800,6 +958,36 @@ class ReaderStudy(
         highest = getattr(last, "order", 0)
         return (highest + 10) // 10 * 10
 
+    def update_shuffled_hanging_list(self, *, user):
+        """
+        Stores the shuffled hanging list of a user if it does not exist
+
+        The display sets are shuffled with a seed that is fixed for each user
+        and reader study, the stored list is removed when display sets are
+        added or removed.
+        """
+        if self.shuffled_display_set_indices.filter(user=user).exists():
+            return
+
+        display_set_pks = [
+            *self.display_sets.order_by("pk").values_list("pk", flat=True)
+        ]
+        Random(f"{self.pk}:{user.pk}").shuffle(display_set_pks)
+
+        ShuffledDisplaySetIndex.objects.bulk_create(
+            [
+                ShuffledDisplaySetIndex(
+                    reader_study=self,
+                    user=user,
+                    display_set_id=display_set_pk,
+                    index=index,
+                )
+                for index, display_set_pk in enumerate(display_set_pks)
+            ],
+            # Concurrent requests create the same list
+            ignore_conflicts=True,
+        )
+
     @property
     def civ_sets_list_url(self):
         return reverse(
@@ -904,6 +1092,144 @@ class WorkstationSessionReaderStudy(models.Model):
         unique_together = (("reader_study", "workstation_session"),)
 
 
+def _add_to_answer_count(*, model, delta, **kwargs):
+    """Adds delta to the answer count of a progress row, or creates it"""
+    progress = model.objects.filter(**kwargs)
+
+    if progress.update(answer_count=F("answer_count") + delta):
+        progress.filter(answer_count=0).delete()
+    elif delta > 0:
+        _, created = model.objects.get_or_create(
+            **kwargs, defaults={"answer_count": delta}
+        )
+
+        if not created:
+            # The row was created by a concurrent transaction
+            progress.update(answer_count=F("answer_count") + delta)
+
+
+class ReaderProgress(models.Model):
+    """The number of questions a reader has answered in a reader study"""
+
+    reader_study = models.ForeignKey(
+        ReaderStudy, on_delete=models.CASCADE, related_name="reader_progress"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE
+    )
+    answer_count = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["reader_study", "user"],
+                name="unique_reader_progress",
+            ),
+        ]
+
+
+class ReaderStudyStatisticsSnapshotQuerySet(models.QuerySet):
+    def invalidate(self):
+        """
+        Marks the statistics as out of date
+
+        The statistics are kept so that they can be served until they are
+        updated. An update is scheduled for the snapshots that were
+        current, the others already have one pending.
+        """
+        with transaction.atomic():
+            reader_study_ids = [
+                *self.filter(statistics_version=F("version")).values_list(
+                    "reader_study_id", flat=True
+                )
+            ]
+            self.update(version=F("version") + 1)
+
+        for reader_study_id in reader_study_ids:
+            schedule_statistics_snapshot_update(
+                reader_study_id=reader_study_id
+            )
+
+
+def schedule_statistics_snapshot_update(*, reader_study_id):
+    from grandchallenge.reader_studies.tasks import update_statistics_snapshot
+
+    step = update_statistics_snapshot.signature(
+        kwargs={"reader_study_pk": str(reader_study_id)}
+    )
+    # Use the delay queue so that the answers given in the meantime
+    # are included in a single update
+    step.options["queue"] = f"{update_statistics_snapshot.queue}-delay"
+
+    transaction.on_commit(step.apply_async)
+
+
+class ReaderStudyStatisticsSnapshot(models.Model):
+    """
+    The scores and ground truth of a ``ReaderStudy`` as shown on its
+    statistics and leaderboard pages.
+
+    ``version`` is incremented whenever the answers, ground truth, questions
+    or display sets of the reader study change. The statistics are only
+    current if they were computed for the latest version, they are
+    computed at ``statistics_computed_at``.
+    """
+
+    # Increment when the structure of ``statistics`` changes
+    SCHEMA_VERSION = 1
+
+    reader_study = models.OneToOneField(
+        ReaderStudy,
+        on_delete=models.CASCADE,
+        related_name="statistics_snapshot",
+        editable=False,
+    )
+    version = models.PositiveBigIntegerField(default=0, editable=False)
+    statistics = models.JSONField(null=True, editable=False)
+    statistics_version = models.PositiveBigIntegerField(
+        null=True, editable=False
+    )
+    statistics_computed_at = models.DateTimeField(null=True, editable=False)
+
+    objects = ReaderStudyStatisticsSnapshotQuerySet.as_manager()
+
+    @property
+    def has_statistics(self):
+        return (
+            self.statistics is not None
+            and self.statistics.get("schema_version") == self.SCHEMA_VERSION
+        )
+
+    @property
+    def is_current(self):
+        return self.has_statistics and self.statistics_version == self.version
+
+    def update_statistics(self):
+        """
+        Computes and stores the statistics, returns False if the snapshot
+        was invalidated while they were computed
+        """
+        statistics = self.reader_study._compute_statistics()
+        computed_at = now()
+
+        # Only store the statistics if nothing was invalidated in the meantime
+        updated = ReaderStudyStatisticsSnapshot.objects.filter(
+            pk=self.pk, version=self.version
+        ).update(
+            statistics=statistics,
+            statistics_version=self.version,
+            statistics_computed_at=computed_at,
+        )
+
+        self.statistics = statistics
+        self.statistics_computed_at = computed_at
+
+        if updated:
+            self.statistics_version = self.version
+
+        return bool(updated)
+
+
 @receiver(post_delete, sender=ReaderStudy)
 def delete_reader_study_groups_hook(*_, instance: ReaderStudy, using, **__):
     """
@@ -923,6 +1249,37 @@ def delete_reader_study_groups_hook(*_, instance: ReaderStudy, using, **__):
         pass
 
 
+def _precedes_in_hanging_list(*, order, created):
+    return Q(order__lt=order) | Q(order=order, created__lt=created)
+
+
+class DisplaySetQuerySet(models.QuerySet):
+    def with_standard_index(self):
+        """Annotates the position in the standard hanging list"""
+        preceding = (
+            DisplaySet.objects.filter(
+                _precedes_in_hanging_list(
+                    order=OuterRef("order"), created=OuterRef("created")
+                ),
+                reader_study=OuterRef("reader_study"),
+            )
+            .order_by()
+            .values("reader_study")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        return self.annotate(standard_index=Coalesce(Subquery(preceding), 0))
+
+    def with_shuffled_index(self, *, user):
+        """Annotates the position in the shuffled hanging list of a user"""
+        return self.alias(
+            user_shuffled_display_set_index=FilteredRelation(
+                "shuffled_indices",
+                condition=Q(shuffled_indices__user=user),
+            )
+        ).annotate(shuffled_index=F("user_shuffled_display_set_index__index"))
+
+
 class DisplaySet(
     CIVSetStringRepresentationMixin,
     CIVSetObjectPermissionsMixin,
@@ -938,6 +1295,8 @@ class DisplaySet(
     order = models.PositiveIntegerField(default=0)
     title = models.CharField(max_length=255, default="", blank=True)
 
+    objects = DisplaySetQuerySet.as_manager()
+
     def assign_permissions(self):
         assign_perm(
             self.delete_perm,
@@ -969,6 +1328,7 @@ class DisplaySet(
                 condition=~Q(title=""),
             )
         ]
+        indexes = [models.Index(fields=["reader_study", "order", "created"])]
 
     @cached_property
     def is_editable(self):
@@ -1017,9 +1377,12 @@ class DisplaySet(
         else:
             return ""
 
-    @property
+    @cached_property
     def standard_index(self) -> int:
-        return [*self.reader_study.display_sets.all()].index(self)
+        # Annotated by DisplaySetQuerySet.with_standard_index for lists
+        return self.reader_study.display_sets.filter(
+            _precedes_in_hanging_list(order=self.order, created=self.created)
+        ).count()
 
     @property
     def update_url(self):
@@ -1053,6 +1416,63 @@ class DisplaySet(
         return self.values.get(interface=interface)
 
 
+class ShuffledDisplaySetIndex(models.Model):
+    """The position of a display set in the shuffled hanging list of a user"""
+
+    reader_study = models.ForeignKey(
+        ReaderStudy,
+        on_delete=models.CASCADE,
+        related_name="shuffled_display_set_indices",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE
+    )
+    display_set = models.ForeignKey(
+        DisplaySet, on_delete=models.CASCADE, related_name="shuffled_indices"
+    )
+    index = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["reader_study", "user", "index"],
+                name="unique_shuffled_display_set_index",
+            ),
+            models.UniqueConstraint(
+                fields=["user", "display_set"],
+                name="unique_shuffled_display_set_user",
+            ),
+        ]
+
+
+class DisplaySetReaderProgress(models.Model):
+    """The number of questions a reader has answered for a display set"""
+
+    reader_study = models.ForeignKey(
+        ReaderStudy,
+        on_delete=models.CASCADE,
+        related_name="display_set_reader_progress",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE
+    )
+    display_set = models.ForeignKey(
+        DisplaySet, on_delete=models.CASCADE, related_name="reader_progress"
+    )
+    answer_count = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["display_set", "user"],
+                name="unique_display_set_reader_progress",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["reader_study", "user", "answer_count"])
+        ]
+
+
 class DisplaySetUserObjectPermission(UserObjectPermissionBase):
     allowed_permissions = frozenset()
 
@@ -1363,6 +1783,7 @@ class Question(UUIDModel, OverlaySegmentsMixin):
         ACCURACY = "ACC", "Accuracy score"
 
     SCORING_FUNCTIONS = {ScoringFunction.ACCURACY: accuracy_score}
+    VECTORIZED_SCORING_FUNCTIONS = {ScoringFunction.ACCURACY: accuracy_scores}
 
     EXAMPLE_FOR_ANSWER_TYPE = {
         AnswerType.TEXT: "'\"answer\"'",
@@ -1568,6 +1989,40 @@ class Question(UUIDModel, OverlaySegmentsMixin):
             gt = [ground_truth]
         return self.SCORING_FUNCTIONS[self.scoring_function](gt, ans)
 
+    def calculate_scores(self, *, answers, ground_truths):
+        """
+        Vectorized version of ``calculate_score`` for sequences of
+        ``answers`` and their ``ground_truths``.
+        """
+        encoder = AnswerEncoder()
+
+        if self.answer_type == Question.AnswerType.MULTIPLE_CHOICE:
+            sizes = np.array(
+                [
+                    max(len(answer), len(ground_truth))
+                    for answer, ground_truth in zip(
+                        answers, ground_truths, strict=True
+                    )
+                ],
+                dtype=np.int64,
+            )
+            width = int(sizes.max(initial=0))
+            ans = encoder.encode_padded(answers, width=width)
+            gt = encoder.encode_padded(ground_truths, width=width)
+        else:
+            sizes = np.ones(len(answers), dtype=np.int64)
+            ans = encoder.encode_padded([[a] for a in answers], width=1)
+            gt = encoder.encode_padded([[g] for g in ground_truths], width=1)
+
+        # Empty multiple choice answers for empty ground truths are correct
+        scores = np.ones(len(sizes))
+        scored = sizes > 0
+        scores[scored] = self.VECTORIZED_SCORING_FUNCTIONS[
+            self.scoring_function
+        ](gt[scored], ans[scored], sizes[scored])
+
+        return scores
+
     def save(self, *args, **kwargs):
         adding = self._state.adding
 
@@ -1880,7 +2335,7 @@ class CategoricalOption(models.Model):
         return f"{self.title} ({'' if self.default else 'not '}default)"
 
 
-class Answer(UUIDModel):
+class Answer(FieldChangeMixin, UUIDModel):
     """
     An ``Answer`` can be provided to a ``Question`` that is a part of a
     ``ReaderStudy``.
@@ -1911,6 +2366,9 @@ class Answer(UUIDModel):
         unique_together = (
             ("creator", "display_set", "question", "is_ground_truth"),
         )
+        indexes = [
+            models.Index(fields=["modified"]),
+        ]
 
     def __str__(self):
         return f"{self.question.question_text} {self.answer} ({self.creator})"
@@ -0,0 +1,204 @@
+import json
+from collections import defaultdict
+from typing import NamedTuple
+
+import numpy as np
+
+
+class AnswerEncoder:
+    """
+    Encodes JSON answers as integer codes so that they can be compared in
+    numpy arrays. Answers that compare equal in Python, such as ``1`` and
+    ``1.0``, get the same code.
+    """
+
+    def __init__(self):
+        self._codes = {}
+
+    def encode(self, value):
+        key = json.dumps(self._normalise(value), sort_keys=True)
+        return self._codes.setdefault(key, len(self._codes))
+
+    def encode_padded(self, values, *, width, padding=0):
+        """Encode a sequence of lists of answers as a 2D array of codes."""
+        codes = np.full(
+            (len(values), width), self.encode(padding), dtype=np.int64
+        )
+
+        for row, value in enumerate(values):
+            codes[row, : len(value)] = [self.encode(v) for v in value]
+
+        return codes
+
+    def _normalise(self, value):
+        if isinstance(value, bool | int | float):
+            return float(value)
+        elif isinstance(value, list):
+            return [self._normalise(v) for v in value]
+        elif isinstance(value, dict):
+            return {k: self._normalise(v) for k, v in value.items()}
+        else:
+            return value
+
+
+class AnswerTable(NamedTuple):
+    """Columns of the answers of a reader study, one row per answer."""
+
+    pk: np.ndarray
+    question: np.ndarray
+    display_set: np.ndarray
+    creator: np.ndarray
+    stored_score: np.ndarray
+    score: np.ndarray
+
+
+def score_answers(*, answers, ground_truths, questions):
+    """
+    Score ``answers`` against ``ground_truths``, one question at a time.
+
+    ``answers`` and ``ground_truths`` are ``Answer`` querysets,
+    ``questions`` are the ``Question`` objects they belong to. Answers
+    without a ground truth get a ``nan`` score.
+    """
+    ground_truth_lookup = {
+        (question_id, display_set_id): answer
+        for question_id, display_set_id, answer in ground_truths.order_by(
+            "created"
+        ).values_list("question_id", "display_set_id", "answer")
+    }
+
+    rows = answers.order_by().values_list(
+        "pk",
+        "question_id",
+        "display_set_id",
+        "creator__username",
+        "score",
+        "answer",
+    )
+    columns = [np.empty(len(rows), dtype=object) for _ in range(6)]
+    for idx, row in enumerate(rows):
+        for column, value in zip(columns, row, strict=True):
+            column[idx] = value
+
+    pk, question, display_set, creator, stored_score, answer = columns
+    score = np.full(len(pk), np.nan)
+
+    rows_by_question = defaultdict(list)
+    for idx, key in enumerate(zip(question, display_set, strict=True)):
+        if key in ground_truth_lookup:
+            rows_by_question[key[0]].append(idx)
+
+    for q in questions:
+        idx = rows_by_question.get(q.pk)
+
+        if idx:
+            score[idx] = q.calculate_scores(
+                answers=answer[idx],
+                ground_truths=[
+                    ground_truth_lookup[(q.pk, ds)] for ds in display_set[idx]
+                ],
+            )
+
+    return AnswerTable(
+        pk=pk,
+        question=question,
+        display_set=display_set,
+        creator=creator,
+        stored_score=np.array(
+            [np.nan if s is None else s for s in stored_score], dtype=float
+        ),
+        score=score,
+    )
+
+
+def aggregate_scores(*, keys, scores):
+    """
+    The sum and mean of the non-nan ``scores`` grouped by ``keys``.
+
+    Groups without any scores get ``None`` for both, like an SQL aggregate.
+    """
+    if len(keys) == 0:
+        return {}
+
+    unique, inverse = np.unique(keys, return_inverse=True)
+    scored = ~np.isnan(scores)
+
+    counts = np.bincount(inverse, weights=scored, minlength=len(unique))
+    sums = np.bincount(
+        inverse, weights=np.where(scored, scores, 0), minlength=len(unique)
+    )
+
+    return {
+        key: ((float(total), float(total / count)) if count else (None, None))
+        for key, total, count in zip(unique, sums, counts, strict=True)
+    }
+
+
+def _nulls_last(value, *, descending=False):
+    if value is None:
+        return True, 0
+    return False, -value if descending else value
+
+
+def get_score_statistics(
+    *, table, questions_with_ground_truth, question_texts, display_sets
+):
+    """
+    The scores of a reader study grouped by user, question and case.
+
+    The entries use the same keys and ordering as the aggregation
+    querysets they replace.
+    """
+    is_scored = np.array(
+        [q in questions_with_ground_truth for q in table.question], dtype=bool
+    )
+
+    scores_by_user = [
+        {
+            "creator__username": username,
+            "score__sum": score_sum,
+            "score__avg": score_avg,
+        }
+        for username, (score_sum, score_avg) in aggregate_scores(
+            keys=table.creator[is_scored], scores=table.score[is_scored]
+        ).items()
+    ]
+    scores_by_user.sort(
+        key=lambda e: _nulls_last(e["score__sum"], descending=True)
+    )
+
+    question_text = np.array(
+        [question_texts[q] for q in table.question], dtype=object
+    )
+    scores_by_question = [
+        {
+            "question__question_text": text,
+            "score__sum": score_sum,
+            "score__avg": score_avg,
+        }
+        for text, (score_sum, score_avg) in aggregate_scores(
+            keys=question_text, scores=table.score
+        ).items()
+    ]
+    scores_by_question.sort(
+        key=lambda e: _nulls_last(e["score__avg"], descending=True)
+    )
+
+    scores_per_display_set = aggregate_scores(
+        keys=table.display_set, scores=table.score
+    )
+    scores_by_case = []
+    for display_set in display_sets:
+        score_sum, score_avg = scores_per_display_set.get(
+            display_set, (None, None)
+        )
+        scores_by_case.append(
+            {"id": str(display_set), "sum": score_sum, "avg": score_avg}
+        )
+    scores_by_case.sort(key=lambda e: _nulls_last(e["avg"]))
+
+    return {
+        "scores_by_user": scores_by_user,
+        "scores_by_question": scores_by_question,
+        "scores_by_case": scores_by_case,
+    }
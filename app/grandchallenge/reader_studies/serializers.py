@@ -138,11 +138,8 @@ class DisplaySetSerializer(HyperlinkedModelSerializer):
 
     def get_index(self, obj) -> int | None:
         if obj.reader_study.shuffle_hanging_list:
-            try:
-                return self.context["view"].randomized_qs.index(obj)
-            except ValueError:
-                # The list is empty if no reader study is specified.
-                return None
+            # Only annotated when a reader study is specified
+            return getattr(obj, "shuffled_index", None)
         else:
             return obj.standard_index
 
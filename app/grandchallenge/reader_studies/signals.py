@@ -1,14 +1,29 @@
+from collections import Counter
+from functools import partial
+
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.db.models.signals import (
     m2m_changed,
+    post_delete,
     post_save,
     pre_delete,
     pre_save,
 )
 from django.dispatch import receiver
 
-from grandchallenge.cases.models import Image
-from grandchallenge.reader_studies.models import DisplaySet
+from grandchallenge.cases.models import (
+    Image,
+    bulk_update_viewer_groups_permissions,
+)
+from grandchallenge.reader_studies.models import (
+    Answer,
+    CategoricalOption,
+    DisplaySet,
+    Question,
+    ReaderStudyStatisticsSnapshot,
+    ShuffledDisplaySetIndex,
+)
 
 
 @receiver(m2m_changed, sender=DisplaySet.values.through)
@@ -45,10 +60,9 @@ def update_view_image_permissions_on_display_set_values_change(
 
     exclude_display_sets = display_sets if action == "pre_clear" else None
 
-    for image in images.distinct():
-        image.update_viewer_groups_permissions(
-            exclude_display_sets=exclude_display_sets
-        )
+    bulk_update_viewer_groups_permissions(
+        images=images, exclude_display_sets=exclude_display_sets
+    )
 
 
 @receiver(pre_delete, sender=DisplaySet)
@@ -61,10 +75,9 @@ def update_view_image_permissions_on_display_set_change(
     )
     exclude_display_sets = [instance] if signal is pre_delete else None
 
-    for image in images.distinct():
-        image.update_viewer_groups_permissions(
-            exclude_display_sets=exclude_display_sets
-        )
+    bulk_update_viewer_groups_permissions(
+        images=images, exclude_display_sets=exclude_display_sets
+    )
 
 
 @receiver(m2m_changed, sender=DisplaySet.values.through)
@@ -96,3 +109,104 @@ def set_display_set_order(sender, instance, **_):
     if instance.order:
         return
     instance.order = instance.reader_study.next_display_set_order
+
+
+@receiver(post_delete, sender=Answer)
+@receiver(post_save, sender=Answer)
+@receiver(post_delete, sender=CategoricalOption)
+@receiver(post_save, sender=CategoricalOption)
+def invalidate_statistics_on_question_related_change(*, instance, **_):
+    _invalidate_statistics_on_commit(
+        reader_study__questions__pk=instance.question_id
+    )
+
+
+@receiver(post_delete, sender=Question)
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=DisplaySet)
+@receiver(post_save, sender=DisplaySet)
+def invalidate_statistics_on_reader_study_related_change(*, instance, **_):
+    _invalidate_statistics_on_commit(reader_study_id=instance.reader_study_id)
+
+
+def _invalidate_statistics_on_commit(**filter_kwargs):
+    """
+    Invalidates the statistics snapshots once the transaction commits
+
+    Readers save many answers in a transaction, so the invalidation is
+    only added once. It is skipped if it was added in the same or an
+    enclosing savepoint, which cannot be rolled back without this one.
+    """
+    connection = transaction.get_connection()
+    savepoint_ids = set(connection.savepoint_ids)
+
+    for callback_savepoint_ids, callback, _ in connection.run_on_commit:
+        if (
+            getattr(callback, "func", None) is _invalidate_statistics
+            and callback.keywords == filter_kwargs
+            and callback_savepoint_ids <= savepoint_ids
+        ):
+            return
+
+    transaction.on_commit(partial(_invalidate_statistics, **filter_kwargs))
+
+
+def _invalidate_statistics(**filter_kwargs):
+    ReaderStudyStatisticsSnapshot.objects.filter(**filter_kwargs).invalidate()
+
+
+@receiver(post_delete, sender=DisplaySet)
+@receiver(post_save, sender=DisplaySet)
+def reset_shuffled_hanging_lists(*, instance, signal, created=False, **_):
+    """The shuffled hanging lists are recreated when they are next used"""
+    if signal is post_save and not created:
+        return
+
+    # Nothing refers to these rows, so skip the collector
+    ShuffledDisplaySetIndex.objects.filter(
+        reader_study_id=instance.reader_study_id
+    )._raw_delete(using=ShuffledDisplaySetIndex.objects.db)
+
+
+@receiver(post_delete, sender=Answer)
+@receiver(post_save, sender=Answer)
+def update_reader_progress_on_answer_change(
+    *, instance, signal, created=False, **_
+):
+    fields = ("creator", "display_set", "is_ground_truth")
+
+    if (
+        signal is post_save
+        and not created
+        and not any(instance.has_changed(f) for f in fields)
+    ):
+        return
+
+    deltas = Counter()
+
+    if (
+        (signal is post_delete or not created)
+        and instance.initial_value("display_set") is not None
+        and not instance.initial_value("is_ground_truth")
+    ):
+        deltas[
+            (
+                instance.initial_value("creator"),
+                instance.initial_value("display_set"),
+            )
+        ] -= 1
+
+    if (
+        signal is post_save
+        and instance.display_set_id is not None
+        and not instance.is_ground_truth
+    ):
+        deltas[(instance.creator_id, instance.display_set_id)] += 1
+
+    reader_study = instance.question.reader_study
+
+    for (user_id, display_set_id), delta in deltas.items():
+        if delta:
+            reader_study.update_reader_progress(
+                user_id=user_id, display_set_id=display_set_id, delta=delta
+            )
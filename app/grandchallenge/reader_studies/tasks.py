@@ -1,3 +1,4 @@
+import numpy as np
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.db import transaction
@@ -15,7 +16,10 @@ from grandchallenge.reader_studies.models import (
     Answer,
     DisplaySet,
     ReaderStudy,
+    ReaderStudyStatisticsSnapshot,
+    schedule_statistics_snapshot_update,
 )
+from grandchallenge.reader_studies.scoring import score_answers
 
 
 @acks_late_2xlarge_task
@@ -46,32 +50,44 @@ def answers_from_ground_truth(*, reader_study_pk, target_user_pk):
 @acks_late_2xlarge_task
 @transaction.atomic
 def bulk_assign_scores_for_reader_study(*, reader_study_pk):
-    ground_truth = Answer.objects.filter(
-        question__reader_study__pk=reader_study_pk,
-        is_ground_truth=True,
-    ).all()
-
-    def key(answer):
-        return (str(answer.question_id), str(answer.display_set_id))
-
-    ground_truth_lookup = {}
-    for answer in ground_truth:
-        ground_truth_lookup[key(answer)] = answer
-
-    answers = Answer.objects.filter(
-        question__reader_study__pk=reader_study_pk,
-        is_ground_truth=False,
-    ).prefetch_related("question")
-
-    for answer in answers:
-        gt_answer = ground_truth_lookup.get(key(answer))
-        if gt_answer is not None:
-            answer.calculate_score(ground_truth=gt_answer.answer)
-        else:
-            # Sanity: should already be none, but just to be sure
-            answer.score = None
+    reader_study = ReaderStudy.objects.get(pk=reader_study_pk)
+    answers = Answer.objects.filter(question__reader_study=reader_study)
+
+    table = score_answers(
+        answers=answers.filter(is_ground_truth=False),
+        ground_truths=answers.filter(is_ground_truth=True),
+        questions=reader_study.questions.all(),
+    )
+
+    # nan != nan, so also check that both scores are not unset
+    changed = (table.score != table.stored_score) & ~(
+        np.isnan(table.score) & np.isnan(table.stored_score)
+    )
+
+    Answer.objects.bulk_update(
+        [
+            Answer(pk=pk, score=None if np.isnan(score) else float(score))
+            for pk, score in zip(
+                table.pk[changed], table.score[changed], strict=True
+            )
+        ],
+        ["score"],
+        batch_size=1000,
+    )
+
+
+@acks_late_2xlarge_task
+def update_statistics_snapshot(*, reader_study_pk):
+    snapshot = ReaderStudyStatisticsSnapshot.objects.select_related(
+        "reader_study"
+    ).get(reader_study_id=reader_study_pk)
+
+    if snapshot.is_current:
+        return
 
-    Answer.objects.bulk_update(answers, ["score"])
+    if not snapshot.update_statistics():
+        # The answers changed while the statistics were computed
+        schedule_statistics_snapshot_update(reader_study_id=reader_study_pk)
 
 
 @acks_late_2xlarge_task
@@ -11,7 +11,7 @@ from django.contrib.auth.mixins import (
 )
 from django.contrib.messages.views import SuccessMessageMixin
 from django.core.exceptions import PermissionDenied, ValidationError
-from django.db.models import Count, Q
+from django.db.models import Exists, OuterRef
 from django.db.transaction import on_commit
 from django.forms import Form
 from django.forms.utils import ErrorList
@@ -75,7 +75,6 @@ from grandchallenge.core.renderers import PaginatedCSVRenderer
 from grandchallenge.core.templatetags.bleach import clean
 from grandchallenge.core.templatetags.random_encode import random_encode
 from grandchallenge.core.utils import strtobool
-from grandchallenge.core.utils.query import set_seed
 from grandchallenge.core.views import PermissionRequestUpdate
 from grandchallenge.datatables.views import Column
 from grandchallenge.groups.forms import EditorsForm
@@ -101,6 +100,7 @@ from grandchallenge.reader_studies.models import (
     Answer,
     CategoricalOption,
     DisplaySet,
+    DisplaySetReaderProgress,
     Question,
     ReaderStudy,
     ReaderStudyPermissionRequest,
@@ -751,16 +751,17 @@ class UsersProgress(
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        users = [
-            {
-                "obj": reader,
-                "progress": self.object.get_progress_for_user(reader),
-            }
-            for reader in get_user_model()
-            .objects.filter(answer__question__reader_study=self.object)
-            .distinct()
+        readers = (
+            get_user_model()
+            .objects.filter(pk__in=self.object.reader_progress.values("user"))
             .select_related("user_profile", "verification")
             .order_by("username")
+        )
+        progress = self.object.get_progress_for_users(users=readers)
+
+        users = [
+            {"obj": reader, "progress": progress[reader.pk]}
+            for reader in readers
         ]
 
         context.update(
@@ -1020,9 +1021,9 @@ class DisplaySetViewSet(
         .prefetch_related(
             "values__image",
             "values__interface",
-            "reader_study__display_sets",
             "reader_study__optional_hanging_protocols",
         )
+        .with_standard_index()
     )
     permission_classes = [DjangoObjectPermissions]
     filter_backends = [DjangoFilterBackend, ViewObjectPermissionsFilter]
@@ -1031,7 +1032,6 @@ class DisplaySetViewSet(
         *api_settings.DEFAULT_RENDERER_CLASSES,
         PaginatedCSVRenderer,
     )
-    randomized_qs = []
 
     @property
     def reader_study(self):
@@ -1047,14 +1047,17 @@ class DisplaySetViewSet(
 
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-        # Note: if more fields besides 'reader_study' are added to the
-        # filter_set fields, we cannot call super anymore before randomizing
-        # as we only want to filter out the display sets for a specific
-        # reader study.
         reader_study = self.reader_study
-        if reader_study and reader_study.shuffle_hanging_list:
-            queryset = queryset.filter(reader_study=reader_study)
-            queryset = self.create_randomized_qs(queryset=queryset)
+        shuffle = (
+            reader_study is not None and reader_study.shuffle_hanging_list
+        )
+
+        if shuffle:
+            reader_study.update_shuffled_hanging_list(user=self.request.user)
+            queryset = queryset.with_shuffled_index(
+                user=self.request.user
+            ).order_by("shuffled_index")
+
         unanswered_by_user = strtobool(
             self.request.query_params.get("unanswered_by_user", "False")
         )
@@ -1083,30 +1086,14 @@ class DisplaySetViewSet(
                     "Please provide a reader study when filtering for "
                     "unanswered display_sets."
                 )
-            answerable_question_count = reader_study.answerable_question_count
-            queryset = (
-                queryset.annotate(
-                    answer_count=Count(
-                        "answers",
-                        filter=Q(
-                            answers__is_ground_truth=False,
-                            answers__creator=user,
-                        ),
-                    )
-                )
-                .exclude(
-                    answer_count__gte=answerable_question_count,
-                )
-                .order_by("order", "created")
+            completed = DisplaySetReaderProgress.objects.filter(
+                display_set=OuterRef("pk"),
+                user=user,
+                answer_count__gte=reader_study.answerable_question_count,
+            )
+            queryset = queryset.filter(~Exists(completed)).order_by(
+                *(("shuffled_index",) if shuffle else ("order", "created"))
             )
-            # Because the filtering has changed the list, we can no longer
-            # reapply .order_by("?"), as the ordering would not be consistent
-            # with the ordering of the full list. Instead, we use the
-            # previously saved randomized_qs and filter the proper items
-            # out of it.
-            if reader_study and reader_study.shuffle_hanging_list:
-                pks = queryset.values_list("pk", flat=True)
-                queryset = [x for x in self.randomized_qs if x.pk in pks]
 
         page = self.paginate_queryset(queryset)
         if page is not None:
@@ -1118,21 +1105,18 @@ class DisplaySetViewSet(
 
     def get_object(self):
         obj = super().get_object()
-        # retrieve the full queryset and save its shuffled version to later
-        # determine the shuffled index for this object
+
         if obj.reader_study.shuffle_hanging_list:
-            queryset = self.get_queryset()
-            queryset = super().filter_queryset(queryset)
-            queryset = queryset.filter(reader_study=obj.reader_study)
-            self.create_randomized_qs(queryset=queryset)
-        return obj
+            obj.reader_study.update_shuffled_hanging_list(
+                user=self.request.user
+            )
+            obj.shuffled_index = (
+                obj.shuffled_indices.filter(user=self.request.user)
+                .values_list("index", flat=True)
+                .first()
+            )
 
-    def create_randomized_qs(self, queryset):
-        set_seed(1 / int(self.request.user.pk))
-        queryset = queryset.order_by("?")
-        # Save the queryset to determine each item's index in the serializer
-        self.randomized_qs = list(queryset)
-        return queryset
+        return obj
 
 
 class QuestionViewSet(ReadOnlyModelViewSet):
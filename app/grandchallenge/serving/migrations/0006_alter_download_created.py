@@ -0,0 +1,21 @@
+# Generated by Django 5.2.9 on 2026-10-17 12:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("serving", "0005_download_submission_supplementary"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="download",
+            name="created",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.utils.timezone import now
 
 from grandchallenge.algorithms.models import (
     AlgorithmImage,
@@ -19,7 +20,8 @@ from grandchallenge.workstations.models import Feedback
 class Download(models.Model):
     """Tracks who downloaded objects."""
 
-    created = models.DateTimeField(auto_now_add=True)
+    # Set from the buffered download event, see serving.tasks
+    created = models.DateTimeField(default=now, editable=False)
     modified = models.DateTimeField(auto_now=True)
 
     creator = models.ForeignKey(
@@ -0,0 +1,98 @@
+import json
+from datetime import datetime
+
+from billiard.exceptions import SoftTimeLimitExceeded, TimeLimitExceeded
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.timezone import now
+from django_redis import get_redis_connection
+from redis.exceptions import LockError
+
+from grandchallenge.core.celery import acks_late_micro_short_task
+from grandchallenge.serving.models import Download
+
+DOWNLOAD_BUFFER_KEY = "serving.download_buffer"
+DOWNLOAD_PROCESSING_KEY = "serving.download_buffer.processing"
+
+
+def buffer_download(**kwargs):
+    """
+    Records a download event without touching the database
+
+    The events are written to the ``Download`` table by
+    ``create_buffered_downloads``. Delivery is at least once: if that task
+    fails after the rows were inserted but before the events were removed
+    from redis the events are inserted again on the next run.
+
+    Args
+    ----
+        kwargs: The primary keys of the ``Download`` foreign keys, by field
+            name, e.g. ``creator=1, image=uuid``
+    """
+    event = {
+        "created": now().isoformat(),
+        **{field: str(value) for field, value in kwargs.items()},
+    }
+    get_redis_connection("default").rpush(
+        cache.make_key(DOWNLOAD_BUFFER_KEY), json.dumps(event)
+    )
+
+
+@acks_late_micro_short_task(
+    ignore_result=True,
+    singleton=True,
+    # No need to retry here as the periodic task call this again
+    ignore_errors=(LockError, SoftTimeLimitExceeded, TimeLimitExceeded),
+)
+def create_buffered_downloads(*, batch_size=1000):
+    """Writes the buffered download events to the database"""
+    redis = get_redis_connection("default")
+    buffer_key = cache.make_key(DOWNLOAD_BUFFER_KEY)
+    processing_key = cache.make_key(DOWNLOAD_PROCESSING_KEY)
+
+    # Events left over from a failed run are processed first, otherwise
+    # take all the current events. Only this singleton task touches the
+    # processing list, new events are only ever appended to the buffer.
+    if not redis.exists(processing_key) and redis.exists(buffer_key):
+        redis.rename(buffer_key, processing_key)
+
+    while events := redis.lrange(processing_key, 0, batch_size - 1):
+        with transaction.atomic():
+            Download.objects.bulk_create(
+                _get_downloads(events=[json.loads(e) for e in events])
+            )
+
+        redis.ltrim(processing_key, len(events), -1)
+
+
+def _get_downloads(*, events):
+    foreign_keys = [
+        {field: pk for field, pk in event.items() if field != "created"}
+        for event in events
+    ]
+
+    # Objects can be deleted before their downloads are written, and their
+    # downloads would be deleted with them, so these events are dropped
+    existing_pks = {}
+
+    for field_name in {field for fks in foreign_keys for field in fks}:
+        related_model = Download._meta.get_field(field_name).related_model
+        existing_pks[field_name] = {
+            str(pk)
+            for pk in related_model.objects.filter(
+                pk__in={
+                    fks[field_name]
+                    for fks in foreign_keys
+                    if field_name in fks
+                }
+            ).values_list("pk", flat=True)
+        }
+
+    return [
+        Download(
+            created=datetime.fromisoformat(event["created"]),
+            **{f"{field}_id": pk for field, pk in fks.items()},
+        )
+        for event, fks in zip(events, foreign_keys, strict=True)
+        if all(pk in existing_pks[field] for field, pk in fks.items())
+    ]
@@ -0,0 +1,141 @@
+from functools import partial
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.crypto import salted_hmac
+
+from grandchallenge.core.metrics import increment_metric, pop_metrics
+
+IMAGE_ACCESS_GRANT_TIMEOUT = 300
+
+_IMAGE_ACCESS_GRANT_METRICS = ("hits", "misses")
+
+
+def _get_image_access_grant_key(*, request, image_pk):
+    # The grant belongs to the credentials that were used to authorize the
+    # request, these are signed so that they are not stored in the cache
+    credentials = salted_hmac(
+        key_salt="grandchallenge.serving.image_access_grant",
+        value="\0".join(
+            [
+                request.META.get("HTTP_AUTHORIZATION", ""),
+                request.COOKIES.get(settings.SESSION_COOKIE_NAME, ""),
+            ]
+        ),
+    ).hexdigest()
+    return f"serving.image_access_grant.{image_pk}.{credentials}"
+
+
+def _get_version_keys(*, image_pk, user_pk):
+    return {
+        "image_version": f"serving.image_access_grant_version.image.{image_pk}",
+        "user_version": f"serving.image_access_grant_version.user.{user_pk}",
+    }
+
+
+def get_image_access_grant(*, request, image_pk):
+    """
+    Returns the pk of the user that was granted access to the image
+
+    The grant is only valid for the credentials of the request that it
+    was created for, and until the permissions of the image or the user
+    are revoked. None is returned if there is no valid grant.
+    """
+    grant = cache.get(
+        _get_image_access_grant_key(request=request, image_pk=image_pk)
+    )
+
+    if grant is not None:
+        version_keys = _get_version_keys(
+            image_pk=image_pk, user_pk=grant["user"]
+        )
+        versions = cache.get_many(version_keys.values())
+
+        if any(
+            grant[name] != versions.get(key)
+            for name, key in version_keys.items()
+        ):
+            grant = None
+
+    _increment_image_access_grant_metric(
+        name="misses" if grant is None else "hits"
+    )
+
+    return None if grant is None else grant["user"]
+
+
+def get_image_access_grant_versions(*, image_pk, user_pk):
+    """
+    Returns the current versions of the grants for the image and user
+
+    These must be read before the access is authorized and then passed
+    to `set_image_access_grant`, otherwise a grant that is revoked while
+    authorizing would be stored as valid.
+    """
+    version_keys = _get_version_keys(image_pk=image_pk, user_pk=user_pk)
+    versions = cache.get_many(version_keys.values())
+    return {name: versions.get(key) for name, key in version_keys.items()}
+
+
+def set_image_access_grant(*, request, image_pk, user_pk, versions):
+    """Grants the credentials of the request access to the image"""
+    cache.set(
+        _get_image_access_grant_key(request=request, image_pk=image_pk),
+        {"user": user_pk, **versions},
+        timeout=IMAGE_ACCESS_GRANT_TIMEOUT,
+    )
+
+
+def invalidate_image_access_grants(*, image_pks=(), user_pks=()):
+    """
+    Revokes the image access grants for the images and users
+
+    Only grants are cached, so this only needs to be called when
+    permissions are removed.
+    """
+    keys = [
+        *(
+            _get_version_keys(image_pk=pk, user_pk=None)["image_version"]
+            for pk in image_pks
+        ),
+        *(
+            _get_version_keys(image_pk=None, user_pk=pk)["user_version"]
+            for pk in user_pks
+        ),
+    ]
+
+    if keys:
+        _set_new_versions(keys=keys)
+        # Until the transaction is committed other requests can still be
+        # authorized with the removed permissions, so the grants that they
+        # create are revoked again once the removal is visible
+        transaction.on_commit(partial(_set_new_versions, keys=keys))
+
+
+def _set_new_versions(*, keys):
+    version = uuid4().hex
+    # Any grant created before the version expires is checked against
+    # it, so it only needs to live as long as the grants
+    cache.set_many(
+        {key: version for key in keys}, timeout=IMAGE_ACCESS_GRANT_TIMEOUT
+    )
+
+
+def _increment_image_access_grant_metric(*, name):
+    increment_metric(name=f"serving.image_access_grant.{name}")
+
+
+def pop_image_access_grant_metrics():
+    """Returns and resets the number of grant cache hits and misses"""
+    metrics = pop_metrics(
+        names=[
+            f"serving.image_access_grant.{name}"
+            for name in _IMAGE_ACCESS_GRANT_METRICS
+        ]
+    )
+    return {
+        name: metrics[f"serving.image_access_grant.{name}"]
+        for name in _IMAGE_ACCESS_GRANT_METRICS
+    }
@@ -1,6 +1,8 @@
 import posixpath
 
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.exceptions import MultipleObjectsReturned, PermissionDenied
 from django.http import Http404, HttpResponseRedirect
 from django.utils._os import safe_join
@@ -16,18 +18,23 @@ from grandchallenge.core.guardian import filter_by_permission
 from grandchallenge.core.storage import internal_protected_s3_storage
 from grandchallenge.evaluation.models import Evaluation, Submission
 from grandchallenge.serving.models import (
-    Download,
     get_component_interface_values_for_user,
 )
+from grandchallenge.serving.tasks import buffer_download
+from grandchallenge.serving.utils import (
+    get_image_access_grant,
+    get_image_access_grant_versions,
+    set_image_access_grant,
+)
 from grandchallenge.workstations.models import Feedback
 
+STORAGE_OBJECT_EXISTS_CACHE_TIMEOUT = 60
+
 
 def protected_storage_redirect(*, name, **kwargs):
     _create_download(**kwargs)
 
-    # Get the storage with the internal redirect and auth. This will prepend
-    # settings.AWS_S3_ENDPOINT_URL to the url
-    if not internal_protected_s3_storage.exists(name=name):
+    if not _storage_object_exists(name=name):
         raise Http404("File not found.")
 
     if settings.PROTECTED_S3_STORAGE_USE_CLOUDFRONT:
@@ -41,6 +48,27 @@ def protected_storage_redirect(*, name, **kwargs):
     return response
 
 
+def _storage_object_exists(*, name):
+    """
+    Checks if the object exists in storage, cached for a short time
+
+    Viewers request many files in quick succession, this avoids blocking
+    each of these requests on a request to the storage backend.
+    """
+    cache_key = f"serving.storage_object_exists.{name}"
+    exists = cache.get(cache_key)
+
+    if exists is None:
+        # Get the storage with the internal redirect and auth. This will
+        # prepend settings.AWS_S3_ENDPOINT_URL to the url
+        exists = internal_protected_s3_storage.exists(name=name)
+        cache.set(
+            cache_key, exists, timeout=STORAGE_OBJECT_EXISTS_CACHE_TIMEOUT
+        )
+
+    return exists
+
+
 def _create_download(  # noqa: C901
     *,
     creator,
@@ -56,38 +84,38 @@ def _create_download(  # noqa: C901
     if creator.is_anonymous:
         creator = get_anonymous_user()
 
-    kwargs = {"creator": creator}
+    kwargs = {"creator": creator.pk}
 
     if image is not None:
-        kwargs["image"] = image
+        kwargs["image"] = image.pk
 
     if submission is not None:
-        kwargs["submission"] = submission
+        kwargs["submission"] = submission.pk
 
     if submission_supplementary is not None:
-        kwargs["submission_supplementary"] = submission_supplementary
+        kwargs["submission_supplementary"] = submission_supplementary.pk
 
     if component_interface_value is not None:
-        kwargs["component_interface_value"] = component_interface_value
+        kwargs["component_interface_value"] = component_interface_value.pk
 
     if challenge_request is not None:
-        kwargs["challenge_request"] = challenge_request
+        kwargs["challenge_request"] = challenge_request.pk
 
     if feedback is not None:
-        kwargs["feedback"] = feedback
+        kwargs["feedback"] = feedback.pk
 
     if algorithm_model is not None:
-        kwargs["algorithm_model"] = algorithm_model
+        kwargs["algorithm_model"] = algorithm_model.pk
 
     if algorithm_image is not None:
-        kwargs["algorithm_image"] = algorithm_image
+        kwargs["algorithm_image"] = algorithm_image.pk
 
     if len(kwargs) != 2:
         raise RuntimeError(
             "creator and only one other foreign key must be set"
         )
 
-    Download.objects.create(**kwargs)
+    buffer_download(**kwargs)
 
 
 def serve_images(request, *, pk, path, pa="", pb=""):
@@ -97,20 +125,48 @@ def serve_images(request, *, pk, path, pa="", pb=""):
     path = posixpath.normpath(path).lstrip("/")
     name = safe_join(document_root, path)
 
-    try:
-        image = Image.objects.get(pk=pk)
-    except Image.DoesNotExist:
-        raise Http404("Image not found.")
+    # Viewers fetch many files per image, so the authorization is only
+    # done for the first one
+    user_pk = get_image_access_grant(request=request, image_pk=pk)
+
+    if user_pk is None:
+        user = _authenticate_image_request(request=request)
+        user_pk = get_anonymous_user().pk if user.is_anonymous else user.pk
 
+        # The versions are read before authorizing, so that permissions
+        # that are revoked in the meantime also invalidate the new grant
+        versions = get_image_access_grant_versions(
+            image_pk=pk, user_pk=user_pk
+        )
+        _authorize_image_access(user=user, image_pk=pk)
+        set_image_access_grant(
+            request=request, image_pk=pk, user_pk=user_pk, versions=versions
+        )
+
+    return protected_storage_redirect(
+        name=name,
+        creator=get_user_model()(pk=user_pk),
+        image=Image(pk=pk),
+    )
+
+
+def _authenticate_image_request(*, request):
     try:
         user, _ = TokenAuthentication().authenticate(request)
     except (AuthenticationFailed, TypeError):
         user = request.user
 
-    if user.has_perm("view_image", image):
-        return protected_storage_redirect(name=name, creator=user, image=image)
+    return user
 
-    raise PermissionDenied
+
+def _authorize_image_access(*, user, image_pk):
+    try:
+        image = Image.objects.get(pk=image_pk)
+    except Image.DoesNotExist:
+        raise Http404("Image not found.")
+
+    if not user.has_perm("view_image", image):
+        raise PermissionDenied
 
 
 def serve_submissions(request, *, submission_pk, **_):
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.9 on 2026-10-17 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthlyStatistic",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "statistic",
+                    models.CharField(editable=False, max_length=32),
+                ),
+                (
+                    "facet",
+                    models.CharField(
+                        blank=True, editable=False, max_length=32
+                    ),
+                ),
+                ("month", models.DateField(editable=False)),
+                (
+                    "object_count",
+                    models.PositiveBigIntegerField(editable=False),
+                ),
+                (
+                    "duration_sum",
+                    models.DurationField(editable=False, null=True),
+                ),
+                ("computed_at", models.DateTimeField(editable=False)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("statistic", "facet", "month"),
+                        name="unique_monthly_statistic",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import models
+
+
+class MonthlyStatistic(models.Model):
+    """
+    Monthly rollup of a site statistic
+
+    The rollups are kept up to date by update_monthly_statistics, which
+    only recomputes the months that have changed since its last run.
+    """
+
+    statistic = models.CharField(max_length=32, editable=False)
+    facet = models.CharField(max_length=32, blank=True, editable=False)
+    month = models.DateField(editable=False)
+    object_count = models.PositiveBigIntegerField(editable=False)
+    duration_sum = models.DurationField(null=True, editable=False)
+    computed_at = models.DateTimeField(editable=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["statistic", "facet", "month"],
+                name="unique_monthly_statistic",
+            )
+        ]
@@ -1,8 +1,28 @@
+from dataclasses import dataclass
+from datetime import datetime
+from functools import reduce
+from operator import or_
+
+from dateutil.relativedelta import relativedelta
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
 from django.core.cache import cache
-from django.db.models import Count, Sum
+from django.db import transaction
+from django.db.models import (
+    CharField,
+    Count,
+    DateField,
+    DurationField,
+    F,
+    Max,
+    Q,
+    QuerySet,
+    Sum,
+    Value,
+)
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
 from django.utils.timezone import now
 
 from grandchallenge.algorithms.models import (
@@ -21,6 +41,7 @@ from grandchallenge.evaluation.models import (
     Submission,
 )
 from grandchallenge.reader_studies.models import Answer, ReaderStudy
+from grandchallenge.statistics.models import MonthlyStatistic
 from grandchallenge.utilization.models import (
     EvaluationUtilization,
     JobUtilization,
@@ -29,21 +50,147 @@ from grandchallenge.utilization.models import (
 from grandchallenge.workstations.models import Session, WorkstationImage
 
 
+@dataclass(frozen=True)
+class MonthlyRollup:
+    queryset: QuerySet
+    date_field: str = "created"
+    # Rows changed since the last run mark their month for recomputation
+    modified_field: str = "modified"
+    facet_field: str | None = None
+    duration_field: str | None = None
+
+
+MONTHLY_ROLLUPS = {
+    "users": MonthlyRollup(
+        queryset=get_user_model().objects.filter(
+            is_active=True, user_profile__first_login_at__isnull=False
+        ),
+        date_field="date_joined",
+        # Users are only counted once they have logged in
+        modified_field="user_profile__first_login_at",
+    ),
+    "challenges": MonthlyRollup(
+        queryset=Challenge.objects.all(), facet_field="hidden"
+    ),
+    "submissions": MonthlyRollup(
+        queryset=Submission.objects.all(),
+        facet_field="phase__submission_kind",
+    ),
+    "algorithms": MonthlyRollup(
+        queryset=Algorithm.objects.all(), facet_field="public"
+    ),
+    "jobs": MonthlyRollup(
+        queryset=JobUtilization.objects.all(), duration_field="duration"
+    ),
+    "archives": MonthlyRollup(
+        queryset=Archive.objects.all(), facet_field="public"
+    ),
+    "images": MonthlyRollup(queryset=Image.objects.all()),
+    "reader_studies": MonthlyRollup(
+        queryset=ReaderStudy.objects.all(), facet_field="public"
+    ),
+    "answers": MonthlyRollup(queryset=Answer.objects.all()),
+    "sessions": MonthlyRollup(
+        queryset=Session.objects.all(), duration_field="maximum_duration"
+    ),
+}
+
+
+def update_monthly_statistics():
+    computed_at = now()
+
+    for statistic, rollup in MONTHLY_ROLLUPS.items():
+        _update_monthly_statistic(
+            statistic=statistic, rollup=rollup, computed_at=computed_at
+        )
+
+
+def _update_monthly_statistic(*, statistic, rollup, computed_at):
+    """
+    Recomputes the rollups of the open month and any changed months
+
+    A month needs recomputing when one of its rows was created or changed
+    since the last run, which covers rows that arrive late and changes to
+    the facets. Deleted rows are only removed from the open month.
+    """
+    existing = MonthlyStatistic.objects.filter(statistic=statistic)
+    last_computed_at = existing.aggregate(Max("computed_at"))[
+        "computed_at__max"
+    ]
+    queryset = rollup.queryset
+
+    if last_computed_at is not None:
+        months = {
+            timezone.localdate(computed_at).replace(day=1),
+            *queryset.filter(
+                **{f"{rollup.modified_field}__gte": last_computed_at}
+            ).dates(rollup.date_field, "month"),
+        }
+        existing = existing.filter(month__in=months)
+        queryset = queryset.filter(
+            reduce(
+                or_,
+                (
+                    Q(
+                        **{
+                            f"{rollup.date_field}__gte": _start_of_month(m),
+                            f"{rollup.date_field}__lt": _start_of_month(
+                                m + relativedelta(months=1)
+                            ),
+                        }
+                    )
+                    for m in months
+                ),
+            )
+        )
+
+    rows = (
+        queryset.annotate(
+            month=TruncMonth(rollup.date_field, output_field=DateField()),
+            facet=(
+                F(rollup.facet_field)
+                if rollup.facet_field
+                else Value("", output_field=CharField())
+            ),
+        )
+        .values("month", "facet")
+        .annotate(
+            object_count=Count("pk"),
+            duration_sum=(
+                Sum(rollup.duration_field)
+                if rollup.duration_field
+                else Value(None, output_field=DurationField())
+            ),
+        )
+        .order_by()
+    )
+
+    with transaction.atomic():
+        existing.delete()
+        MonthlyStatistic.objects.bulk_create(
+            MonthlyStatistic(
+                statistic=statistic,
+                facet=str(row["facet"]),
+                month=row["month"],
+                object_count=row["object_count"],
+                duration_sum=row["duration_sum"],
+                computed_at=computed_at,
+            )
+            for row in rows
+        )
+
+
+def _start_of_month(month):
+    return timezone.make_aware(datetime(month.year, month.month, 1))
+
+
 @acks_late_micro_short_task
 def update_site_statistics_cache():
+    update_monthly_statistics()
+
     public_challenges = Challenge.objects.filter(hidden=False)
 
     stats = {
-        "users": (
-            get_user_model()
-            .objects.filter(is_active=True, last_login__isnull=False)
-            .values(
-                "date_joined__year",
-                "date_joined__month",
-            )
-            .annotate(object_count=Count("date_joined__month"))
-            .order_by("date_joined__year", "date_joined__month")
-        ),
         "countries": (
             get_user_model()
             .objects.exclude(user_profile__country="")
@@ -52,67 +199,6 @@ def update_site_statistics_cache():
             .order_by("-country_count")
             .values_list("user_profile__country", "country_count")
         ),
-        "challenges": (
-            Challenge.objects.values(
-                "hidden", "created__year", "created__month"
-            )
-            .annotate(object_count=Count("hidden"))
-            .order_by("created__year", "created__month", "hidden")
-        ),
-        "submissions": (
-            Submission.objects.values(
-                "phase__submission_kind", "created__year", "created__month"
-            )
-            .annotate(object_count=Count("phase__submission_kind"))
-            .order_by(
-                "created__year", "created__month", "phase__submission_kind"
-            )
-        ),
-        "algorithms": (
-            Algorithm.objects.values(
-                "public", "created__year", "created__month"
-            )
-            .annotate(object_count=Count("public"))
-            .order_by("created__year", "created__month", "public")
-        ),
-        "jobs": (
-            JobUtilization.objects.values("created__year", "created__month")
-            .annotate(
-                object_count=Count("created__month"),
-                duration_sum=Sum("duration"),
-            )
-            .order_by("created__year", "created__month", "duration_sum")
-        ),
-        "archives": (
-            Archive.objects.values("public", "created__year", "created__month")
-            .annotate(object_count=Count("public"))
-            .order_by("created__year", "created__month", "public")
-        ),
-        "images": (
-            Image.objects.values("created__year", "created__month")
-            .annotate(object_count=Count("created__month"))
-            .order_by("created__year", "created__month")
-        ),
-        "reader_studies": (
-            ReaderStudy.objects.values(
-                "public", "created__year", "created__month"
-            )
-            .annotate(object_count=Count("public"))
-            .order_by("created__year", "created__month", "public")
-        ),
-        "answers": (
-            Answer.objects.values("created__year", "created__month")
-            .annotate(object_count=Count("created__month"))
-            .order_by("created__year", "created__month")
-        ),
-        "sessions": (
-            Session.objects.values("created__year", "created__month")
-            .annotate(
-                duration_sum=Sum("maximum_duration"),
-                object_count=Count("created__month"),
-            )
-            .order_by("created__year", "created__month")
-        ),
         "most_popular_challenge_group": (
             Group.objects.filter(
                 participants_of_challenge__in=public_challenges
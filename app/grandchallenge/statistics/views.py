@@ -1,3 +1,4 @@
+from collections import defaultdict
 from datetime import datetime, timedelta
 
 from django.conf import settings
@@ -16,6 +17,7 @@ from grandchallenge.charts.specs import (
     world_map,
 )
 from grandchallenge.evaluation.models import Phase
+from grandchallenge.statistics.models import MonthlyStatistic
 from grandchallenge.statistics.tasks import update_site_statistics_cache
 from grandchallenge.subdomains.utils import reverse
 from grandchallenge.workstations.models import Workstation
@@ -37,6 +39,10 @@ class StatisticsDetail(TemplateView):
             for c in challenge_list
         ]
 
+    @staticmethod
+    def _month(datum):
+        return datetime(datum.month.year, datum.month.month, 1).isoformat()
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
@@ -53,6 +59,11 @@ class StatisticsDetail(TemplateView):
             update_site_statistics_cache()
             stats = cache.get(settings.STATISTICS_SITE_CACHE_KEY)
 
+        monthly_statistics = defaultdict(list)
+
+        for datum in MonthlyStatistic.objects.order_by("month", "facet"):
+            monthly_statistics[datum.statistic].append(datum)
+
         storage_data = {}
 
         for key, value in stats.get("storage", {}).items():
@@ -69,14 +80,10 @@ class StatisticsDetail(TemplateView):
                 "users": bar(
                     values=[
                         {
-                            "Month": datetime(
-                                datum["date_joined__year"],
-                                datum["date_joined__month"],
-                                1,
-                            ).isoformat(),
-                            "New Users": datum["object_count"],
+                            "Month": self._month(datum),
+                            "New Users": datum.object_count,
                         }
-                        for datum in stats["users"]
+                        for datum in monthly_statistics["users"]
                     ],
                     lookup="New Users",
                     title="New Users per Month",
@@ -93,15 +100,11 @@ class StatisticsDetail(TemplateView):
                 "challenges": stacked_bar(
                     values=[
                         {
-                            "Month": datetime(
-                                datum["created__year"],
-                                datum["created__month"],
-                                1,
-                            ).isoformat(),
-                            "New Challenges": datum["object_count"],
-                            "Visibility": not datum["hidden"],
+                            "Month": self._month(datum),
+                            "New Challenges": datum.object_count,
+                            "Visibility": datum.facet != str(True),
                         }
-                        for datum in stats["challenges"]
+                        for datum in monthly_statistics["challenges"]
                     ],
                     lookup="New Challenges",
                     title="New Challenges per Month",
@@ -111,15 +114,11 @@ class StatisticsDetail(TemplateView):
                 "submissions": stacked_bar(
                     values=[
                         {
-                            "Month": datetime(
-                                datum["created__year"],
-                                datum["created__month"],
-                                1,
-                            ).isoformat(),
-                            "New Submissions": datum["object_count"],
-                            "Challenge Type": datum["phase__submission_kind"],
+                            "Month": self._month(datum),
+                            "New Submissions": datum.object_count,
+                            "Challenge Type": datum.facet,
                         }
-                        for datum in stats["submissions"]
+                        for datum in monthly_statistics["submissions"]
                     ],
                     lookup="New Submissions",
                     title="New Submissions per Month",
@@ -132,15 +131,11 @@ class StatisticsDetail(TemplateView):
                 "algorithms": stacked_bar(
                     values=[
                         {
-                            "Month": datetime(
-                                datum["created__year"],
-                                datum["created__month"],
-                                1,
-                            ).isoformat(),
-                            "New Algorithms": datum["object_count"],
-                            "Visibility": datum["public"],
+                            "Month": self._month(datum),
+                            "New Algorithms": datum.object_count,
+                            "Visibility": datum.facet == str(True),
                         }
-                        for datum in stats["algorithms"]
+                        for datum in monthly_statistics["algorithms"]
                     ],
                     lookup="New Algorithms",
                     title="New Algorithms per Month",
@@ -150,14 +145,10 @@ class StatisticsDetail(TemplateView):
                 "jobs": bar(
                     values=[
                         {
-                            "Month": datetime(
-                                datum["created__year"],
-                                datum["created__month"],
-                                1,
-                            ).isoformat(),
-                            "Inference Jobs": datum["object_count"],
+                            "Month": self._month(datum),
+                            "Inference Jobs": datum.object_count,
                         }
-                        for datum in stats["jobs"]
+                        for datum in monthly_statistics["jobs"]
                     ],
                     lookup="Inference Jobs",
                     title="Inference Jobs per Month",
@@ -165,19 +156,14 @@ class StatisticsDetail(TemplateView):
                 "job_durations": bar(
                     values=[
                         {
-                            "Month": datetime(
-                                datum["created__year"],
-                                datum["created__month"],
-                                1,
-                            ).isoformat(),
+                            "Month": self._month(datum),
                             "Inference Hours": (
-                                datum["duration_sum"].total_seconds()
-                                // (60 * 60)
-                                if datum["duration_sum"]
+                                datum.duration_sum.total_seconds() // (60 * 60)
+                                if datum.duration_sum
                                 else 0
                             ),
                         }
-                        for datum in stats["jobs"]
+                        for datum in monthly_statistics["jobs"]
                     ],
                     lookup="Inference Hours",
                     title="Inference Hours per Month",
@@ -185,15 +171,11 @@ class StatisticsDetail(TemplateView):
                 "archives": stacked_bar(
                     values=[
                         {
-                            "Month": datetime(
-                                datum["created__year"],
-                                datum["created__month"],
-                                1,
-                            ).isoformat(),
-                            "New Archives": datum["object_count"],
-                            "Visibility": datum["public"],
+                            "Month": self._month(datum),
+                            "New Archives": datum.object_count,
+                            "Visibility": datum.facet == str(True),
                         }
-                        for datum in stats["archives"]
+                        for datum in monthly_statistics["archives"]
                     ],
                     lookup="New Archives",
                     title="New Archives per Month",
@@ -203,14 +185,10 @@ class StatisticsDetail(TemplateView):
                 "images": bar(
                     values=[
                         {
-                            "Month": datetime(
-                                datum["created__year"],
-                                datum["created__month"],
-                                1,
-                            ).isoformat(),
-                            "New Images": datum["object_count"],
+                            "Month": self._month(datum),
+                            "New Images": datum.object_count,
                         }
-                        for datum in stats["images"]
+                        for datum in monthly_statistics["images"]
                     ],
                     lookup="New Images",
                     title="New Images per Month",
@@ -218,15 +196,11 @@ class StatisticsDetail(TemplateView):
                 "reader_studies": stacked_bar(
                     values=[
                         {
-                            "Month": datetime(
-                                datum["created__year"],
-                                datum["created__month"],
-                                1,
-                            ).isoformat(),
-                            "New Reader Studies": datum["object_count"],
-                            "Visibility": datum["public"],
+                            "Month": self._month(datum),
+                            "New Reader Studies": datum.object_count,
+                            "Visibility": datum.facet == str(True),
                         }
-                        for datum in stats["reader_studies"]
+                        for datum in monthly_statistics["reader_studies"]
                     ],
                     lookup="New Reader Studies",
                     title="New Reader Studies per Month",
@@ -236,14 +210,10 @@ class StatisticsDetail(TemplateView):
                 "answers": bar(
                     values=[
                         {
-                            "Month": datetime(
-                                datum["created__year"],
-                                datum["created__month"],
-                                1,
-                            ).isoformat(),
-                            "New Answers": datum["object_count"],
+                            "Month": self._month(datum),
+                            "New Answers": datum.object_count,
                         }
-                        for datum in stats["answers"]
+                        for datum in monthly_statistics["answers"]
                     ],
                     lookup="New Answers",
                     title="New Answers per Month",
@@ -251,23 +221,18 @@ class StatisticsDetail(TemplateView):
                 "sessions": bar(
                     values=[
                         {
-                            "Month": datetime(
-                                datum["created__year"],
-                                datum["created__month"],
-                                1,
-                            ).isoformat(),
-                            "Total Hours": datum[
-                                "duration_sum"
-                            ].total_seconds()
+                            "Month": self._month(datum),
+                            "Total Hours": datum.duration_sum.total_seconds()
                             // (60 * 60),
                         }
-                        for datum in stats["sessions"]
+                        for datum in monthly_statistics["sessions"]
                     ],
                     lookup="Total Hours",
                     title="Total Session Hours per Month",
                 ),
                 "sessions_total": sum(
-                    datum["object_count"] for datum in stats["sessions"]
+                    datum.object_count
+                    for datum in monthly_statistics["sessions"]
                 ),
                 "most_popular_challenge_group": stats.get(
                     "most_popular_challenge_group"
@@ -1,4 +1,5 @@
 import os
+from contextlib import closing
 
 import boto3
 import magic
@@ -111,7 +112,7 @@ class UserUpload(UUIDModel):
     def creators_key_prefix(self):
         # Prefix to objects that the user has uploaded
         # Do not change this
-        return f"uploads/{self.creator.pk}/"
+        return f"uploads/{self.creator_id}/"
 
     @property
     def can_upload_more(self):
@@ -321,6 +322,18 @@ class UserUpload(UUIDModel):
         body = obj["Body"]
         return body.read().decode("utf-8")
 
+    def iter_object_chunks(self):
+        obj = self._client.get_object(Bucket=self.bucket, Key=self.key)
+        yield from obj["Body"].iter_chunks()
+
+    def open_object_stream(self, *, offset=0):
+        """A forward only stream of the object from the byte offset"""
+        kwargs = {"Range": f"bytes={offset}-"} if offset else {}
+        obj = self._client.get_object(
+            Bucket=self.bucket, Key=self.key, **kwargs
+        )
+        return closing(obj["Body"])
+
 
 @receiver(post_delete, sender=UserUpload)
 def delete_objects_hook(*_, instance: UserUpload, **__):
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-17 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("utilization", "0005_jobwarmpoolutilization"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="jobutilization",
+            index=models.Index(
+                fields=["modified"], name="utilization_modifie_1fbec7_idx"
+            ),
+        ),
+    ]
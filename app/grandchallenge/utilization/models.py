@@ -152,6 +152,7 @@ class JobUtilization(ComponentJobUtilization):
         indexes = [
             models.Index(fields=["-created"]),
             models.Index(fields=["creator", "algorithm"]),
+            models.Index(fields=["modified"]),
         ]
 
     def save(self, *args, **kwargs) -> None:
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.9 on 2026-10-17 15:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("workstations", "0033_alter_workstation_logo"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="session",
+            index=models.Index(
+                fields=["modified"], name="workstation_modifie_366680_idx"
+            ),
+        ),
+    ]
@@ -449,6 +449,9 @@ class Session(FieldChangeMixin, UUIDModel):
 
     class Meta(UUIDModel.Meta):
         ordering = ("created", "creator")
+        indexes = [
+            models.Index(fields=["modified"]),
+        ]
 
     def __str__(self):
         return f"Session {self.pk}"
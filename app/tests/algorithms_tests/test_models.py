@@ -18,7 +18,13 @@ from grandchallenge.algorithms.models import (
     Job,
     get_existing_interface_for_inputs_and_outputs,
 )
-from grandchallenge.components.models import CIVData, ComponentInterface
+from grandchallenge.components.models import (
+    EMPTY_CIV_SET_FINGERPRINT,
+    CIVData,
+    ComponentInterface,
+    ComponentInterfaceValue,
+    get_civ_set_fingerprint,
+)
 from grandchallenge.components.schemas import GPUTypeChoices
 from tests.algorithms_tests.factories import (
     AlgorithmFactory,
@@ -798,6 +804,91 @@ class TestGetJobsWithSameInputs:
         )
         assert len(jobs) == 0
 
+    def test_job_with_duplicated_image_input(self):
+        alg_image = AlgorithmImageFactory()
+        ci_str = ComponentInterfaceFactory(kind=ComponentInterface.Kind.STRING)
+        ci_im = ComponentInterfaceFactory(
+            kind=ComponentInterface.Kind.PANIMG_IMAGE
+        )
+        image = ImageFactory()
+        image_civs = ComponentInterfaceValueFactory.create_batch(
+            3, interface=ci_im, image=image
+        )
+        str_civ = ComponentInterfaceValueFactory(interface=ci_str, value="foo")
+
+        j = AlgorithmJobFactory(algorithm_image=alg_image, time_limit=10)
+        j.inputs.set([image_civs[1], str_civ])
+
+        jobs = Job.objects.get_jobs_with_same_inputs(
+            inputs=[
+                CIVData(interface_slug=ci_im.slug, value=image),
+                CIVData(interface_slug=ci_str.slug, value="foo"),
+            ],
+            algorithm_image=alg_image,
+            algorithm_model=None,
+        )
+        assert [*jobs] == [j]
+
+    def test_job_without_fingerprint(
+        self, algorithm_with_image_and_model_and_two_inputs
+    ):
+        alg = algorithm_with_image_and_model_and_two_inputs.algorithm
+        civs = algorithm_with_image_and_model_and_two_inputs.civs
+        data = self.get_civ_data(civs=civs)
+
+        j = AlgorithmJobFactory(
+            algorithm_image=alg.active_image,
+            time_limit=10,
+            algorithm_interface=alg.interfaces.first(),
+        )
+        j.inputs.set(civs)
+        j2 = AlgorithmJobFactory(
+            algorithm_image=alg.active_image,
+            time_limit=10,
+            algorithm_interface=alg.interfaces.first(),
+        )
+        j2.inputs.set([*civs, ComponentInterfaceValueFactory()])
+
+        # Like the rows that existed before the fingerprints were added
+        Job.objects.filter(pk__in=[j.pk, j2.pk]).update(civ_set_fingerprint="")
+        ComponentInterfaceValue.objects.filter(
+            pk__in=[civ.pk for civ in civs]
+        ).update(content_hash="")
+
+        jobs = Job.objects.get_jobs_with_same_inputs(
+            inputs=data,
+            algorithm_image=alg.active_image,
+            algorithm_model=None,
+        )
+        assert [*jobs] == [j]
+
+
+@pytest.mark.django_db
+def test_job_civ_set_fingerprint():
+    civ1, civ2 = ComponentInterfaceValueFactory.create_batch(2)
+    job = AlgorithmJobFactory(time_limit=10)
+
+    assert job.civ_set_fingerprint == EMPTY_CIV_SET_FINGERPRINT
+
+    job.inputs.set([civ2, civ1])
+    job.refresh_from_db()
+
+    assert job.civ_set_fingerprint == get_civ_set_fingerprint(
+        civ_pks=[civ1.pk, civ2.pk]
+    )
+
+    civ1.algorithms_jobs_as_input.remove(job)
+    job.refresh_from_db()
+
+    assert job.civ_set_fingerprint == get_civ_set_fingerprint(
+        civ_pks=[civ2.pk]
+    )
+
+    job.inputs.clear()
+    job.refresh_from_db()
+
+    assert job.civ_set_fingerprint == EMPTY_CIV_SET_FINGERPRINT
+
 
 @pytest.mark.django_db
 def test_is_complimentary_set_for_editors():
@@ -5,8 +5,9 @@ import pytest
 from actstream.models import Follow
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils.timezone import now
-from guardian.shortcuts import assign_perm
+from guardian.shortcuts import assign_perm, get_perms
 
+from grandchallenge.algorithms.exceptions import TooManyJobsScheduled
 from grandchallenge.algorithms.models import AlgorithmImage, Job
 from grandchallenge.algorithms.tasks import (
     create_algorithm_jobs,
@@ -212,6 +213,40 @@ class TestCreateAlgorithmJobs:
         assert Job.objects.count() == 1
         assert len(jobs) == 0
 
+    def test_jobs_are_fingerprinted(self):
+        ai = AlgorithmImageFactory()
+        ci1 = ComponentInterfaceFactory(kind=InterfaceKindChoices.BOOL)
+        ci2 = ComponentInterfaceFactory(kind=InterfaceKindChoices.STRING)
+        interface = AlgorithmInterfaceFactory(inputs=[ci1, ci2])
+        ai.algorithm.interfaces.set([interface])
+        archive = ArchiveFactory()
+        items = ArchiveItemFactory.create_batch(2, archive=archive)
+
+        for idx, item in enumerate(items):
+            item.values.set(
+                [
+                    ComponentInterfaceValueFactory(value=True, interface=ci1),
+                    ComponentInterfaceValueFactory(
+                        value=f"foo{idx}", interface=ci2
+                    ),
+                ]
+            )
+
+        jobs = create_algorithm_jobs(
+            algorithm_image=ai,
+            archive_items=ArchiveItem.objects.all(),
+            time_limit=ai.algorithm.time_limit,
+            requires_gpu_type=ai.algorithm.job_requires_gpu_type,
+            requires_memory_gb=ai.algorithm.job_requires_memory_gb,
+            max_jobs=16,
+        )
+
+        assert len(jobs) == 2
+
+        for item in ArchiveItem.objects.all():
+            job = Job.objects.get(civ_set_fingerprint=item.civ_set_fingerprint)
+            assert {*job.inputs.all()} == {*item.values.all()}
+
     def test_extra_viewer_groups(self):
         ai = AlgorithmImageFactory()
         ci = ComponentInterface.objects.get(slug="generic-medical-image")
@@ -233,6 +268,44 @@ class TestCreateAlgorithmJobs:
         for g in groups:
             assert jobs[0].viewer_groups.filter(pk=g.pk).exists()
 
+    def test_max_jobs(self):
+        ai = AlgorithmImageFactory()
+        ci = ComponentInterface.objects.get(slug="generic-medical-image")
+        interface = AlgorithmInterfaceFactory(inputs=[ci])
+        ai.algorithm.interfaces.set([interface])
+        archive = ArchiveFactory()
+        images = ImageFactory.create_batch(3)
+        for image in images:
+            item = ArchiveItemFactory(archive=archive)
+            item.values.add(
+                ComponentInterfaceValueFactory(image=image, interface=ci)
+            )
+        group = GroupFactory()
+
+        with pytest.raises(TooManyJobsScheduled):
+            create_algorithm_jobs(
+                algorithm_image=ai,
+                archive_items=ArchiveItem.objects.order_by("created"),
+                extra_viewer_groups=[group],
+                extra_logs_viewer_groups=[group],
+                time_limit=ai.algorithm.time_limit,
+                requires_gpu_type=ai.algorithm.job_requires_gpu_type,
+                requires_memory_gb=ai.algorithm.job_requires_memory_gb,
+                max_jobs=2,
+            )
+
+        # The jobs created before the limit was reached are kept
+        jobs = Job.objects.all()
+        assert len(jobs) == 2
+
+        for job in jobs:
+            assert job.utilization.archive == archive
+            assert job.utilization.algorithm == ai.algorithm
+            assert {*get_perms(group, job)} == {"view_job", "view_logs"}
+            assert "view_image" in get_perms(group, job.inputs.get().image)
+
+        assert {job.inputs.get().image for job in jobs} == {*images[:2]}
+
 
 @pytest.mark.django_db
 def test_no_jobs_workflow(django_capture_on_commit_callbacks):
@@ -271,7 +344,9 @@ def test_jobs_workflow(django_capture_on_commit_callbacks):
             requires_memory_gb=ai.algorithm.job_requires_memory_gb,
             max_jobs=16,
         )
-    assert len(callbacks) == 2
+    # The jobs are provisioned in one group
+    assert len(callbacks) == 1
+    assert Job.objects.count() == 2
 
 
 @pytest.mark.django_db
@@ -13,7 +13,11 @@ from panimg.image_builders.metaio_utils import (
 )
 
 from grandchallenge.cases.models import Image, RawImageUploadSession
-from grandchallenge.cases.tasks import check_compressed_and_extract
+from grandchallenge.cases.tasks import (
+    InsufficientDiskSpaceException,
+    check_compressed_and_extract,
+    is_zip_file,
+)
 from grandchallenge.notifications.models import Notification
 from tests.cases_tests import RESOURCE_PATH
 from tests.factories import UploadSessionFactory
@@ -228,6 +232,37 @@ def test_check_compressed_and_extract(tmpdir):
     assert actual == expected
 
 
+@pytest.mark.parametrize(
+    "file_name,expected",
+    (
+        ("test.zip", True),
+        ("same_name_zipped.zip", True),
+        ("image10x10x10.mha", False),
+        ("deep_folder.tar", False),
+    ),
+)
+def test_is_zip_file(file_name, expected):
+    assert is_zip_file(path=RESOURCE_PATH / file_name) is expected
+
+
+def test_is_zip_file_directory(tmpdir):
+    assert is_zip_file(path=Path(tmpdir)) is False
+
+
+def test_check_compressed_and_extract_insufficient_disk_space(tmpdir, mocker):
+    tmp_file = Path(shutil.copy(str(RESOURCE_PATH / "test.zip"), str(tmpdir)))
+    mocker.patch(
+        "grandchallenge.cases.tasks.disk_usage",
+        return_value=mocker.Mock(free=0),
+    )
+
+    with pytest.raises(InsufficientDiskSpaceException):
+        check_compressed_and_extract(src_path=tmp_file, checked_paths=set())
+
+    # The archive is left in place and the partial extraction removed
+    assert [*Path(tmpdir).iterdir()] == [tmp_file]
+
+
 @pytest.mark.parametrize(
     "file_name,double_zipped",
     (("same_name.zip", False), ("same_name_zipped.zip", True)),
@@ -1,5 +1,8 @@
+import fcntl
 import gzip
 import json
+import os
+import time
 import uuid
 from io import BytesIO
 from pathlib import Path
@@ -13,12 +16,14 @@ from django.conf import settings
 from django.core.exceptions import MultipleObjectsReturned
 from django.core.files import File
 
+from grandchallenge.cases.image_cache import _LOCK_FILE_NAME
 from grandchallenge.cases.models import (
     DICOMImageSet,
     Image,
     JobSummary,
     generate_dicom_id_suffix,
 )
+from grandchallenge.core.metrics import pop_metrics
 from grandchallenge.notifications.models import Notification
 from tests.cases_tests.factories import (
     DICOMImageSetFactory,
@@ -113,6 +118,68 @@ class TestGetSitkImage:
             exec_info.value.args[0]
         )
 
+    def test_sitk_image_is_cached(self, settings, tmp_path):
+        settings.IMAGE_CACHE_DIRECTORY = tmp_path
+        image = ImageFactoryWithImageFile()
+        metric_names = [
+            "cases.image_cache.hits",
+            "cases.image_cache.misses",
+            "cases.image_cache.bytes_saved",
+        ]
+        pop_metrics(names=metric_names)
+
+        assert image.sitk_image.GetSize() == (3, 4)
+
+        # Cache hits do not need the storage backend
+        for imagefile in image.files.all():
+            imagefile.file.storage.delete(imagefile.file.name)
+
+        assert image.sitk_image.GetSize() == (3, 4)
+        assert pop_metrics(names=metric_names) == {
+            "cases.image_cache.hits": 1,
+            "cases.image_cache.misses": 1,
+            "cases.image_cache.bytes_saved": sum(
+                f.size_in_storage for f in image.files.all()
+            ),
+        }
+
+    def test_image_cache_eviction(self, settings, tmp_path):
+        settings.IMAGE_CACHE_DIRECTORY = tmp_path
+        settings.IMAGE_CACHE_MAX_BYTES = 1
+        image = ImageFactoryWithImageFile()
+
+        assert image.sitk_image.GetSize() == (3, 4)
+
+        # The entry is evicted once it is no longer in use
+        assert [*tmp_path.iterdir()] == []
+
+    def test_image_cache_removes_stale_directories(self, settings, tmp_path):
+        settings.IMAGE_CACHE_DIRECTORY = tmp_path
+        settings.IMAGE_CACHE_MAX_BYTES = 1024
+        stale = time.time() - 60 * 60
+
+        for name in [".staging-dead", ".evicted-dead", ".staging-locked"]:
+            (tmp_path / name).mkdir()
+            (tmp_path / name / _LOCK_FILE_NAME).touch()
+            (tmp_path / name / "image.mha").write_bytes(b"0" * 1024)
+            os.utime(tmp_path / name, (stale, stale))
+
+        # Directories that are still being filled are kept
+        (tmp_path / ".staging-new").mkdir()
+
+        with open(tmp_path / ".staging-locked" / _LOCK_FILE_NAME, "rb") as f:
+            fcntl.flock(f, fcntl.LOCK_SH)
+
+            image = ImageFactoryWithImageFile()
+            assert image.sitk_image.GetSize() == (3, 4)
+
+        # The locked staging directory still counts towards the size,
+        # so the new entry is evicted
+        assert {p.name for p in tmp_path.iterdir()} == {
+            ".staging-locked",
+            ".staging-new",
+        }
+
     def test_correct_dimensions(self):
         image = ImageFactoryWithImageFile()
         sitk_image = image.sitk_image
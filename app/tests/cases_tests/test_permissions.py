@@ -1,12 +1,17 @@
 import pytest
 from django.conf import settings
 from django.contrib.auth.models import Group
-from guardian.shortcuts import get_perms
+from django.core.management import call_command
+from guardian.shortcuts import assign_perm, get_perms
 
+from grandchallenge.cases.models import ImageObjectPermissionIndex
+from grandchallenge.cases.tasks import update_image_viewer_groups_permissions
+from grandchallenge.core.guardian import check_obj_perms_index
 from tests.algorithms_tests.factories import AlgorithmJobFactory
 from tests.archives_tests.factories import ArchiveFactory, ArchiveItemFactory
 from tests.components_tests.factories import ComponentInterfaceValueFactory
-from tests.factories import ImageFactory
+from tests.evaluation_tests.test_permissions import get_groups_with_set_perms
+from tests.factories import GroupFactory, ImageFactory
 from tests.reader_studies_tests.factories import (
     DisplaySetFactory,
     ReaderStudyFactory,
@@ -192,3 +197,65 @@ def test_view_permission_when_reused(
 
     for g in job.viewer_groups.all():
         assert ("view_image" in get_perms(g, im)) is in_job
+
+
+@pytest.mark.django_db
+def test_update_image_viewer_groups_permissions(settings):
+    settings.GUARDIAN_PERMISSION_INDEX_MODELS = {"cases.Image"}
+
+    archive_item = ArchiveItemFactory()
+    display_set = DisplaySetFactory()
+    images = ImageFactory.create_batch(3)
+    extra_group = GroupFactory()
+
+    archive_item.values.add(ComponentInterfaceValueFactory(image=images[0]))
+    display_set.values.add(ComponentInterfaceValueFactory(image=images[1]))
+
+    for image in images:
+        assign_perm("view_image", extra_group, image)
+
+    update_image_viewer_groups_permissions(
+        image_pks=[str(image.pk) for image in images]
+    )
+
+    archive = archive_item.archive
+    reader_study = display_set.reader_study
+
+    assert get_groups_with_set_perms(images[0]) == {
+        archive.editors_group: {"view_image"},
+        archive.uploaders_group: {"view_image"},
+        archive.users_group: {"view_image"},
+    }
+    assert get_groups_with_set_perms(images[1]) == {
+        reader_study.editors_group: {"view_image"},
+        reader_study.readers_group: {"view_image"},
+    }
+    assert get_groups_with_set_perms(images[2]) == {}
+    assert check_obj_perms_index(index_model=ImageObjectPermissionIndex) == (
+        0,
+        0,
+    )
+
+
+@pytest.mark.django_db
+def test_update_image_viewer_groups_permissions_command(mocker):
+    images = ImageFactory.create_batch(3)
+    mocker.patch(
+        "grandchallenge.cases.management.commands.update_image_viewer_groups_permissions.VIEWER_GROUPS_PERMISSIONS_CHUNK_SIZE",
+        2,
+    )
+    apply_async = mocker.patch.object(
+        update_image_viewer_groups_permissions, "apply_async"
+    )
+
+    call_command("update_image_viewer_groups_permissions")
+
+    # One task is scheduled per chunk of images
+    chunks = [
+        call.kwargs["kwargs"]["image_pks"]
+        for call in apply_async.call_args_list
+    ]
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert {pk for chunk in chunks for pk in chunk} == {
+        str(image.pk) for image in images
+    }
@@ -20,6 +20,7 @@ from grandchallenge.cases.models import (
     JobSummary,
     PostProcessImageTask,
     PostProcessImageTaskStatusChoices,
+    image_file_path,
 )
 from grandchallenge.cases.tasks import (
     POST_PROCESSORS,
@@ -37,7 +38,10 @@ from grandchallenge.core.celery import acks_late_micro_short_task
 from grandchallenge.core.storage import protected_s3_storage
 from tests.algorithms_tests.factories import AlgorithmJobFactory
 from tests.cases_tests import RESOURCE_PATH
-from tests.cases_tests.factories import DICOMImageSetUploadFactory
+from tests.cases_tests.factories import (
+    DICOMImageSetUploadFactory,
+    RawImageUploadSessionFactory,
+)
 from tests.components_tests.factories import ComponentInterfaceFactory
 from tests.factories import ImageFactory
 from tests.utils import create_raw_upload_image_session
@@ -596,3 +600,70 @@ def test_handle_health_imaging_import_job_event_marks_job_as_failed_on_validatio
     assert obj.error_message == "One or more of the inputs failed validation."
     assert "An unexpected error occurred" in str(obj.detailed_error_message)
     assert "some_async_task" not in str(callbacks)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("bulk_store", (True, False))
+def test_import_images_storage_paths_are_equivalent(
+    tmpdir_factory, django_capture_on_commit_callbacks, bulk_store
+):
+    input_directory = tmpdir_factory.mktemp("temp")
+    for filename in ("image10x10x10.mhd", "image10x10x10.zraw", "no_dzi.tif"):
+        shutil.copy(RESOURCE_PATH / filename, input_directory / filename)
+
+    with django_capture_on_commit_callbacks():
+        result = import_images(
+            input_directory=input_directory, bulk_store=bulk_store
+        )
+
+    assert len(result.new_images) == 2
+
+    image_files = ImageFile.objects.filter(image__in=result.new_images)
+
+    assert len(image_files) == 3
+    assert {f.image_type for f in image_files} == {
+        ImageFile.IMAGE_TYPE_MHD,
+        ImageFile.IMAGE_TYPE_TIFF,
+    }
+
+    for image_file in image_files:
+        assert protected_s3_storage.exists(image_file.file.name)
+        assert image_file.size_in_storage == image_file.file.size
+        assert image_file.file.name.startswith(
+            f"images/{str(image_file.image.pk)[0:2]}/"
+        )
+
+    assert (
+        PostProcessImageTask.objects.filter(
+            image__in=result.new_images
+        ).count()
+        == 1
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_store_images(tmpdir_factory, django_capture_on_commit_callbacks):
+    input_directory = tmpdir_factory.mktemp("temp")
+    for filename in ("image10x10x10.mhd", "image10x10x10.zraw"):
+        shutil.copy(RESOURCE_PATH / filename, input_directory / filename)
+
+    session = RawImageUploadSessionFactory()
+
+    with django_capture_on_commit_callbacks():
+        import_images(
+            input_directory=input_directory, origin=session, bulk_store=True
+        )
+
+    image = Image.objects.get()
+
+    assert image.origin == session
+
+    image_files = ImageFile.objects.filter(image=image)
+
+    assert len(image_files) == 2
+
+    for image_file in image_files:
+        assert image_file.file.name == image_file_path(
+            instance=image_file, filename=Path(image_file.file.name).name
+        )
+        assert protected_s3_storage.exists(image_file.file.name)
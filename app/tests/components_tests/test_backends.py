@@ -4,6 +4,8 @@ import hmac
 import io
 import json
 import os
+import subprocess
+import sys
 from datetime import timedelta
 from unittest.mock import Mock
 from uuid import uuid4
@@ -20,10 +22,18 @@ from grandchallenge.components.backends.base import (
     ASYNC_BOTO_CONFIG,
     ASYNC_CONCURRENCY,
     InferenceResult,
+    s3_download_bounded_file,
     s3_stream_response,
 )
 from grandchallenge.components.backends.docker_client import _get_cpuset_cpus
-from grandchallenge.components.backends.exceptions import ComponentException
+from grandchallenge.components.backends.exceptions import (
+    ComponentException,
+    ObjectTooLarge,
+)
+from grandchallenge.components.backends.local import (
+    INFERENCE_SCRIPT,
+    LocalExecutor,
+)
 from grandchallenge.components.backends.utils import (
     _filter_members,
     user_error,
@@ -271,8 +281,9 @@ def test_invocation_json(settings):
     prefixed_image_civ = image_interface.create_instance(
         image=ImageFileFactory().image
     )
-    prefixed_file_civ = file_interface.create_instance(value=1337)
-    prefixed_value_civ = value_interface.create_instance(value="foo")
+    # Different values, identical ones would reuse the same CIVs
+    prefixed_file_civ = file_interface.create_instance(value=1338)
+    prefixed_value_civ = value_interface.create_instance(value="bar")
 
     executor.provision(
         input_civs=[
@@ -474,6 +485,50 @@ async def test_s3_stream_response_aborts_on_stream_error(settings):
         assert status_code == 404
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "max_size,expected_error", ((11, None), (10, ObjectTooLarge))
+)
+async def test_s3_download_bounded_file_is_size_bounded(
+    settings, tmp_path, max_size, expected_error
+):
+    semaphore = asyncio.Semaphore(ASYNC_CONCURRENCY)
+    session = aioboto3.Session()
+
+    key = f"test-{uuid4()}"
+    bucket = settings.COMPONENTS_OUTPUT_BUCKET_NAME
+    content = b'{"a": 1.5}\n'
+    filename = tmp_path / "output" / "result.json"
+
+    async with session.client(
+        "s3",
+        endpoint_url=settings.AWS_S3_ENDPOINT_URL,
+        config=ASYNC_BOTO_CONFIG,
+    ) as s3_client:
+        await s3_client.put_object(Bucket=bucket, Key=key, Body=content)
+
+        if expected_error:
+            with pytest.raises(expected_error):
+                await s3_download_bounded_file(
+                    bucket=bucket,
+                    key=key,
+                    filename=filename,
+                    max_size=max_size,
+                    semaphore=semaphore,
+                    s3_client=s3_client,
+                )
+        else:
+            await s3_download_bounded_file(
+                bucket=bucket,
+                key=key,
+                filename=filename,
+                max_size=max_size,
+                semaphore=semaphore,
+                s3_client=s3_client,
+            )
+            assert filename.read_bytes() == content
+
+
 def normalize_partial(partial):
     keywords = dict(partial.keywords)
 
@@ -855,3 +910,96 @@ def test_invocation_results_signature_verified(settings):
     )
 
     assert executor._get_inference_result() == inference_result
+
+
+def test_local_executor(settings):
+    settings.COMPONENTS_LOCAL_EXECUTOR_INFERENCE_SECONDS = 0
+
+    job_pk = uuid4()
+    executor = LocalExecutor(
+        job_id=f"algorithms-job-{job_pk}-00",
+        exec_image_repo_tag="test",
+        memory_limit=4,
+        time_limit=100,
+        requires_gpu_type=GPUTypeChoices.NO_GPU,
+        use_warm_pool=False,
+        signing_key=b"correct-key",
+    )
+
+    job_params = LocalExecutor.get_job_params(
+        job_name=LocalExecutor.get_job_name(
+            event={"job_name": executor._job_id}
+        )
+    )
+    assert job_params.pk == str(job_pk)
+    assert job_params.app_label == "algorithms"
+    assert job_params.model_name == "job"
+    assert job_params.attempt == 0
+
+    executor._s3_client.upload_fileobj(
+        Fileobj=io.BytesIO(b"{}"),
+        Bucket=settings.COMPONENTS_INPUT_BUCKET_NAME,
+        Key=f"{executor._io_prefix}/input/input.json",
+    )
+    executor._s3_client.upload_fileobj(
+        Fileobj=io.BytesIO(
+            json.dumps(
+                [
+                    {
+                        "inputs": [
+                            {
+                                "relative_path": "input.json",
+                                "bucket_name": settings.COMPONENTS_INPUT_BUCKET_NAME,
+                                "bucket_key": f"{executor._io_prefix}/input/input.json",
+                            }
+                        ],
+                        "output_prefix": f"{executor._io_prefix}/output",
+                    }
+                ]
+            ).encode("utf-8")
+        ),
+        Bucket=settings.COMPONENTS_INPUT_BUCKET_NAME,
+        Key=executor._invocation_key,
+    )
+
+    process = subprocess.run(
+        [sys.executable, str(INFERENCE_SCRIPT)],
+        input=json.dumps(executor._inference_config),
+        text=True,
+        capture_output=True,
+    )
+
+    executor.handle_event(
+        event={
+            "job_name": executor._job_id,
+            "start_time": "2026-01-01T00:00:00+00:00",
+            "stop_time": "2026-01-01T00:00:02+00:00",
+            "return_code": process.returncode,
+            "stdout": process.stdout,
+            "stderr": process.stderr,
+        }
+    )
+
+    assert executor.utilization_duration == timedelta(seconds=2)
+    assert executor.stdout == "Copying input.json"
+    assert executor.exec_duration is not None
+
+    for output in ("input.json", "results.json", "metrics.json"):
+        executor._s3_client.head_object(
+            Bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME,
+            Key=f"{executor._io_prefix}/output/{output}",
+        )
+
+    with pytest.raises(ComponentException) as error:
+        executor.handle_event(
+            event={
+                "job_name": executor._job_id,
+                "start_time": "2026-01-01T00:00:00+00:00",
+                "stop_time": "2026-01-01T00:00:02+00:00",
+                "return_code": 1,
+                "stdout": "",
+                "stderr": "Traceback\nValueError: Oops",
+            }
+        )
+
+    assert str(error.value) == "ValueError: Oops"
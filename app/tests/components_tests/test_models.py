@@ -1,3 +1,4 @@
+import io
 import json
 import uuid
 from contextlib import nullcontext
@@ -23,8 +24,12 @@ from grandchallenge.components.models import (
     ImportStatusChoices,
     InterfaceKindChoices,
     InterfaceKinds,
+    get_file_content_hash,
+)
+from grandchallenge.components.schemas import (
+    INTERFACE_VALUE_SCHEMA,
+    get_component_json_validator,
 )
-from grandchallenge.components.schemas import INTERFACE_VALUE_SCHEMA
 from grandchallenge.components.tasks import (
     delete_container_image,
     remove_container_image_from_registry,
@@ -33,6 +38,7 @@ from grandchallenge.core.storage import (
     private_s3_storage,
     protected_s3_storage,
 )
+from grandchallenge.core.utils.json_streams import JSONItemTooLargeError
 from grandchallenge.reader_studies.models import Question
 from grandchallenge.uploads.models import UserUpload
 from tests.algorithms_tests.factories import (
@@ -842,6 +848,87 @@ def test_extra_schema_validation(kind, value, invalidation_schema, use_file):
         v.full_clean()
 
 
+@pytest.mark.django_db
+def test_component_json_validator_registry():
+    i = ComponentInterfaceFactory(kind=InterfaceKindChoices.INTEGER)
+
+    validator = get_component_json_validator(
+        component_interface=i, required=True
+    )
+
+    assert (
+        get_component_json_validator(
+            component_interface=ComponentInterface.objects.get(pk=i.pk),
+            required=True,
+        )
+        is validator
+    )
+
+    i.schema = {"type": "number", "minimum": 2}
+    i.save()
+
+    assert (
+        get_component_json_validator(component_interface=i, required=True)
+        is not validator
+    )
+
+    with pytest.raises(ValidationError) as error:
+        i.validate_many_against_schema(values=[1, 2, 3, "4"])
+
+    assert [m.split(":")[0] for m in error.value.messages] == [
+        "Item 0",
+        "Item 3",
+    ]
+    assert "less than the minimum of 2" in error.value.messages[0]
+
+
+@pytest.mark.django_db
+def test_file_json_values_are_streamed(settings):
+    i = ComponentInterfaceFactory(
+        kind=InterfaceKindChoices.MULTIPLE_POINTS, store_in_database=False
+    )
+    value = {
+        "type": "Multiple points",
+        "points": [{"point": [n, n, n]} for n in range(100)],
+        "version": {"major": 1, "minor": 0},
+    }
+    content = json.dumps(value, indent=2).encode("utf-8")
+
+    civ = ComponentInterfaceValue.objects.create(interface=i)
+    civ.file.save("test.json", ContentFile(content), save=False)
+    civ.full_clean()
+
+    assert civ.size_in_storage == len(content)
+    assert civ.content_hash == get_file_content_hash([content])
+
+    civ.save()
+    civ.refresh_from_db()
+
+    assert civ.content_hash == get_file_content_hash([content])
+
+    value["points"][73]["point"] = [1, 2]
+    invalid_civ = ComponentInterfaceValue(
+        interface=i,
+        file=ContentFile(json.dumps(value).encode("utf-8"), name="test.json"),
+    )
+
+    with pytest.raises(ValidationError):
+        invalid_civ.full_clean()
+
+    settings.COMPONENTS_MAXIMUM_JSON_ITEM_SIZE = 64
+    value["points"][73]["point"] = [1, 2, 3]
+    value["points"][73]["name"] = "a" * 128
+    large_item_civ = ComponentInterfaceValue(
+        interface=i,
+        file=ContentFile(json.dumps(value).encode("utf-8"), name="test.json"),
+    )
+
+    with pytest.raises(ValidationError) as error:
+        large_item_civ.full_clean()
+
+    assert "The file was too large to process" in str(error.value)
+
+
 def test_runtime_metrics_chart():
     job = Job(
         runtime_metrics={
@@ -1765,6 +1852,105 @@ def test_component_interface_value_manager():
     assert not created
 
 
+@pytest.mark.django_db
+def test_create_instance_reuses_civs_with_same_content():
+    value_ci = ComponentInterfaceFactory(
+        kind=InterfaceKindChoices.ANY, store_in_database=True
+    )
+    file_ci = ComponentInterfaceFactory(
+        kind=InterfaceKindChoices.ANY,
+        store_in_database=False,
+        relative_path="file.json",
+    )
+
+    value_civ = value_ci.create_instance(value={"b": 1, "a": [True]})
+    file_civ = file_ci.create_instance(value={"a": 1})
+
+    assert value_civ.content_hash.startswith("value:sha256:")
+    assert file_civ.content_hash.startswith("file:sha256:")
+    assert file_civ.content_hash == file_civ.calculate_content_hash()
+
+    assert value_ci.create_instance(value={"a": [True], "b": 1}) == value_civ
+    assert file_ci.create_instance(value={"a": 1}) == file_civ
+    assert file_ci.create_instance(value={"a": 2}) != file_civ
+
+    # The same value on another interface is another CIV
+    other_civ = ComponentInterfaceFactory(
+        kind=InterfaceKindChoices.ANY, store_in_database=True
+    ).create_instance(value={"b": 1, "a": [True]})
+
+    assert other_civ != value_civ
+    assert other_civ.content_hash == value_civ.content_hash
+
+
+@pytest.mark.django_db
+def test_create_instance_from_object(settings):
+    ci = ComponentInterfaceFactory(
+        kind=InterfaceKindChoices.ANY,
+        store_in_database=False,
+        relative_path="file.json",
+        schema={"type": "array", "items": {"type": "integer"}, "maxItems": 3},
+    )
+    s3_client = protected_s3_storage.connection.meta.client
+    key = f"{uuid.uuid4()}/file.json"
+
+    s3_client.upload_fileobj(
+        Fileobj=io.BytesIO(b"[1, 2, 3]"),
+        Bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME,
+        Key=key,
+    )
+
+    civ = ci.create_instance_from_object(
+        bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME, key=key
+    )
+
+    assert civ.file.read() == b"[1, 2, 3]"
+    assert civ.size_in_storage == 9
+    assert civ.content_hash == civ.calculate_content_hash()
+    assert (
+        ci.create_instance_from_object(
+            bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME, key=key
+        )
+        == civ
+    )
+
+    s3_client.upload_fileobj(
+        Fileobj=io.BytesIO(b"[1, 2, 3, 4]"),
+        Bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME,
+        Key=key,
+    )
+
+    with pytest.raises(ValidationError) as error:
+        ci.create_instance_from_object(
+            bucket=settings.COMPONENTS_OUTPUT_BUCKET_NAME, key=key
+        )
+
+    assert "is too long" in str(error.value)
+    assert "StreamedJSONArray" not in str(error.value)
+    assert ComponentInterfaceValue.objects.filter(interface=ci).count() == 1
+
+
+@pytest.mark.django_db
+def test_saving_file_civs_does_not_read_the_file():
+    ci = ComponentInterfaceFactory(
+        kind=InterfaceKindChoices.ANY,
+        store_in_database=False,
+        relative_path="file.json",
+    )
+    civ = ComponentInterfaceValueFactory(
+        interface=ci, file=ContentFile(b"{}", name="file.json")
+    )
+
+    # Files that were not hashed when they were created are left for the
+    # backfill
+    assert civ.content_hash == ""
+
+    civ.file.storage.delete(civ.file.name)
+    civ.save()
+
+    assert civ.content_hash == ""
+
+
 @pytest.mark.parametrize(
     "mock_error, expected_error, msg",
     (
@@ -1774,6 +1960,11 @@ def test_component_interface_value_manager():
             ValidationError,
             "The file was too large",
         ),
+        (
+            JSONItemTooLargeError,
+            ValidationError,
+            "The file was too large",
+        ),
         (
             TimeLimitExceeded,
             ValidationError,
@@ -1809,7 +2000,7 @@ def test_validate_user_upload_resource_error_handling(
         is_completed = True
 
         @classmethod
-        def read_object(cls, *_, **__):
+        def open_object_stream(cls, *_, **__):
             if mock_error is UnicodeDecodeError:
                 # Requires some args
                 raise mock_error("foo", b"", 0, 1, "bar")
@@ -1832,8 +2023,8 @@ def test_validate_user_upload_json_decode_error_handling():
         is_completed = True
 
         @classmethod
-        def read_object(cls, *_, **__):
-            return '{"foo": "bar"'  # invalid json
+        def open_object_stream(cls, *_, **__):
+            return nullcontext(io.BytesIO(b'{"foo": "bar"'))  # invalid json
 
     with pytest.raises(ValidationError) as err:
         civ.validate_user_upload(user_upload=MockUserUpload)
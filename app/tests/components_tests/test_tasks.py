@@ -1,7 +1,9 @@
 import json
+import tarfile
 import uuid
 from contextlib import nullcontext
 from pathlib import Path
+from tempfile import TemporaryFile
 from unittest.mock import call, patch
 
 import pytest
@@ -1063,10 +1065,18 @@ def test_get_image_config_and_sha256(container_image_file):
     with open(resource_dir / container_image_file, "rb") as f:
         ai.image.save(container_image_file, ContentFile(f.read()))
 
-    assert (
-        _get_image_config_and_sha256(instance=ai)["image_sha256"]
-        == "1bf4ef3c617a6f34a728ec2a5cff1b1dcb926d2d0b93c5bccd830a7918d833da"
-    )
+    with TemporaryFile() as decompressed_tarball:
+        assert (
+            _get_image_config_and_sha256(
+                instance=ai, out_fileobj=decompressed_tarball
+            )["image_sha256"]
+            == "1bf4ef3c617a6f34a728ec2a5cff1b1dcb926d2d0b93c5bccd830a7918d833da"
+        )
+
+        decompressed_tarball.seek(0)
+
+        with tarfile.open(fileobj=decompressed_tarball, mode="r:") as t:
+            assert "manifest.json" in t.getnames()
 
 
 @pytest.mark.parametrize(
@@ -9,14 +9,17 @@ from guardian.core import ObjectPermissionChecker
 from guardian.shortcuts import assign_perm, remove_perm
 from guardian.utils import get_anonymous_user
 
+from grandchallenge.cases.models import Image, ImageObjectPermissionIndex
 from grandchallenge.core.guardian import (
     ObjectPermissionCheckerMixin,
     ObjectPermissionRequiredMixin,
     ViewObjectPermissionListMixin,
+    check_obj_perms_index,
     filter_by_permission,
+    update_obj_perms_index,
 )
 from grandchallenge.reader_studies.models import Answer
-from tests.factories import GroupFactory, UserFactory
+from tests.factories import GroupFactory, ImageFactory, UserFactory
 from tests.reader_studies_tests.factories import AnswerFactory
 
 
@@ -460,3 +463,137 @@ def test_unique_objects_returned_with_dual_access():
         ).count()
         == 1
     )
+
+
+@pytest.mark.django_db
+def test_filter_by_permission_index(settings):
+    settings.GUARDIAN_PERMISSION_INDEX_MODELS = {"cases.Image"}
+
+    user, other_user = UserFactory.create_batch(2)
+    group = GroupFactory()
+    image, other_image = ImageFactory.create_batch(2)
+    queryset = Image.objects.all()
+    codename = "view_image"
+
+    def visible_images():
+        return {
+            *filter_by_permission(
+                queryset=queryset, user=user, codename=codename
+            )
+        }
+
+    assert visible_images() == set()
+
+    assign_perm(codename, user, image)
+    # Has user permission
+    assert visible_images() == {image}
+
+    assign_perm(codename, group, image)
+    assign_perm(codename, group, other_image)
+    # Not a member of the group yet
+    assert visible_images() == {image}
+
+    group.user_set.add(user, other_user)
+    # Has both user and group permission
+    assert visible_images() == {image, other_image}
+
+    remove_perm(codename, user, image)
+    # Has group permission
+    assert visible_images() == {image, other_image}
+
+    user.groups.remove(group)
+    # Has no permission again
+    assert visible_images() == set()
+
+    group.user_set.add(user)
+    assign_perm(codename, user, image)
+    group.user_set.clear()
+    # Only has user permission
+    assert visible_images() == {image}
+
+    assert check_obj_perms_index(index_model=ImageObjectPermissionIndex) == (
+        0,
+        0,
+    )
+
+
+@pytest.mark.django_db
+def test_obj_perms_index_not_maintained_when_disabled(settings):
+    settings.GUARDIAN_PERMISSION_INDEX_MODELS = set()
+
+    user = UserFactory()
+    group = GroupFactory()
+    image = ImageFactory()
+
+    group.user_set.add(user)
+    assign_perm("view_image", user, image)
+    assign_perm("view_image", group, image)
+
+    assert not ImageObjectPermissionIndex.objects.exists()
+
+
+@pytest.mark.django_db
+def test_obj_perms_index_membership_change_only_updates_group(settings):
+    settings.GUARDIAN_PERMISSION_INDEX_MODELS = {"cases.Image"}
+
+    user = UserFactory()
+    group, other_group = GroupFactory.create_batch(2)
+    image, other_image = ImageFactory.create_batch(2)
+
+    assign_perm("view_image", group, image)
+    assign_perm("view_image", other_group, other_image)
+    other_group.user_set.add(user)
+
+    # Drift in the entries for the other group is left alone
+    ImageObjectPermissionIndex.objects.filter(
+        content_object=other_image
+    ).delete()
+
+    user.groups.add(group)
+
+    assert {
+        *ImageObjectPermissionIndex.objects.filter(user=user).values_list(
+            "content_object", flat=True
+        )
+    } == {image.pk}
+
+    group.user_set.remove(user)
+
+    assert not ImageObjectPermissionIndex.objects.filter(user=user).exists()
+
+
+@pytest.mark.django_db
+def test_check_obj_perms_index(settings):
+    settings.GUARDIAN_PERMISSION_INDEX_MODELS = {"cases.Image"}
+
+    user = UserFactory()
+    group = GroupFactory()
+    image = ImageFactory()
+
+    group.user_set.add(user)
+    assign_perm("view_image", group, image)
+
+    assert check_obj_perms_index(index_model=ImageObjectPermissionIndex) == (
+        0,
+        0,
+    )
+
+    entry = ImageObjectPermissionIndex.objects.get()
+    entry.delete()
+    ImageObjectPermissionIndex.objects.create(
+        user=UserFactory(),
+        permission=entry.permission,
+        content_object=image,
+    )
+
+    assert check_obj_perms_index(index_model=ImageObjectPermissionIndex) == (
+        1,
+        1,
+    )
+
+    update_obj_perms_index(index_model=ImageObjectPermissionIndex)
+
+    assert check_obj_perms_index(index_model=ImageObjectPermissionIndex) == (
+        0,
+        0,
+    )
@@ -0,0 +1,66 @@
+import io
+import json
+from contextlib import nullcontext
+
+import pytest
+
+from grandchallenge.core.utils import json_streams
+from grandchallenge.core.utils.json_streams import (
+    JSONItemTooLargeError,
+    StreamedJSONArray,
+    load_streamed_json,
+)
+
+
+def _get_open_stream(content):
+    def open_stream(*, offset):
+        return nullcontext(io.BytesIO(content[offset:]))
+
+    return open_stream
+
+
+def _materialize(value):
+    if isinstance(value, StreamedJSONArray):
+        return [_materialize(item) for item in value]
+    elif isinstance(value, dict):
+        return {k: _materialize(v) for k, v in value.items()}
+    else:
+        return value
+
+
+@pytest.mark.parametrize("chunk_size", (1, 2, 3, 5, 8, 1024))
+@pytest.mark.parametrize(
+    "content",
+    (
+        '{"points": [{"point": [1, 2.5, -3e-2]}, {"name": "\\u00e9"}], "a": 1}',
+        '[0.5E-3, true, null, -Infinity, "\\ud83d\\ude00", [1, [2]], {}]',
+        '"text"',
+        "-1.25e-10",
+        "[]",
+    ),
+)
+def test_load_streamed_json(monkeypatch, chunk_size, content):
+    monkeypatch.setattr(json_streams, "CHUNK_SIZE", chunk_size)
+    encoded = content.encode("utf-8")
+
+    document = load_streamed_json(open_stream=_get_open_stream(encoded))
+
+    assert _materialize(document.value) == json.loads(content)
+    assert document.size == len(encoded)
+
+
+@pytest.mark.parametrize("chunk_size", (7, 1024))
+def test_load_streamed_json_syntax_error(settings, monkeypatch, chunk_size):
+    settings.COMPONENTS_MAXIMUM_JSON_ITEM_SIZE = 64
+    monkeypatch.setattr(json_streams, "CHUNK_SIZE", chunk_size)
+    content = '{"points": [1, 2, x, ' + ", ".join(["1"] * 1000) + "]}"
+
+    with pytest.raises(json.JSONDecodeError) as error:
+        load_streamed_json(open_stream=_get_open_stream(content.encode()))
+
+    assert str(error.value) == "Expecting value: line 1 column 19 (char 18)"
+
+    with pytest.raises(JSONItemTooLargeError):
+        load_streamed_json(
+            open_stream=_get_open_stream(json.dumps(["a" * 128]).encode())
+        )
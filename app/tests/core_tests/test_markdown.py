@@ -1,9 +1,15 @@
 import textwrap
+from uuid import uuid4
 
 import pytest
+from django.utils.safestring import SafeString
 from markdown import markdown
 
-from grandchallenge.core.templatetags.bleach import md2html
+from grandchallenge.core.templatetags.bleach import (
+    _local_md2html_cache,
+    md2html,
+    pop_md2html_cache_metrics,
+)
 
 
 @pytest.mark.parametrize(
@@ -244,3 +250,28 @@ def test_extend_html_tag_classes(html, expected_output, settings):
     )
 
     assert output == expected_output
+
+
+def test_md2html_is_cached(settings):
+    text = f"# {uuid4()}"
+    pop_md2html_cache_metrics()
+
+    html = md2html(text)
+
+    assert md2html(text) == html
+
+    _local_md2html_cache.clear()
+    cached_html = md2html(text)
+
+    assert cached_html == html
+    assert isinstance(cached_html, SafeString)
+
+    # The cache depends on the settings
+    settings.BLEACH_ALLOWED_TAGS = ["p"]
+
+    assert md2html(text) != html
+
+    metrics = pop_md2html_cache_metrics()
+
+    assert metrics["hits"] == 1
+    assert metrics["misses"] == 2
@@ -1,8 +1,11 @@
 import pytest
 
 from grandchallenge.algorithms.models import AlgorithmImage
+from grandchallenge.core.metrics import pop_metrics
 from grandchallenge.core.tasks import _get_metrics
+from grandchallenge.core.templatetags.bleach import pop_md2html_cache_metrics
 from grandchallenge.evaluation.models import Method
+from grandchallenge.serving.utils import pop_image_access_grant_metrics
 from tests.algorithms_tests.factories import (
     AlgorithmImageFactory,
     AlgorithmJobFactory,
@@ -37,6 +40,17 @@ def test_get_metrics():
     s.status = s.SUCCESS
     s.save()
 
+    # Reset the counters left behind by other tests
+    pop_image_access_grant_metrics()
+    pop_md2html_cache_metrics()
+    pop_metrics(
+        names=[
+            "cases.image_cache.hits",
+            "cases.image_cache.misses",
+            "cases.image_cache.bytes_saved",
+        ]
+    )
+
     # Note, this is the format expected by CloudWatch,
     # consult the API when changing this
     result = _get_metrics()
@@ -261,4 +275,59 @@ def test_get_metrics():
                 },
             ],
         },
+        {
+            "Namespace": "testserver/cases",
+            "MetricData": [
+                {
+                    "MetricName": "ImageCacheHits",
+                    "Value": 0,
+                    "Unit": "Count",
+                },
+                {
+                    "MetricName": "ImageCacheMisses",
+                    "Value": 0,
+                    "Unit": "Count",
+                },
+                {
+                    "MetricName": "ImageCacheBytesSaved",
+                    "Value": 0,
+                    "Unit": "Bytes",
+                },
+            ],
+        },
+        {
+            "Namespace": "testserver/serving",
+            "MetricData": [
+                {
+                    "MetricName": "ImageAccessGrantCacheHits",
+                    "Value": 0,
+                    "Unit": "Count",
+                },
+                {
+                    "MetricName": "ImageAccessGrantCacheMisses",
+                    "Value": 0,
+                    "Unit": "Count",
+                },
+            ],
+        },
+        {
+            "Namespace": "testserver/core",
+            "MetricData": [
+                {
+                    "MetricName": "Md2HtmlLocalCacheHits",
+                    "Value": 0,
+                    "Unit": "Count",
+                },
+                {
+                    "MetricName": "Md2HtmlCacheHits",
+                    "Value": 0,
+                    "Unit": "Count",
+                },
+                {
+                    "MetricName": "Md2HtmlCacheMisses",
+                    "Value": 0,
+                    "Unit": "Count",
+                },
+            ],
+        },
     ]
@@ -18,7 +18,11 @@ from grandchallenge.core.utils.access_requests import (
     AccessRequestHandlingOptions,
 )
 from grandchallenge.core.views import RedirectPath
-from grandchallenge.datatables.views import Column, PaginatedTableListView
+from grandchallenge.datatables.views import (
+    Column,
+    PaginatedTableListView,
+    invalidate_total_counts,
+)
 from grandchallenge.subdomains.middleware import (
     challenge_subdomain_middleware,
     subdomain_middleware,
@@ -125,6 +129,50 @@ def test_paginated_table_list_view_ordering():
     assert "BbbbbB" == json_resp["data"][1][1].strip()
 
 
+@pytest.mark.django_db
+def test_paginated_table_list_view_caching(django_assert_num_queries):
+    view = PaginatedTableListView()
+    view.model = Algorithm
+    view.row_template = "datatable_row_template.html"
+    view.columns = [Column(title="Created"), Column(title="Title")]
+    view.row_cache_timeout = 60
+    view.total_count_cache_timeout = 60
+
+    request = HttpRequest()
+    request.META["HTTP_X_REQUESTED_WITH"] = "XMLHttpRequest"
+    request.POST["length"] = 50
+    request.POST["draw"] = 1
+    request.user = UserFactory()
+    view.request = request
+
+    algorithm = AlgorithmFactory(title="AaaaaA")
+    invalidate_total_counts(model=Algorithm)
+
+    def get_table():
+        return json.loads(view.post(request).content)
+
+    assert get_table()["recordsTotal"] == 1
+
+    # The count and the row are now cached, only the page is fetched
+    with django_assert_num_queries(1):
+        json_resp = get_table()
+
+    assert json_resp["recordsTotal"] == 1
+    assert json_resp["data"][0][1].strip() == "AaaaaA"
+
+    # Saving the object renders its row again
+    algorithm.title = "BbbbbB"
+    algorithm.save()
+    assert get_table()["data"][0][1].strip() == "BbbbbB"
+
+    # Until invalidated the total count is stale
+    AlgorithmFactory()
+    assert get_table()["recordsTotal"] == 1
+
+    invalidate_total_counts(model=Algorithm)
+    assert get_table()["recordsTotal"] == 2
+
+
 @pytest.mark.django_db
 def test_healthcheck(client, django_assert_num_queries):
     with django_assert_num_queries(3):
@@ -1,3 +1,5 @@
+import csv
+import json
 import time
 from datetime import timedelta
 from typing import NamedTuple
@@ -645,3 +647,58 @@ def test_durations_are_serialized(client):
 
     assert response["exec_duration"] == "P0DT00H22M17S"
     assert response["invoke_duration"] == "P0DT00H31M14S"
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("output_format", ("ndjson", "csv"))
+def test_export_evaluations(client, output_format):
+    admin, participant = UserFactory.create_batch(2)
+    challenge = ChallengeFactory()
+    challenge.add_admin(user=admin)
+    challenge.add_participant(user=participant)
+
+    phase1, phase2 = PhaseFactory.create_batch(2, challenge=challenge)
+    civ = ComponentInterfaceValueFactory(
+        interface=ComponentInterface.objects.get(slug="metrics-json-file"),
+        value={"acc": 0.5},
+    )
+    e1 = EvaluationFactory(submission__phase=phase1, time_limit=60)
+    e1.outputs.set([civ])
+    EvaluationFactory(submission__phase=phase2, time_limit=60)
+    EvaluationFactory(time_limit=60)
+
+    def export(user, **kwargs):
+        return get_view_for_user(
+            client=client,
+            viewname="api:evaluation-export",
+            user=user,
+            data={
+                "challenge": challenge.short_name,
+                "output_format": output_format,
+                **kwargs,
+            },
+        )
+
+    assert export(user=participant).status_code == 403
+
+    response = export(user=admin, phase=phase1.slug)
+
+    assert response.status_code == 200
+    assert response.streaming
+
+    content = b"".join(response.streaming_content).decode("utf-8")
+
+    if output_format == "ndjson":
+        records = [json.loads(line) for line in content.splitlines()]
+        metrics = records[0]["metrics"]
+    else:
+        records = list(csv.DictReader(content.splitlines()))
+        metrics = json.loads(records[0]["metrics"])
+
+    assert [r["pk"] for r in records] == [str(e1.pk)]
+    assert metrics == {"acc": 0.5}
+
+    response = export(user=admin)
+    content = b"".join(response.streaming_content).decode("utf-8")
+
+    assert len(content.splitlines()) == (3 if output_format == "csv" else 2)
@@ -3,6 +3,7 @@ from contextlib import nullcontext
 from datetime import timedelta
 from typing import NamedTuple
 
+import numpy as np
 import pytest
 from django.core import mail
 from django.core.exceptions import ValidationError
@@ -33,7 +34,11 @@ from grandchallenge.evaluation.tasks import (
     create_algorithm_jobs_for_evaluation,
     update_combined_leaderboard,
 )
-from grandchallenge.evaluation.utils import SubmissionKindChoices
+from grandchallenge.evaluation.utils import (
+    CombinedRank,
+    SubmissionKindChoices,
+    combine_phase_ranks,
+)
 from grandchallenge.invoices.models import PaymentTypeChoices
 from tests.algorithms_tests.factories import (
     AlgorithmImageFactory,
@@ -620,12 +625,12 @@ def test_combined_leaderboards(
 
     ranks = leaderboard.combined_ranks
 
-    assert ranks[0]["combined_rank"] == 1
-    assert ranks[0]["user"] == users[0].username
-    assert ranks[1]["combined_rank"] == 2
-    assert ranks[1]["user"] == users[2].username
-    assert ranks[2]["combined_rank"] == 3
-    assert ranks[2]["user"] == users[1].username
+    assert ranks[0].combined_rank == 1
+    assert ranks[0].user.username == users[0].username
+    assert ranks[1].combined_rank == 2
+    assert ranks[1].user.username == users[2].username
+    assert ranks[2].combined_rank == 3
+    assert ranks[2].user.username == users[1].username
 
 
 @pytest.mark.django_db
@@ -687,8 +692,8 @@ def test_combined_leaderboards_with_non_public_components():
         update_combined_leaderboard(pk=leaderboard.pk)
 
         # clear cached property
-        if hasattr(leaderboard, "_combined_ranks_object"):
-            del leaderboard._combined_ranks_object
+        if hasattr(leaderboard, "public_phases"):
+            del leaderboard.public_phases
 
     update_leaderboards()
 
@@ -708,12 +713,12 @@ def test_combined_leaderboards_with_non_public_components():
     ranks = leaderboard.combined_ranks
 
     # Default ranks, user 0 is ranked first
-    assert ranks[0]["combined_rank"] == 2
-    assert ranks[0]["user"] == users[0].username
-    assert ranks[1]["combined_rank"] == 6
-    assert ranks[1]["user"] == users[1].username
-    assert ranks[2]["combined_rank"] == 10
-    assert ranks[2]["user"] == users[2].username
+    assert ranks[0].combined_rank == 2
+    assert ranks[0].user.username == users[0].username
+    assert ranks[1].combined_rank == 6
+    assert ranks[1].user.username == users[1].username
+    assert ranks[2].combined_rank == 10
+    assert ranks[2].user.username == users[2].username
 
     # Retract the two best evaluations of user 0
     phase = phases[0]
@@ -737,17 +742,31 @@ def test_combined_leaderboards_with_non_public_components():
     # user 1: 3 + 1 = 4
     # user 2: 5 + 3 = 8
 
-    assert new_ranks[0]["combined_rank"] == 4
-    assert new_ranks[0]["user"] == users[1].username
-    assert new_ranks[1]["combined_rank"] == 6
-    assert new_ranks[1]["user"] == users[0].username
-    assert new_ranks[2]["combined_rank"] == 8
-    assert new_ranks[2]["user"] == users[2].username
+    assert new_ranks[0].combined_rank == 4
+    assert new_ranks[0].user.username == users[1].username
+    assert new_ranks[1].combined_rank == 6
+    assert new_ranks[1].user.username == users[0].username
+    assert new_ranks[2].combined_rank == 8
+    assert new_ranks[2].user.username == users[2].username
 
-    # Retracting a phase should result in an empty leaderboard
+    # Retracting a phase should only rank on the remaining phase
     phase.public = False
     phase.save()
 
+    update_leaderboards()
+    ranks = leaderboard.combined_ranks
+
+    assert [(r.user.username, r.combined_rank) for r in ranks] == [
+        (users[0].username, 1),
+        (users[1].username, 3),
+        (users[2].username, 5),
+    ]
+    assert [*ranks[0].evaluations_by_phase] == [phases[1].pk]
+
+    # Retracting all phases should result in an empty leaderboard
+    phases[1].public = False
+    phases[1].save()
+
     update_leaderboards()
     assert len(leaderboard.combined_ranks) == 0
 
@@ -823,6 +842,25 @@ def test_combined_leaderboard_updated_on_phase_change(
     assert_callbacks(callbacks)
 
 
+@pytest.mark.django_db
+def test_combined_leaderboard_updated_on_phase_visibility_change(
+    django_capture_on_commit_callbacks,
+):
+    leaderboard = CombinedLeaderboardFactory()
+    phase = PhaseFactory(public=True)
+    leaderboard.phases.add(phase)
+
+    phase.public = False
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        phase.save(skip_calculate_ranks=True)
+
+    assert (
+        f"<bound method Signature.apply_async of grandchallenge.evaluation.tasks.update_combined_leaderboard(pk={leaderboard.pk!r})>"
+        in [repr(callback) for callback in callbacks]
+    )
+
+
 @pytest.mark.parametrize(
     "combined_ranks,expected_ranks",
     (
@@ -832,9 +870,48 @@ def test_combined_leaderboard_updated_on_phase_change(
     ),
 )
 def test_combined_leaderboard_ranks(combined_ranks, expected_ranks):
-    combined_ranks = [{"combined_rank": cr} for cr in combined_ranks]
-    CombinedLeaderboard._rank_combined_rank_scores(combined_ranks)
-    assert [cr["rank"] for cr in combined_ranks] == expected_ranks
+    combined_ranks = combine_phase_ranks(
+        phase_ranks=[
+            ("phase", user, "evaluation", rank, None)
+            for user, rank in enumerate(combined_ranks)
+        ],
+        combination_method=lambda x: np.sum(x, axis=1),
+    )
+    assert [cr.rank for cr in combined_ranks] == expected_ranks
+
+
+def test_combined_leaderboard_ranks_excludes_missing_phases():
+    combined_ranks = combine_phase_ranks(
+        phase_ranks=[
+            ("p1", 1, "e1", 2, 10),
+            ("p2", 1, "e2", 4, 20),
+            ("p1", 2, "e3", 1, 30),
+            ("p3", None, None, None, None),
+        ],
+        combination_method=lambda x: np.mean(x, axis=1),
+    )
+    assert combined_ranks == []
+
+    combined_ranks = combine_phase_ranks(
+        phase_ranks=[
+            ("p1", 1, "e1", 2, 10),
+            ("p2", 1, "e2", 4, 20),
+            ("p1", 2, "e3", 1, 30),
+        ],
+        combination_method=lambda x: np.mean(x, axis=1),
+    )
+    assert combined_ranks == [
+        CombinedRank(
+            user=1,
+            rank=1,
+            combined_rank=3.0,
+            created=20,
+            evaluations={
+                "p1": {"pk": "e1", "rank": 2},
+                "p2": {"pk": "e2", "rank": 4},
+            },
+        )
+    ]
 
 
 @pytest.mark.parametrize(
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from grandchallenge.components.models import (
@@ -6,6 +7,14 @@ from grandchallenge.components.models import (
 )
 from grandchallenge.evaluation.models import Evaluation, Phase
 from grandchallenge.evaluation.tasks import calculate_ranks
+from grandchallenge.evaluation.utils import (
+    LeaderboardMetricValues,
+    Metric,
+    ScoreMatrix,
+    _values_to_ranks,
+    get_leaderboard_metric_values,
+    rank_score_matrix,
+)
 from tests.evaluation_tests.factories import EvaluationFactory, PhaseFactory
 from tests.factories import UserFactory
 
@@ -445,3 +454,68 @@ def assert_ranks(queryset, expected_ranks, expected_rank_scores=None):
 
     if expected_rank_scores:
         assert [r.rank_score for r in queryset] == expected_rank_scores
+
+
+@pytest.mark.parametrize(
+    "values, reverse, expected",
+    (
+        ([0.5, 0.1, 0.5, 0.7], False, [2, 1, 2, 4]),
+        ([0.5, 0.1, 0.5, 0.7], True, [2, 4, 2, 1]),
+        ([1, 1, 1], False, [1, 1, 1]),
+        ([], False, []),
+    ),
+)
+def test_values_to_ranks(values, reverse, expected):
+    ranks = _values_to_ranks(
+        values=np.array(values, dtype=np.float64), reverse=reverse
+    )
+
+    assert ranks.tolist() == expected
+
+
+def test_rank_score_matrix_take_subset():
+    metrics = (
+        Metric(path="a", reverse=True),
+        Metric(path="b", reverse=False),
+    )
+    score_matrix = ScoreMatrix(
+        pks=["x", "y", "z"],
+        scores=np.array([[0.1, 0.3], [0.9, 0.2], [0.5, 0.1]]),
+    )
+
+    positions = rank_score_matrix(
+        score_matrix=score_matrix.take(pks=["z", "x"]),
+        metrics=metrics,
+        score_method=lambda x: np.mean(x, axis=1),
+    )
+
+    assert positions.ranks == {"z": 1, "x": 2}
+    assert positions.rank_scores == {"z": 1.0, "x": 2.0}
+    assert positions.rank_per_metric == {
+        "z": {"a": 1, "b": 1},
+        "x": {"a": 2, "b": 2},
+    }
+
+
+def test_get_leaderboard_metric_values():
+    values = get_leaderboard_metric_values(
+        metrics_json_file={
+            "dice": {"mean": 0.5, "std": 0.1},
+            "label": "foo",
+            "count": 3,
+        },
+        rank_per_metric={"dice.mean": 2},
+        columns=(
+            ("dice.mean", "dice.std"),
+            ("label", ""),
+            ("count", "missing"),
+            ("missing", ""),
+        ),
+    )
+
+    assert values == {
+        "dice.mean": LeaderboardMetricValues(value=0.5, error=0.1, rank=2),
+        "label": LeaderboardMetricValues(value=None, error=None, rank=None),
+        "count": LeaderboardMetricValues(value=3.0, error=None, rank=None),
+        "missing": LeaderboardMetricValues(value=None, error=None, rank=None),
+    }
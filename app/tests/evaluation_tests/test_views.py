@@ -9,7 +9,6 @@ from unittest.mock import patch
 import pytest
 from django.conf import settings
 from django.contrib.auth.models import Group
-from django.core.cache import cache
 from django.core.files.base import ContentFile
 from django.test import override_settings
 from django.utils import timezone
@@ -28,11 +27,15 @@ from grandchallenge.components.schemas import GPUTypeChoices
 from grandchallenge.core.templatetags.remove_whitespace import oxford_comma
 from grandchallenge.evaluation.models import (
     CombinedLeaderboard,
+    CombinedLeaderboardRank,
     Evaluation,
     PhaseAlgorithmInterface,
     Submission,
 )
-from grandchallenge.evaluation.tasks import update_combined_leaderboard
+from grandchallenge.evaluation.tasks import (
+    calculate_ranks,
+    update_combined_leaderboard,
+)
 from grandchallenge.evaluation.utils import SubmissionKindChoices
 from grandchallenge.invoices.models import (
     PaymentStatusChoices,
@@ -1405,6 +1408,116 @@ def test_combined_leaderboard_create(client):
     assert CombinedLeaderboard.objects.get().challenge == ch1
 
 
+@pytest.mark.django_db
+def test_combined_leaderboard_detail_is_paginated(client):
+    challenge = ChallengeFactory()
+    phases = PhaseFactory.create_batch(2, challenge=challenge, public=True)
+    leaderboard = CombinedLeaderboardFactory(challenge=challenge)
+    leaderboard.phases.set(phases)
+    users = UserFactory.create_batch(3)
+
+    for phase in phases:
+        for rank, user in enumerate(users, start=1):
+            EvaluationFactory(
+                submission__creator=user,
+                submission__phase=phase,
+                published=True,
+                status=Evaluation.SUCCESS,
+                rank=rank,
+                time_limit=phase.evaluation_time_limit,
+            )
+        phase.update_user_ranks()
+
+    update_combined_leaderboard(pk=leaderboard.pk)
+
+    response = get_view_for_user(
+        viewname="evaluation:combined-leaderboard-detail",
+        client=client,
+        method=client.post,
+        reverse_kwargs={
+            "challenge_short_name": challenge.short_name,
+            "slug": leaderboard.slug,
+        },
+        data={"draw": "1", "start": "0", "length": "2"},
+        HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+    )
+    response_content = json.loads(response.content.decode("utf-8"))
+
+    assert response.status_code == 200
+    assert response_content["recordsTotal"] == 3
+    assert len(response_content["data"]) == 2
+    # Rank, user, created, combined rank and a column per phase
+    assert len(response_content["data"][0]) == 6
+    assert users[0].username in response_content["data"][0][1]
+    assert users[1].username in response_content["data"][1][1]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "direction,expected_order", (("asc", (1, 0, 2)), ("desc", (0, 1, 2)))
+)
+def test_leaderboard_sorted_by_metric(client, direction, expected_order):
+    phase = PhaseFactory(
+        challenge=ChallengeFactory(hidden=False),
+        public=True,
+        submission_kind=SubmissionKindChoices.CSV,
+        score_jsonpath="a",
+        score_default_sort="desc",
+        extra_results_columns=[
+            {
+                "path": "b",
+                "title": "b",
+                "order": "asc",
+                "exclude_from_ranking": True,
+            }
+        ],
+    )
+    interface = ComponentInterface.objects.get(slug="metrics-json-file")
+    evaluations = []
+
+    for metrics in ({"a": 0.1, "b": 3}, {"a": 0.9, "b": 1}, {"a": 0.5}):
+        evaluation = EvaluationFactory(
+            submission__phase=phase,
+            published=True,
+            status=Evaluation.SUCCESS,
+            time_limit=phase.evaluation_time_limit,
+        )
+        evaluation.outputs.add(
+            ComponentInterfaceValueFactory(interface=interface, value=metrics)
+        )
+        evaluations.append(evaluation)
+
+    calculate_ranks(phase_pk=phase.pk)
+
+    assert phase.leaderboard_metric_values.count() == 6
+
+    response = get_view_for_user(
+        viewname="evaluation:leaderboard",
+        client=client,
+        method=client.post,
+        reverse_kwargs={
+            "challenge_short_name": phase.challenge.short_name,
+            "slug": phase.slug,
+        },
+        data={
+            "draw": "1",
+            "start": "0",
+            "length": "10",
+            # Rank, user, created, a, b
+            "order[0][column]": "4",
+            "order[0][dir]": direction,
+        },
+        HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+    )
+    rows = json.loads(response.content.decode("utf-8"))["data"]
+
+    assert response.status_code == 200
+    assert len(rows) == 3
+    for row, idx in zip(rows, expected_order, strict=True):
+        assert str(evaluations[idx].pk) in row[3]
+    assert "3" in rows[expected_order.index(0)][4]
+
+
 @pytest.mark.django_db
 def test_combined_leaderboard_delete(client):
     challenge = ChallengeFactory()
@@ -1415,7 +1528,8 @@ def test_combined_leaderboard_delete(client):
 
     # Sanity check
     assert CombinedLeaderboard.objects.filter(pk=leaderboard.pk).exists()
-    assert cache.get(leaderboard.combined_ranks_cache_key) is not None
+    leaderboard.refresh_from_db()
+    assert leaderboard.combined_ranks_created is not None
 
     view_args = {
         "viewname": "evaluation:combined-leaderboard-delete",
@@ -1442,7 +1556,9 @@ def test_combined_leaderboard_delete(client):
     assert response.status_code == 302
 
     assert not CombinedLeaderboard.objects.filter(pk=leaderboard.pk).exists()
-    assert cache.get(leaderboard.combined_ranks_cache_key) is None
+    assert not CombinedLeaderboardRank.objects.filter(
+        combined_leaderboard_id=leaderboard.pk
+    ).exists()
 
 
 @pytest.mark.django_db
@@ -7,7 +7,6 @@ from django.urls import reverse
 
 from grandchallenge.cases.models import RawImageUploadSession
 from grandchallenge.components.models import InterfaceKindChoices
-from grandchallenge.core.utils.query import set_seed
 from grandchallenge.reader_studies.models import (
     Answer,
     AnswerType,
@@ -2066,6 +2065,7 @@ def test_display_set_index(client):
         *range(n_display_sets)
     ]
     shuffled_order = [x["order"] for x in response.json()["results"]]
+    shuffled_pks = [x["pk"] for x in response.json()["results"]]
 
     response = get_view_for_user(
         viewname="api:reader-studies-display-set-detail",
@@ -2075,12 +2075,10 @@ def test_display_set_index(client):
         method=client.get,
     )
 
-    # determine shuffled index of first Displayset
-    set_seed(1 / int(user.pk))
-    queryset = list(DisplaySet.objects.all().order_by("?"))
-    new_index = queryset.index(DisplaySet.objects.first())
-
-    assert response.json()["index"] == new_index
+    # The index of the first display set is its position in the shuffled list
+    assert response.json()["index"] == shuffled_pks.index(
+        str(DisplaySet.objects.first().pk)
+    )
 
     reader_study.shuffle_hanging_list = False
     reader_study.save()
@@ -2130,6 +2128,59 @@ def test_display_set_index(client):
     ]
 
 
+@pytest.mark.django_db
+def test_shuffled_hanging_list_reset_on_display_set_change(client):
+    reader_study = ReaderStudyFactory(shuffle_hanging_list=True)
+    user = UserFactory()
+    reader_study.add_reader(user)
+
+    ds1, ds2, ds3 = DisplaySetFactory.create_batch(
+        3, reader_study=reader_study
+    )
+
+    def get_indices():
+        response = get_view_for_user(
+            viewname="api:reader-studies-display-set-list",
+            data={"reader_study": str(reader_study.pk)},
+            user=user,
+            client=client,
+            method=client.get,
+        )
+        return {x["pk"]: x["index"] for x in response.json()["results"]}
+
+    indices = get_indices()
+
+    assert sorted(indices.values()) == [0, 1, 2]
+    assert (
+        reader_study.shuffled_display_set_indices.filter(user=user).count()
+        == 3
+    )
+
+    ds4 = DisplaySetFactory(reader_study=reader_study)
+
+    assert not reader_study.shuffled_display_set_indices.exists()
+
+    indices = get_indices()
+
+    assert sorted(indices.values()) == [0, 1, 2, 3]
+    assert str(ds4.pk) in indices
+
+    ds2.delete()
+
+    assert not reader_study.shuffled_display_set_indices.exists()
+
+    indices = get_indices()
+
+    assert sorted(indices.values()) == [0, 1, 2]
+    assert str(ds2.pk) not in indices
+
+    # Updating a display set keeps the shuffled list
+    ds1.title = "foo"
+    ds1.save()
+
+    assert get_indices() == indices
+
+
 @pytest.mark.django_db
 def test_display_set_index_with_duplicate_order(
     client, django_assert_num_queries
@@ -2143,7 +2194,7 @@ def test_display_set_index_with_duplicate_order(
     ds2.order = ds1.order
     ds2.save()
 
-    with django_assert_num_queries(34):
+    with django_assert_num_queries(33):
         response = get_view_for_user(
             viewname="api:reader-studies-display-set-list",
             data={"reader_study": str(reader_study.pk)},
@@ -1,8 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import nullcontext
 from datetime import timedelta
+from threading import Event
+from time import sleep
 
 import pytest
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.core.management import call_command
+from django.db import connection, transaction
 from django.db.models import ProtectedError
 from django.db.utils import IntegrityError
 
@@ -19,7 +24,9 @@ from grandchallenge.reader_studies.models import (
     Question,
     QuestionWidgetKindChoices,
     ReaderStudy,
+    ReaderStudyStatisticsSnapshot,
 )
+from grandchallenge.reader_studies.tasks import update_statistics_snapshot
 from tests.components_tests.factories import (
     ComponentInterfaceFactory,
     ComponentInterfaceValueFactory,
@@ -192,12 +199,106 @@ def test_progress_for_user(settings):
     assert progress["questions"] == 100.0
 
 
+@pytest.mark.django_db
+def test_reader_progress_ledger():
+    rs = ReaderStudyFactory()
+    q1, q2 = QuestionFactory.create_batch(2, reader_study=rs)
+    ds1, ds2 = DisplaySetFactory.create_batch(2, reader_study=rs)
+    reader = UserFactory()
+
+    def ledger():
+        return (
+            {
+                (p.user_id, p.display_set_id): p.answer_count
+                for p in rs.display_set_reader_progress.all()
+            },
+            {p.user_id: p.answer_count for p in rs.reader_progress.all()},
+        )
+
+    a1 = AnswerFactory(question=q1, creator=reader, display_set=ds1)
+    AnswerFactory(question=q2, creator=reader, display_set=ds1)
+    AnswerFactory(question=q1, creator=reader, display_set=ds2)
+    AnswerFactory(
+        question=q1, creator=reader, display_set=ds2, is_ground_truth=True
+    )
+
+    assert ledger() == (
+        {(reader.pk, ds1.pk): 2, (reader.pk, ds2.pk): 1},
+        {reader.pk: 3},
+    )
+    assert rs.get_progress_for_user(reader)["hangings"] == 50
+
+    a1.display_set = ds2
+    a1.save()
+
+    assert ledger() == (
+        {(reader.pk, ds1.pk): 1, (reader.pk, ds2.pk): 2},
+        {reader.pk: 3},
+    )
+
+    a1.delete()
+
+    assert ledger() == (
+        {(reader.pk, ds1.pk): 1, (reader.pk, ds2.pk): 1},
+        {reader.pk: 2},
+    )
+
+    rs.display_set_reader_progress.all().delete()
+    rs.reader_progress.all().delete()
+
+    call_command("rebuild_reader_progress", reader_study=rs.slug)
+
+    assert ledger() == (
+        {(reader.pk, ds1.pk): 1, (reader.pk, ds2.pk): 1},
+        {reader.pk: 2},
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_reader_progress_ledger_concurrent_answers():
+    rs = ReaderStudyFactory()
+    q1, q2 = QuestionFactory.create_batch(2, reader_study=rs)
+    ds = DisplaySetFactory(reader_study=rs)
+    reader = UserFactory()
+    first_answer_saved = Event()
+
+    def create_answer(*, question, hold_transaction):
+        try:
+            with transaction.atomic():
+                AnswerFactory(
+                    question=question, creator=reader, display_set=ds
+                )
+                first_answer_saved.set()
+
+                if hold_transaction:
+                    sleep(1)
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first = executor.submit(
+            create_answer, question=q1, hold_transaction=True
+        )
+        first_answer_saved.wait(timeout=10)
+        # Saved while the first answer is not committed yet
+        second = executor.submit(
+            create_answer, question=q2, hold_transaction=False
+        )
+        first.result()
+        second.result()
+
+    assert rs.display_set_reader_progress.get().answer_count == 2
+    assert rs.reader_progress.get().answer_count == 2
+
+
 @pytest.mark.django_db
 def test_leaderboard(  # noqa: C901
     reader_study_with_gt, settings, django_capture_on_commit_callbacks
 ):
     settings.task_eager_propagates = (True,)
     settings.task_always_eager = (True,)
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    settings.CELERY_TASK_EAGER_PROPAGATES = True
 
     rs = reader_study_with_gt
     r1, r2 = rs.readers_group.user_set.all()
@@ -270,6 +371,8 @@ def test_statistics(
 ):
     settings.task_eager_propagates = (True,)
     settings.task_always_eager = (True,)
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    settings.CELERY_TASK_EAGER_PROPAGATES = True
 
     rs = reader_study_with_gt
     r1, r2 = rs.readers_group.user_set.all()
@@ -368,6 +471,112 @@ def test_score_for_user(
     assert score["score__avg"] == 0.5
 
 
+@pytest.mark.parametrize(
+    "answer_type,answers,ground_truths",
+    (
+        (
+            AnswerType.BOOL,
+            [True, False, True, False],
+            [True, True, False, False],
+        ),
+        (AnswerType.NUMBER, [1, 1.0, 2, 0.5], [1.0, 1, 3, 0.5]),
+        (
+            AnswerType.TEXT,
+            ["a", "", "b", "a "],
+            ["a", "", "c", "a"],
+        ),
+        (
+            AnswerType.MULTIPLE_CHOICE,
+            [[], [1, 2], [2, 1], [1], [], [3, 0]],
+            [[], [1, 2], [1, 2], [1, 3], [2], [3]],
+        ),
+    ),
+)
+def test_calculate_scores_matches_calculate_score(
+    answer_type, answers, ground_truths
+):
+    question = Question(answer_type=answer_type)
+
+    scores = question.calculate_scores(
+        answers=answers, ground_truths=ground_truths
+    )
+
+    assert list(scores) == [
+        question.calculate_score(answer, ground_truth)
+        for answer, ground_truth in zip(answers, ground_truths, strict=True)
+    ]
+
+
+@pytest.mark.django_db
+def test_statistics_snapshot_invalidation(
+    reader_study_with_gt, django_capture_on_commit_callbacks
+):
+    rs = reader_study_with_gt
+    r1, r2 = rs.readers_group.user_set.all()
+    question = rs.questions.first()
+    ds1, ds2 = rs.display_sets.all()
+
+    AnswerFactory(question=question, creator=r1, answer=True, display_set=ds1)
+
+    assert rs.score_for_user(r1) == {"score__sum": 1.0, "score__avg": 1.0}
+
+    snapshot = ReaderStudyStatisticsSnapshot.objects.get(reader_study=rs)
+    assert snapshot.is_current
+    assert snapshot.statistics_computed_at is not None
+
+    with django_capture_on_commit_callbacks(execute=True):
+        AnswerFactory(
+            question=question, creator=r1, answer=False, display_set=ds2
+        )
+        AnswerFactory(
+            question=question, creator=r2, answer=True, display_set=ds1
+        )
+
+        # Nothing is invalidated until the transaction commits
+        snapshot.refresh_from_db()
+        assert snapshot.is_current
+
+    previous_version = snapshot.version
+    snapshot.refresh_from_db()
+    assert not snapshot.is_current
+    assert snapshot.version == previous_version + 1
+
+    # The out of date statistics are served until they are updated
+    assert rs.score_for_user(r1) == {"score__sum": 1.0, "score__avg": 1.0}
+
+    previous_computed_at = snapshot.statistics_computed_at
+    update_statistics_snapshot(reader_study_pk=rs.pk)
+
+    snapshot.refresh_from_db()
+    assert snapshot.is_current
+    assert snapshot.statistics_computed_at > previous_computed_at
+    assert rs.score_for_user(r1) == {"score__sum": 1.0, "score__avg": 0.5}
+
+    # The snapshot is used as long as nothing changes
+    ReaderStudyStatisticsSnapshot.objects.filter(pk=snapshot.pk).update(
+        statistics={**snapshot.statistics, "scores_by_user": []}
+    )
+    assert rs.score_for_user(r1) == {"score__sum": None, "score__avg": None}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Answer.objects.get(
+            question=question, display_set=ds2, is_ground_truth=True
+        ).delete()
+
+    update_statistics_snapshot(reader_study_pk=rs.pk)
+
+    assert rs.score_for_user(r1) == {"score__sum": 1.0, "score__avg": 1.0}
+
+    # Out of date statistics are not stored
+    snapshot.refresh_from_db()
+    ReaderStudyStatisticsSnapshot.objects.filter(pk=snapshot.pk).invalidate()
+
+    assert not snapshot.update_statistics()
+
+    snapshot.refresh_from_db()
+    assert not snapshot.is_current
+
+
 @pytest.mark.django_db
 def test_description_is_scrubbed(client):
     u = UserFactory()
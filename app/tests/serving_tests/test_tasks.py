@@ -0,0 +1,63 @@
+import pytest
+from django.core.cache import cache
+from django_redis import get_redis_connection
+from guardian.shortcuts import assign_perm
+
+from grandchallenge.serving.models import Download
+from grandchallenge.serving.tasks import (
+    DOWNLOAD_BUFFER_KEY,
+    DOWNLOAD_PROCESSING_KEY,
+    buffer_download,
+    create_buffered_downloads,
+)
+from tests.factories import ImageFactory, ImageFileFactory, UserFactory
+from tests.utils import get_view_for_user
+
+
+@pytest.fixture
+def empty_download_buffer():
+    redis = get_redis_connection("default")
+    redis.delete(
+        cache.make_key(DOWNLOAD_BUFFER_KEY),
+        cache.make_key(DOWNLOAD_PROCESSING_KEY),
+    )
+
+
+@pytest.mark.django_db
+def test_downloads_are_buffered(client, empty_download_buffer):
+    image_file = ImageFileFactory()
+    user = UserFactory()
+    assign_perm("view_image", user, image_file.image)
+
+    for _ in range(2):
+        response = get_view_for_user(
+            url=image_file.file.url, client=client, user=user
+        )
+        assert response.status_code == 302
+
+    assert not Download.objects.exists()
+
+    create_buffered_downloads(batch_size=1)
+
+    assert (
+        Download.objects.filter(creator=user, image=image_file.image).count()
+        == 2
+    )
+
+    # Nothing is left in the buffer
+    create_buffered_downloads()
+    assert Download.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_downloads_of_deleted_objects_are_dropped(empty_download_buffer):
+    user = UserFactory()
+    image, deleted_image = ImageFactory.create_batch(2)
+
+    buffer_download(creator=user.pk, image=image.pk)
+    buffer_download(creator=user.pk, image=deleted_image.pk)
+    deleted_image.delete()
+
+    create_buffered_downloads()
+
+    assert [*Download.objects.values_list("image", flat=True)] == [image.pk]
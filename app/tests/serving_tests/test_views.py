@@ -4,12 +4,18 @@ from pathlib import Path
 import pytest
 from django.core.files.base import ContentFile
 from django.core.files.images import ImageFile
-from guardian.shortcuts import assign_perm
+from guardian.shortcuts import assign_perm, remove_perm
 
 from grandchallenge.components.models import (
     ComponentInterface,
     ComponentInterfaceValue,
 )
+from grandchallenge.serving import views
+from grandchallenge.serving.utils import (
+    get_image_access_grant,
+    invalidate_image_access_grants,
+    pop_image_access_grant_metrics,
+)
 from tests.algorithms_tests.factories import (
     AlgorithmInterfaceFactory,
     AlgorithmJobFactory,
@@ -103,6 +109,128 @@ def test_image_response(client, settings, cloudfront, tmpdir):
         assert "Expires" in redirect
 
 
+@pytest.mark.django_db
+def test_image_access_grants(client):
+    image_file = ImageFileFactory()
+    user, other_user = UserFactory.create_batch(2)
+    group = GroupFactory()
+    group.user_set.add(user, other_user)
+    assign_perm("view_image", group, image_file.image)
+
+    def get_image_file(u):
+        return get_view_for_user(
+            url=image_file.file.url, client=client, user=u
+        )
+
+    pop_image_access_grant_metrics()
+
+    assert get_image_file(user).status_code == 302
+    assert get_image_file(other_user).status_code == 302
+
+    # The grant is reused for the same session
+    assert client.get(image_file.file.url).status_code == 302
+    assert pop_image_access_grant_metrics() == {"hits": 1, "misses": 2}
+
+    # Revoking the permissions revokes the grants
+    group.user_set.remove(other_user)
+    assert client.get(image_file.file.url).status_code == 403
+
+    assert get_image_file(user).status_code == 302
+
+    remove_perm("view_image", group, image_file.image)
+    assert client.get(image_file.file.url).status_code == 403
+
+
+@pytest.mark.django_db
+def test_image_access_grant_revoked_during_authorization(client, monkeypatch):
+    image_file = ImageFileFactory()
+    user = UserFactory()
+    assign_perm("view_image", user, image_file.image)
+
+    authorize_image_access = views._authorize_image_access
+
+    def revoke_during_authorization(**kwargs):
+        authorize_image_access(**kwargs)
+        invalidate_image_access_grants(image_pks=[image_file.image.pk])
+
+    monkeypatch.setattr(
+        views, "_authorize_image_access", revoke_during_authorization
+    )
+
+    response = get_view_for_user(
+        url=image_file.file.url, client=client, user=user
+    )
+    assert response.status_code == 302
+
+    # The grant was created with the versions from before the revocation
+    assert (
+        get_image_access_grant(
+            request=response.wsgi_request, image_pk=image_file.image.pk
+        )
+        is None
+    )
+
+
+@pytest.mark.django_db
+def test_image_access_grant_revoked_on_commit(
+    client, django_capture_on_commit_callbacks
+):
+    image_file = ImageFileFactory()
+    user = UserFactory()
+    assign_perm("view_image", user, image_file.image)
+
+    def get_image_file():
+        return get_view_for_user(
+            url=image_file.file.url, client=client, user=user
+        )
+
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        invalidate_image_access_grants(image_pks=[image_file.image.pk])
+
+    # The removal is not visible yet, so access is granted again
+    response = get_image_file()
+    assert response.status_code == 302
+    assert (
+        get_image_access_grant(
+            request=response.wsgi_request, image_pk=image_file.image.pk
+        )
+        == user.pk
+    )
+
+    for callback in callbacks:
+        callback()
+
+    assert (
+        get_image_access_grant(
+            request=response.wsgi_request, image_pk=image_file.image.pk
+        )
+        is None
+    )
+
+
+@pytest.mark.django_db
+def test_image_access_grant_revoked_on_deactivation(client):
+    image_file = ImageFileFactory()
+    user = UserFactory()
+    assign_perm("view_image", user, image_file.image)
+
+    response = get_view_for_user(
+        url=image_file.file.url, client=client, user=user
+    )
+    assert response.status_code == 302
+
+    user.is_active = False
+    user.save()
+
+    assert (
+        get_image_access_grant(
+            request=response.wsgi_request, image_pk=image_file.image.pk
+        )
+        is None
+    )
+    assert client.get(image_file.file.url).status_code == 403
+
+
 @pytest.mark.django_db
 def test_submission_download(client, two_challenge_sets):
     """Only the challenge admin should be able to download submissions."""
@@ -0,0 +1,97 @@
+import pytest
+from dateutil.relativedelta import relativedelta
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_in
+from django.utils import timezone
+
+from grandchallenge.cases.models import Image
+from grandchallenge.statistics.models import MonthlyStatistic
+from grandchallenge.statistics.tasks import update_monthly_statistics
+from tests.algorithms_tests.factories import AlgorithmFactory
+from tests.factories import ImageFactory, UserFactory
+
+
+def get_counts(statistic):
+    return {
+        (s.month, s.facet): s.object_count
+        for s in MonthlyStatistic.objects.filter(statistic=statistic)
+    }
+
+
+@pytest.mark.django_db
+def test_update_monthly_statistics():
+    this_month = timezone.localdate().replace(day=1)
+    last_year = this_month - relativedelta(years=1)
+
+    ImageFactory.create_batch(2)
+    algorithm = AlgorithmFactory(public=False)
+
+    update_monthly_statistics()
+
+    assert get_counts("images") == {(this_month, ""): 2}
+    assert get_counts("algorithms") == {(this_month, "False"): 1}
+
+    # Late arriving rows are added to their month
+    late_image = ImageFactory()
+    Image.objects.filter(pk=late_image.pk).update(
+        created=late_image.created - relativedelta(years=1)
+    )
+
+    # Changes to the facets are picked up
+    algorithm.public = True
+    algorithm.save()
+
+    update_monthly_statistics()
+
+    assert get_counts("images") == {(this_month, ""): 2, (last_year, ""): 1}
+    assert get_counts("algorithms") == {(this_month, "True"): 1}
+
+    # Closed months without changes are not recomputed
+    MonthlyStatistic.objects.filter(
+        statistic="images", month=last_year
+    ).update(object_count=5)
+    computed_at = MonthlyStatistic.objects.get(
+        statistic="images", month=last_year
+    ).computed_at
+
+    update_monthly_statistics()
+
+    last_years_images = MonthlyStatistic.objects.get(
+        statistic="images", month=last_year
+    )
+    assert last_years_images.object_count == 5
+    assert last_years_images.computed_at == computed_at
+    assert (
+        MonthlyStatistic.objects.get(
+            statistic="images", month=this_month
+        ).computed_at
+        > computed_at
+    )
+
+
+@pytest.mark.django_db
+def test_users_are_counted_from_their_first_login():
+    last_year = timezone.localdate().replace(day=1) - relativedelta(years=1)
+
+    user = UserFactory()
+    get_user_model().objects.filter(pk=user.pk).update(
+        date_joined=user.date_joined - relativedelta(years=1)
+    )
+
+    update_monthly_statistics()
+
+    assert (last_year, "") not in get_counts("users")
+
+    user_logged_in.send(sender=user.__class__, request=None, user=user)
+    user.user_profile.refresh_from_db()
+    first_login_at = user.user_profile.first_login_at
+
+    update_monthly_statistics()
+
+    assert get_counts("users")[(last_year, "")] == 1
+
+    # Later logins do not change the first login
+    user_logged_in.send(sender=user.__class__, request=None, user=user)
+    user.user_profile.refresh_from_db()
+
+    assert user.user_profile.first_login_at == first_login_at